@@ -59,6 +59,7 @@ TENANT_APPS = [
     "services.inventory.products",
     "services.inventory.items",
     "services.inventory.pricelists",
+    "services.finance.common",
     "services.finance.estimates",
     "services.finance.customers",
     "services.finance.sales_orders",
@@ -67,6 +68,8 @@ TENANT_APPS = [
     "services.settings.currencies",
     "services.settings.inventory",
     "services.settings.taxes",
+    "services.search",
+    "services.imports",
     # Future services
     # "services.teaminbox",
     # "services.finance",
@@ -162,6 +165,12 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads are SHA-256 hashed as they stream in, for content-addressed attachment storage
+FILE_UPLOAD_HANDLERS = [
+    "services.attachments.uploadhandlers.HashingMemoryFileUploadHandler",
+    "services.attachments.uploadhandlers.HashingTemporaryFileUploadHandler",
+]
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -173,7 +182,7 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "core.shared.pagination.SelectablePagination",
     "PAGE_SIZE": 20,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
@@ -183,6 +192,17 @@ JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", SECRET_KEY)
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRATION_MINUTES = int(os.getenv("JWT_EXPIRATION_MINUTES", "60"))
 
+# Rate Limiting (counters live in a shared database table; CacheRateLimitBackend
+# is only shared when RATE_LIMIT_CACHE is a Redis/Memcached cache; use
+# core.auth.ratelimit.LocalRateLimitBackend for tests)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "core.auth.ratelimit.DatabaseRateLimitBackend")
+RATE_LIMIT_CACHE = os.getenv("RATE_LIMIT_CACHE", "default")
+
+# Audit Log (entries are batched by a background writer; "sync" writes inline, for tests)
+AUDIT_LOG_MODE = os.getenv("AUDIT_LOG_MODE", "background")
+AUDIT_LOG_BATCH_SIZE = int(os.getenv("AUDIT_LOG_BATCH_SIZE", "500"))
+AUDIT_LOG_FLUSH_INTERVAL = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL", "2.0"))
+
 # Session Settings (for Django Admin)
 SESSION_COOKIE_AGE = 3600  # 1 hour (in seconds)
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
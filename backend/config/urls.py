@@ -83,6 +83,12 @@ urlpatterns = [
     # Settings APIs
     path("api/settings/", include("services.settings.urls")),
 
+    # Global search API
+    path("api/search/", include("services.search.urls")),
+
+    # Bulk import API
+    path("api/imports/", include("services.imports.urls")),
+
     # TeamInbox APIs
     # path("api/teaminbox/", include("services.teaminbox.urls")),  # Commented out for new backend
 
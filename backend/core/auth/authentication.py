@@ -6,6 +6,8 @@ from django.contrib.auth import get_user_model
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
+from core.tenant_core.principals import get_tenant_principal
+
 # Constants
 PUBLIC_SCHEMA_NAME = "public"
 BEARER_PREFIX = "Bearer "
@@ -64,20 +66,15 @@ class JWTAuthentication(BaseAuthentication):
             # Verify user belongs to current tenant
             if current_tenant and current_tenant.schema_name != PUBLIC_SCHEMA_NAME:
                 try:
-                    # Switch to public schema for user-tenant verification
-                    from django.db import connection as db_connection
-                    db_connection.set_schema_to_public()
-
-                    # Check if user is authorized for this tenant
-                    if not user.tenants.filter(schema_name=current_tenant.schema_name).exists():
-                        raise AuthenticationFailed("User not authorized for this tenant")
-
-                    # Switch back to tenant schema
-                    db_connection.set_schema(current_tenant.schema_name)
-
+                    # Resolved once here and reused by the permission classes
+                    principal = get_tenant_principal(user, current_tenant, request)
                 except Exception:
                     raise AuthenticationFailed("Tenant verification failed")
 
+                # Check if user is authorized for this tenant
+                if not principal.is_member:
+                    raise AuthenticationFailed("User not authorized for this tenant")
+
             return (user, token)
 
         except jwt.ExpiredSignatureError:
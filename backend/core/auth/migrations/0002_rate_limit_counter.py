@@ -0,0 +1,29 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core_auth", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateLimitCounter",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("window_index", models.BigIntegerField()),
+                ("current_count", models.IntegerField(default=0)),
+                ("previous_count", models.IntegerField(default=0)),
+                ("expires_at", models.DateTimeField(db_index=True)),
+            ],
+            options={
+                "db_table": "core_rate_limit_counters",
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core_auth", "0002_rate_limit_counter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TenantPrincipalVersion",
+            fields=[
+                (
+                    "schema_name",
+                    models.CharField(max_length=63, primary_key=True, serialize=False),
+                ),
+                ("version", models.CharField(max_length=32)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "core_tenant_principal_versions",
+            },
+        ),
+    ]
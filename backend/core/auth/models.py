@@ -32,3 +32,42 @@ class User(AbstractUser):
     def full_name(self):
         """Get user's full name"""
         return f"{self.first_name} {self.last_name}".strip()
+
+
+class RateLimitCounter(models.Model):
+    """
+    Sliding-window counters for core.auth.ratelimit.DatabaseRateLimitBackend.
+    One row per limiter key holds the current and previous window's counts;
+    the table lives in the public schema so every worker and tenant shares it.
+    """
+    key = models.CharField(max_length=255, primary_key=True)
+    window_index = models.BigIntegerField()
+    current_count = models.IntegerField(default=0)
+    previous_count = models.IntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        app_label = 'core_auth'
+        db_table = 'core_rate_limit_counters'
+
+    def __str__(self):
+        return f"{self.key} ({self.current_count})"
+
+
+class TenantPrincipalVersion(models.Model):
+    """
+    Invalidation token for the cached principals in core.tenant_core.principals.
+    One row per tenant schema (plus '__all__' for every tenant); a role or
+    membership change writes a new token, and each request reads the tokens
+    for its tenant, so every worker drops stale principals at once.
+    """
+    schema_name = models.CharField(max_length=63, primary_key=True)
+    version = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'core_auth'
+        db_table = 'core_tenant_principal_versions'
+
+    def __str__(self):
+        return f"{self.schema_name}: {self.version}"
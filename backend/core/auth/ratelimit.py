@@ -0,0 +1,247 @@
+import hashlib
+import threading
+import time
+from datetime import UTC, datetime
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.utils.module_loading import import_string
+
+DEFAULT_BACKEND = 'core.auth.ratelimit.DatabaseRateLimitBackend'
+
+
+class RateLimitResult:
+    """Outcome of one rate limit check"""
+
+    __slots__ = ('allowed', 'count', 'retry_after')
+
+    def __init__(self, allowed, count, retry_after=0):
+        self.allowed = allowed
+        self.count = count
+        self.retry_after = retry_after
+
+
+class BaseRateLimitBackend:
+    """
+    Sliding-window counter limiter.
+
+    Each key keeps two fixed-size counters: the current window and the
+    previous one. The request rate is estimated as
+        previous * (1 - elapsed / window) + current
+    which gives a sliding window in constant memory and O(1) time per hit.
+    """
+
+    def hit(self, key, limit, window_seconds):
+        now = time.time()
+        window_index = int(now // window_seconds)
+        elapsed = (now - window_index * window_seconds) / window_seconds
+
+        current, previous = self.get_counts(key, window_index, window_seconds)
+        estimate = previous * (1 - elapsed) + current
+        if estimate >= limit:
+            return RateLimitResult(False, int(estimate), self._retry_after(
+                limit, current, previous, elapsed, window_seconds
+            ))
+
+        current = self.increment(key, window_index, window_seconds)
+        return RateLimitResult(True, int(previous * (1 - elapsed) + current))
+
+    @staticmethod
+    def _retry_after(limit, current, previous, elapsed, window_seconds):
+        """Seconds until the weighted count drops below the limit"""
+        if previous and current < limit:
+            needed = 1 - (limit - current) / previous
+            return max(0, (needed - elapsed) * window_seconds)
+        return (1 - elapsed) * window_seconds
+
+    def get_counts(self, key, window_index, window_seconds):
+        """Return (current_window_count, previous_window_count)"""
+        raise NotImplementedError
+
+    def increment(self, key, window_index, window_seconds):
+        """Count one request in the current window and return the new count"""
+        raise NotImplementedError
+
+
+class DatabaseRateLimitBackend(BaseRateLimitBackend):
+    """
+    Shared backend on the RateLimitCounter table, so every worker sees the
+    same counts without a cache server. A hit is one INSERT ... ON CONFLICT
+    DO UPDATE ... RETURNING, so concurrent workers never lose increments.
+    Rows idle for two windows are deleted every SWEEP_INTERVAL hits.
+    """
+
+    SWEEP_INTERVAL = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits_since_sweep = 0
+
+    @staticmethod
+    def _table():
+        from .models import RateLimitCounter
+        return connection.ops.quote_name(RateLimitCounter._meta.db_table)
+
+    @staticmethod
+    def _row_key(key):
+        if len(key) <= 255:
+            return key
+        return 'sha256:' + hashlib.sha256(key.encode()).hexdigest()
+
+    def get_counts(self, key, window_index, window_seconds):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT window_index, current_count, previous_count FROM {self._table()} WHERE key = %s',
+                [self._row_key(key)]
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return 0, 0
+        row_index, current, previous = row
+        if row_index >= window_index:
+            return current, previous
+        if row_index == window_index - 1:
+            return 0, current
+        return 0, 0
+
+    def increment(self, key, window_index, window_seconds):
+        expires_at = datetime.fromtimestamp((window_index + 2) * window_seconds, tz=UTC)
+        table = self._table()
+        # SET expressions all read the row as it was before this hit
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} AS counter
+                    (key, window_index, current_count, previous_count, expires_at)
+                VALUES (%s, %s, 1, 0, %s)
+                ON CONFLICT (key) DO UPDATE SET
+                    current_count = CASE
+                        WHEN counter.window_index >= EXCLUDED.window_index THEN counter.current_count + 1
+                        ELSE 1 END,
+                    previous_count = CASE
+                        WHEN counter.window_index >= EXCLUDED.window_index THEN counter.previous_count
+                        WHEN counter.window_index = EXCLUDED.window_index - 1 THEN counter.current_count
+                        ELSE 0 END,
+                    window_index = GREATEST(counter.window_index, EXCLUDED.window_index),
+                    expires_at = GREATEST(counter.expires_at, EXCLUDED.expires_at)
+                RETURNING current_count
+                """,
+                [self._row_key(key), window_index, expires_at]
+            )
+            current = cursor.fetchone()[0]
+
+        with self._lock:
+            self._hits_since_sweep += 1
+            sweep = self._hits_since_sweep >= self.SWEEP_INTERVAL
+            if sweep:
+                self._hits_since_sweep = 0
+        if sweep:
+            self._sweep()
+        return current
+
+    def _sweep(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self._table()} WHERE expires_at < %s',
+                [datetime.now(tz=UTC)]
+            )
+
+
+class CacheRateLimitBackend(BaseRateLimitBackend):
+    """
+    Backend on the Django cache named by RATE_LIMIT_CACHE. Counts are only
+    shared between workers when that cache is a server (Redis/Memcached);
+    on the default LocMemCache each process counts on its own. Counters
+    expire after two windows, so idle keys are swept by the cache itself.
+    """
+
+    def __init__(self, cache_alias=None):
+        self.cache = caches[cache_alias or getattr(settings, 'RATE_LIMIT_CACHE', 'default')]
+
+    @staticmethod
+    def _counter_key(key, window_index):
+        return f'ratelimit:{key}:{window_index}'
+
+    def get_counts(self, key, window_index, window_seconds):
+        current_key = self._counter_key(key, window_index)
+        previous_key = self._counter_key(key, window_index - 1)
+        counts = self.cache.get_many([current_key, previous_key])
+        return counts.get(current_key, 0), counts.get(previous_key, 0)
+
+    def increment(self, key, window_index, window_seconds):
+        counter_key = self._counter_key(key, window_index)
+        timeout = int(window_seconds * 2) + 1
+        if self.cache.add(counter_key, 1, timeout):
+            return 1
+        try:
+            return self.cache.incr(counter_key)
+        except ValueError:
+            # Expired between add() and incr()
+            self.cache.set(counter_key, 1, timeout)
+            return 1
+
+
+class LocalRateLimitBackend(BaseRateLimitBackend):
+    """
+    In-process backend for tests and single-process development. Holds
+    three numbers per key and sweeps keys idle for two windows.
+    """
+
+    SWEEP_INTERVAL = 1000
+
+    def __init__(self):
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._hits_since_sweep = 0
+
+    def get_counts(self, key, window_index, window_seconds):
+        with self._lock:
+            entry = self._counters.get(key)
+        if entry is None:
+            return 0, 0
+        entry_index, current, previous = entry
+        if entry_index == window_index:
+            return current, previous
+        if entry_index == window_index - 1:
+            return 0, current
+        return 0, 0
+
+    def increment(self, key, window_index, window_seconds):
+        with self._lock:
+            entry_index, current, previous = self._counters.get(key, (window_index, 0, 0))
+            if entry_index != window_index:
+                previous = current if entry_index == window_index - 1 else 0
+                current = 0
+            current += 1
+            self._counters[key] = (window_index, current, previous)
+
+            self._hits_since_sweep += 1
+            if self._hits_since_sweep >= self.SWEEP_INTERVAL:
+                self._sweep(window_index)
+            return current
+
+    def _sweep(self, window_index):
+        self._hits_since_sweep = 0
+        stale = [key for key, entry in self._counters.items() if entry[0] < window_index - 1]
+        for key in stale:
+            del self._counters[key]
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_rate_limit_backend():
+    """Return the backend configured by settings.RATE_LIMIT_BACKEND"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_path = getattr(settings, 'RATE_LIMIT_BACKEND', DEFAULT_BACKEND)
+                _backend = import_string(backend_path)()
+    return _backend
@@ -1,22 +1,19 @@
-import threading
-from collections import defaultdict
-from datetime import datetime, timedelta
+import math
 from functools import wraps
 
 from rest_framework import status
+from rest_framework.exceptions import Throttled
 from rest_framework.response import Response
 
-from core.tenant_core.models import AuditLog
+from core.tenant_core.audit import record_audit_log
+
+from .ratelimit import get_rate_limit_backend
 
 # Constants
 HTTP_X_FORWARDED_FOR = 'HTTP_X_FORWARDED_FOR'
 REMOTE_ADDR = 'REMOTE_ADDR'
 HTTP_USER_AGENT = 'HTTP_USER_AGENT'
 
-# Thread-safe storage for rate limiting (in production, use Redis)
-rate_limit_storage = defaultdict(list)
-storage_lock = threading.Lock()
-
 
 def get_client_ip(request):
     """
@@ -49,7 +46,8 @@ def create_audit_log(user, action, model_name, object_id, changes=None, request=
         request (HttpRequest, optional): HTTP request object for IP and user agent
         
     Returns:
-        AuditLog: Created audit log instance
+        AuditLog: The recorded entry (written in the background unless
+        AUDIT_LOG_MODE is 'sync'), or None in the public schema
     """
     audit_data = {
         "user": user,
@@ -63,55 +61,72 @@ def create_audit_log(user, action, model_name, object_id, changes=None, request=
         audit_data["ip_address"] = get_client_ip(request)
         audit_data["user_agent"] = request.META.get(HTTP_USER_AGENT, '')
 
-    return AuditLog.objects.create(**audit_data)
+    return record_audit_log(**audit_data)
+
 
+def _resolve_request(first_arg, args, kwargs):
+    """
+    Find the HTTP request for a decorated callable. Supports function views,
+    view methods (self, request), and perform_create/perform_update hooks
+    where the request comes from the view or the serializer context.
+    Returns (request, is_view) where is_view means a Response may be returned.
+    """
+    if hasattr(first_arg, 'META'):
+        return first_arg, True
+    if args and hasattr(args[0], 'META'):
+        return args[0], True
+    if hasattr(kwargs.get('request'), 'META'):
+        return kwargs['request'], True
+
+    # View instance (decorated directly) or serializer (via method_decorator)
+    for candidate in (first_arg, *args):
+        request = getattr(candidate, 'request', None)
+        if hasattr(request, 'META'):
+            return request, False
+        context = getattr(candidate, 'context', None)
+        if isinstance(context, dict) and hasattr(context.get('request'), 'META'):
+            return context['request'], False
+    return None, False
+
+
+def rate_limit(max_requests=5, window_minutes=1, key_func=None, scope=None):
+    """
+    Sliding-window rate limiting decorator backed by the shared limiter in
+    core.auth.ratelimit. Requests are keyed per tenant and per user (or IP
+    for anonymous requests) unless key_func is given, and counted per scope
+    (the decorated function by default).
+    """
+    window_seconds = window_minutes * 60
 
-def rate_limit(max_requests=5, window_minutes=1, key_func=None):
-    """Simple rate limiting decorator"""
     def decorator(view_func):
+        limit_scope = scope or f'{view_func.__module__}.{view_func.__qualname__}'
+
         @wraps(view_func)
         def wrapper(self_or_request, *args, **kwargs):
-            # Handle both class-based and function-based views
-            if hasattr(self_or_request, 'META'):
-                # Function-based view - first arg is request
-                request = self_or_request
-                view_args = args
-                view_kwargs = kwargs
-            else:
-                # Class-based view - first arg is self, second is request
-                request = args[0] if args else kwargs.get('request')
-                if not request:
-                    return view_func(self_or_request, *args, **kwargs)
-                view_args = args
-                view_kwargs = kwargs
-
-            # Generate rate limit key
-            if key_func:
-                key = key_func(request)
-            else:
-                key = request.META.get('REMOTE_ADDR', 'unknown')
-
-            current_time = datetime.now()
-            window_start = current_time - timedelta(minutes=window_minutes)
-
-            with storage_lock:
-                # Clean old entries
-                rate_limit_storage[key] = [
-                    timestamp for timestamp in rate_limit_storage[key]
-                    if timestamp > window_start
-                ]
-
-                # Check if rate limit exceeded
-                if len(rate_limit_storage[key]) >= max_requests:
-                    return Response({
-                        'error': 'Rate limit exceeded',
-                        'detail': f'Maximum {max_requests} requests per {window_minutes} minute(s)'
-                    }, status=status.HTTP_429_TOO_MANY_REQUESTS)
-
-                # Add current request
-                rate_limit_storage[key].append(current_time)
-
-            return view_func(self_or_request, *view_args, **view_kwargs)
+            request, is_view = _resolve_request(self_or_request, args, kwargs)
+            if request is None:
+                return view_func(self_or_request, *args, **kwargs)
+
+            key = (key_func or get_tenant_user_key)(request)
+            result = get_rate_limit_backend().hit(
+                f'{limit_scope}:{key}', max_requests, window_seconds
+            )
+
+            if not result.allowed:
+                detail = f'Maximum {max_requests} requests per {window_minutes} minute(s)'
+                retry_after = int(math.ceil(result.retry_after))
+                if not is_view:
+                    # Hooks such as perform_create cannot return a response
+                    raise Throttled(wait=retry_after, detail=detail)
+
+                response = Response({
+                    'error': 'Rate limit exceeded',
+                    'detail': detail
+                }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+                response['Retry-After'] = str(retry_after)
+                return response
+
+            return view_func(self_or_request, *args, **kwargs)
         return wrapper
     return decorator
 
@@ -120,15 +135,22 @@ def get_user_key(request):
     """Generate rate limit key based on user"""
     if request.user.is_authenticated:
         return f"user:{request.user.id}"
-    return request.META.get('REMOTE_ADDR', 'unknown')
+    return get_ip_key(request)
 
 
 def get_ip_key(request):
     """Generate rate limit key based on IP"""
-    return request.META.get('REMOTE_ADDR', 'unknown')
+    return f"ip:{request.META.get(REMOTE_ADDR, 'unknown')}"
+
+
+def get_tenant_user_key(request):
+    """Generate rate limit key based on tenant and user (IP for anonymous requests)"""
+    tenant = getattr(request, 'tenant', None)
+    schema_name = tenant.schema_name if tenant else 'public'
+    return f"tenant:{schema_name}:{get_user_key(request)}"
 
 
 # Specific rate limiting decorators for different operations
 auth_rate_limit = rate_limit(max_requests=5, window_minutes=1, key_func=get_ip_key)
-user_management_rate_limit = rate_limit(max_requests=10, window_minutes=1, key_func=get_user_key)
-role_management_rate_limit = rate_limit(max_requests=5, window_minutes=1, key_func=get_user_key)
+user_management_rate_limit = rate_limit(max_requests=10, window_minutes=1, key_func=get_tenant_user_key)
+role_management_rate_limit = rate_limit(max_requests=5, window_minutes=1, key_func=get_tenant_user_key)
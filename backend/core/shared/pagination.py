@@ -0,0 +1,376 @@
+"""
+Pagination for list endpoints.
+
+SelectablePagination is the project default. It keeps DRF page-number
+pagination (?page=) for existing clients, and switches to KeysetPagination
+when a request asks for it (?pagination=cursor, or a ?cursor= from a previous
+response) or the view sets pagination_mode = 'cursor'.
+
+KeysetPagination pages on the endpoint's own ordering (view.keyset_ordering,
+the queryset's order_by, or the model's Meta.ordering) with the primary key
+as tie-breaker. Cursors carry the ordering values of the boundary row, so
+each page is an index range scan instead of an OFFSET scan, and no COUNT(*)
+runs unless asked for (?count=estimate or ?count=exact). Views over large
+tables set keyset_count = 'estimate' to always include the planner estimate.
+"""
+import base64
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import DatabaseError, connections, router
+from django.db.models import BooleanField, F, Field, Func, Model, Q, Value
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+def _resolve_field(model, path):
+    """Model field at the end of a lookup path, or None for annotations"""
+    parts = path.split(LOOKUP_SEP)
+    field = None
+    for part in parts:
+        if model is None:
+            return None
+        try:
+            field = model._meta.pk if part == 'pk' else model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model
+    if field is not None and field.is_relation:
+        return field.target_field
+    return field
+
+
+def _object_value(obj, path):
+    value = obj
+    for part in path.split(LOOKUP_SEP):
+        if value is None:
+            return None
+        value = getattr(value, part)
+    return value.pk if isinstance(value, Model) else value
+
+
+class RowComparison(Func):
+    """(a, b, ...) < (x, y, ...) (or >) as a filter condition"""
+
+    template = '(%(expressions)s)'
+    output_field = BooleanField()
+
+    def __init__(self, lhs, rhs, operator):
+        super().__init__(lhs, rhs)
+        self.arg_joiner = f' {operator} '
+
+
+def estimate_count(queryset):
+    """
+    Approximate row count without COUNT(*): the planner's reltuples for an
+    unfiltered table (summed over partitions), otherwise the row estimate
+    of EXPLAIN for the filtered query. Returns None when no estimate exists.
+    """
+    model = queryset.model
+    connection = connections[router.db_for_read(model)]
+    try:
+        if not queryset.query.where:
+            table = connection.ops.quote_name(model._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT c.reltuples FROM pg_class c WHERE c.oid = to_regclass(%s) '
+                    'UNION ALL '
+                    'SELECT c.reltuples FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+                    'WHERE i.inhparent = to_regclass(%s)',
+                    [table, table]
+                )
+                # reltuples is -1 (or 0 for partitioned parents) until ANALYZE has run
+                total = sum(max(row[0], 0) for row in cursor.fetchall())
+            if total > 0:
+                return int(total)
+
+        plan = queryset.order_by().explain(format='json')
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    except (DatabaseError, KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over any ordering, keyed on every ordering column plus
+    the primary key.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.ordering = self.get_ordering(queryset, view)
+        self.count = self.get_count(queryset, request, view)
+        values, reverse = self.decode_cursor(request)
+        self.has_cursor = values is not None
+
+        if reverse:
+            order_by = [(name, not descending) for name, descending in self.ordering]
+        else:
+            order_by = self.ordering
+
+        if values is not None:
+            queryset = queryset.filter(self.position_filter(queryset.model, order_by, values))
+        # Spell out Postgres' default null placement so the position filter matches on every backend
+        queryset = queryset.order_by(*[
+            F(name).desc(nulls_first=True) if descending else F(name).asc(nulls_last=True)
+            for name, descending in order_by
+        ])
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.reverse = reverse
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, queryset, view):
+        """[(field, descending), ...] ending with the primary key"""
+        ordering = (
+            getattr(view, 'keyset_ordering', None)
+            or queryset.query.order_by
+            or queryset.model._meta.ordering
+        )
+        fields = []
+        for item in ordering:
+            if not isinstance(item, str) or item == '?':
+                # Expression orderings cannot be keyed; fall back to the primary key
+                fields = []
+                break
+            descending = item.startswith('-')
+            fields.append((item.lstrip('-+'), descending))
+
+        pk_names = {'pk', queryset.model._meta.pk.name, queryset.model._meta.pk.attname}
+        if not any(name in pk_names for name, _descending in fields):
+            fields.append(('pk', fields[-1][1] if fields else False))
+        return fields
+
+    def position_filter(self, model, order_by, values):
+        """Q() selecting rows strictly after the cursor position in order_by"""
+        fields = [_resolve_field(model, name) for name, _descending in order_by]
+        try:
+            values = [
+                field.to_python(value) if field is not None and value is not None else value
+                for field, value in zip(fields, values)
+            ]
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message) from None
+
+        directions = {descending for _name, descending in order_by}
+        if len(directions) == 1 and None not in values and all(
+            field is not None and not field.null for field in fields
+        ):
+            # Uniform direction over NOT NULL columns: one row comparison the
+            # planner turns into an index range, e.g. (a, b, pk) < (%s, %s, %s)
+            position = Func(*[F(name) for name, _descending in order_by], function='', output_field=Field())
+            boundary = Func(
+                *[Value(value, output_field=field) for value, field in zip(values, fields)],
+                function='', output_field=Field()
+            )
+            return Q(RowComparison(position, boundary, '<' if directions.pop() else '>'))
+
+        # Mixed directions or nullable columns: expand to
+        # a > x OR (a = x AND b > y) OR ..., with Postgres' NULLS LAST for
+        # ascending and NULLS FIRST for descending order
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (name, descending), value in zip(order_by, values):
+            condition |= equal & self._after(name, descending, value)
+            equal &= Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _after(name, descending, value):
+        if descending:
+            return Q(**{f'{name}__isnull': False}) if value is None else Q(**{f'{name}__lt': value})
+        if value is None:
+            return Q(pk__in=[])
+        return Q(**{f'{name}__gt': value}) | Q(**{f'{name}__isnull': True})
+
+    def get_count(self, queryset, request, view):
+        mode = request.query_params.get(self.count_query_param) or getattr(view, 'keyset_count', None)
+        self.count_is_estimate = mode == 'estimate'
+        if mode == 'exact':
+            return queryset.order_by().count()
+        if mode == 'estimate':
+            return estimate_count(queryset)
+        return None
+
+    def encode_cursor(self, obj, reverse):
+        values = [_encode_value(_object_value(obj, name)) for name, _descending in self.ordering]
+        payload = json.dumps({'v': values, 'r': reverse}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            values = payload['v']
+            reverse = bool(payload.get('r', False))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message) from None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def get_next_link(self):
+        if not self.page:
+            return None
+        # Going backwards there is always a page after the one we came from
+        if self.has_more or self.reverse:
+            return self.encode_cursor(self.page[-1], reverse=False)
+        return None
+
+    def get_previous_link(self):
+        if not self.page or not self.has_cursor:
+            return None
+        if self.reverse and not self.has_more:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+        if self.count is not None:
+            response['count'] = self.count
+            response['count_is_estimate'] = self.count_is_estimate
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer', 'description': 'Only with ?count=estimate or ?count=exact'},
+                'count_is_estimate': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque cursor from a previous next/previous link',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Results per page (max {self.max_page_size})',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Include a total: "estimate" (planner statistics) or "exact" (COUNT)',
+                'schema': {'type': 'string', 'enum': ['estimate', 'exact']},
+            },
+        ]
+
+
+class SelectablePagination(BasePagination):
+    """
+    Page-number pagination by default, keyset pagination on request or for
+    views with pagination_mode = 'cursor' (unless the request sends ?page=).
+    """
+
+    pagination_query_param = 'pagination'
+    cursor_modes = ('cursor', 'keyset')
+
+    def __init__(self):
+        self.page_number = PageNumberPagination()
+        self.keyset = KeysetPagination()
+        self.active = self.page_number
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.active, 'display_page_controls', False)
+
+    def use_keyset(self, request, view):
+        mode = request.query_params.get(self.pagination_query_param)
+        if mode:
+            return mode in self.cursor_modes
+        if self.keyset.cursor_query_param in request.query_params:
+            return True
+        if self.page_number.page_query_param in request.query_params:
+            return False
+        return getattr(view, 'pagination_mode', 'page') == 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.active = self.keyset if self.use_keyset(request, view) else self.page_number
+        return self.active.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.active.to_html()
+
+    def get_schema_operation_parameters(self, view):
+        return self.page_number.get_schema_operation_parameters(view) + [
+            {
+                'name': self.pagination_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to "cursor" for keyset pagination',
+                'schema': {'type': 'string', 'enum': ['page', 'cursor']},
+            },
+        ] + self.keyset.get_schema_operation_parameters(view)
@@ -0,0 +1,124 @@
+"""
+Indexed text search shared by the CRM, finance and inventory list endpoints.
+
+Matching keeps the existing case-insensitive substring semantics
+(``icontains``), which Postgres answers from ``pg_trgm`` GIN indexes on
+``UPPER(field)`` (see ``trigram_index``). Fields on the model itself are
+OR-ed in one branch so the planner can BitmapOr their indexes; every related
+path (``account__account_name``) gets its own branch, and the branches are
+combined with UNION into a ``pk IN (...)`` filter. That keeps each branch
+index-backed and never duplicates rows through to-many joins.
+
+Results are ranked by the best pg_trgm word similarity across the fields.
+"""
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import FloatField, Q, Value
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Coalesce, Greatest, Upper
+from rest_framework.filters import BaseFilterBackend
+
+
+def trigram_index(field, name):
+    """
+    GIN trigram index on UPPER(field), the expression icontains filters on.
+    Migrations adding one create pg_trgm in the public schema first.
+    """
+    return GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=name)
+
+
+def _is_to_many(model, path):
+    """True if following the lookup path can produce more than one row per object"""
+    parts = path.split(LOOKUP_SEP)
+    for part in parts[:-1]:
+        field = model._meta.get_field(part)
+        if field.one_to_many or field.many_to_many:
+            return True
+        model = field.related_model
+    return False
+
+
+def _local_condition(fields, query):
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__icontains': query})
+    return condition
+
+
+def search_queryset(queryset, query, fields, rank=True):
+    """
+    Filter queryset to rows where any of fields contains query
+    (case-insensitive), ordered by relevance when rank is True.
+    """
+    query = (query or '').strip()
+    if not query or not fields:
+        return queryset
+
+    model = queryset.model
+    manager = model._default_manager
+    local_fields = [field for field in fields if LOOKUP_SEP not in field]
+    related_fields = [field for field in fields if LOOKUP_SEP in field]
+
+    if not related_fields:
+        queryset = queryset.filter(_local_condition(local_fields, query))
+    else:
+        branches = []
+        if local_fields:
+            branches.append(manager.filter(_local_condition(local_fields, query)).values('pk'))
+        for field in related_fields:
+            branches.append(manager.filter(**{f'{field}__icontains': query}).values('pk'))
+        matches = branches[0].union(*branches[1:]) if len(branches) > 1 else branches[0]
+        queryset = queryset.filter(pk__in=matches)
+
+    if not rank:
+        return queryset
+
+    rank_fields = [field for field in fields if not _is_to_many(model, field)]
+    if not rank_fields:
+        return queryset
+
+    similarities = [TrigramWordSimilarity(query, field) for field in rank_fields]
+    score = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+    ordering = queryset.query.order_by or model._meta.ordering
+    return queryset.annotate(
+        search_rank=Coalesce(score, Value(0.0), output_field=FloatField())
+    ).order_by('-search_rank', *ordering)
+
+
+class SearchFilter(BaseFilterBackend):
+    """
+    DRF filter backend over search_queryset. Views declare the searchable
+    fields, optionally per action:
+
+        filter_backends = [SearchFilter]
+        search_fields = ['invoice_number', 'account__account_name']
+    """
+
+    search_param = 'search'
+    ordering_param = 'ordering'
+
+    def get_search_fields(self, view, request):
+        if hasattr(view, 'get_search_fields'):
+            return view.get_search_fields()
+        return getattr(view, 'search_fields', None)
+
+    def get_search_query(self, request):
+        return request.query_params.get(self.search_param, '')
+
+    def filter_queryset(self, request, queryset, view):
+        fields = self.get_search_fields(view, request)
+        query = self.get_search_query(request)
+        if not fields or not query:
+            return queryset
+        # An explicit ?ordering= wins over relevance ordering
+        rank = getattr(view, 'search_rank', True) and self.ordering_param not in request.query_params
+        return search_queryset(queryset, query, fields, rank=rank)
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Case-insensitive text search, ranked by relevance',
+            'schema': {'type': 'string'},
+        }]
@@ -0,0 +1,96 @@
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+
+
+def _context_filter(instances):
+    """Q() matching every entity context (or the standalone bucket) the instances belong to"""
+    contexts = set()
+    standalone = False
+    for instance in instances:
+        if instance.content_type_id and instance.object_id:
+            contexts.add((instance.content_type_id, instance.object_id))
+        else:
+            standalone = True
+
+    condition = Q(pk__in=[])
+    for content_type_id, object_id in contexts:
+        condition |= Q(content_type_id=content_type_id, object_id=object_id)
+    if standalone:
+        condition |= Q(content_type__isnull=True)
+    return condition
+
+
+def get_serial_numbers(model, instances, ordering):
+    """
+    Map pk -> 1-based position of each active record within its entity context
+    (the same content_type/object_id, or all standalone records), numbered with
+    ROW_NUMBER() OVER (PARTITION BY content_type, object_id ORDER BY ...).
+
+    One query for any number of instances. The window runs over whole active
+    contexts, so numbers stay stable however the list being shown was filtered.
+    """
+    instances = [instance for instance in instances if instance.pk is not None]
+    if not instances:
+        return {}
+
+    order_by = [
+        F(field[1:]).desc() if field.startswith('-') else F(field).asc()
+        for field in ordering
+    ]
+    order_by.append(F('pk').asc())
+
+    rows = model.objects.filter(is_active=True).filter(_context_filter(instances)).annotate(
+        serial_number=Window(
+            expression=RowNumber(),
+            partition_by=[F('content_type'), F('object_id')],
+            order_by=order_by,
+        )
+    ).values_list('pk', 'serial_number')
+    return dict(rows)
+
+
+class SerialNumberListSerializer(serializers.ListSerializer):
+    """Resolves serial numbers for a whole page with one query before rendering it"""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, BaseManager) else data
+        instances = list(iterable)
+        self.child.serial_numbers = self.child.resolve_serial_numbers(instances)
+        return super().to_representation(instances)
+
+
+class SerialNumberMixin:
+    """
+    Serializer mixin for activity models (tasks, calls, meetings, emails) that
+    exposes a dynamic serial_number: the record's position within its entity
+    context, ordered by serial_number_ordering.
+    """
+
+    serial_number_ordering = ('created_at',)
+    serial_numbers = None
+
+    def resolve_serial_numbers(self, instances):
+        return get_serial_numbers(self.Meta.model, instances, self.serial_number_ordering)
+
+    def get_serial_number(self, obj):
+        """Serial number from the page lookup, resolving single records on demand"""
+        if self.serial_numbers is None or obj.pk not in self.serial_numbers:
+            # Merge into the page map; records outside any active context fall
+            # back to their ID, cached so they are not looked up again
+            resolved = self.resolve_serial_numbers([obj])
+            resolved.setdefault(obj.pk, obj.pk)
+            self.serial_numbers = {**(self.serial_numbers or {}), **resolved}
+        return self.serial_numbers[obj.pk]
+
+
+def related_count(obj, annotation, related_name):
+    """
+    Count of a related set, read from a queryset annotation when the view
+    added one, otherwise from the relation (which uses prefetched rows).
+    """
+    count = getattr(obj, annotation, None)
+    if count is not None:
+        return count
+    return getattr(obj, related_name).count()
@@ -5,3 +5,6 @@ class TenantCoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core.tenant_core"
     verbose_name = "Tenant Core"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,168 @@
+import atexit
+import logging
+import threading
+from collections import defaultdict, deque
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, transaction
+from django_tenants.utils import schema_context
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_SCHEMA_NAME = 'public'
+AUDIT_TABLE = 'tenant_core_auditlog'
+
+AUDIT_LOG_BATCH_SIZE = getattr(settings, 'AUDIT_LOG_BATCH_SIZE', 500)
+AUDIT_LOG_FLUSH_INTERVAL = getattr(settings, 'AUDIT_LOG_FLUSH_INTERVAL', 2.0)
+# Queue length at which the caller flushes inline instead of growing the queue
+AUDIT_LOG_MAX_QUEUE = getattr(settings, 'AUDIT_LOG_MAX_QUEUE', 10000)
+
+
+class AuditLogWriter:
+    """
+    Buffers AuditLog rows in-process and writes them with bulk_create, one
+    batch per tenant schema. A daemon thread flushes every flush_interval
+    seconds or as soon as batch_size entries are waiting; anything left is
+    flushed at interpreter exit.
+    """
+
+    def __init__(self, batch_size=AUDIT_LOG_BATCH_SIZE, flush_interval=AUDIT_LOG_FLUSH_INTERVAL,
+                 max_queue=AUDIT_LOG_MAX_QUEUE):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue = deque()
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def enqueue(self, schema_name, entry):
+        self._ensure_started()
+        self._queue.append((schema_name, entry))
+        if len(self._queue) >= self.max_queue:
+            # Worker is not keeping up; apply back-pressure to the caller
+            self.flush()
+        elif len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write everything queued so far. Returns the number of rows written."""
+        with self._flush_lock:
+            pending = defaultdict(list)
+            while self._queue:
+                schema_name, entry = self._queue.popleft()
+                pending[schema_name].append(entry)
+
+            written = 0
+            for schema_name, entries in pending.items():
+                written += self._write(schema_name, entries)
+            return written
+
+    def _write(self, schema_name, entries):
+        from .models import AuditLog
+
+        try:
+            with schema_context(schema_name):
+                AuditLog.objects.bulk_create(entries, batch_size=self.batch_size)
+            return len(entries)
+        except Exception as e:
+            # Auditing must never take the request path down with it
+            logger.warning(f"Failed to write {len(entries)} audit log entries for {schema_name}: {e}")
+            return 0
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._queue:
+                self.flush()
+                connection.close_if_unusable_or_obsolete()
+
+
+audit_log_writer = AuditLogWriter()
+atexit.register(audit_log_writer.flush)
+
+
+def record_audit_log(user, action, model_name, object_id, changes=None, ip_address=None, user_agent=''):
+    """
+    Record an audit entry for the current tenant schema.
+
+    In 'background' mode the entry is queued once the surrounding transaction
+    commits (entries for rolled-back work are dropped) and written later in a
+    batch; the returned instance is unsaved at that point. In 'sync' mode it
+    is saved before returning. Returns None in the public schema.
+    """
+    from .models import AuditLog
+
+    schema_name = connection.schema_name
+    if schema_name == PUBLIC_SCHEMA_NAME:
+        return None
+
+    entry = AuditLog(
+        user=user,
+        action=action,
+        model_name=model_name,
+        object_id=object_id,
+        changes=changes or {},
+        ip_address=ip_address,
+        user_agent=user_agent or '',
+    )
+
+    # 'background' (default) or 'sync', which tests can switch to with override_settings
+    if getattr(settings, 'AUDIT_LOG_MODE', 'background') == 'sync':
+        entry.save()
+    else:
+        transaction.on_commit(lambda: audit_log_writer.enqueue(schema_name, entry))
+    return entry
+
+
+def _month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value, months):
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def ensure_audit_partitions(months_ahead=2, start=None):
+    """
+    Create the monthly partitions of the audit table for the current schema,
+    from start (default: this month) through months_ahead months ahead.
+    Rows already sitting in the default partition for a new month are moved
+    into it. Returns the names of the partitions that were created.
+    """
+    month = _month_start(start or date.today())
+    created = []
+    for _offset in range(months_ahead + 1):
+        next_month = _add_months(month, 1)
+        partition = f'{AUDIT_TABLE}_{month:%Y_%m}'
+        bounds = (month.isoformat(), next_month.isoformat())
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [partition])
+            if cursor.fetchone()[0] is None:
+                cursor.execute(f'CREATE TABLE "{partition}" (LIKE "{AUDIT_TABLE}" INCLUDING DEFAULTS)')
+                cursor.execute(
+                    f'WITH moved AS (DELETE FROM "{AUDIT_TABLE}_default" '
+                    f'WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *) '
+                    f'INSERT INTO "{partition}" SELECT * FROM moved',
+                    bounds
+                )
+                cursor.execute(
+                    f'ALTER TABLE "{AUDIT_TABLE}" ATTACH PARTITION "{partition}" '
+                    f"FOR VALUES FROM ('{bounds[0]}') TO ('{bounds[1]}')"
+                )
+                created.append(partition)
+        month = next_month
+    return created
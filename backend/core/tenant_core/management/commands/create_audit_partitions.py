@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django_tenants.utils import get_tenant_model, schema_context
+
+from core.tenant_core.audit import ensure_audit_partitions
+
+
+class Command(BaseCommand):
+    help = 'Creates upcoming monthly partitions of the audit log table (run monthly, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema',
+            type=str,
+            help='Specific schema to process (optional, defaults to all tenants)',
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=2,
+            help='Number of future months to create partitions for (default: 2)',
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options.get('schema')
+
+        TenantModel = get_tenant_model()
+        if schema_name:
+            tenants = TenantModel.objects.filter(schema_name=schema_name)
+            if not tenants.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'Tenant with schema {schema_name} does not exist')
+                )
+                return
+        else:
+            tenants = TenantModel.objects.exclude(schema_name='public')
+
+        for tenant in tenants:
+            try:
+                with schema_context(tenant.schema_name):
+                    created = ensure_audit_partitions(months_ahead=options['months_ahead'])
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'Created {len(created)} audit partitions for {tenant.schema_name}'
+                    )
+                )
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Error processing {tenant.schema_name}: {str(e)}')
+                )
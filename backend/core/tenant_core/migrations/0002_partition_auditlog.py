@@ -0,0 +1,96 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+# Rebuild the audit table as a monthly RANGE-partitioned table. Postgres
+# requires the partition key in the primary key, hence (id, timestamp).
+PARTITION_SQL = """
+ALTER TABLE tenant_core_auditlog RENAME TO tenant_core_auditlog_unpartitioned;
+CREATE TABLE tenant_core_auditlog (
+    LIKE tenant_core_auditlog_unpartitioned INCLUDING DEFAULTS
+) PARTITION BY RANGE ("timestamp");
+CREATE TABLE tenant_core_auditlog_default PARTITION OF tenant_core_auditlog DEFAULT;
+INSERT INTO tenant_core_auditlog SELECT * FROM tenant_core_auditlog_unpartitioned;
+DROP TABLE tenant_core_auditlog_unpartitioned;
+ALTER TABLE tenant_core_auditlog ADD PRIMARY KEY (id, "timestamp");
+ALTER TABLE tenant_core_auditlog ADD CONSTRAINT tenant_core_auditlog_user_id_fk_core_user_id
+    FOREIGN KEY (user_id) REFERENCES core_user (id) DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX idx_auditlog_model ON tenant_core_auditlog (model_name);
+CREATE INDEX idx_auditlog_timestamp ON tenant_core_auditlog ("timestamp");
+CREATE INDEX idx_auditlog_user_timestamp ON tenant_core_auditlog (user_id, "timestamp");
+CREATE INDEX idx_auditlog_action_timestamp ON tenant_core_auditlog (action, "timestamp");
+"""
+
+UNPARTITION_SQL = """
+ALTER TABLE tenant_core_auditlog RENAME TO tenant_core_auditlog_partitioned;
+CREATE TABLE tenant_core_auditlog (
+    LIKE tenant_core_auditlog_partitioned INCLUDING DEFAULTS
+);
+INSERT INTO tenant_core_auditlog SELECT * FROM tenant_core_auditlog_partitioned;
+DROP TABLE tenant_core_auditlog_partitioned CASCADE;
+ALTER TABLE tenant_core_auditlog ADD PRIMARY KEY (id);
+ALTER TABLE tenant_core_auditlog ADD CONSTRAINT tenant_core_auditlog_user_id_fk_core_user_id
+    FOREIGN KEY (user_id) REFERENCES core_user (id) DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX idx_auditlog_model ON tenant_core_auditlog (model_name);
+CREATE INDEX idx_auditlog_timestamp ON tenant_core_auditlog ("timestamp");
+CREATE INDEX idx_auditlog_user_timestamp ON tenant_core_auditlog (user_id, "timestamp");
+CREATE INDEX idx_auditlog_action_timestamp ON tenant_core_auditlog (action, "timestamp");
+"""
+
+
+def create_monthly_partitions(apps, schema_editor):
+    """Partitions from the oldest existing entry through two months ahead"""
+    from core.tenant_core.audit import _month_start, ensure_audit_partitions
+
+    AuditLog = apps.get_model("tenant_core", "AuditLog")
+    oldest = (
+        AuditLog.objects.order_by("timestamp")
+        .values_list("timestamp", flat=True)
+        .first()
+    )
+    today = django.utils.timezone.now().date()
+    start = _month_start(oldest.date()) if oldest else _month_start(today)
+    months = (today.year - start.year) * 12 + today.month - start.month
+    ensure_audit_partitions(months_ahead=months + 2, start=start)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tenant_core", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="auditlog",
+            name="idx_auditlog_user",
+        ),
+        migrations.RemoveIndex(
+            model_name="auditlog",
+            name="idx_auditlog_action",
+        ),
+        migrations.AlterField(
+            model_name="auditlog",
+            name="timestamp",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.AlterField(
+            model_name="auditlog",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="tenant_audit_logs",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RunSQL(PARTITION_SQL, reverse_sql=UNPARTITION_SQL),
+        migrations.RunPython(create_monthly_partitions, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,7 @@ import uuid
 from django.contrib.auth import get_user_model
 from django.contrib.auth.base_user import BaseUserManager
 from django.db import models
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -124,6 +125,10 @@ class UserRole(models.Model):
 class AuditLog(models.Model):
     """
     Audit log model for tracking changes - TENANT SPECIFIC
+
+    Written in batches by core.tenant_core.audit. The table is range
+    partitioned by month on timestamp (see migration 0002), so its primary
+    key is (id, timestamp) in the database.
     """
     ACTION_TYPES = [
         ("create", "Create"),
@@ -135,21 +140,22 @@ class AuditLog(models.Model):
     ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="tenant_audit_logs")
+    user = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, related_name="tenant_audit_logs", db_index=False
+    )
     action = models.CharField(max_length=20, choices=ACTION_TYPES)
     model_name = models.CharField(max_length=100)
     object_id = models.CharField(max_length=100)
     changes = models.JSONField(default=dict)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the entry is recorded, not when a buffered batch is written
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         app_label = 'tenant_core'
         ordering = ["-timestamp"]
         indexes = [
-            models.Index(fields=['user'], name='idx_auditlog_user'),
-            models.Index(fields=['action'], name='idx_auditlog_action'),
             models.Index(fields=['model_name'], name='idx_auditlog_model'),
             models.Index(fields=['timestamp'], name='idx_auditlog_timestamp'),
             models.Index(fields=['user', 'timestamp'], name='idx_auditlog_user_timestamp'),
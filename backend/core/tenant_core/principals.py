@@ -0,0 +1,169 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connection
+from django_tenants.utils import schema_context
+
+PUBLIC_SCHEMA_NAME = 'public'
+GLOBAL_VERSION_KEY = '__all__'
+
+# Seconds a resolved principal may be reused by this process, and how many to
+# keep. Invalidation is immediate; the TTL only bounds memory held per entry.
+PRINCIPAL_CACHE_TTL = getattr(settings, 'TENANT_PRINCIPAL_CACHE_TTL', 60)
+PRINCIPAL_CACHE_SIZE = getattr(settings, 'TENANT_PRINCIPAL_CACHE_SIZE', 2048)
+
+# Permissions granted to tenant members that have no roles assigned
+BASIC_PERMISSIONS = ('view_customers', 'view_only')
+
+
+class TenantPrincipal:
+    """
+    A user's resolved access in one tenant: membership, active role types and
+    the flattened permission set from all active roles.
+    """
+
+    __slots__ = ('user_id', 'schema_name', 'is_member', 'role_types', 'permissions')
+
+    def __init__(self, user_id, schema_name, is_member, roles):
+        self.user_id = user_id
+        self.schema_name = schema_name
+        self.is_member = is_member
+        self.role_types = frozenset(role_type for role_type, _permissions in roles)
+
+        permissions = set()
+        for _role_type, role_permissions in roles:
+            role_permissions = role_permissions or []
+            # Handle both dict and list formats for backward compatibility
+            if isinstance(role_permissions, dict):
+                permissions.update(key for key, value in role_permissions.items() if value)
+            else:
+                permissions.update(role_permissions)
+        self.permissions = frozenset(permissions)
+
+    @property
+    def has_roles(self):
+        return bool(self.role_types)
+
+    def has_any_permission(self, permissions):
+        """True if any active role grants one of the given permissions"""
+        return any(permission in self.permissions for permission in permissions)
+
+    def has_role_type(self, *role_types):
+        return any(role_type in self.role_types for role_type in role_types)
+
+
+class _PrincipalCache:
+    """Thread-safe LRU of principals with a TTL per entry"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, entry_version, principal = entry
+            if expires_at < time.monotonic() or entry_version != version:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def set(self, key, version, principal):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, version, principal)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_principal_cache = _PrincipalCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL)
+
+
+def _current_version(schema_name):
+    """
+    Invalidation token for a tenant, read from the shared
+    TenantPrincipalVersion table (one indexed lookup per request) so a role
+    or membership change committed by one process expires every process's
+    cached principals for that tenant on their next request.
+    """
+    from core.auth.models import TenantPrincipalVersion
+    versions = dict(
+        TenantPrincipalVersion.objects.filter(
+            schema_name__in=[GLOBAL_VERSION_KEY, schema_name]
+        ).values_list('schema_name', 'version')
+    )
+    return (versions.get(GLOBAL_VERSION_KEY), versions.get(schema_name))
+
+
+def invalidate_tenant_principals(schema_name=None):
+    """
+    Drop cached principals for one tenant, or for every tenant when
+    schema_name is None. The new token is written in the caller's
+    transaction, so other workers see it when the change itself commits.
+    """
+    from core.auth.models import TenantPrincipalVersion
+    TenantPrincipalVersion.objects.bulk_create(
+        [TenantPrincipalVersion(schema_name=schema_name or GLOBAL_VERSION_KEY, version=uuid.uuid4().hex)],
+        update_conflicts=True,
+        unique_fields=['schema_name'],
+        update_fields=['version', 'updated_at'],
+    )
+    if schema_name is None:
+        _principal_cache.clear()
+
+
+def _load_principal(user, schema_name):
+    if schema_name == PUBLIC_SCHEMA_NAME:
+        # Roles live in tenant schemas; nobody is a member of the public schema
+        return TenantPrincipal(user.pk, schema_name, False, [])
+
+    # Query tenant membership in public schema to avoid schema context issues
+    with schema_context(PUBLIC_SCHEMA_NAME):
+        is_member = user.tenants.filter(schema_name=schema_name).exists()
+
+    from .models import UserRole
+    with schema_context(schema_name):
+        roles = list(
+            UserRole.objects.filter(user_id=user.pk, is_active=True).values_list(
+                'role__role_type', 'role__permissions'
+            )
+        )
+    return TenantPrincipal(user.pk, schema_name, is_member, roles)
+
+
+def get_tenant_principal(user, tenant=None, request=None):
+    """
+    Resolve the user's principal for the tenant (the current schema by
+    default). Memoised on the request, then held in a per-process TTL/LRU
+    cache that is invalidated by Role, UserRole and membership changes
+    through the version tokens in TenantPrincipalVersion.
+    """
+    schema_name = tenant.schema_name if tenant is not None else connection.schema_name
+
+    if request is not None:
+        principal = getattr(request, '_tenant_principal', None)
+        if principal is not None and principal.user_id == user.pk and principal.schema_name == schema_name:
+            return principal
+
+    key = (schema_name, user.pk)
+    version = _current_version(schema_name)
+    principal = _principal_cache.get(key, version)
+    if principal is None:
+        principal = _load_principal(user, schema_name)
+        _principal_cache.set(key, version, principal)
+
+    if request is not None:
+        request._tenant_principal = principal
+    return principal
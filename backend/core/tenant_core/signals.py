@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Role, UserRole
+from .principals import invalidate_tenant_principals
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def invalidate_principals_for_role_change(sender, **kwargs):
+    """Roles are tenant specific, so only the current tenant is affected"""
+    invalidate_tenant_principals(connection.schema_name)
+
+
+@receiver(m2m_changed, sender=User.tenants.through)
+def invalidate_principals_for_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Tenant membership changed for a user (or a tenant's users changed)"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        # instance is the tenant
+        invalidate_tenant_principals(instance.schema_name)
+    elif pk_set:
+        from core.tenants.models import Client
+        for schema_name in Client.objects.filter(pk__in=pk_set).values_list('schema_name', flat=True):
+            invalidate_tenant_principals(schema_name)
+    else:
+        # clear() does not report which tenants were removed
+        invalidate_tenant_principals()
@@ -1,5 +1,20 @@
 from rest_framework import permissions
 
+from core.tenant_core.principals import BASIC_PERMISSIONS, get_tenant_principal
+
+
+def _get_principal(request):
+    """Resolved membership and roles for request.user, cached per request and process"""
+    return get_tenant_principal(request.user, getattr(request, 'tenant', None), request)
+
+
+def _is_tenant_member(request):
+    """Membership check used by every class; the public schema needs no membership"""
+    current_tenant = getattr(request, 'tenant', None)
+    if current_tenant and current_tenant.schema_name != 'public':
+        return _get_principal(request).is_member
+    return True
+
 
 class IsTenantUser(permissions.BasePermission):
     """
@@ -16,12 +31,7 @@ class IsTenantUser(permissions.BasePermission):
         # Check if user belongs to current tenant
         current_tenant = getattr(request, 'tenant', None)
         if current_tenant and current_tenant.schema_name != 'public':
-            # Query tenant membership in public schema to avoid schema context issues
-            from django_tenants.utils import schema_context
-            with schema_context('public'):
-                return request.user.tenants.filter(
-                    schema_name=current_tenant.schema_name
-                ).exists()
+            return get_tenant_principal(request.user, current_tenant, request).is_member
 
         return False
 
@@ -35,32 +45,20 @@ class CanManageUsers(permissions.BasePermission):
             return False
 
         # Check if user belongs to current tenant (including superadmin)
-        current_tenant = getattr(request, 'tenant', None)
-        if current_tenant and current_tenant.schema_name != 'public':
-            # Query tenant membership in public schema to avoid schema context issues
-            from django_tenants.utils import schema_context
-            with schema_context('public'):
-                if not request.user.tenants.filter(
-                    schema_name=current_tenant.schema_name
-                ).exists():
-                    return False
+        if not _is_tenant_member(request):
+            return False
 
         # Allow superadmin after tenant check
         if request.user.is_superadmin:
             return True
 
         # Check if user has permission to manage users
-        return self._has_tenant_permission(request.user, 'manage_team')
+        return self._has_tenant_permission(request, ['manage_team', 'all'])
 
-    def _has_tenant_permission(self, user, permission):
-        """Check if user has specific permission in current tenant"""
+    def _has_tenant_permission(self, request, permissions):
+        """Check if user has any of the specified permissions in current tenant"""
         try:
-            user_roles = user.tenant_user_roles.filter(is_active=True)
-            for user_role in user_roles:
-                role_permissions = user_role.role.permissions or []
-                if permission in role_permissions or 'all' in role_permissions:
-                    return True
-            return False
+            return _get_principal(request).has_any_permission(permissions)
         except Exception:
             return False
 
@@ -74,33 +72,20 @@ class CanManageRoles(permissions.BasePermission):
             return False
 
         # Check if user belongs to current tenant (including superadmin)
-        current_tenant = getattr(request, 'tenant', None)
-        if current_tenant and current_tenant.schema_name != 'public':
-            # Query tenant membership in public schema to avoid schema context issues
-            from django_tenants.utils import schema_context
-            with schema_context('public'):
-                if not request.user.tenants.filter(
-                    schema_name=current_tenant.schema_name
-                ).exists():
-                    return False
+        if not _is_tenant_member(request):
+            return False
 
         # Allow superadmin after tenant check
         if request.user.is_superadmin:
             return True
 
         # Check if user has admin or management permissions
-        return self._has_tenant_permission(request.user, ['all', 'manage_settings'])
+        return self._has_tenant_permission(request, ['all', 'manage_settings'])
 
-    def _has_tenant_permission(self, user, permissions):
+    def _has_tenant_permission(self, request, permissions):
         """Check if user has any of the specified permissions in current tenant"""
         try:
-            user_roles = user.tenant_user_roles.filter(is_active=True)
-            for user_role in user_roles:
-                role_permissions = user_role.role.permissions or []
-                for permission in permissions:
-                    if permission in role_permissions:
-                        return True
-            return False
+            return _get_principal(request).has_any_permission(permissions)
         except Exception:
             return False
 
@@ -114,33 +99,20 @@ class CanViewAuditLogs(permissions.BasePermission):
             return False
 
         # Check if user belongs to current tenant (including superadmin)
-        current_tenant = getattr(request, 'tenant', None)
-        if current_tenant and current_tenant.schema_name != 'public':
-            # Query tenant membership in public schema to avoid schema context issues
-            from django_tenants.utils import schema_context
-            with schema_context('public'):
-                if not request.user.tenants.filter(
-                    schema_name=current_tenant.schema_name
-                ).exists():
-                    return False
+        if not _is_tenant_member(request):
+            return False
 
         # Allow superadmin after tenant check
         if request.user.is_superadmin:
             return True
 
         # Check if user has admin permissions
-        return self._has_tenant_permission(request.user, ['all', 'manage_settings'])
+        return self._has_tenant_permission(request, ['all', 'manage_settings'])
 
-    def _has_tenant_permission(self, user, permissions):
+    def _has_tenant_permission(self, request, permissions):
         """Check if user has any of the specified permissions in current tenant"""
         try:
-            user_roles = user.tenant_user_roles.filter(is_active=True)
-            for user_role in user_roles:
-                role_permissions = user_role.role.permissions or []
-                for permission in permissions:
-                    if permission in role_permissions:
-                        return True
-            return False
+            return _get_principal(request).has_any_permission(permissions)
         except Exception:
             return False
 
@@ -154,15 +126,8 @@ class TenantAdminRequired(permissions.BasePermission):
             return False
 
         # Check if user belongs to current tenant (including superadmin)
-        current_tenant = getattr(request, 'tenant', None)
-        if current_tenant and current_tenant.schema_name != 'public':
-            # Query tenant membership in public schema to avoid schema context issues
-            from django_tenants.utils import schema_context
-            with schema_context('public'):
-                if not request.user.tenants.filter(
-                    schema_name=current_tenant.schema_name
-                ).exists():
-                    return False
+        if not _is_tenant_member(request):
+            return False
 
         # Allow superadmin after tenant check
         if request.user.is_superadmin:
@@ -170,10 +135,7 @@ class TenantAdminRequired(permissions.BasePermission):
 
         # Check if user has admin role
         try:
-            return request.user.tenant_user_roles.filter(
-                role__role_type='admin',
-                is_active=True
-            ).exists()
+            return _get_principal(request).has_role_type('admin')
         except Exception:
             return False
 
@@ -187,15 +149,8 @@ class TenantManagerRequired(permissions.BasePermission):
             return False
 
         # Check if user belongs to current tenant (including superadmin)
-        current_tenant = getattr(request, 'tenant', None)
-        if current_tenant and current_tenant.schema_name != 'public':
-            # Query tenant membership in public schema to avoid schema context issues
-            from django_tenants.utils import schema_context
-            with schema_context('public'):
-                if not request.user.tenants.filter(
-                    schema_name=current_tenant.schema_name
-                ).exists():
-                    return False
+        if not _is_tenant_member(request):
+            return False
 
         # Allow superadmin after tenant check
         if request.user.is_superadmin:
@@ -203,10 +158,7 @@ class TenantManagerRequired(permissions.BasePermission):
 
         # Check if user has admin or manager role
         try:
-            return request.user.tenant_user_roles.filter(
-                role__role_type__in=['admin', 'manager'],
-                is_active=True
-            ).exists()
+            return _get_principal(request).has_role_type('admin', 'manager')
         except Exception:
             return False
 
@@ -222,15 +174,8 @@ class HasTenantPermission(permissions.BasePermission):
             return False
 
         # Check if user belongs to current tenant (including superadmin)
-        current_tenant = getattr(request, 'tenant', None)
-        if current_tenant and current_tenant.schema_name != 'public':
-            # Query tenant membership in public schema to avoid schema context issues
-            from django_tenants.utils import schema_context
-            with schema_context('public'):
-                if not request.user.tenants.filter(
-                    schema_name=current_tenant.schema_name
-                ).exists():
-                    return False
+        if not _is_tenant_member(request):
+            return False
 
         # Allow superadmin after tenant check
         if request.user.is_superadmin:
@@ -242,35 +187,21 @@ class HasTenantPermission(permissions.BasePermission):
             return True  # No specific permissions required
 
         # Check if user has any of the required permissions
-        return self._has_any_tenant_permission(request.user, required_permissions)
+        return self._has_any_tenant_permission(request, required_permissions)
 
-    def _has_any_tenant_permission(self, user, permissions):
+    def _has_any_tenant_permission(self, request, permissions):
         """Check if user has any of the specified permissions in current tenant"""
         try:
-            user_roles = user.tenant_user_roles.filter(is_active=True)
+            principal = _get_principal(request)
 
             # If user has no roles but is a valid tenant member, allow basic viewing permissions
-            if not user_roles.exists():
-                # Allow basic viewing permissions for users without roles
-                basic_permissions = ['view_customers', 'view_only']
+            if not principal.has_roles:
                 for permission in permissions:
-                    if permission in basic_permissions:
+                    if permission in BASIC_PERMISSIONS:
                         return True
 
             # Check assigned role permissions
-            for user_role in user_roles:
-                role_permissions = user_role.role.permissions or []
-                
-                # Handle both dict and list formats for backward compatibility
-                if isinstance(role_permissions, dict):
-                    for permission in permissions:
-                        if role_permissions.get(permission, False):
-                            return True
-                else:  # list format
-                    for permission in permissions:
-                        if permission in role_permissions:
-                            return True
-            return False
+            return principal.has_any_permission(permissions)
         except Exception:
             return False
 
@@ -284,15 +215,8 @@ class IsOwnerOrTenantAdmin(permissions.BasePermission):
             return False
 
         # Check if user belongs to current tenant (including superadmin)
-        current_tenant = getattr(request, 'tenant', None)
-        if current_tenant and current_tenant.schema_name != 'public':
-            # Query tenant membership in public schema to avoid schema context issues
-            from django_tenants.utils import schema_context
-            with schema_context('public'):
-                if not request.user.tenants.filter(
-                    schema_name=current_tenant.schema_name
-                ).exists():
-                    return False
+        if not _is_tenant_member(request):
+            return False
 
         # Allow superadmin after tenant check
         if request.user.is_superadmin:
@@ -304,9 +228,6 @@ class IsOwnerOrTenantAdmin(permissions.BasePermission):
 
         # Check if user is tenant admin
         try:
-            return request.user.tenant_user_roles.filter(
-                role__role_type='admin',
-                is_active=True
-            ).exists()
+            return _get_principal(request).has_role_type('admin')
         except Exception:
             return False
@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.db import connection
 
-from core.tenant_core.models import AuditLog
+from core.tenant_core.audit import record_audit_log
 
 User = get_user_model()
 
@@ -23,8 +23,8 @@ def create_audit_log(user, action, model_name, object_id, changes=None, request=
             ip_address = get_client_ip(request)
             user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]  # Limit length
 
-        # Create audit log entry
-        audit_log = AuditLog.objects.create(
+        # Queue audit log entry for the batched writer
+        audit_log = record_audit_log(
             user=user,
             action=action,
             model_name=model_name,
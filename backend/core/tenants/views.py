@@ -338,6 +338,7 @@ class AuditLogListView(generics.ListAPIView):
     queryset = AuditLog.objects.all()
     serializer_class = AuditLogSerializer
     permission_classes = [CanManageUsers]
+    keyset_count = 'estimate'
 
     def get_queryset(self):
         queryset = super().get_queryset()
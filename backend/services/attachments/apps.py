@@ -6,3 +6,6 @@ class AttachmentsConfig(AppConfig):
     name = 'services.attachments'
     label = 'attachments'
     verbose_name = 'Attachments'
+
+    def ready(self):
+        from . import signals  # noqa: F401
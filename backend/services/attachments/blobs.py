@@ -0,0 +1,138 @@
+"""
+Content-addressed attachment storage.
+
+A file attachment's bytes are stored once per tenant under their SHA-256:
+``attachments/{tenant_schema}/blobs/{hash[:2]}/{hash}``. Attaching the same
+quote PDF to a lead, contact and deal writes one blob that all three
+Attachment rows point at; the rows referencing a stored name are its
+reference count, and the blob (with its derivatives) is removed when the
+last one is deleted. Storing a blob and releasing one both hold a
+transaction-level advisory lock on its name, so a release never removes a
+blob that a concurrent upload has just decided to reuse. Files uploaded
+before this scheme keep their per-upload names until the
+dedupe_attachments command moves them.
+"""
+import hashlib
+import logging
+import os
+import posixpath
+
+from django.db import connection, transaction
+
+from .derivatives import delete_derivatives
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR = 'blobs'
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def tenant_blob_root(schema_name=None):
+    schema_name = schema_name or getattr(connection, 'schema_name', 'public')
+    return f'attachments/{schema_name}/{BLOB_DIR}'
+
+
+def blob_name(content_hash, schema_name=None):
+    return posixpath.join(tenant_blob_root(schema_name), content_hash[:2], content_hash)
+
+
+def hash_file(file):
+    """
+    SHA-256 hex digest of file. Uploads hashed while they streamed in (see
+    uploadhandlers) carry it already; anything else is read in chunks.
+    """
+    content_hash = getattr(file, 'content_hash', None)
+    if content_hash:
+        return content_hash
+    hasher = hashlib.sha256()
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    for chunk in file.chunks(HASH_CHUNK_SIZE):
+        hasher.update(chunk)
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    return hasher.hexdigest()
+
+
+def lock_blob(name):
+    """Serialize reuse and release of one stored name until the transaction ends"""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [name])
+
+
+def store_blob(storage, content, content_hash):
+    """
+    Write content under its blob name unless the tenant already has it and
+    return the name. Call inside the transaction that saves the referencing
+    row, which keeps the blob locked until that row is committed.
+    """
+    name = blob_name(content_hash)
+    lock_blob(name)
+    if storage.exists(name):
+        return name
+    saved = storage.save(name, content)
+    if saved != name:
+        # A concurrent upload of the same content stored it first
+        storage.delete(saved)
+    return name
+
+
+def link_or_copy_blob(storage, source_name, content_hash):
+    """
+    Blob name for a file already in storage. On local storage the blob is a
+    hard link to the existing file, so no bytes are copied; otherwise (or
+    across filesystems) the content is copied once. Like store_blob, call it
+    inside the transaction that repoints the rows.
+    """
+    name = blob_name(content_hash)
+    lock_blob(name)
+    if storage.exists(name):
+        return name
+    try:
+        target = storage.path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.link(storage.path(source_name), target)
+        return name
+    except FileExistsError:
+        return name
+    except (NotImplementedError, OSError):
+        pass
+    with storage.open(source_name, 'rb') as content:
+        return store_blob(storage, content, content_hash)
+
+
+def reference_count(name):
+    from .models import Attachment
+
+    return Attachment.objects.filter(file=name).count()
+
+
+def release_file(storage, name):
+    """Delete a stored file and its derivatives once no attachment references it"""
+    if not name:
+        return False
+    with transaction.atomic():
+        lock_blob(name)
+        if reference_count(name):
+            return False
+        try:
+            if storage.exists(name):
+                storage.delete(name)
+        except OSError:
+            logger.warning('Could not delete attachment file %s', name, exc_info=True)
+            return False
+    delete_derivatives(storage, name)
+    return True
+
+
+def iter_blob_names(storage, schema_name=None):
+    """Every blob stored for the tenant"""
+    root = tenant_blob_root(schema_name)
+    if not storage.exists(root):
+        return
+    prefixes, _files = storage.listdir(root)
+    for prefix in sorted(prefixes):
+        _dirs, files = storage.listdir(posixpath.join(root, prefix))
+        for filename in files:
+            yield posixpath.join(root, prefix, filename)
@@ -0,0 +1,168 @@
+"""
+Attachment delivery: conditional GET, byte ranges and web server offload.
+
+serve_file() answers If-None-Match / If-Modified-Since with 304 from the
+stored metadata alone, honours single ``Range: bytes=...`` requests (with
+If-Range) by streaming just that slice, and otherwise streams the file.
+
+With ATTACHMENT_DELIVERY_BACKEND set to ``x-accel`` (nginx) or
+``x-sendfile`` (Apache/lighttpd) the view only runs the permission and
+conditional checks and returns an empty response whose header tells the web
+server which file to send; the server then handles ranges and the copy.
+For nginx, map ATTACHMENT_X_ACCEL_PREFIX to MEDIA_ROOT as an internal
+location::
+
+    location /protected-media/ { internal; alias /srv/neuraone/media/; }
+"""
+import hashlib
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import (
+    content_disposition_header,
+    http_date,
+    parse_http_date_safe,
+    quote_etag,
+)
+
+DELIVERY_BACKEND = getattr(settings, 'ATTACHMENT_DELIVERY_BACKEND', 'django')
+X_ACCEL_PREFIX = getattr(settings, 'ATTACHMENT_X_ACCEL_PREFIX', '/protected-media/')
+CACHE_SECONDS = getattr(settings, 'ATTACHMENT_PREVIEW_CACHE_SECONDS', 3600)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def original_etag(attachment):
+    """
+    The content hash for content-addressed files; older per-upload names are
+    unique, so name and size identify their content
+    """
+    if attachment.content_hash:
+        return attachment.content_hash
+    return hashlib.sha1(f'{attachment.file.name}:{attachment.file_size}'.encode('utf-8')).hexdigest()
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single-range header, None to send the whole
+    file (no, malformed or multi-range header), or False if unsatisfiable.
+    """
+    match = RANGE_RE.match((header or '').strip())
+    if not match or size <= 0:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        return False
+    if end < start:
+        return None
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    """A Range request with If-Range only gets a partial response if the validator still matches"""
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return last_modified is not None and parse_http_date_safe(if_range) == int(last_modified)
+
+
+def _iter_range(file, start, length):
+    try:
+        file.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = file.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def _offload_response(storage, name):
+    response = HttpResponse()
+    if DELIVERY_BACKEND == 'x-accel':
+        response['X-Accel-Redirect'] = X_ACCEL_PREFIX.rstrip('/') + '/' + quote(name)
+    else:
+        response['X-Sendfile'] = storage.path(name)
+    return response
+
+
+def serve_file(request, storage, name, size, etag, content_type, filename=None,
+               as_attachment=False, last_modified=None, max_age=CACHE_SECONDS):
+    """
+    Response for a stored file. size, etag and last_modified (a timestamp)
+    come from stored metadata so 304s never touch the file.
+    """
+    quoted_etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=quoted_etag, last_modified=last_modified)
+
+    if response is None:
+        if DELIVERY_BACKEND in ('x-accel', 'x-sendfile'):
+            response = _offload_response(storage, name)
+        else:
+            byte_range = None
+            if request.headers.get('Range') and _if_range_matches(request, quoted_etag, last_modified):
+                byte_range = parse_range(request.headers['Range'], size)
+
+            if byte_range is False:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+            elif byte_range:
+                start, end = byte_range
+                length = end - start + 1
+                response = StreamingHttpResponse(
+                    _iter_range(storage.open(name, 'rb'), start, length), status=206
+                )
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+                response['Content-Length'] = str(length)
+            else:
+                response = FileResponse(storage.open(name, 'rb'))
+                response['Content-Length'] = str(size)
+
+        if response.status_code != 416:
+            response['Content-Type'] = content_type or 'application/octet-stream'
+            response['Content-Disposition'] = content_disposition_header(as_attachment, filename) if filename else (
+                'attachment' if as_attachment else 'inline'
+            )
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = quoted_etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, max_age=max_age)
+    return response
+
+
+def serve_attachment(request, attachment, as_attachment=False, content_type=None):
+    """Serve an attachment's stored file with its row metadata as validators"""
+    storage, name = attachment.file.storage, attachment.file.name
+    return serve_file(
+        request,
+        storage,
+        name,
+        size=attachment.file_size or storage.size(name),
+        etag=original_etag(attachment),
+        content_type=content_type or attachment.content_type_header,
+        filename=attachment.original_filename,
+        as_attachment=as_attachment,
+        last_modified=int(attachment.uploaded_at.timestamp()) if attachment.uploaded_at else None,
+    )
@@ -0,0 +1,102 @@
+"""
+Cached image derivatives (thumbnails) for attachment previews.
+
+Each size is rendered once, lazily on first preview or by the
+generate_attachment_thumbnails command, and stored beside the original
+under ``.../{entity_id}/derivatives/``. Derivative names embed the
+original's stored name, so replacing a file never serves a stale
+thumbnail; the signal handlers remove a file's derivatives when it is
+replaced or the attachment is deleted.
+"""
+import hashlib
+import io
+import logging
+import posixpath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZES = {
+    'thumb': (150, 150),
+    'small': (300, 300),
+    'medium': (600, 600),
+}
+
+# Bump to re-render every derivative after changing the rendering below
+DERIVATIVE_VERSION = 1
+
+DERIVATIVE_DIR = 'derivatives'
+
+
+def derivative_name(file_name, size):
+    directory, filename = posixpath.split(file_name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, DERIVATIVE_DIR, f'{stem}_{size}_v{DERIVATIVE_VERSION}.jpg')
+
+
+def derivative_etag(file_name, file_size, size):
+    """Strong ETag: the rendering is a pure function of the original and the version"""
+    key = f'{file_name}:{file_size}:{size}:{DERIVATIVE_VERSION}'
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def render_thumbnail(source, size):
+    """JPEG bytes of the image in source scaled to fit THUMBNAIL_SIZES[size]"""
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        img.thumbnail(THUMBNAIL_SIZES[size], Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=85, optimize=True)
+        return buffer.getvalue()
+
+
+def get_or_create_derivative(attachment, size, force=False):
+    """
+    Storage name of the attachment's derivative for size, rendering and
+    storing it first if needed. Returns None when the image cannot be read.
+    """
+    storage = attachment.file.storage
+    name = derivative_name(attachment.file.name, size)
+    if not force and storage.exists(name):
+        return name
+
+    try:
+        with attachment.file.open('rb') as source:
+            content = render_thumbnail(source, size)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning('Could not render %s thumbnail for attachment %s', size, attachment.pk, exc_info=True)
+        return None
+
+    if storage.exists(name):
+        storage.delete(name)
+    saved = storage.save(name, ContentFile(content))
+    if saved != name:
+        # Another request stored it first; keep one copy
+        storage.delete(saved)
+    return name
+
+
+def generate_derivatives(attachment, sizes=None, force=False):
+    """Render every size for an image attachment; returns the number stored"""
+    if attachment.attachment_type != 'file' or not attachment.file or not attachment.is_image:
+        return 0
+    return sum(
+        1 for size in (sizes or THUMBNAIL_SIZES)
+        if get_or_create_derivative(attachment, size, force=force)
+    )
+
+
+def delete_derivatives(storage, file_name):
+    """Remove every stored derivative of the original stored at file_name"""
+    for size in THUMBNAIL_SIZES:
+        name = derivative_name(file_name, size)
+        try:
+            if storage.exists(name):
+                storage.delete(name)
+        except OSError:
+            logger.warning('Could not delete derivative %s', name, exc_info=True)
@@ -0,0 +1,330 @@
+"""
+Text extraction for attachment previews and content search.
+
+After a file attachment is committed its text, page count and a preview
+snippet are pulled from the stored file once, off the request path:
+
+- ``background`` (default): a daemon thread in the web process works
+  through attachments queued on commit;
+- ``command``: only the process_attachment_extraction command (run from
+  cron or a worker) extracts, which also picks up anything a restarted
+  process left pending;
+- ``sync``: extracted inline on commit, for tests.
+
+The preview snippet and metadata are cached on the Attachment row, so
+previews never open the file; the full text goes to AttachmentContent,
+whose tsvector column is GIN-indexed in each tenant schema. Attachments
+sharing a blob (see blobs.py) copy the result instead of re-reading it.
+"""
+import logging
+import queue
+import re
+import threading
+import zipfile
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import connection, transaction
+from django.db.models import Value
+from django.utils import timezone
+from django_tenants.utils import schema_context
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_SCHEMA_NAME = 'public'
+
+EXTRACTION_MODE = getattr(settings, 'ATTACHMENT_EXTRACTION_MODE', 'background')
+SEARCH_CONFIG = getattr(settings, 'ATTACHMENT_SEARCH_CONFIG', 'english')
+# Postgres caps a tsvector at 1MB; indexed text stays well below that
+MAX_TEXT_CHARS = getattr(settings, 'ATTACHMENT_EXTRACT_MAX_CHARS', 200_000)
+PREVIEW_CHARS = 10 * 1024
+# Largest text file read for extraction
+MAX_TEXT_FILE_BYTES = 4 * MAX_TEXT_CHARS
+
+TEXT_EXTENSIONS = {'.txt', '.md', '.csv', '.json', '.xml', '.log'}
+OFFICE_EXTENSIONS = {'.docx', '.pptx', '.xlsx'}
+
+XML_SPACE = re.compile(r'[ \t]+')
+
+
+class ExtractionError(Exception):
+    pass
+
+
+class Extracted:
+    def __init__(self, text='', page_count=None, metadata=None):
+        # Postgres text columns cannot hold NUL characters
+        text = text.replace('\x00', '')
+        self.text = text[:MAX_TEXT_CHARS]
+        self.page_count = page_count
+        self.metadata = metadata or {}
+        if len(text) > MAX_TEXT_CHARS:
+            self.metadata['text_truncated'] = True
+
+
+def extract_text_file(file):
+    data = file.read(MAX_TEXT_FILE_BYTES + 1)
+    if b'\x00' in data[:8192]:
+        raise ExtractionError('Binary file - preview not available')
+    metadata = {'encoding': 'utf-8'}
+    if len(data) > MAX_TEXT_FILE_BYTES:
+        data = data[:MAX_TEXT_FILE_BYTES]
+        metadata['text_truncated'] = True
+    return Extracted(data.decode('utf-8', errors='ignore'), metadata=metadata)
+
+
+def extract_pdf(file):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ExtractionError('PDF extraction requires pypdf') from None
+
+    try:
+        reader = PdfReader(file)
+        page_count = len(reader.pages)
+        parts, length = [], 0
+        for page in reader.pages:
+            if length >= MAX_TEXT_CHARS:
+                break
+            text = page.extract_text() or ''
+            parts.append(text)
+            length += len(text)
+        info = reader.metadata or {}
+    except Exception as e:
+        # pypdf raises a wide range of errors on damaged or encrypted files
+        raise ExtractionError(f'Unreadable PDF: {e}') from e
+
+    metadata = {
+        key: str(info.get(f'/{key.title()}'))
+        for key in ('title', 'author')
+        if info.get(f'/{key.title()}')
+    }
+    return Extracted('\n'.join(parts), page_count=page_count, metadata=metadata)
+
+
+def _xml_text(archive, name):
+    """Text runs (<w:t>, <a:t>, <t>) of one document part, a line per paragraph or shared string"""
+    parts = []
+    with archive.open(name) as part:
+        for _event, element in ElementTree.iterparse(part):
+            local = element.tag.rsplit('}', 1)[-1]
+            if local == 't' and element.text:
+                parts.append(element.text)
+            elif local in ('p', 'si'):
+                parts.append('\n')
+                element.clear()
+    return XML_SPACE.sub(' ', ''.join(parts)).strip()
+
+
+def _app_property(archive, name):
+    """An integer from docProps/app.xml (Pages, Slides), if the writer recorded it"""
+    try:
+        with archive.open('docProps/app.xml') as part:
+            for _event, element in ElementTree.iterparse(part):
+                if element.tag.rsplit('}', 1)[-1] == name and element.text:
+                    return int(element.text)
+    except (KeyError, ValueError):
+        pass
+    return None
+
+
+def _numbered_parts(archive, prefix):
+    pattern = re.compile(re.escape(prefix) + r'(\d+)\.xml$')
+    numbered = [(int(match.group(1)), name) for name in archive.namelist() if (match := pattern.match(name))]
+    return [name for _number, name in sorted(numbered)]
+
+
+def extract_office(file, extension):
+    """Text of Office Open XML documents, read with the standard library"""
+    try:
+        with zipfile.ZipFile(file) as archive:
+            if extension == '.docx':
+                text = _xml_text(archive, 'word/document.xml')
+                return Extracted(text, page_count=_app_property(archive, 'Pages'))
+            if extension == '.pptx':
+                slides = _numbered_parts(archive, 'ppt/slides/slide')
+                text = '\n\n'.join(_xml_text(archive, slide) for slide in slides)
+                return Extracted(text, page_count=len(slides))
+            sheets = _numbered_parts(archive, 'xl/worksheets/sheet')
+            # Cell text lives in the shared string table; numbers are not worth indexing
+            strings = ''
+            if 'xl/sharedStrings.xml' in archive.namelist():
+                strings = _xml_text(archive, 'xl/sharedStrings.xml')
+            return Extracted(strings, metadata={'sheets': len(sheets)})
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ExtractionError(f'Unreadable {extension[1:]} file: {e}') from e
+
+
+def is_extractable(extension):
+    return extension in TEXT_EXTENSIONS or extension == '.pdf' or extension in OFFICE_EXTENSIONS
+
+
+def extract_file(file, extension):
+    """Extracted content of an open file, or None for types without text"""
+    if extension in TEXT_EXTENSIONS:
+        return extract_text_file(file)
+    if extension == '.pdf':
+        return extract_pdf(file)
+    if extension in OFFICE_EXTENSIONS:
+        return extract_office(file, extension)
+    return None
+
+
+def _save_result(attachment, status, text='', page_count=None, metadata=None):
+    from .models import Attachment, AttachmentContent
+
+    with transaction.atomic():
+        updated = Attachment.objects.filter(pk=attachment.pk, file=attachment.file.name).update(
+            extraction_status=status,
+            preview_text=text[:PREVIEW_CHARS],
+            page_count=page_count,
+            content_metadata=metadata or {},
+            extracted_at=timezone.now(),
+        )
+        if not updated:
+            # Deleted, or the file changed while it was being read
+            return False
+        if text:
+            AttachmentContent.objects.update_or_create(attachment_id=attachment.pk, defaults={'text': text})
+            AttachmentContent.objects.filter(attachment_id=attachment.pk).update(
+                search_vector=(
+                    SearchVector(Value(attachment.original_filename), config=SEARCH_CONFIG, weight='A')
+                    + SearchVector('text', config=SEARCH_CONFIG, weight='B')
+                )
+            )
+        else:
+            AttachmentContent.objects.filter(attachment_id=attachment.pk).delete()
+    return True
+
+
+def _copy_from_duplicate(attachment):
+    """Reuse the extraction of another attachment with the same content"""
+    from .models import Attachment, AttachmentContent
+
+    if not attachment.content_hash:
+        return False
+    source = (
+        Attachment.objects.filter(
+            content_hash=attachment.content_hash,
+            extraction_status__in=[Attachment.EXTRACTION_EXTRACTED, Attachment.EXTRACTION_UNSUPPORTED],
+        )
+        .exclude(pk=attachment.pk)
+        .select_related('content_index')
+        .first()
+    )
+    if source is None:
+        return False
+    try:
+        text = source.content_index.text
+    except AttachmentContent.DoesNotExist:
+        text = source.preview_text
+    return _save_result(attachment, source.extraction_status, text, source.page_count, source.content_metadata)
+
+
+def extract_attachment(attachment):
+    """Extract and store one attachment's content. Returns the resulting status."""
+    from .models import Attachment
+
+    if _copy_from_duplicate(attachment):
+        attachment.refresh_from_db()
+        return attachment.extraction_status
+
+    extension = attachment.file_extension
+    try:
+        with attachment.file.open('rb') as file:
+            extracted = extract_file(file, extension)
+    except ExtractionError as e:
+        _save_result(attachment, Attachment.EXTRACTION_FAILED, metadata={'error': str(e)})
+        return Attachment.EXTRACTION_FAILED
+    except OSError as e:
+        logger.warning('Could not read attachment %s for extraction: %s', attachment.pk, e)
+        _save_result(attachment, Attachment.EXTRACTION_FAILED, metadata={'error': 'File not found on server'})
+        return Attachment.EXTRACTION_FAILED
+
+    if extracted is None:
+        _save_result(attachment, Attachment.EXTRACTION_UNSUPPORTED)
+        return Attachment.EXTRACTION_UNSUPPORTED
+    _save_result(
+        attachment, Attachment.EXTRACTION_EXTRACTED, extracted.text, extracted.page_count, extracted.metadata
+    )
+    return Attachment.EXTRACTION_EXTRACTED
+
+
+def process_pending_extractions(limit=None):
+    """Extract the current tenant's pending attachments, oldest first. Returns {status: count}."""
+    from .models import Attachment
+
+    pending = Attachment.objects.filter(
+        attachment_type='file', extraction_status=Attachment.EXTRACTION_PENDING
+    ).exclude(file='').order_by('uploaded_at')
+    if limit:
+        pending = pending[:limit]
+
+    counts = {}
+    for attachment in pending.iterator(chunk_size=100):
+        try:
+            status = extract_attachment(attachment)
+        except Exception as e:
+            # Keep a broken file from being retried on every run
+            logger.exception('Extraction failed for attachment %s', attachment.pk)
+            _save_result(attachment, Attachment.EXTRACTION_FAILED, metadata={'error': str(e)})
+            status = Attachment.EXTRACTION_FAILED
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+
+class ExtractionWorker:
+    """Daemon thread extracting attachments queued by schema and primary key"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def enqueue(self, schema_name, attachment_id):
+        self._ensure_started()
+        self._queue.put((schema_name, attachment_id))
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='attachment-extraction', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            schema_name, attachment_id = self._queue.get()
+            try:
+                run_extraction(schema_name, attachment_id)
+            except Exception:
+                logger.exception('Extraction failed for attachment %s in %s', attachment_id, schema_name)
+            finally:
+                connection.close_if_unusable_or_obsolete()
+
+
+extraction_worker = ExtractionWorker()
+
+
+def run_extraction(schema_name, attachment_id):
+    from .models import Attachment
+
+    with schema_context(schema_name):
+        attachment = Attachment.objects.filter(
+            pk=attachment_id, extraction_status=Attachment.EXTRACTION_PENDING
+        ).first()
+        if attachment is not None:
+            extract_attachment(attachment)
+
+
+def schedule_extraction(attachment):
+    """Queue extraction of a new or replaced file once the surrounding transaction commits"""
+    schema_name = connection.schema_name
+    if schema_name == PUBLIC_SCHEMA_NAME or EXTRACTION_MODE == 'command':
+        return
+    if EXTRACTION_MODE == 'sync':
+        transaction.on_commit(lambda: run_extraction(schema_name, attachment.pk))
+    else:
+        transaction.on_commit(lambda: extraction_worker.enqueue(schema_name, attachment.pk))
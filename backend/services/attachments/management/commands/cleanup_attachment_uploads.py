@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import get_tenant_model, schema_context
+
+from services.attachments.uploads import SESSION_TTL_HOURS, cleanup_stale_sessions
+
+
+class Command(BaseCommand):
+    help = 'Discards chunked attachment uploads that were abandoned, with their temporary files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema',
+            type=str,
+            help='Specific schema to process (optional, defaults to all tenants)',
+        )
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=SESSION_TTL_HOURS,
+            help=f'Discard uploads idle for longer than this (default: {SESSION_TTL_HOURS})',
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options.get('schema')
+        if options['hours'] < 1:
+            raise CommandError('--hours must be at least 1')
+
+        TenantModel = get_tenant_model()
+        if schema_name:
+            tenants = TenantModel.objects.filter(schema_name=schema_name)
+            if not tenants.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'Tenant with schema {schema_name} does not exist')
+                )
+                return
+        else:
+            tenants = TenantModel.objects.exclude(schema_name='public')
+
+        for tenant in tenants:
+            try:
+                with schema_context(tenant.schema_name):
+                    discarded = cleanup_stale_sessions(options['hours'])
+                self.stdout.write(
+                    self.style.SUCCESS(f'{tenant.schema_name}: Discarded {discarded} stale uploads')
+                )
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Error processing {tenant.schema_name}: {str(e)}')
+                )
@@ -0,0 +1,90 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_tenants.utils import get_tenant_model, schema_context
+
+from services.attachments.blobs import (
+    blob_name,
+    hash_file,
+    link_or_copy_blob,
+    release_file,
+    tenant_blob_root,
+)
+from services.attachments.models import Attachment
+
+
+class Command(BaseCommand):
+    help = 'Moves attachment files stored per upload into the content-addressed blob store, sharing duplicates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema',
+            type=str,
+            help='Specific schema to process (optional, defaults to all tenants)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Hash files and report the space that would be reclaimed without changing anything',
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options.get('schema')
+        dry_run = options['dry_run']
+
+        TenantModel = get_tenant_model()
+        if schema_name:
+            tenants = TenantModel.objects.filter(schema_name=schema_name)
+            if not tenants.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'Tenant with schema {schema_name} does not exist')
+                )
+                return
+        else:
+            tenants = TenantModel.objects.exclude(schema_name='public')
+
+        for tenant in tenants:
+            try:
+                with schema_context(tenant.schema_name):
+                    moved, missing, reclaimed = self.dedupe(dry_run)
+                verb = 'Would move' if dry_run else 'Moved'
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'{tenant.schema_name}: {verb} {moved} files, '
+                        f'{reclaimed / (1024 * 1024):.1f} MB in duplicates, {missing} missing files skipped'
+                    )
+                )
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Error processing {tenant.schema_name}: {str(e)}')
+                )
+
+    def dedupe(self, dry_run):
+        """Returns (files moved, files missing, bytes of duplicate content)"""
+        storage = Attachment._meta.get_field('file').storage
+        legacy = list(
+            Attachment.objects.filter(attachment_type='file')
+            .exclude(file__isnull=True).exclude(file='')
+            .exclude(file__startswith=tenant_blob_root() + '/')
+            .order_by('pk')
+            .values_list('pk', 'file')
+        )
+        seen = set()
+        moved = missing = reclaimed = 0
+        for pk, name in legacy:
+            if not storage.exists(name):
+                missing += 1
+                continue
+            with storage.open(name, 'rb') as content:
+                content_hash = hash_file(content)
+            if content_hash in seen or storage.exists(blob_name(content_hash)):
+                reclaimed += storage.size(name)
+            seen.add(content_hash)
+            moved += 1
+            if dry_run:
+                continue
+
+            with transaction.atomic():
+                blob = link_or_copy_blob(storage, name, content_hash)
+                Attachment.objects.filter(pk=pk, file=name).update(file=blob, content_hash=content_hash)
+            release_file(storage, name)
+        return moved, missing, reclaimed
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django_tenants.utils import get_tenant_model, schema_context
+
+from services.attachments.blobs import iter_blob_names, release_file, tenant_blob_root
+from services.attachments.models import Attachment
+
+
+class Command(BaseCommand):
+    help = 'Deletes attachment blobs (and their thumbnails) that no attachment references'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema',
+            type=str,
+            help='Specific schema to process (optional, defaults to all tenants)',
+        )
+        parser.add_argument(
+            '--min-age-hours',
+            type=int,
+            default=24,
+            help='Only delete blobs older than this, so uploads still being committed are kept (default: 24)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report orphaned blobs without deleting them',
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options.get('schema')
+        if options['min_age_hours'] < 0:
+            raise CommandError('--min-age-hours cannot be negative')
+        cutoff = timezone.now() - timedelta(hours=options['min_age_hours'])
+
+        TenantModel = get_tenant_model()
+        if schema_name:
+            tenants = TenantModel.objects.filter(schema_name=schema_name)
+            if not tenants.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'Tenant with schema {schema_name} does not exist')
+                )
+                return
+        else:
+            tenants = TenantModel.objects.exclude(schema_name='public')
+
+        for tenant in tenants:
+            try:
+                with schema_context(tenant.schema_name):
+                    orphans, size = self.collect(cutoff, options['dry_run'])
+                verb = 'Found' if options['dry_run'] else 'Deleted'
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'{tenant.schema_name}: {verb} {orphans} orphaned blobs ({size / (1024 * 1024):.1f} MB)'
+                    )
+                )
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Error processing {tenant.schema_name}: {str(e)}')
+                )
+
+    def collect(self, cutoff, dry_run):
+        """Returns (orphaned blobs, their total size in bytes)"""
+        storage = Attachment._meta.get_field('file').storage
+        referenced = set(
+            Attachment.objects.filter(file__startswith=tenant_blob_root() + '/').values_list('file', flat=True)
+        )
+        orphans = size = 0
+        for name in iter_blob_names(storage):
+            if name in referenced or storage.get_modified_time(name) > cutoff:
+                continue
+            blob_size = storage.size(name)
+            # release_file re-checks the references under the blob lock
+            if dry_run or release_file(storage, name):
+                orphans += 1
+                size += blob_size
+        return orphans, size
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import get_tenant_model, schema_context
+
+from services.attachments.derivatives import THUMBNAIL_SIZES, generate_derivatives
+from services.attachments.models import Attachment
+
+
+class Command(BaseCommand):
+    help = 'Backfills the cached preview thumbnails for image attachments'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema',
+            type=str,
+            help='Specific schema to process (optional, defaults to all tenants)',
+        )
+        parser.add_argument(
+            '--sizes',
+            type=str,
+            help=f"Comma-separated sizes to render (default: all of {', '.join(THUMBNAIL_SIZES)})",
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render thumbnails that already exist',
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options.get('schema')
+        sizes = self.parse_sizes(options.get('sizes'))
+
+        TenantModel = get_tenant_model()
+        if schema_name:
+            tenants = TenantModel.objects.filter(schema_name=schema_name)
+            if not tenants.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'Tenant with schema {schema_name} does not exist')
+                )
+                return
+        else:
+            tenants = TenantModel.objects.exclude(schema_name='public')
+
+        for tenant in tenants:
+            try:
+                with schema_context(tenant.schema_name):
+                    attachments, rendered = self.backfill(sizes, options['force'])
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'{tenant.schema_name}: {rendered} thumbnails for {attachments} image attachments'
+                    )
+                )
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Error processing {tenant.schema_name}: {str(e)}')
+                )
+
+    def backfill(self, sizes, force):
+        images = Attachment.objects.filter(attachment_type='file', is_active=True).exclude(file__isnull=True).exclude(file='')
+        attachments = rendered = 0
+        for attachment in images.iterator(chunk_size=500):
+            if not attachment.is_image:
+                continue
+            attachments += 1
+            rendered += generate_derivatives(attachment, sizes=sizes, force=force)
+        return attachments, rendered
+
+    def parse_sizes(self, value):
+        if not value:
+            return None
+        sizes = [size.strip() for size in value.split(',') if size.strip()]
+        unknown = [size for size in sizes if size not in THUMBNAIL_SIZES]
+        if unknown:
+            raise CommandError(f"Unknown sizes: {', '.join(unknown)}")
+        return sizes
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from django_tenants.utils import get_tenant_model, schema_context
+
+from services.attachments.extraction import process_pending_extractions
+from services.attachments.models import Attachment
+
+
+class Command(BaseCommand):
+    help = 'Extracts text, page counts and preview snippets from pending file attachments for each tenant'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema',
+            type=str,
+            help='Specific schema to process (optional, defaults to all tenants)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Maximum number of attachments to extract per tenant',
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Queue attachments whose extraction failed again first',
+        )
+        parser.add_argument(
+            '--reextract',
+            action='store_true',
+            help='Queue every file attachment again, e.g. after changing the extraction settings',
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options.get('schema')
+
+        TenantModel = get_tenant_model()
+        if schema_name:
+            tenants = TenantModel.objects.filter(schema_name=schema_name)
+            if not tenants.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'Tenant with schema {schema_name} does not exist')
+                )
+                return
+        else:
+            tenants = TenantModel.objects.exclude(schema_name='public')
+
+        for tenant in tenants:
+            try:
+                with schema_context(tenant.schema_name):
+                    self.requeue(options['retry_failed'], options['reextract'])
+                    counts = process_pending_extractions(limit=options.get('limit'))
+                summary = ', '.join(f'{count} {status}' for status, count in sorted(counts.items())) or 'nothing pending'
+                self.stdout.write(self.style.SUCCESS(f'{tenant.schema_name}: {summary}'))
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Error processing {tenant.schema_name}: {str(e)}')
+                )
+
+    def requeue(self, retry_failed, reextract):
+        files = Attachment.objects.filter(attachment_type='file').exclude(file='')
+        if reextract:
+            files.exclude(extraction_status=Attachment.EXTRACTION_PENDING).update(
+                extraction_status=Attachment.EXTRACTION_PENDING
+            )
+        elif retry_failed:
+            files.filter(extraction_status=Attachment.EXTRACTION_FAILED).update(
+                extraction_status=Attachment.EXTRACTION_PENDING
+            )
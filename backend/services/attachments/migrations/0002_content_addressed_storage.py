@@ -0,0 +1,30 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attachments", "0001_initial"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attachment",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="SHA-256 of the file content; identifies the shared blob (for files only)",
+                max_length=64,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attachment",
+            index=models.Index(fields=["file"], name="idx_attachment_file"),
+        ),
+    ]
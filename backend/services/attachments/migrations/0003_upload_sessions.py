@@ -0,0 +1,98 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:23
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attachments", "0002_content_addressed_storage"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttachmentUploadSession",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "upload_id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        help_text="Public identifier of the upload session",
+                        unique=True,
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.PositiveIntegerField(
+                        help_text="The ID of the entity the attachment will belong to"
+                    ),
+                ),
+                ("original_filename", models.CharField(max_length=255)),
+                ("content_type_header", models.CharField(max_length=100)),
+                ("description", models.TextField(blank=True)),
+                (
+                    "total_size",
+                    models.PositiveBigIntegerField(
+                        help_text="Declared size of the file in bytes"
+                    ),
+                ),
+                (
+                    "received_size",
+                    models.PositiveBigIntegerField(
+                        default=0,
+                        help_text="Bytes stored so far; the offset of the next chunk",
+                    ),
+                ),
+                (
+                    "checksum",
+                    models.CharField(
+                        blank=True,
+                        help_text="Optional SHA-256 the client expects the completed file to have",
+                        max_length=64,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        help_text="The type of entity the attachment will belong to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+                (
+                    "uploaded_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attachment_upload_sessions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "attachment_upload_session",
+                "indexes": [
+                    models.Index(
+                        fields=["updated_at"], name="idx_upload_session_updated"
+                    )
+                ],
+            },
+        ),
+    ]
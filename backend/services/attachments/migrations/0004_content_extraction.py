@@ -0,0 +1,112 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:26
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def queue_existing_files(apps, schema_editor):
+    """Existing file attachments are extracted by process_attachment_extraction"""
+    Attachment = apps.get_model("attachments", "Attachment")
+    Attachment.objects.filter(attachment_type="file").exclude(file="").update(
+        extraction_status="pending"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attachments", "0003_upload_sessions"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttachmentContent",
+            fields=[
+                (
+                    "attachment",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="content_index",
+                        serialize=False,
+                        to="attachments.attachment",
+                    ),
+                ),
+                ("text", models.TextField()),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(null=True),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "attachment_content",
+            },
+        ),
+        migrations.AddField(
+            model_name="attachment",
+            name="content_metadata",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Extracted document metadata such as title, author or sheet count",
+            ),
+        ),
+        migrations.AddField(
+            model_name="attachment",
+            name="extracted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="attachment",
+            name="extraction_status",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("pending", "Pending"),
+                    ("extracted", "Extracted"),
+                    ("unsupported", "Unsupported"),
+                    ("failed", "Failed"),
+                ],
+                default="",
+                help_text="Text extraction state (for files only)",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="attachment",
+            name="page_count",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Pages (PDF, Word) or slides (PowerPoint), when known",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="attachment",
+            name="preview_text",
+            field=models.TextField(
+                blank=True,
+                default="",
+                help_text="Leading extracted text shown in previews",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attachment",
+            index=models.Index(
+                fields=["extraction_status"], name="idx_attachment_extraction"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attachmentcontent",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="idx_attachment_content_fts"
+            ),
+        ),
+        migrations.RunPython(queue_existing_files, migrations.RunPython.noop),
+    ]
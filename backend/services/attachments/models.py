@@ -4,14 +4,22 @@ import uuid
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.db import connection, models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection, models, transaction
 from django.utils.text import slugify
 
+from .blobs import hash_file, store_blob
+from .extraction import is_extractable, schedule_extraction
+
 
 def attachment_upload_path(instance, filename):
     """
     Generate upload path for attachments with tenant and entity isolation.
     Path format: attachments/{tenant_schema}/{entity_type}/{entity_id}/{uuid}_{filename}
+
+    Only used for files stored before content-addressed storage; new uploads
+    are stored by Attachment.save() under their blob name (see blobs.py).
     """
     # Get current tenant schema
     tenant_schema = connection.schema_name if hasattr(connection, 'schema_name') else 'public'
@@ -39,6 +47,18 @@ class Attachment(models.Model):
         ('link', 'Link'),
     )
 
+    # Text extraction status choices (see extraction.py)
+    EXTRACTION_PENDING = 'pending'
+    EXTRACTION_EXTRACTED = 'extracted'
+    EXTRACTION_UNSUPPORTED = 'unsupported'
+    EXTRACTION_FAILED = 'failed'
+    EXTRACTION_STATUSES = (
+        (EXTRACTION_PENDING, 'Pending'),
+        (EXTRACTION_EXTRACTED, 'Extracted'),
+        (EXTRACTION_UNSUPPORTED, 'Unsupported'),
+        (EXTRACTION_FAILED, 'Failed'),
+    )
+
     # Generic foreign key to link to any CRM entity (Account, Contact, Lead, Deal, Product)
     content_type = models.ForeignKey(
         ContentType,
@@ -90,6 +110,37 @@ class Attachment(models.Model):
         blank=True,
         help_text="MIME type of the file (for files only)"
     )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text="SHA-256 of the file content; identifies the shared blob (for files only)"
+    )
+
+    # Extracted content, cached so previews never read the file
+    extraction_status = models.CharField(
+        max_length=20,
+        choices=EXTRACTION_STATUSES,
+        blank=True,
+        default='',
+        help_text="Text extraction state (for files only)"
+    )
+    preview_text = models.TextField(
+        blank=True,
+        default='',
+        help_text="Leading extracted text shown in previews"
+    )
+    page_count = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Pages (PDF, Word) or slides (PowerPoint), when known"
+    )
+    content_metadata = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Extracted document metadata such as title, author or sheet count"
+    )
+    extracted_at = models.DateTimeField(null=True, blank=True)
 
     # Metadata
     description = models.TextField(
@@ -133,6 +184,8 @@ class Attachment(models.Model):
             models.Index(fields=['uploaded_at'], name='idx_attachment_uploaded'),
             models.Index(fields=['is_active'], name='idx_attachment_active'),
             models.Index(fields=['content_type_header'], name='idx_attachment_mime'),
+            models.Index(fields=['file'], name='idx_attachment_file'),
+            models.Index(fields=['extraction_status'], name='idx_attachment_extraction'),
         ]
         constraints = [
             models.CheckConstraint(
@@ -158,11 +211,35 @@ class Attachment(models.Model):
             self.file = None
             self.file_size = None
             self.content_type_header = None
+            self.content_hash = ''
+            self.extraction_status = ''
         elif self.attachment_type == 'file':
             self.link_url = None
+            if self.file and not self.file._committed:
+                # Store new content once per tenant; the blob stays locked
+                # until this row referencing it is committed
+                with transaction.atomic():
+                    self._store_blob()
+                    super().save(*args, **kwargs)
+                    if self.extraction_status == self.EXTRACTION_PENDING:
+                        schedule_extraction(self)
+                return
 
         super().save(*args, **kwargs)
 
+    def _store_blob(self):
+        content = self.file.file
+        self.content_hash = hash_file(content)
+        self.file.name = store_blob(self.file.storage, content, self.content_hash)
+        self.file._committed = True
+        self.extraction_status = (
+            self.EXTRACTION_PENDING if is_extractable(self.file_extension) else self.EXTRACTION_UNSUPPORTED
+        )
+        self.preview_text = ''
+        self.page_count = None
+        self.content_metadata = {}
+        self.extracted_at = None
+
     def __str__(self):
         return f"{self.original_filename} ({self.content_object})"
 
@@ -204,8 +281,86 @@ class Attachment(models.Model):
             size /= 1024.0
         return f"{size:.1f} TB"
 
-    def delete(self, *args, **kwargs):
-        """Override delete to remove file from storage"""
-        if self.file and os.path.isfile(self.file.path):
-            os.remove(self.file.path)
-        super().delete(*args, **kwargs)
+
+class AttachmentContent(models.Model):
+    """
+    Full extracted text of a file attachment with its tsvector, GIN-indexed
+    for content search within the tenant (written by extraction.py).
+    """
+    attachment = models.OneToOneField(
+        Attachment,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='content_index'
+    )
+    text = models.TextField()
+    search_vector = SearchVectorField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'attachments'
+        db_table = 'attachment_content'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='idx_attachment_content_fts'),
+        ]
+
+    def __str__(self):
+        return f"Content of attachment {self.attachment_id}"
+
+
+class AttachmentUploadSession(models.Model):
+    """
+    A chunked upload in progress. Chunks are appended at received_size to a
+    temporary file (see uploads.py); completing the session creates the
+    Attachment and deletes the session.
+    """
+    upload_id = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        editable=False,
+        help_text="Public identifier of the upload session"
+    )
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        help_text="The type of entity the attachment will belong to"
+    )
+    object_id = models.PositiveIntegerField(
+        help_text="The ID of the entity the attachment will belong to"
+    )
+    original_filename = models.CharField(max_length=255)
+    content_type_header = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+    total_size = models.PositiveBigIntegerField(
+        help_text="Declared size of the file in bytes"
+    )
+    received_size = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Bytes stored so far; the offset of the next chunk"
+    )
+    checksum = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Optional SHA-256 the client expects the completed file to have"
+    )
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='attachment_upload_sessions'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'attachments'
+        db_table = 'attachment_upload_session'
+        indexes = [
+            models.Index(fields=['updated_at'], name='idx_upload_session_updated'),
+        ]
+
+    def __str__(self):
+        return f"{self.original_filename} ({self.received_size}/{self.total_size})"
+
+    @property
+    def is_complete(self):
+        return self.received_size == self.total_size
@@ -1,9 +1,51 @@
+import mimetypes
+
 from django.contrib.contenttypes.models import ContentType
+from django.core.files.uploadedfile import UploadedFile
 from rest_framework import serializers
 
-from .models import Attachment
+from .models import Attachment, AttachmentUploadSession
 from .utils import sanitize_filename, validate_file_upload
 
+# Map entity types to app labels and models
+ENTITY_MODELS = {
+    'account': ('accounts', 'account'),
+    'contact': ('contacts', 'contact'),
+    'lead': ('leads', 'lead'),
+    'deal': ('deals', 'deal'),
+    'product': ('products', 'product'),
+    'estimate': ('estimates', 'estimate'),
+    'customer': ('customers', 'customer'),
+}
+
+
+def validate_entity_type(value):
+    """Validate that entity_type corresponds to a valid CRM model."""
+    if value.lower() not in ENTITY_MODELS:
+        raise serializers.ValidationError(
+            f"Invalid entity type. Must be one of: {', '.join(ENTITY_MODELS)}"
+        )
+    return value.lower()
+
+
+def resolve_entity(entity_type, entity_id):
+    """Content type of an existing entity attachments can be linked to."""
+    try:
+        app_label, model_name = ENTITY_MODELS[entity_type]
+        content_type = ContentType.objects.get(app_label=app_label, model=model_name)
+    except ContentType.DoesNotExist:
+        raise serializers.ValidationError({
+            'entity_type': f"Invalid entity type: {entity_type}"
+        }) from None
+
+    # Check if the entity exists
+    model_class = content_type.model_class()
+    if not model_class.objects.filter(pk=entity_id).exists():
+        raise serializers.ValidationError({
+            'entity_id': f"No {entity_type} found with ID {entity_id}"
+        })
+    return content_type
+
 
 class AttachmentSerializer(serializers.ModelSerializer):
     """Serializer for Attachment model supporting both files and links."""
@@ -46,6 +88,8 @@ class AttachmentSerializer(serializers.ModelSerializer):
             'entity_type',
             'entity_id',
             'is_active',
+            'extraction_status',
+            'page_count',
         ]
         read_only_fields = [
             'id',
@@ -64,6 +108,8 @@ class AttachmentSerializer(serializers.ModelSerializer):
             'download_url',
             'entity_type',
             'entity_id',
+            'extraction_status',
+            'page_count',
         ]
 
     def get_file_url(self, obj):
@@ -136,12 +182,7 @@ class AttachmentUploadSerializer(serializers.Serializer):
 
     def validate_entity_type(self, value):
         """Validate that entity_type corresponds to a valid CRM model."""
-        valid_models = ['account', 'contact', 'lead', 'deal', 'product', 'estimate', 'customer']
-        if value.lower() not in valid_models:
-            raise serializers.ValidationError(
-                f"Invalid entity type. Must be one of: {', '.join(valid_models)}"
-            )
-        return value.lower()
+        return validate_entity_type(value)
 
     def validate_link_url(self, value):
         """Validate link URL format and accessibility."""
@@ -178,36 +219,8 @@ class AttachmentUploadSerializer(serializers.Serializer):
                     'file': 'File should not be provided for link attachments.'
                 })
 
-        # Get the content type for the entity
-        try:
-            # Map entity types to app labels and models
-            entity_map = {
-                'account': ('accounts', 'account'),
-                'contact': ('contacts', 'contact'),
-                'lead': ('leads', 'lead'),
-                'deal': ('deals', 'deal'),
-                'product': ('products', 'product'),
-                'estimate': ('estimates', 'estimate'),
-                'customer': ('customers', 'customer'),
-            }
-
-            app_label, model_name = entity_map[entity_type]
-            content_type = ContentType.objects.get(app_label=app_label, model=model_name)
-
-            # Check if the entity exists
-            model_class = content_type.model_class()
-            if not model_class.objects.filter(pk=entity_id).exists():
-                raise serializers.ValidationError({
-                    'entity_id': f"No {entity_type} found with ID {entity_id}"
-                })
-
-            data['content_type'] = content_type
-            data['object_id'] = entity_id
-
-        except ContentType.DoesNotExist:
-            raise serializers.ValidationError({
-                'entity_type': f"Invalid entity type: {entity_type}"
-            })
+        data['content_type'] = resolve_entity(entity_type, entity_id)
+        data['object_id'] = entity_id
 
         return data
 
@@ -311,3 +324,52 @@ class AttachmentUpdateSerializer(serializers.ModelSerializer):
             })
 
         return data
+
+
+class AttachmentUploadSessionSerializer(serializers.ModelSerializer):
+    """State of a chunked upload; received_size is where the next chunk starts."""
+
+    entity_type = serializers.CharField(source='content_type.model', read_only=True)
+    entity_id = serializers.IntegerField(source='object_id', read_only=True)
+
+    class Meta:
+        model = AttachmentUploadSession
+        fields = [
+            'upload_id',
+            'original_filename',
+            'content_type_header',
+            'total_size',
+            'received_size',
+            'checksum',
+            'entity_type',
+            'entity_id',
+            'created_at',
+            'updated_at',
+        ]
+        read_only_fields = fields
+
+
+class AttachmentUploadSessionCreateSerializer(serializers.Serializer):
+    """Declare a file to be uploaded in chunks."""
+
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    content_type = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    checksum = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, allow_blank=True,
+                                      help_text='SHA-256 of the whole file, checked on completion')
+    description = serializers.CharField(max_length=1000, required=False, allow_blank=True)
+    entity_type = serializers.CharField(max_length=50)
+    entity_id = serializers.IntegerField(min_value=1)
+
+    def validate_entity_type(self, value):
+        return validate_entity_type(value)
+
+    def validate(self, data):
+        if not data.get('content_type'):
+            data['content_type'] = mimetypes.guess_type(data['filename'])[0] or 'application/octet-stream'
+        # Same size and type policy as single-request uploads
+        validate_file_upload(
+            UploadedFile(name=data['filename'], content_type=data['content_type'], size=data['size'])
+        )
+        data['entity_content_type'] = resolve_entity(data['entity_type'], data['entity_id'])
+        return data
@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+
+from .blobs import release_file
+from .models import Attachment
+
+
+@receiver(pre_save, sender=Attachment)
+def release_replaced_file(sender, instance, update_fields=None, **kwargs):
+    """Release the old file (and its thumbnails) once a replacement is committed"""
+    if not instance.pk or (update_fields is not None and 'file' not in update_fields):
+        return
+    previous = Attachment.objects.filter(pk=instance.pk).values_list('file', flat=True).first()
+    if previous and previous != instance.file.name:
+        storage = instance.file.storage
+        transaction.on_commit(lambda: release_file(storage, previous))
+
+
+@receiver(post_delete, sender=Attachment)
+def release_deleted_file(sender, instance, **kwargs):
+    """Shared blobs are only removed with the last attachment that references them"""
+    if instance.file:
+        storage, name = instance.file.storage, instance.file.name
+        transaction.on_commit(lambda: release_file(storage, name))
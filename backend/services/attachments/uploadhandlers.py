@@ -0,0 +1,41 @@
+"""
+Upload handlers that hash each uploaded file while it streams in.
+
+They behave exactly like Django's memory/temporary-file handlers and add a
+``content_hash`` (SHA-256 hex) attribute to the resulting UploadedFile, so
+content-addressed attachment storage never reads the upload a second time.
+"""
+import hashlib
+
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+
+
+class ContentHashMixin:
+    def new_file(self, *args, **kwargs):
+        self.content_hasher = hashlib.sha256()
+        return super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.keeps_data:
+            self.content_hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.content_hash = self.content_hasher.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(ContentHashMixin, MemoryFileUploadHandler):
+    @property
+    def keeps_data(self):
+        # Uploads too large for memory are passed on to the temporary file handler
+        return self.activated
+
+
+class HashingTemporaryFileUploadHandler(ContentHashMixin, TemporaryFileUploadHandler):
+    keeps_data = True
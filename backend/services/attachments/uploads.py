@@ -0,0 +1,256 @@
+"""
+Chunked, resumable attachment uploads.
+
+A session is opened with the file's name and size, chunks are appended in
+order with the byte offset they start at, and completing the session turns
+the temporary file into an Attachment. Each chunk is copied from the
+request body straight into ``{ATTACHMENT_UPLOAD_TEMP_DIR}/{schema}/{upload_id}.part``
+and hashed as it is written, so a failed request only repeats its own
+chunk and the completed file is never re-read when the chunks were handled
+by the same worker. The temporary directory should be on the same
+filesystem as MEDIA_ROOT so storing the completed file is a rename.
+"""
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .blobs import HASH_CHUNK_SIZE
+from .models import Attachment, AttachmentUploadSession
+from .utils import sanitize_filename
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_TEMP_DIR = getattr(settings, 'ATTACHMENT_UPLOAD_TEMP_DIR', None) or os.path.join(settings.MEDIA_ROOT, '.uploads')
+MAX_CHUNK_SIZE = getattr(settings, 'ATTACHMENT_UPLOAD_MAX_CHUNK_SIZE', 8 * 1024 * 1024)
+SESSION_TTL_HOURS = getattr(settings, 'ATTACHMENT_UPLOAD_SESSION_TTL_HOURS', 24)
+
+COPY_BUFFER_SIZE = 64 * 1024
+
+# Running SHA-256 per session for the chunks this process wrote, keyed by
+# upload_id: (offset hashed up to, hasher). A session continued by another
+# worker falls back to hashing the completed file once.
+_hashers = OrderedDict()
+MAX_CACHED_HASHERS = 256
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+class StagedUpload(UploadedFile):
+    """A completed session's temporary file, moved (not copied) into storage"""
+
+    def __init__(self, path, name, content_type, size, content_hash):
+        super().__init__(open(path, 'rb'), name, content_type, size)
+        self.path = path
+        self.content_hash = content_hash
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def tenant_temp_dir(schema_name=None):
+    schema_name = schema_name or getattr(connection, 'schema_name', 'public')
+    return os.path.join(UPLOAD_TEMP_DIR, schema_name)
+
+
+def temp_path(session):
+    return os.path.join(tenant_temp_dir(), f'{session.upload_id}.part')
+
+
+def _cache_hasher(upload_id, offset, hasher):
+    _hashers[upload_id] = (offset, hasher)
+    _hashers.move_to_end(upload_id)
+    while len(_hashers) > MAX_CACHED_HASHERS:
+        _hashers.popitem(last=False)
+
+
+def _running_hasher(upload_id, offset):
+    """A copy of the hasher that has seen exactly offset bytes, if this process has one"""
+    if offset == 0:
+        return hashlib.sha256()
+    cached = _hashers.get(upload_id)
+    if cached and cached[0] == offset:
+        return cached[1].copy()
+    return None
+
+
+def start_session(user, content_type, object_id, filename, size, mime_type, description='', checksum=''):
+    """Open a session for a file already validated against the upload policy"""
+    session = AttachmentUploadSession.objects.create(
+        content_type=content_type,
+        object_id=object_id,
+        original_filename=sanitize_filename(filename),
+        content_type_header=mime_type,
+        description=description,
+        total_size=size,
+        checksum=checksum.lower(),
+        uploaded_by=user,
+    )
+    os.makedirs(tenant_temp_dir(), exist_ok=True)
+    open(temp_path(session), 'wb').close()
+    return session
+
+
+def append_chunk(session, offset, stream, length):
+    """
+    Write length bytes from stream at offset and return the new offset. The
+    offset must be the session's received_size: a client that lost a
+    response asks for the session and resumes from there.
+    """
+    if length is None:
+        raise UploadError('Content-Length is required', status=411)
+    if length <= 0:
+        raise UploadError('Empty chunk')
+    if length > MAX_CHUNK_SIZE:
+        raise UploadError(f'Chunks may be at most {MAX_CHUNK_SIZE} bytes', status=413)
+
+    with transaction.atomic():
+        # The row lock keeps two requests from writing the same session at once
+        session = AttachmentUploadSession.objects.select_for_update().get(pk=session.pk)
+        if offset != session.received_size:
+            raise UploadError(
+                f'Expected offset {session.received_size}', status=409, offset=session.received_size
+            )
+        if offset + length > session.total_size:
+            raise UploadError(
+                f'Chunk ends past the declared size of {session.total_size} bytes', status=413,
+                offset=session.received_size
+            )
+
+        upload_id = str(session.upload_id)
+        hasher = _running_hasher(upload_id, offset)
+        path = temp_path(session)
+        written = 0
+        try:
+            with open(path, 'r+b') as part:
+                part.seek(offset)
+                while written < length:
+                    data = stream.read(min(COPY_BUFFER_SIZE, length - written))
+                    if not data:
+                        break
+                    part.write(data)
+                    if hasher:
+                        hasher.update(data)
+                    written += len(data)
+                # Drop anything left past the offset by an earlier, interrupted write
+                part.truncate()
+        except FileNotFoundError:
+            raise UploadError('Upload session has expired', status=410) from None
+
+        if written != length:
+            raise UploadError(
+                f'Received {written} of {length} bytes', offset=session.received_size
+            )
+
+        session.received_size = offset + length
+        session.save(update_fields=['received_size', 'updated_at'])
+
+    if hasher:
+        _cache_hasher(upload_id, session.received_size, hasher)
+    return session.received_size
+
+
+def _file_hash(session, path):
+    hasher = _running_hasher(str(session.upload_id), session.total_size)
+    if hasher is None:
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as part:
+            while data := part.read(HASH_CHUNK_SIZE):
+                hasher.update(data)
+    return hasher.hexdigest()
+
+
+def complete_session(session):
+    """Turn a fully received session into an Attachment and close it"""
+    path = temp_path(session)
+    with transaction.atomic():
+        session = AttachmentUploadSession.objects.select_for_update().get(pk=session.pk)
+        if not session.is_complete:
+            raise UploadError(
+                f'Received {session.received_size} of {session.total_size} bytes',
+                status=409, offset=session.received_size
+            )
+        if not os.path.exists(path) or os.path.getsize(path) != session.total_size:
+            raise UploadError('Upload file is missing; start a new upload', status=410)
+
+        content_hash = _file_hash(session, path)
+        if session.checksum and session.checksum != content_hash:
+            raise UploadError('Checksum does not match the uploaded content')
+
+        staged = StagedUpload(
+            path, session.original_filename, session.content_type_header, session.total_size, content_hash
+        )
+        try:
+            attachment = Attachment(
+                attachment_type='file',
+                content_type=session.content_type,
+                object_id=session.object_id,
+                file=staged,
+                original_filename=session.original_filename,
+                file_size=session.total_size,
+                content_type_header=session.content_type_header,
+                description=session.description,
+                uploaded_by=session.uploaded_by,
+            )
+            attachment.save()
+        finally:
+            staged.close()
+        session.delete()
+
+    _hashers.pop(str(session.upload_id), None)
+    # Left behind when the tenant already had this content
+    _remove(path)
+    return attachment
+
+
+def discard_session(session):
+    _hashers.pop(str(session.upload_id), None)
+    path = temp_path(session)
+    session.delete()
+    _remove(path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logger.warning('Could not remove upload file %s', path, exc_info=True)
+
+
+def cleanup_stale_sessions(max_age_hours=None):
+    """
+    Discard the current tenant's sessions idle for longer than max_age_hours
+    and any temporary file without a session. Returns the sessions discarded.
+    """
+    age = timedelta(hours=SESSION_TTL_HOURS if max_age_hours is None else max_age_hours)
+    cutoff = timezone.now() - age
+    stale = AttachmentUploadSession.objects.filter(updated_at__lt=cutoff)
+    discarded = 0
+    for session in stale:
+        discard_session(session)
+        discarded += 1
+
+    directory = tenant_temp_dir()
+    if os.path.isdir(directory):
+        live = {
+            f'{upload_id}.part'
+            for upload_id in AttachmentUploadSession.objects.values_list('upload_id', flat=True)
+        }
+        for entry in os.scandir(directory):
+            if (entry.name not in live and entry.is_file()
+                    and entry.stat().st_mtime < cutoff.timestamp()):
+                _remove(entry.path)
+    return discarded
@@ -5,6 +5,13 @@ from . import views
 app_name = 'attachments'
 
 urlpatterns = [
+    # Full-text search inside attached documents
+    path(
+        'search/',
+        views.search_attachments,
+        name='attachment-search'
+    ),
+
     # Entity-specific attachment endpoints
     path(
         '<str:entity_type>/<int:entity_id>/',
@@ -17,6 +24,23 @@ urlpatterns = [
         name='attachment-stats'
     ),
 
+    # Chunked, resumable uploads
+    path(
+        '<str:entity_type>/<int:entity_id>/uploads/',
+        views.AttachmentUploadSessionCreateView.as_view(),
+        name='attachment-upload-create'
+    ),
+    path(
+        'uploads/<uuid:upload_id>/',
+        views.upload_session,
+        name='attachment-upload-session'
+    ),
+    path(
+        'uploads/<uuid:upload_id>/complete/',
+        views.complete_upload_session,
+        name='attachment-upload-complete'
+    ),
+
     # Individual attachment endpoints
     path(
         '<int:pk>/',
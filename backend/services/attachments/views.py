@@ -1,11 +1,13 @@
 import mimetypes
 import os
-import tempfile
 
 from django.contrib.contenttypes.models import ContentType
-from django.http import FileResponse, Http404, HttpResponse
-from django.utils.encoding import smart_str
-from PIL import Image
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.html import escape
+from django.utils.http import quote_etag
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.parsers import FormParser, MultiPartParser
@@ -13,12 +15,30 @@ from rest_framework.response import Response
 
 from core.tenants.permissions import IsTenantUser
 
-from .models import Attachment
+from .delivery import CACHE_SECONDS, serve_attachment, serve_file
+from .derivatives import THUMBNAIL_SIZES, derivative_etag, get_or_create_derivative
+from .extraction import PREVIEW_CHARS, SEARCH_CONFIG
+from .models import Attachment, AttachmentUploadSession
 from .serializers import (
+    ENTITY_MODELS,
     AttachmentSerializer,
     AttachmentUpdateSerializer,
     AttachmentUploadSerializer,
+    AttachmentUploadSessionCreateSerializer,
+    AttachmentUploadSessionSerializer,
 )
+from .uploads import (
+    MAX_CHUNK_SIZE,
+    UploadError,
+    append_chunk,
+    complete_session,
+    discard_session,
+    start_session,
+)
+
+# Control characters survive HTML escaping, so they can mark headline matches
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
 
 
 class AttachmentListCreateView(generics.ListCreateAPIView):
@@ -154,26 +174,117 @@ def download_attachment(request, attachment_id):
             status=status.HTTP_404_NOT_FOUND
         )
 
-    try:
-        # Create file response
-        response = FileResponse(
-            open(attachment.file.path, 'rb'),
-            content_type=attachment.content_type_header
-        )
+    # Ranges, conditional GET and X-Accel/X-Sendfile offload
+    return serve_attachment(request, attachment, as_attachment=True)
 
-        # Set headers for download
-        response['Content-Disposition'] = f'attachment; filename="{smart_str(attachment.original_filename)}"'
-        response['Content-Length'] = attachment.file_size
 
-        return response
+class AttachmentUploadSessionCreateView(generics.CreateAPIView):
+    """
+    Start a chunked, resumable upload for a specific entity.
+    URL: /api/attachments/{entity_type}/{entity_id}/uploads/
 
-    except OSError:
+    Chunks are then sent with PATCH /api/attachments/uploads/{upload_id}/
+    (raw body, Upload-Offset header) and the attachment is created by
+    POST /api/attachments/uploads/{upload_id}/complete/.
+    """
+    serializer_class = AttachmentUploadSessionCreateSerializer
+    permission_classes = [permissions.IsAuthenticated, IsTenantUser]
+
+    def create(self, request, *args, **kwargs):
+        fields = ['filename', 'size', 'content_type', 'checksum', 'description']
+        data = {field: request.data.get(field) for field in fields if request.data.get(field) is not None}
+        data.update(entity_type=self.kwargs.get('entity_type'), entity_id=self.kwargs.get('entity_id'))
+
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        validated = serializer.validated_data
+        session = start_session(
+            request.user,
+            validated['entity_content_type'],
+            validated['entity_id'],
+            validated['filename'],
+            validated['size'],
+            validated['content_type'],
+            description=validated.get('description', ''),
+            checksum=validated.get('checksum', ''),
+        )
         return Response(
-            {'error': 'Error reading file'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            {**AttachmentUploadSessionSerializer(session).data, 'max_chunk_size': MAX_CHUNK_SIZE},
+            status=status.HTTP_201_CREATED
         )
 
 
+def _get_upload_session(request, upload_id):
+    try:
+        return AttachmentUploadSession.objects.select_related('content_type').get(
+            upload_id=upload_id, uploaded_by=request.user
+        )
+    except AttachmentUploadSession.DoesNotExist:
+        raise Http404("Upload session not found") from None
+
+
+def _upload_error_response(error):
+    body = {'error': str(error)}
+    if error.offset is not None:
+        body['received_size'] = error.offset
+    response = Response(body, status=error.status)
+    if error.offset is not None:
+        response['Upload-Offset'] = str(error.offset)
+    return response
+
+
+@api_view(['GET', 'PATCH', 'DELETE'])
+@permission_classes([permissions.IsAuthenticated, IsTenantUser])
+def upload_session(request, upload_id):
+    """
+    GET: session state; resume from received_size.
+    PATCH: append the raw request body at the Upload-Offset header (or ?offset=).
+    DELETE: abandon the upload.
+    URL: /api/attachments/uploads/{upload_id}/
+    """
+    session = _get_upload_session(request, upload_id)
+
+    if request.method == 'DELETE':
+        discard_session(session)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    if request.method == 'PATCH':
+        try:
+            offset = int(request.headers.get('Upload-Offset', request.query_params.get('offset', '')))
+        except ValueError:
+            return Response(
+                {'error': 'Upload-Offset header is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        length = request.META.get('CONTENT_LENGTH')
+        try:
+            session.received_size = append_chunk(
+                session, offset, request.stream, int(length) if length else None
+            )
+        except UploadError as e:
+            return _upload_error_response(e)
+
+    response = Response(AttachmentUploadSessionSerializer(session).data)
+    response['Upload-Offset'] = str(session.received_size)
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated, IsTenantUser])
+def complete_upload_session(request, upload_id):
+    """
+    Create the attachment from a fully received chunked upload.
+    URL: /api/attachments/uploads/{upload_id}/complete/
+    """
+    session = _get_upload_session(request, upload_id)
+    try:
+        attachment = complete_session(session)
+    except UploadError as e:
+        return _upload_error_response(e)
+    serializer = AttachmentSerializer(attachment, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated, IsTenantUser])
 def attachment_stats(request, entity_type, entity_id):
@@ -240,6 +351,67 @@ def _format_file_size(size_bytes):
     return f"{size_bytes:.1f} PB"
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated, IsTenantUser])
+def search_attachments(request):
+    """
+    Full-text search inside attached documents.
+    URL: /api/attachments/search/?q=...&entity_type=deal&entity_id=5&limit=20
+
+    q uses web search syntax ("quoted phrases", or, -exclude). Matches in the
+    filename rank above matches in the text.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response(
+            {'error': 'Query parameter q is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+    except ValueError:
+        limit = 20
+
+    search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+    attachments = Attachment.objects.filter(is_active=True, content_index__search_vector=search_query)
+
+    entity_type = request.query_params.get('entity_type')
+    if entity_type:
+        if entity_type not in ENTITY_MODELS:
+            return Response(
+                {'error': f"Invalid entity type. Must be one of: {', '.join(ENTITY_MODELS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        app_label, model = ENTITY_MODELS[entity_type]
+        attachments = attachments.filter(content_type__app_label=app_label, content_type__model=model)
+        entity_id = request.query_params.get('entity_id')
+        if entity_id and entity_id.isdigit():
+            attachments = attachments.filter(object_id=int(entity_id))
+
+    # ts_headline only runs for the rows that survive the LIMIT; its markers
+    # are swapped for <mark> after escaping the document text
+    attachments = attachments.annotate(
+        rank=SearchRank(F('content_index__search_vector'), search_query),
+        snippet=SearchHeadline(
+            'content_index__text', search_query, config=SEARCH_CONFIG,
+            start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP, max_words=35, min_words=15,
+        ),
+    ).select_related('uploaded_by', 'content_type').defer('preview_text').order_by(
+        '-rank', '-uploaded_at'
+    )[:limit]
+
+    results = []
+    for attachment in attachments:
+        data = AttachmentSerializer(attachment, context={'request': request}).data
+        data['snippet'] = (
+            escape(attachment.snippet).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_STOP, '</mark>')
+        )
+        data['rank'] = round(attachment.rank, 4)
+        results.append(data)
+
+    return Response({'query': query, 'count': len(results), 'results': results})
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated, IsTenantUser])
 def preview_attachment(request, attachment_id):
@@ -259,44 +431,44 @@ def preview_attachment(request, attachment_id):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # Check if file exists
-    if not os.path.exists(attachment.file.path):
-        return Response(
-            {'error': 'File not found on server'},
-            status=status.HTTP_404_NOT_FOUND
-        )
-
-    file_path = attachment.file.path
     file_ext = attachment.file_extension.lower()
-    mime_type = attachment.content_type_header or mimetypes.guess_type(file_path)[0]
+    mime_type = attachment.content_type_header or mimetypes.guess_type(attachment.original_filename)[0]
 
-    # Handle different file types
+    # Handle different file types; only images are read from storage, text
+    # and documents are previewed from the content cached on the row
     try:
         # Images - serve directly or create thumbnails
         if attachment.is_image:
+            if not os.path.exists(attachment.file.path):
+                return Response(
+                    {'error': 'File not found on server'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
             # For preview, we might want to create thumbnails for large images
             max_size = request.GET.get('size', 'original')
 
-            if max_size in ['thumb', 'small', 'medium']:
-                return _create_image_thumbnail(file_path, max_size, mime_type)
+            if max_size in THUMBNAIL_SIZES:
+                return _serve_thumbnail(request, attachment, max_size, mime_type)
             else:
-                # Serve original image
-                with open(file_path, 'rb') as f:
-                    response = HttpResponse(f.read(), content_type=mime_type)
-                    response['Content-Disposition'] = f'inline; filename="{attachment.original_filename}"'
-                    return response
+                # Serve original image, streamed from storage
+                return serve_attachment(request, attachment, content_type=mime_type)
+
+        # Content not extracted yet
+        elif attachment.extraction_status == Attachment.EXTRACTION_PENDING:
+            return _preview_pending(attachment)
 
         # Text files - return content as JSON for preview
         elif file_ext in ['.txt', '.md', '.csv', '.json', '.xml', '.log']:
-            return _preview_text_file(file_path, attachment)
+            return _preview_text_file(attachment)
 
         # PDFs - return metadata for preview (frontend can use PDF.js)
         elif file_ext == '.pdf':
-            return _preview_pdf_metadata(file_path, attachment)
+            return _preview_pdf_metadata(attachment)
 
-        # Office documents - return metadata
+        # Office documents - return metadata and extracted text
         elif file_ext in ['.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx']:
-            return _preview_office_metadata(file_path, attachment)
+            return _preview_office_metadata(attachment)
 
         # Default: return file metadata for unsupported previews
         else:
@@ -315,105 +487,108 @@ def preview_attachment(request, attachment_id):
         )
 
 
-def _create_image_thumbnail(file_path, size, mime_type):
-    """Create and serve image thumbnail."""
-    size_map = {
-        'thumb': (150, 150),
-        'small': (300, 300),
-        'medium': (600, 600)
-    }
-
-    target_size = size_map.get(size, (300, 300))
-
-    try:
-        with Image.open(file_path) as img:
-            # Convert to RGB if necessary
-            if img.mode in ('RGBA', 'LA', 'P'):
-                img = img.convert('RGB')
-
-            img.thumbnail(target_size, Image.Resampling.LANCZOS)
-
-            # Save to temporary buffer
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
-                img.save(temp_file, format='JPEG', quality=85, optimize=True)
-                temp_file.flush()
-
-                # Serve the thumbnail
-                with open(temp_file.name, 'rb') as f:
-                    response = HttpResponse(f.read(), content_type='image/jpeg')
-                    response['Content-Disposition'] = 'inline'
-                    return response
-
-    except Exception:
-        # Fallback to original file if thumbnail creation fails
-        with open(file_path, 'rb') as f:
-            response = HttpResponse(f.read(), content_type=mime_type)
-            response['Content-Disposition'] = 'inline'
+def _serve_thumbnail(request, attachment, size, mime_type):
+    """Serve the cached thumbnail, rendering and storing it on first request."""
+    etag = derivative_etag(attachment.file.name, attachment.file_size, size)
+    if request.headers.get('If-None-Match'):
+        # Revalidation needs neither the image nor the stored derivative
+        response = get_conditional_response(request, etag=quote_etag(etag))
+        if response is not None:
+            response['ETag'] = quote_etag(etag)
+            patch_cache_control(response, private=True, max_age=CACHE_SECONDS)
             return response
 
+    name = get_or_create_derivative(attachment, size)
+    if name is None:
+        # Fallback to original file if thumbnail creation fails
+        return serve_attachment(request, attachment, content_type=mime_type)
+    storage = attachment.file.storage
+    return serve_file(
+        request, storage, name, size=storage.size(name), etag=etag, content_type='image/jpeg'
+    )
 
-def _preview_text_file(file_path, attachment):
-    """Preview text-based files."""
-    try:
-        # Limit preview to first 10KB for safety
-        max_size = 10 * 1024  # 10KB
-
-        with open(file_path, encoding='utf-8', errors='ignore') as f:
-            content = f.read(max_size)
 
-        is_truncated = len(content) == max_size
+def _preview_pending(attachment):
+    """Preview requested before the background extraction has run."""
+    return Response({
+        'preview_available': False,
+        'extraction_status': attachment.extraction_status,
+        'filename': attachment.original_filename,
+        'size': attachment.file_size_human,
+        'message': 'Preview is being prepared. Try again shortly.'
+    })
 
-        return Response({
-            'preview_available': True,
-            'preview_type': 'text',
-            'content': content,
-            'is_truncated': is_truncated,
-            'filename': attachment.original_filename,
-            'size': attachment.file_size_human,
-            'encoding': 'utf-8'
-        })
 
-    except UnicodeDecodeError:
+def _preview_text_file(attachment):
+    """Preview text-based files from the extracted leading text."""
+    if attachment.extraction_status != Attachment.EXTRACTION_EXTRACTED:
         return Response({
             'preview_available': False,
+            'extraction_status': attachment.extraction_status,
             'filename': attachment.original_filename,
             'size': attachment.file_size_human,
-            'message': 'Binary file - preview not available'
+            'message': attachment.content_metadata.get('error') or 'Binary file - preview not available'
         })
 
+    content = attachment.preview_text
+    return Response({
+        'preview_available': True,
+        'preview_type': 'text',
+        'content': content,
+        'is_truncated': len(content) >= PREVIEW_CHARS,
+        'filename': attachment.original_filename,
+        'size': attachment.file_size_human,
+        'encoding': attachment.content_metadata.get('encoding', 'utf-8')
+    })
 
-def _preview_pdf_metadata(file_path, attachment):
-    """Return PDF metadata for frontend preview."""
-    try:
-        # Basic PDF info - frontend can use PDF.js for actual rendering
-        file_size = os.path.getsize(file_path)
 
+def _preview_pdf_metadata(attachment):
+    """Return PDF metadata and leading text for frontend preview."""
+    if attachment.extraction_status != Attachment.EXTRACTION_EXTRACTED:
         return Response({
-            'preview_available': True,
-            'preview_type': 'pdf',
+            'preview_available': False,
+            'extraction_status': attachment.extraction_status,
             'filename': attachment.original_filename,
             'size': attachment.file_size_human,
-            'pages': None,  # Could use PyPDF2 to get page count if needed
-            'download_url': f'/api/attachments/{attachment.id}/download/',
-            'message': 'PDF preview will be rendered in browser'
+            'message': 'PDF preview not available'
         })
 
-    except Exception:
+    # Frontend can use PDF.js for actual rendering
+    return Response({
+        'preview_available': True,
+        'preview_type': 'pdf',
+        'filename': attachment.original_filename,
+        'size': attachment.file_size_human,
+        'pages': attachment.page_count,
+        'title': attachment.content_metadata.get('title'),
+        'author': attachment.content_metadata.get('author'),
+        'snippet': attachment.preview_text,
+        'download_url': f'/api/attachments/{attachment.id}/download/',
+        'message': 'PDF preview will be rendered in browser'
+    })
+
+
+def _preview_office_metadata(attachment):
+    """Return Office document metadata and leading text (Office Open XML formats)."""
+    if attachment.extraction_status != Attachment.EXTRACTION_EXTRACTED:
         return Response({
             'preview_available': False,
+            'preview_type': 'office',
+            'extraction_status': attachment.extraction_status,
             'filename': attachment.original_filename,
             'size': attachment.file_size_human,
-            'message': 'PDF preview not available'
+            'message': 'Office document preview not available. Download to view.',
+            'download_url': f'/api/attachments/{attachment.id}/download/'
         })
 
-
-def _preview_office_metadata(file_path, attachment):
-    """Return Office document metadata."""
     return Response({
-        'preview_available': False,
+        'preview_available': bool(attachment.preview_text),
         'preview_type': 'office',
+        'content': attachment.preview_text,
+        'is_truncated': len(attachment.preview_text) >= PREVIEW_CHARS,
+        'pages': attachment.page_count,
+        'sheets': attachment.content_metadata.get('sheets'),
         'filename': attachment.original_filename,
         'size': attachment.file_size_human,
-        'message': 'Office document preview not available. Download to view.',
         'download_url': f'/api/attachments/{attachment.id}/download/'
     })
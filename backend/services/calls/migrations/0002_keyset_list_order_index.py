@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calls", "0001_initial"),
+        ("contacts", "0002_search_trigram_indexes"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="call",
+            index=models.Index(
+                fields=["call_date", "call_time", "created_at", "id"],
+                name="idx_call_list_order",
+            ),
+        ),
+    ]
@@ -190,6 +190,7 @@ class Call(models.Model):
             models.Index(fields=['call_date'], name='idx_call_date'),
             models.Index(fields=['call_time'], name='idx_call_time'),
             models.Index(fields=['created_at'], name='idx_call_created'),
+            models.Index(fields=['call_date', 'call_time', 'created_at', 'id'], name='idx_call_list_order'),
             models.Index(fields=['content_type', 'object_id'], name='idx_call_content'),
             models.Index(fields=['is_active'], name='idx_call_active'),
             models.Index(fields=['follow_up_required'], name='idx_call_followup'),
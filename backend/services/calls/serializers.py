@@ -1,6 +1,8 @@
 from django.contrib.contenttypes.models import ContentType
 from rest_framework import serializers
 
+from core.shared.serial_numbers import SerialNumberListSerializer, SerialNumberMixin, related_count
+
 from .models import Call, CallComment
 
 
@@ -18,11 +20,12 @@ class CallCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'author', 'author_name', 'author_email', 'created_at', 'updated_at']
 
 
-class CallSerializer(serializers.ModelSerializer):
+class CallSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Main serializer for Call model with full functionality"""
 
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('-call_date', '-call_time', '-created_at')
 
     # Read-only fields for user information
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
@@ -49,41 +52,20 @@ class CallSerializer(serializers.ModelSerializer):
 
     # Comments (nested)
     comments = CallCommentSerializer(many=True, read_only=True)
-    comment_count = serializers.IntegerField(source='comments.count', read_only=True)
+    comment_count = serializers.SerializerMethodField()
 
     # Attachment count
-    attachment_count = serializers.IntegerField(source='attachments.count', read_only=True)
-
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on call position in ordered list within the same context"""
-        # Filter calls by the same context as the current call
-        queryset_filter = {'is_active': True}
-
-        # If call is linked to an entity, only count calls for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If call is standalone, only count standalone calls
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-
-        # Get calls in the same context ordered by call date/time, then creation date
-        active_calls = obj.__class__.objects.filter(**queryset_filter).order_by('-call_date', '-call_time', '-created_at')
-
-        # Find the position of current call (1-based indexing)
-        for index, call in enumerate(active_calls, 1):
-            if call.id == obj.id:
-                return index
-
-        # Fallback: return call ID if not found (shouldn't happen)
-        return obj.id
+    attachment_count = serializers.SerializerMethodField()
+
+    def get_comment_count(self, obj):
+        return related_count(obj, 'comment_count', 'comments')
+
+    def get_attachment_count(self, obj):
+        return related_count(obj, 'attachment_count', 'attachments')
 
     class Meta:
         model = Call
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'title', 'description', 'direction', 'direction_display',
             'status', 'status_display', 'priority', 'priority_display',
@@ -111,11 +93,12 @@ class CallSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class CallCreateSerializer(serializers.ModelSerializer):
+class CallCreateSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Simplified serializer for call creation"""
 
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('-call_date', '-call_time', '-created_at')
 
     # Optional entity linking
     entity_type = serializers.CharField(required=False, allow_blank=True)
@@ -130,36 +113,9 @@ class CallCreateSerializer(serializers.ModelSerializer):
         """Convert frontend entity type to backend model name"""
         return self.ENTITY_TYPE_MAPPING.get(entity_type.lower(), entity_type.lower())
 
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on call position in ordered list within the same context"""
-        # Filter calls by the same context as the current call
-        queryset_filter = {'is_active': True}
-
-        # If call is linked to an entity, only count calls for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If call is standalone, only count standalone calls
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-
-        # Get calls in the same context ordered by call date/time, then creation date
-        active_calls = obj.__class__.objects.filter(**queryset_filter).order_by('-call_date', '-call_time', '-created_at')
-
-        # Find the position of current call (1-based indexing)
-        for index, call in enumerate(active_calls, 1):
-            if call.id == obj.id:
-                return index
-
-        # Fallback: return call ID if not found (shouldn't happen)
-        return obj.id
-
     class Meta:
         model = Call
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'title', 'description', 'direction', 'status', 'priority',
             'contact', 'contact_name', 'contact_phone', 'contact_email',
@@ -261,11 +217,12 @@ class CallUpdateSerializer(serializers.ModelSerializer):
         return data
 
 
-class CallListSerializer(serializers.ModelSerializer):
+class CallListSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Lightweight serializer for call lists"""
 
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('-call_date', '-call_time', '-created_at')
 
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
     contact_display_name = serializers.CharField(read_only=True)
@@ -277,36 +234,9 @@ class CallListSerializer(serializers.ModelSerializer):
     entity_type = serializers.CharField(read_only=True)
     entity_id = serializers.IntegerField(source='object_id', read_only=True)
 
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on call position in ordered list within the same context"""
-        # Filter calls by the same context as the current call
-        queryset_filter = {'is_active': True}
-
-        # If call is linked to an entity, only count calls for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If call is standalone, only count standalone calls
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-
-        # Get calls in the same context ordered by call date/time, then creation date
-        active_calls = obj.__class__.objects.filter(**queryset_filter).order_by('-call_date', '-call_time', '-created_at')
-
-        # Find the position of current call (1-based indexing)
-        for index, call in enumerate(active_calls, 1):
-            if call.id == obj.id:
-                return index
-
-        # Fallback: return call ID if not found (shouldn't happen)
-        return obj.id
-
     class Meta:
         model = Call
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'title', 'description', 'direction', 'direction_display',
             'status', 'status_display', 'priority', 'priority_display',
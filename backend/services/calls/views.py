@@ -1,5 +1,5 @@
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q, Sum
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
@@ -25,6 +25,7 @@ class CallListCreateView(generics.ListCreateAPIView):
     """
     permission_classes = [permissions.IsAuthenticated, IsTenantUser, HasTenantPermission]
     required_permissions = ['all', 'view_customers', 'manage_opportunities']
+    keyset_count = 'estimate'
 
     # Entity type mapping for frontend-backend compatibility
     ENTITY_TYPE_MAPPING = {
@@ -139,6 +140,9 @@ class CallDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Call.objects.filter(is_active=True).select_related(
             'created_by', 'content_type', 'contact'
+        ).annotate(
+            comment_count=Count('comments', distinct=True),
+            attachment_count=Count('attachments', distinct=True)
         ).prefetch_related('comments__author', 'attachments')
 
     def destroy(self, request, *args, **kwargs):
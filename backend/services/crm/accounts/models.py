@@ -2,6 +2,8 @@ from django.conf import settings
 from django.db import models
 from django.db.models.functions import Lower
 
+from core.shared.search import trigram_index
+
 
 class Account(models.Model):
     account_id = models.AutoField(primary_key=True)
@@ -86,6 +88,7 @@ class Account(models.Model):
             models.Index(fields=['created_at'], name='idx_account_created'),
             models.Index(fields=['account_name'], name='idx_account_name'),
             models.Index(fields=['industry'], name='idx_account_industry'),
+            trigram_index('account_name', name='idx_account_name_trgm'),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from core.auth.utils import rate_limit
+from core.shared.search import SearchFilter
 
 # Removed cache_page import - caching disabled for immediate data updates
 from core.tenants.permissions import HasTenantPermission, IsTenantUser
@@ -22,6 +23,8 @@ class AccountViewSet(viewsets.ModelViewSet):
     """
     permission_classes = [IsAuthenticated, IsTenantUser, HasTenantPermission]
     required_permissions = ['all', 'manage_accounts']
+    filter_backends = [SearchFilter]
+    search_fields = ['account_name']
 
     def get_queryset(self):
         """
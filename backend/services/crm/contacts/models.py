@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.db import models
 
+from core.shared.search import trigram_index
+
 
 class Contact(models.Model):
     contact_id = models.AutoField(primary_key=True)
@@ -75,6 +77,9 @@ class Contact(models.Model):
             models.Index(fields=['created_at'], name='idx_contact_created'),
             models.Index(fields=['last_name'], name='idx_contact_lastname'),
             models.Index(fields=['email'], name='idx_contact_email'),
+            trigram_index('first_name', name='idx_contact_fname_trgm'),
+            trigram_index('last_name', name='idx_contact_lname_trgm'),
+            trigram_index('email', name='idx_contact_email_trgm'),
         ]
         constraints = [
             models.UniqueConstraint(
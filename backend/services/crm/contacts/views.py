@@ -6,6 +6,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from core.auth.utils import rate_limit
+from core.shared.search import SearchFilter
 
 # Removed cache_page import - caching disabled for immediate data updates
 from core.tenants.permissions import HasTenantPermission, IsTenantUser
@@ -23,6 +24,8 @@ class ContactViewSet(viewsets.ModelViewSet):
     """
     permission_classes = [IsAuthenticated, IsTenantUser, HasTenantPermission]
     required_permissions = ['all', 'manage_contacts']
+    filter_backends = [SearchFilter]
+    search_fields = ['first_name', 'last_name', 'email', 'account__account_name']
 
     def get_queryset(self):
         """
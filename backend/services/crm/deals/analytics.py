@@ -0,0 +1,296 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncMonth, TruncQuarter
+
+from .models import Deal, DealPipelineSnapshot
+
+CLOSED_STAGES = ['Closed', 'Closed Won', 'Closed Lost']
+WON_STAGES = ['Closed', 'Closed Won']
+LOST_STAGES = ['Closed Lost']
+
+# Win probability per stage, used to weight pipeline amounts in forecasts
+DEFAULT_STAGE_PROBABILITIES = {
+    'Prospecting': Decimal('0.10'),
+    'Qualification': Decimal('0.20'),
+    'Analysis': Decimal('0.25'),
+    'Needs Analysis': Decimal('0.25'),
+    'Proposal': Decimal('0.50'),
+    'Proposal/Price Quote': Decimal('0.50'),
+    'Negotiation': Decimal('0.75'),
+    'Closed': Decimal('1.00'),
+    'Closed Won': Decimal('1.00'),
+    'Closed Lost': Decimal('0.00'),
+}
+DEFAULT_UNKNOWN_STAGE_PROBABILITY = Decimal('0.10')
+
+PERIODS = {
+    'month': TruncMonth,
+    'quarter': TruncQuarter,
+}
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def get_stage_probabilities():
+    overrides = getattr(settings, 'DEAL_STAGE_PROBABILITIES', None) or {}
+    probabilities = dict(DEFAULT_STAGE_PROBABILITIES)
+    probabilities.update({stage: Decimal(str(value)) for stage, value in overrides.items()})
+    return probabilities
+
+
+def stage_probability():
+    """CASE expression mapping deal.stage (case-insensitively) to its win probability"""
+    default = Decimal(str(getattr(
+        settings, 'DEAL_UNKNOWN_STAGE_PROBABILITY', DEFAULT_UNKNOWN_STAGE_PROBABILITY
+    )))
+    return Case(
+        *[
+            When(stage__iexact=stage, then=Value(probability))
+            for stage, probability in get_stage_probabilities().items()
+        ],
+        default=Value(default),
+        output_field=DecimalField(max_digits=5, decimal_places=4),
+    )
+
+
+def weighted_amount():
+    return Sum(F('amount') * stage_probability(), output_field=MONEY)
+
+
+def _money(value):
+    return (value or Decimal('0')).quantize(Decimal('0.01'))
+
+
+def _period_key(value, period):
+    if period == 'quarter':
+        return f'{value.year}-Q{(value.month - 1) // 3 + 1}'
+    return value.strftime('%Y-%m')
+
+
+def _period_label(value, period):
+    if period == 'quarter':
+        return f'Q{(value.month - 1) // 3 + 1} {value.year}'
+    return value.strftime('%B %Y')
+
+
+class DealPipelineAnalytics:
+    """
+    Pipeline reporting over a Deal queryset, grouped in SQL.
+
+    The close-date series and stage matrix come from one query grouped by
+    (period, stage); totals per period and per stage are rolled up from those
+    groups. Forecasts weight each deal's amount by its stage probability.
+    """
+
+    def __init__(self, queryset, period='month'):
+        if period not in PERIODS:
+            raise ValueError(f"period must be one of {', '.join(PERIODS)}")
+        self.queryset = queryset.order_by()
+        self.period = period
+        self._groups = None
+
+    def get_groups(self):
+        if self._groups is None:
+            self._groups = list(
+                self.queryset.exclude(close_date__isnull=True).annotate(
+                    period_start=PERIODS[self.period]('close_date')
+                ).values('period_start', 'stage').annotate(
+                    count=Count('pk'),
+                    total_value=Coalesce(Sum('amount'), Value(Decimal('0')), output_field=MONEY),
+                    weighted_value=Coalesce(weighted_amount(), Value(Decimal('0')), output_field=MONEY),
+                ).order_by('period_start', 'stage')
+            )
+        return self._groups
+
+    def stages(self):
+        return sorted({group['stage'] or 'Unknown' for group in self.get_groups()})
+
+    def series(self):
+        """Per-period deal count, total, average and weighted value by close date"""
+        periods = {}
+        for group in self.get_groups():
+            start = group['period_start']
+            entry = periods.setdefault(start, {
+                'period': _period_key(start, self.period),
+                'label': _period_label(start, self.period),
+                'start': start.isoformat(),
+                'count': 0,
+                'total_value': Decimal('0'),
+                'weighted_value': Decimal('0'),
+            })
+            entry['count'] += group['count']
+            entry['total_value'] += group['total_value']
+            entry['weighted_value'] += group['weighted_value']
+
+        series = []
+        for start in sorted(periods):
+            entry = periods[start]
+            entry['avg_value'] = _money(entry['total_value'] / entry['count']) if entry['count'] else Decimal('0')
+            entry['total_value'] = _money(entry['total_value'])
+            entry['weighted_value'] = _money(entry['weighted_value'])
+            series.append(entry)
+        return series
+
+    def stage_matrix(self):
+        """Rows per period with the deal count in every stage"""
+        stages = self.stages()
+        rows = {}
+        for group in self.get_groups():
+            start = group['period_start']
+            row = rows.setdefault(start, {
+                'period': _period_key(start, self.period),
+                'label': _period_label(start, self.period),
+                **dict.fromkeys(stages, 0),
+            })
+            row[group['stage'] or 'Unknown'] += group['count']
+        return [rows[start] for start in sorted(rows)]
+
+    def forecast_by_owner(self):
+        """
+        Open pipeline and probability-weighted forecast per owner and close
+        period, plus won value already closed in each period.
+        """
+        groups = self.queryset.exclude(close_date__isnull=True).exclude(
+            stage__in=LOST_STAGES
+        ).annotate(
+            period_start=PERIODS[self.period]('close_date')
+        ).values(
+            'owner_id', 'owner__first_name', 'owner__last_name', 'period_start'
+        ).annotate(
+            open_count=Count('pk', filter=~Q(stage__in=WON_STAGES)),
+            pipeline_value=Coalesce(
+                Sum('amount', filter=~Q(stage__in=WON_STAGES)), Value(Decimal('0')), output_field=MONEY
+            ),
+            weighted_value=Coalesce(
+                Sum(F('amount') * stage_probability(), filter=~Q(stage__in=WON_STAGES), output_field=MONEY),
+                Value(Decimal('0')), output_field=MONEY
+            ),
+            won_count=Count('pk', filter=Q(stage__in=WON_STAGES)),
+            won_value=Coalesce(
+                Sum('amount', filter=Q(stage__in=WON_STAGES)), Value(Decimal('0')), output_field=MONEY
+            ),
+        ).order_by('owner_id', 'period_start')
+
+        owners = {}
+        for group in groups:
+            owner_id = group['owner_id']
+            owner = owners.setdefault(owner_id, {
+                'owner_id': owner_id,
+                'owner': (
+                    f"{group['owner__first_name'] or ''} {group['owner__last_name'] or ''}".strip()
+                    if owner_id else None
+                ),
+                'pipeline_value': Decimal('0'),
+                'weighted_value': Decimal('0'),
+                'won_value': Decimal('0'),
+                'periods': [],
+            })
+            owner['pipeline_value'] += group['pipeline_value']
+            owner['weighted_value'] += group['weighted_value']
+            owner['won_value'] += group['won_value']
+            owner['periods'].append({
+                'period': _period_key(group['period_start'], self.period),
+                'open_count': group['open_count'],
+                'pipeline_value': _money(group['pipeline_value']),
+                'weighted_value': _money(group['weighted_value']),
+                'won_count': group['won_count'],
+                'won_value': _money(group['won_value']),
+                # Expected bookings: already won plus the weighted open pipeline
+                'forecast_value': _money(group['won_value'] + group['weighted_value']),
+            })
+
+        forecast = []
+        for owner in owners.values():
+            owner['forecast_value'] = _money(owner['won_value'] + owner['weighted_value'])
+            for field in ('pipeline_value', 'weighted_value', 'won_value'):
+                owner[field] = _money(owner[field])
+            forecast.append(owner)
+        return sorted(forecast, key=lambda owner: owner['forecast_value'], reverse=True)
+
+
+class DealPipelineSnapshotService:
+    """
+    Writes and reads the daily pipeline snapshot table, so pipeline-over-time
+    reports read a few pre-grouped rows per day instead of rescanning deals
+    (whose past stages are not kept anywhere else).
+    """
+
+    def create_snapshot(self, snapshot_date):
+        """Replace the snapshot for snapshot_date with the current pipeline. Returns rows written."""
+        groups = Deal.objects.order_by().annotate(
+            close_month=TruncMonth('close_date')
+        ).values('stage', 'owner_id', 'close_month').annotate(
+            deal_count=Count('pk'),
+            total_amount=Coalesce(Sum('amount'), Value(Decimal('0')), output_field=MONEY),
+            weighted_amount=Coalesce(weighted_amount(), Value(Decimal('0')), output_field=MONEY),
+        )
+
+        snapshots = [
+            DealPipelineSnapshot(
+                snapshot_date=snapshot_date,
+                stage=group['stage'] or '',
+                owner_id=group['owner_id'] or 0,
+                close_month=group['close_month'],
+                deal_count=group['deal_count'],
+                total_amount=_money(group['total_amount']),
+                weighted_amount=_money(group['weighted_amount']),
+            )
+            for group in groups
+        ]
+
+        with transaction.atomic():
+            DealPipelineSnapshot.objects.filter(snapshot_date=snapshot_date).delete()
+            DealPipelineSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+        return len(snapshots)
+
+    def history(self, start_date, end_date, owner_id=None):
+        """
+        Pipeline per snapshot day and stage between start_date and end_date,
+        in one grouped query over the snapshot table.
+        """
+        rows = DealPipelineSnapshot.objects.filter(
+            snapshot_date__gte=start_date, snapshot_date__lte=end_date
+        )
+        if owner_id is not None:
+            rows = rows.filter(owner_id=owner_id)
+        rows = rows.order_by('snapshot_date', 'stage').values('snapshot_date', 'stage').annotate(
+            deal_count=Sum('deal_count'),
+            total_amount=Sum('total_amount'),
+            weighted_amount=Sum('weighted_amount'),
+        )
+
+        days = defaultdict(lambda: {
+            'deal_count': 0,
+            'total_amount': Decimal('0'),
+            'weighted_amount': Decimal('0'),
+            'open_amount': Decimal('0'),
+            'stages': {},
+        })
+        for row in rows:
+            day = days[row['snapshot_date']]
+            day['deal_count'] += row['deal_count']
+            day['total_amount'] += row['total_amount']
+            day['weighted_amount'] += row['weighted_amount']
+            if row['stage'] not in CLOSED_STAGES:
+                day['open_amount'] += row['total_amount']
+            day['stages'][row['stage'] or 'Unknown'] = {
+                'deal_count': row['deal_count'],
+                'total_amount': _money(row['total_amount']),
+                'weighted_amount': _money(row['weighted_amount']),
+            }
+
+        return [
+            {
+                'snapshot_date': snapshot_date.isoformat(),
+                'deal_count': day['deal_count'],
+                'total_amount': _money(day['total_amount']),
+                'weighted_amount': _money(day['weighted_amount']),
+                'open_amount': _money(day['open_amount']),
+                'stages': day['stages'],
+            }
+            for snapshot_date, day in sorted(days.items())
+        ]
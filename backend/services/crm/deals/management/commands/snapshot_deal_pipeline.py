@@ -0,0 +1,60 @@
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import get_tenant_model, schema_context
+
+from services.crm.deals.analytics import DealPipelineSnapshotService
+
+
+class Command(BaseCommand):
+    help = 'Records the daily deal pipeline snapshot used by pipeline-over-time reports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema',
+            type=str,
+            help='Specific schema to process (optional, defaults to all tenants)',
+        )
+        parser.add_argument(
+            '--date',
+            type=str,
+            help='Snapshot date in YYYY-MM-DD format (default: today)',
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options.get('schema')
+        snapshot_date = self.parse_date(options.get('date')) or date.today()
+
+        TenantModel = get_tenant_model()
+        if schema_name:
+            tenants = TenantModel.objects.filter(schema_name=schema_name)
+            if not tenants.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'Tenant with schema {schema_name} does not exist')
+                )
+                return
+        else:
+            tenants = TenantModel.objects.exclude(schema_name='public')
+
+        service = DealPipelineSnapshotService()
+        for tenant in tenants:
+            try:
+                with schema_context(tenant.schema_name):
+                    written = service.create_snapshot(snapshot_date)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'Wrote {written} pipeline rows dated {snapshot_date} for {tenant.schema_name}'
+                    )
+                )
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Error processing {tenant.schema_name}: {str(e)}')
+                )
+
+    def parse_date(self, value):
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'Invalid date "{value}", expected YYYY-MM-DD') from None
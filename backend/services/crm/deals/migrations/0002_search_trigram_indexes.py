@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:58
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_search_trigram_indexes"),
+        ("contacts", "0002_search_trigram_indexes"),
+        ("deals", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Installed once in the public schema, which every tenant's search_path includes
+        migrations.RunSQL(
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public",
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="deal",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("deal_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="idx_deal_name_trgm",
+            ),
+        ),
+    ]
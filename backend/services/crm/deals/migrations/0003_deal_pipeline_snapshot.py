@@ -0,0 +1,57 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deals", "0002_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DealPipelineSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("snapshot_date", models.DateField()),
+                ("stage", models.CharField(max_length=100)),
+                ("owner_id", models.BigIntegerField(default=0)),
+                ("close_month", models.DateField(blank=True, null=True)),
+                ("deal_count", models.PositiveIntegerField(default=0)),
+                (
+                    "total_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=16),
+                ),
+                (
+                    "weighted_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=16),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Deal Pipeline Snapshot",
+                "verbose_name_plural": "Deal Pipeline Snapshots",
+                "db_table": "deal_pipeline_snapshot",
+                "ordering": ["snapshot_date", "stage"],
+                "indexes": [
+                    models.Index(
+                        fields=["snapshot_date", "stage"],
+                        name="idx_pipeline_snap_date_stage",
+                    ),
+                    models.Index(
+                        fields=["owner_id", "snapshot_date"],
+                        name="idx_pipeline_snap_owner_date",
+                    ),
+                ],
+            },
+        ),
+    ]
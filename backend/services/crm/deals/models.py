@@ -2,6 +2,8 @@ from django import forms
 from django.conf import settings
 from django.db import models
 
+from core.shared.search import trigram_index
+
 
 class Deal(models.Model):
     """Django ORM model for the DEAL table with account name and owner alias."""
@@ -86,12 +88,46 @@ class Deal(models.Model):
             models.Index(fields=['account'], name='idx_deal_account_idx'),
             models.Index(fields=['owner'], name='idx_deal_owner_idx'),
             models.Index(fields=['primary_contact'], name='idx_deal_primary_contact'),
+            trigram_index('deal_name', name='idx_deal_name_trgm'),
         ]
 
     def __str__(self):
         return f"{self.deal_name} ({self.stage})"
 
 
+class DealPipelineSnapshot(models.Model):
+    """
+    Daily snapshot of the open and closed pipeline, pre-grouped by stage,
+    owner and close month. Written by the snapshot_deal_pipeline command;
+    owner_id 0 stands for deals without an owner.
+    """
+
+    snapshot_date = models.DateField()
+    stage = models.CharField(max_length=100)
+    owner_id = models.BigIntegerField(default=0)
+    close_month = models.DateField(null=True, blank=True)
+
+    deal_count = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    weighted_amount = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = 'deals'
+        db_table = 'deal_pipeline_snapshot'
+        verbose_name = 'Deal Pipeline Snapshot'
+        verbose_name_plural = 'Deal Pipeline Snapshots'
+        ordering = ['snapshot_date', 'stage']
+        indexes = [
+            models.Index(fields=['snapshot_date', 'stage'], name='idx_pipeline_snap_date_stage'),
+            models.Index(fields=['owner_id', 'snapshot_date'], name='idx_pipeline_snap_owner_date'),
+        ]
+
+    def __str__(self):
+        return f"{self.snapshot_date} {self.stage}: {self.deal_count} deals"
+
+
 class DealForm(forms.ModelForm):
     """Form for creating and updating Deal instances, including account name and owner alias."""
 
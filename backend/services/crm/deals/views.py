@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 # Removed cache_page import - caching disabled for immediate data updates
 from django.db.models import Avg, Count, Sum
@@ -10,8 +10,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from core.auth.utils import rate_limit
+from core.shared.search import SearchFilter
 from core.tenants.permissions import HasTenantPermission, IsTenantUser
 
+from .analytics import PERIODS, DealPipelineAnalytics, DealPipelineSnapshotService
 from .models import Deal
 from .serializers import (
     DealListSerializer,
@@ -26,6 +28,8 @@ class DealViewSet(viewsets.ModelViewSet):
     """
     permission_classes = [IsAuthenticated, IsTenantUser, HasTenantPermission]
     required_permissions = ['all', 'manage_opportunities']
+    filter_backends = [SearchFilter]
+    search_fields = ['deal_name', 'account__account_name']
 
     def get_queryset(self):
         """
@@ -108,26 +112,31 @@ class DealViewSet(viewsets.ModelViewSet):
         if stage:
             deals = deals.filter(stage__icontains=stage)
 
+        # Read only the columns the grouping needs instead of full Deal/Account/User rows
+        rows = deals.order_by('stage', '-close_date').values(
+            'deal_id', 'deal_name', 'stage', 'amount', 'close_date',
+            'account__account_name', 'owner_id', 'owner__first_name', 'owner__last_name',
+        )
+
         # Group by stage
         stage_groups = {}
-        for deal in deals:
-            stage_key = deal.stage
-            if stage_key not in stage_groups:
-                stage_groups[stage_key] = []
-
-            stage_groups[stage_key].append({
-                'deal_id': deal.deal_id,
-                'deal_name': deal.deal_name,
-                'amount': str(deal.amount),
-                'close_date': deal.close_date,
-                'account_name': deal.account.account_name if deal.account else None,
-                'owner': deal.owner.get_full_name() if deal.owner else None,
+        for row in rows:
+            stage_groups.setdefault(row['stage'], []).append({
+                'deal_id': row['deal_id'],
+                'deal_name': row['deal_name'],
+                'amount': str(row['amount']),
+                'close_date': row['close_date'],
+                'account_name': row['account__account_name'],
+                'owner': (
+                    f"{row['owner__first_name']} {row['owner__last_name']}".strip()
+                    if row['owner_id'] else None
+                ),
             })
 
         return Response({
             'deals_by_stage': stage_groups,
             'total_stages': len(stage_groups),
-            'total_deals': deals.count()
+            'total_deals': sum(len(group) for group in stage_groups.values())
         })
 
     @action(detail=False, methods=['get'])
@@ -295,17 +304,10 @@ class DealViewSet(viewsets.ModelViewSet):
         """
         Get deal analytics by date/month for reporting charts
         """
-        from datetime import datetime
-        from collections import defaultdict
-        import calendar
-        
-        deals = self.get_queryset()
-        
-        # Get deals with close dates
-        dated_deals = deals.exclude(close_date__isnull=True)
-        
-        # Total deals count
-        total_deals = dated_deals.count()
+        analytics = DealPipelineAnalytics(self.get_queryset(), period='month')
+        series = analytics.series()
+
+        total_deals = sum(entry['count'] for entry in series)
         if total_deals == 0:
             return Response({
                 'total_deals': 0,
@@ -315,93 +317,110 @@ class DealViewSet(viewsets.ModelViewSet):
                 'avg_deal_value_by_month': [],
                 'current_year': datetime.now().year
             })
-        
-        # Group deals by month/year for charts
-        monthly_data = defaultdict(lambda: {
-            'count': 0, 
-            'total_value': 0, 
-            'stages': defaultdict(int),
-            'month_name': '',
-            'year': 0
-        })
-        
-        for deal in dated_deals:
-            if deal.close_date:
-                # Create month key (YYYY-MM format)
-                month_key = deal.close_date.strftime('%Y-%m')
-                month_name = deal.close_date.strftime('%B %Y')
-                year = deal.close_date.year
-                
-                monthly_data[month_key]['count'] += 1
-                monthly_data[month_key]['month_name'] = month_name
-                monthly_data[month_key]['year'] = year
-                
-                # Add deal value
-                try:
-                    deal_value = float(deal.amount) if deal.amount else 0
-                    monthly_data[month_key]['total_value'] += deal_value
-                except (ValueError, TypeError):
-                    pass  # Skip invalid amounts
-                
-                # Track stages
-                stage = deal.stage or 'Unknown'
-                monthly_data[month_key]['stages'][stage] += 1
-        
-        # Sort months chronologically and format for charts
-        sorted_months = sorted(monthly_data.items(), key=lambda x: x[0])
-        
-        # Prepare chart data
+
         deals_by_month = []
-        deals_by_stage_monthly = []
         total_value_by_month = []
         avg_deal_value_by_month = []
-        
-        # Get unique stages across all months
-        all_stages = set()
-        for _, data in sorted_months:
-            all_stages.update(data['stages'].keys())
-        all_stages = sorted(list(all_stages))
-        
-        for month_key, data in sorted_months:
-            # Deals count by month
+        for entry in series:
             deals_by_month.append({
-                'month': data['month_name'],
-                'count': data['count'],
-                'month_key': month_key
+                'month': entry['label'],
+                'count': entry['count'],
+                'month_key': entry['period']
             })
-            
-            # Total value by month  
             total_value_by_month.append({
-                'month': data['month_name'],
-                'value': round(data['total_value'], 2),
-                'month_key': month_key
+                'month': entry['label'],
+                'value': float(entry['total_value']),
+                'month_key': entry['period']
             })
-            
-            # Average deal value by month
-            avg_value = round(data['total_value'] / data['count'], 2) if data['count'] > 0 else 0
             avg_deal_value_by_month.append({
-                'month': data['month_name'],
-                'avg_value': avg_value,
-                'month_key': month_key
+                'month': entry['label'],
+                'avg_value': float(entry['avg_value']),
+                'month_key': entry['period']
             })
-            
-            # Deals by stage for each month
-            stage_data = {'month': data['month_name'], 'month_key': month_key}
-            for stage in all_stages:
-                stage_data[stage] = data['stages'].get(stage, 0)
-            deals_by_stage_monthly.append(stage_data)
-        
+
+        deals_by_stage_monthly = [
+            {'month': row.pop('label'), 'month_key': row.pop('period'), **row}
+            for row in analytics.stage_matrix()
+        ]
+
         return Response({
             'total_deals': total_deals,
             'deals_by_month': deals_by_month,
             'deals_by_stage_monthly': deals_by_stage_monthly,
             'total_value_by_month': total_value_by_month,
             'avg_deal_value_by_month': avg_deal_value_by_month,
-            'available_stages': all_stages,
+            'available_stages': analytics.stages(),
             'current_year': datetime.now().year,
-            'months_count': len(sorted_months)
+            'months_count': len(series)
         })
 
+    @action(detail=False, methods=['get'])
+    def pipeline(self, request):
+        """
+        Close-date series, stage matrix and probability-weighted forecast by
+        owner. Optional period (month|quarter), owner_id and
+        close_date_from/close_date_to (YYYY-MM-DD).
+        """
+        period = request.query_params.get('period', 'month')
+        if period not in PERIODS:
+            return Response({
+                'error': f"period must be one of: {', '.join(PERIODS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        deals = self.get_queryset()
+        try:
+            close_date_from = self._parse_date(request.query_params.get('close_date_from'))
+            close_date_to = self._parse_date(request.query_params.get('close_date_to'))
+        except ValueError:
+            return Response({
+                'error': 'Invalid date format. Use YYYY-MM-DD'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if close_date_from:
+            deals = deals.filter(close_date__gte=close_date_from)
+        if close_date_to:
+            deals = deals.filter(close_date__lte=close_date_to)
+        owner_id = request.query_params.get('owner_id')
+        if owner_id and owner_id.isdigit():
+            deals = deals.filter(owner_id=int(owner_id))
+
+        analytics = DealPipelineAnalytics(deals, period=period)
+        return Response({
+            'period': period,
+            'stages': analytics.stages(),
+            'series': analytics.series(),
+            'stage_matrix': analytics.stage_matrix(),
+            'forecast_by_owner': analytics.forecast_by_owner(),
+        })
+
+    @action(detail=False, methods=['get'])
+    def pipeline_history(self, request):
+        """
+        Pipeline over time from the daily snapshot table. Optional
+        start_date/end_date (YYYY-MM-DD, default last 90 days) and owner_id.
+        """
+        try:
+            end_date = self._parse_date(request.query_params.get('end_date')) or timezone.localdate()
+            start_date = self._parse_date(request.query_params.get('start_date')) or end_date - timedelta(days=89)
+        except ValueError:
+            return Response({
+                'error': 'Invalid date format. Use YYYY-MM-DD'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        owner_id = request.query_params.get('owner_id')
+        history = DealPipelineSnapshotService().history(
+            start_date, end_date, owner_id=int(owner_id) if owner_id and owner_id.isdigit() else None
+        )
+        return Response({
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'history': history,
+            'count': len(history),
+        })
+
+    @staticmethod
+    def _parse_date(value):
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
     def destroy(self, request, *args, **kwargs):
         """
         Delete deal with additional validation
@@ -0,0 +1,200 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import LeadFunnelDaily
+
+UNKNOWN = 'Unknown'
+
+# (key, label, condition) for each reported score range
+SCORE_BUCKETS = [
+    ('high', 'High Score (>50)', Q(score__gt=50)),
+    ('medium', 'Medium Score (30-50)', Q(score__gte=30, score__lte=50)),
+    ('low', 'Low Score (10-30)', Q(score__gte=10, score__lt=30)),
+    ('very_low', 'Very Low Score (<10)', Q(score__lt=10)),
+]
+
+FUNNEL_FIELDS = [
+    'leads_created', 'leads_converted', 'accounts_linked',
+    'contacts_created', 'deals_created', 'deal_amount',
+]
+
+
+def _percentage(part, whole):
+    return round(part / whole * 100, 1) if whole else 0
+
+
+class LeadAnalyticsService:
+    """
+    Lead reporting over an already scoped Lead queryset.
+
+    Everything comes from one query grouped by (lead_status, lead_source)
+    with conditional aggregates for coverage and score ranges; the per-status,
+    per-source and overall figures are rolled up from those few groups.
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self._groups = None
+
+    def get_groups(self):
+        if self._groups is None:
+            score_counts = {
+                f'score_{key}': Count('pk', filter=condition)
+                for key, _label, condition in SCORE_BUCKETS
+            }
+            self._groups = list(
+                self.queryset.order_by().values('lead_status', 'lead_source').annotate(
+                    total=Count('pk'),
+                    with_account=Count('pk', filter=Q(account__isnull=False)),
+                    with_phone=Count('pk', filter=Q(phone__isnull=False) & ~Q(phone='')),
+                    with_score=Count('score'),
+                    score_sum=Sum('score'),
+                    **score_counts
+                )
+            )
+        return self._groups
+
+    def _totals(self):
+        totals = defaultdict(int)
+        for group in self.get_groups():
+            for key, value in group.items():
+                if key not in ('lead_status', 'lead_source'):
+                    totals[key] += value or 0
+        return totals
+
+    def summary(self):
+        totals = self._totals()
+        leads_by_status = defaultdict(int)
+        leads_by_source = defaultdict(int)
+        for group in self.get_groups():
+            leads_by_status[group['lead_status'] or UNKNOWN] += group['total']
+            leads_by_source[group['lead_source'] or UNKNOWN] += group['total']
+
+        return {
+            'total_leads': totals['total'],
+            'leads_with_account': totals['with_account'],
+            'leads_with_phone': totals['with_phone'],
+            'leads_with_score': totals['with_score'],
+            'leads_by_status': dict(leads_by_status),
+            'leads_by_source': dict(leads_by_source),
+        }
+
+    def score_distribution(self):
+        totals = self._totals()
+        total_leads = totals['total']
+        avg_score = totals['score_sum'] / totals['with_score'] if totals['with_score'] else 0
+
+        result = {
+            'total_leads': total_leads,
+            'avg_score': round(avg_score, 1) if avg_score else 0,
+        }
+        distribution = []
+        for key, label, _condition in SCORE_BUCKETS:
+            count = totals[f'score_{key}']
+            result[f'{key}_score_leads'] = count
+            distribution.append({
+                'score_range': label,
+                'count': count,
+                'percentage': _percentage(count, total_leads),
+            })
+        result['distribution'] = distribution if total_leads else []
+        return result
+
+
+def _bump_rollup(lead, day, **increments):
+    """Add increments to the rollup row for the lead's day, source, owner and creator"""
+    bucket = {
+        'day': day,
+        'lead_source': lead.lead_source or '',
+        'owner_id': lead.lead_owner_id or 0,
+        'created_by_id': lead.created_by_id or 0,
+    }
+    try:
+        with transaction.atomic():
+            LeadFunnelDaily.objects.get_or_create(**bucket)
+    except IntegrityError:
+        # Created concurrently by another request; the row exists either way
+        pass
+    LeadFunnelDaily.objects.filter(**bucket).update(
+        **{field: F(field) + value for field, value in increments.items()}
+    )
+
+
+def record_lead_created(lead):
+    _bump_rollup(lead, timezone.localdate(lead.created_at), leads_created=1)
+
+
+def record_leads_created(leads):
+    """Count leads saved in bulk (bulk_create skips post_save), one update per rollup row"""
+    groups = defaultdict(list)
+    for lead in leads:
+        key = (
+            timezone.localdate(lead.created_at),
+            lead.lead_source or '',
+            lead.lead_owner_id or 0,
+            lead.created_by_id or 0,
+        )
+        groups[key].append(lead)
+    for (day, _source, _owner, _creator), group in groups.items():
+        _bump_rollup(group[0], day, leads_created=len(group))
+
+
+def record_lead_conversion(lead, deal=None):
+    """Count a conversion into an account and contact (and a deal when one was created)"""
+    _bump_rollup(
+        lead,
+        timezone.localdate(),
+        leads_converted=1,
+        accounts_linked=1,
+        contacts_created=1,
+        deals_created=1 if deal is not None else 0,
+        deal_amount=Decimal(str(deal.amount or 0)) if deal is not None else Decimal('0'),
+    )
+
+
+def lead_funnel(start_date, end_date, scope=None):
+    """
+    Conversion funnel for created/converted activity between start_date and
+    end_date (inclusive) from the daily rollup, grouped by day and source in
+    one query. scope is an optional Q over owner_id/created_by_id.
+    """
+    rows = LeadFunnelDaily.objects.filter(day__gte=start_date, day__lte=end_date)
+    if scope is not None:
+        rows = rows.filter(scope)
+    rows = rows.order_by('day').values('day', 'lead_source').annotate(
+        **{field: Sum(field) for field in FUNNEL_FIELDS}
+    )
+
+    totals = defaultdict(int)
+    by_day = defaultdict(lambda: defaultdict(int))
+    by_source = defaultdict(lambda: defaultdict(int))
+    for row in rows:
+        for field in FUNNEL_FIELDS:
+            value = row[field] or 0
+            totals[field] += value
+            by_day[row['day']][field] += value
+            by_source[row['lead_source'] or UNKNOWN][field] += value
+
+    def with_rates(counts):
+        counts = {field: counts[field] for field in FUNNEL_FIELDS}
+        counts['deal_amount'] = str(counts['deal_amount'])
+        counts['conversion_rate'] = _percentage(counts['leads_converted'], counts['leads_created'])
+        counts['contact_rate'] = _percentage(counts['contacts_created'], counts['leads_converted'])
+        counts['deal_rate'] = _percentage(counts['deals_created'], counts['leads_converted'])
+        counts['lead_to_deal_rate'] = _percentage(counts['deals_created'], counts['leads_created'])
+        return counts
+
+    return {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'totals': with_rates(totals),
+        'by_source': {source: with_rates(counts) for source, counts in by_source.items()},
+        'daily': [
+            {'day': day.isoformat(), **with_rates(counts)}
+            for day, counts in sorted(by_day.items())
+        ],
+    }
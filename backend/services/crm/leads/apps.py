@@ -5,3 +5,6 @@ class LeadsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "services.crm.leads"
     verbose_name = "CRM Leads"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:58
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_search_trigram_indexes"),
+        ("leads", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Installed once in the public schema, which every tenant's search_path includes
+        migrations.RunSQL(
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public",
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("first_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="idx_lead_fname_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("last_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="idx_lead_lname_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("company_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="idx_lead_company_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"), name="gin_trgm_ops"
+                ),
+                name="idx_lead_email_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0002_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeadFunnelDaily",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "lead_source",
+                    models.CharField(blank=True, default="", max_length=100),
+                ),
+                ("owner_id", models.BigIntegerField(default=0)),
+                ("created_by_id", models.BigIntegerField(default=0)),
+                ("leads_created", models.PositiveIntegerField(default=0)),
+                ("leads_converted", models.PositiveIntegerField(default=0)),
+                ("accounts_linked", models.PositiveIntegerField(default=0)),
+                ("contacts_created", models.PositiveIntegerField(default=0)),
+                ("deals_created", models.PositiveIntegerField(default=0)),
+                (
+                    "deal_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+            ],
+            options={
+                "verbose_name": "Lead Funnel Daily Rollup",
+                "verbose_name_plural": "Lead Funnel Daily Rollups",
+                "db_table": "lead_funnel_daily",
+                "ordering": ["day"],
+                "indexes": [models.Index(fields=["day"], name="idx_lead_funnel_day")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "lead_source", "owner_id", "created_by_id"),
+                        name="unique_lead_funnel_bucket",
+                    )
+                ],
+            },
+        ),
+    ]
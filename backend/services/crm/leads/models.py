@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.db import models, transaction
 
+from core.shared.search import trigram_index
 from services.crm.accounts.models import Account
 from services.crm.contacts.models import Contact
 from services.crm.deals.models import Deal
@@ -111,6 +112,10 @@ class Lead(models.Model):
             models.Index(fields=['email'], name='idx_lead_email'),
             models.Index(fields=['score'], name='idx_lead_score'),
             # models.Index(fields=['campaign'], name='idx_lead_campaign'),  # Disabled until campaign model is added
+            trigram_index('first_name', name='idx_lead_fname_trgm'),
+            trigram_index('last_name', name='idx_lead_lname_trgm'),
+            trigram_index('company_name', name='idx_lead_company_trgm'),
+            trigram_index('email', name='idx_lead_email_trgm'),
         ]
 
     def __str__(self):
@@ -262,7 +267,49 @@ class Lead(models.Model):
             self.account = account
             self.save()
 
+            # Count the conversion before the lead row goes away
+            from .analytics import record_lead_conversion
+            record_lead_conversion(self, deal)
+
             # Delete the original lead
             self.delete()
 
             return account, contact, deal
+
+
+class LeadFunnelDaily(models.Model):
+    """
+    Daily lead funnel rollup, maintained incrementally as leads are created
+    and converted (converted leads are deleted, so this is the only record of
+    them). One row per day, lead source, owner and creator; users are stored
+    as plain ids with 0 for "none" so the unique constraint covers them.
+    """
+    day = models.DateField()
+    lead_source = models.CharField(max_length=100, blank=True, default='')
+    owner_id = models.BigIntegerField(default=0)
+    created_by_id = models.BigIntegerField(default=0)
+
+    leads_created = models.PositiveIntegerField(default=0)
+    leads_converted = models.PositiveIntegerField(default=0)
+    accounts_linked = models.PositiveIntegerField(default=0)
+    contacts_created = models.PositiveIntegerField(default=0)
+    deals_created = models.PositiveIntegerField(default=0)
+    deal_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'lead_funnel_daily'
+        verbose_name = 'Lead Funnel Daily Rollup'
+        verbose_name_plural = 'Lead Funnel Daily Rollups'
+        ordering = ['day']
+        indexes = [
+            models.Index(fields=['day'], name='idx_lead_funnel_day'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'lead_source', 'owner_id', 'created_by_id'],
+                name='unique_lead_funnel_bucket'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.lead_source or 'Unknown'}: {self.leads_created} created, {self.leads_converted} converted"
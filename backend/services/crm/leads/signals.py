@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .analytics import record_lead_created
+from .models import Lead
+
+
+@receiver(post_save, sender=Lead)
+def count_created_lead(sender, instance, created, raw=False, **kwargs):
+    """Keep the daily funnel rollup's created count current"""
+    if created and not raw:
+        record_lead_created(instance)
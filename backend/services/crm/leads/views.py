@@ -1,8 +1,9 @@
 # Removed cache_page import - caching disabled for immediate data updates
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from django.db import models
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -10,23 +11,55 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from core.auth.utils import rate_limit
+from core.shared.exports import ExportMixin
+from core.shared.search import SearchFilter
 from core.tenants.permissions import HasTenantPermission, IsTenantUser
 
+from .analytics import LeadAnalyticsService, lead_funnel, record_lead_conversion
 from .models import Lead
 from .serializers import LeadListSerializer, LeadSerializer
 
 
-class LeadViewSet(viewsets.ModelViewSet):
+class LeadViewSet(ExportMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing leads with tenant isolation and RBAC
     """
     permission_classes = [IsAuthenticated, IsTenantUser, HasTenantPermission]
+    filter_backends = [SearchFilter]
+    search_fields = ['first_name', 'last_name', 'company_name', 'email']
+    export_filename = 'leads'
+    export_fields = {
+        'lead_id': 'lead_id',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'title': 'title',
+        'company_name': 'company_name',
+        'email': 'email',
+        'phone': 'phone',
+        'website': 'website',
+        'lead_status': 'lead_status',
+        'lead_source': 'lead_source',
+        'industry': 'industry',
+        'score': 'score',
+        'account_id': 'account_id',
+        'account_name': 'account__account_name',
+        'owner_email': 'lead_owner__email',
+        'street': 'street',
+        'city': 'city',
+        'state': 'state',
+        'country': 'country',
+        'postal_code': 'postal_code',
+        'number_of_employees': 'number_of_employees',
+        'average_revenue': 'average_revenue',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
 
     def get_required_permissions(self):
         """
         Return required permissions based on action
         """
-        if self.action in ['list', 'retrieve', 'summary', 'account_info', 'by_account', 'by_status']:
+        if self.action in ['list', 'retrieve', 'export', 'summary', 'account_info', 'by_account', 'by_status', 'funnel']:
             # View permissions - allow various viewing roles
             return ['all', 'manage_leads', 'view_customers', 'view_only', 'manage_contacts', 'manage_accounts']
         elif self.action in ['create']:
@@ -56,28 +89,21 @@ class LeadViewSet(viewsets.ModelViewSet):
         """
         queryset = Lead.objects.all()
 
-        # If user is superadmin or has 'all' permission, return all leads
-        if (hasattr(self.request.user, 'is_superadmin') and self.request.user.is_superadmin) or \
-           self._has_tenant_permission(self.request.user, 'all'):
+        if self._can_view_all_leads():
             return queryset
 
-        # If user has manage_leads or view_customers, return all leads in tenant
-        if self._has_tenant_permission(self.request.user, ['manage_leads', 'view_customers']):
-            return queryset
-
-        # For sales reps or limited users, return only leads they own or created
-        if self._has_tenant_permission(self.request.user, ['view_only']):
-            return queryset.filter(
-                models.Q(lead_owner=self.request.user) |
-                models.Q(created_by=self.request.user)
-            )
-
-        # Default to user's leads only
+        # Sales reps, view_only and other limited users only see leads they own or created
         return queryset.filter(
             models.Q(lead_owner=self.request.user) |
             models.Q(created_by=self.request.user)
         )
 
+    def _can_view_all_leads(self):
+        """Superadmins and users with all, manage_leads or view_customers see every lead in the tenant"""
+        if hasattr(self.request.user, 'is_superadmin') and self.request.user.is_superadmin:
+            return True
+        return self._has_tenant_permission(self.request.user, ['all', 'manage_leads', 'view_customers'])
+
     def _has_tenant_permission(self, user, permissions):
         """Check if user has any of the specified permissions in current tenant"""
         if isinstance(permissions, str):
@@ -258,6 +284,9 @@ class LeadViewSet(viewsets.ModelViewSet):
             lead.account = account
             lead.save()
 
+            # Count the conversion before the lead row goes away
+            record_lead_conversion(lead, deal)
+
             # Delete the original lead
             lead.delete()
 
@@ -268,10 +297,26 @@ class LeadViewSet(viewsets.ModelViewSet):
         List leads with optional date filtering for immediate data updates
         """
         # Get base queryset
-        queryset = self.filter_queryset(self.get_queryset())
+        queryset = self.apply_list_filters(self.filter_queryset(self.get_queryset()))
         
+        # Apply pagination
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def get_export_queryset(self):
+        return self.apply_list_filters(self.filter_queryset(self.get_queryset()))
+
+    def apply_list_filters(self, queryset):
+        """
+        Apply the list query parameters; shared by list and export
+        """
         # Handle created_at__date filtering for "Today's Leads" functionality
-        created_at_date = request.query_params.get('created_at__date')
+        created_at_date = self.request.query_params.get('created_at__date')
         if created_at_date:
             try:
                 # Parse the date string (YYYY-MM-DD format)
@@ -282,48 +327,17 @@ class LeadViewSet(viewsets.ModelViewSet):
                 # If date parsing fails, log it but don't break the request
                 logger = logging.getLogger(__name__)
                 logger.warning(f"Invalid date format for created_at__date: {created_at_date}")
-        
-        # Apply pagination
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return queryset
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
         """
         Get lead summary statistics
         """
-        leads = self.get_queryset()
-
-        # Calculate statistics
-        total_leads = leads.count()
-        leads_with_account = leads.filter(account__isnull=False).count()
-        leads_with_phone = leads.exclude(phone__isnull=True).exclude(phone__exact='').count()
-        leads_with_score = leads.exclude(score__isnull=True).count()
-
-        # Group by status
-        leads_by_status = {}
-        for lead in leads:
-            status = lead.lead_status or 'Unknown'
-            leads_by_status[status] = leads_by_status.get(status, 0) + 1
-
-        # Group by source
-        leads_by_source = {}
-        for lead in leads:
-            source = lead.lead_source or 'Unknown'
-            leads_by_source[source] = leads_by_source.get(source, 0) + 1
+        analytics = LeadAnalyticsService(self.get_queryset())
 
         return Response({
-            'total_leads': total_leads,
-            'leads_with_account': leads_with_account,
-            'leads_with_phone': leads_with_phone,
-            'leads_with_score': leads_with_score,
-            'leads_by_status': leads_by_status,
-            'leads_by_source': leads_by_source,
+            **analytics.summary(),
             'tenant': request.tenant.name if request.tenant else None,
         })
 
@@ -414,66 +428,37 @@ class LeadViewSet(viewsets.ModelViewSet):
         """
         Get lead score distribution statistics for reporting
         """
-        leads = self.get_queryset()
-        
-        # Calculate total leads
-        total_leads = leads.count()
-        if total_leads == 0:
+        analytics = LeadAnalyticsService(self.get_queryset())
+        return Response(analytics.score_distribution())
+
+    @action(detail=False, methods=['get'])
+    def funnel(self, request):
+        """
+        Lead conversion funnel (lead -> account/contact/deal) from the daily
+        rollup. Optional start_date/end_date (YYYY-MM-DD), default last 30 days.
+        """
+        try:
+            end_date = self._parse_date(request.query_params.get('end_date')) or timezone.localdate()
+            start_date = self._parse_date(request.query_params.get('start_date')) or end_date - timedelta(days=29)
+        except ValueError:
             return Response({
-                'total_leads': 0,
-                'avg_score': 0,
-                'high_score_leads': 0,
-                'medium_score_leads': 0,
-                'low_score_leads': 0,
-                'very_low_score_leads': 0,
-                'distribution': []
-            })
+                'error': 'Invalid date format. Use YYYY-MM-DD'
+            }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Filter leads with scores (exclude null scores)
-        scored_leads = leads.exclude(score__isnull=True)
-        
-        # Calculate average score
-        avg_score = scored_leads.aggregate(avg_score=models.Avg('score'))['avg_score'] or 0
-        
-        # Count leads in different score ranges
-        high_score_leads = scored_leads.filter(score__gt=50).count()
-        medium_score_leads = scored_leads.filter(score__gte=30, score__lte=50).count()
-        low_score_leads = scored_leads.filter(score__gte=10, score__lt=30).count()
-        very_low_score_leads = scored_leads.filter(score__lt=10).count()
-        
-        # Create distribution data
-        distribution = [
-            {
-                'score_range': 'High Score (>50)',
-                'count': high_score_leads,
-                'percentage': round((high_score_leads / total_leads) * 100, 1) if total_leads > 0 else 0
-            },
-            {
-                'score_range': 'Medium Score (30-50)',
-                'count': medium_score_leads,
-                'percentage': round((medium_score_leads / total_leads) * 100, 1) if total_leads > 0 else 0
-            },
-            {
-                'score_range': 'Low Score (10-30)',
-                'count': low_score_leads,
-                'percentage': round((low_score_leads / total_leads) * 100, 1) if total_leads > 0 else 0
-            },
-            {
-                'score_range': 'Very Low Score (<10)',
-                'count': very_low_score_leads,
-                'percentage': round((very_low_score_leads / total_leads) * 100, 1) if total_leads > 0 else 0
-            },
-        ]
-        
-        return Response({
-            'total_leads': total_leads,
-            'avg_score': round(avg_score, 1) if avg_score else 0,
-            'high_score_leads': high_score_leads,
-            'medium_score_leads': medium_score_leads,
-            'low_score_leads': low_score_leads,
-            'very_low_score_leads': very_low_score_leads,
-            'distribution': distribution
-        })
+        if start_date > end_date:
+            return Response({
+                'error': 'start_date must be on or before end_date'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        scope = None
+        if not self._can_view_all_leads():
+            scope = models.Q(owner_id=request.user.pk) | models.Q(created_by_id=request.user.pk)
+
+        return Response(lead_funnel(start_date, end_date, scope))
+
+    @staticmethod
+    def _parse_date(value):
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
 
     @action(detail=True, methods=['post'])
     def convert(self, request, pk=None):
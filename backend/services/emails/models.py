@@ -200,6 +200,7 @@ class Email(models.Model):
             models.Index(fields=['email_date'], name='idx_email_date'),
             models.Index(fields=['email_time'], name='idx_email_time'),
             models.Index(fields=['created_at'], name='idx_email_created'),
+            models.Index(fields=['email_date', 'email_time', 'created_at', 'id'], name='idx_email_list_order'),
             models.Index(fields=['content_type', 'object_id'], name='idx_email_content'),
             models.Index(fields=['is_active'], name='idx_email_active'),
             models.Index(fields=['follow_up_required'], name='idx_email_followup'),
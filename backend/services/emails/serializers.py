@@ -1,6 +1,8 @@
 from django.contrib.contenttypes.models import ContentType
 from rest_framework import serializers
 
+from core.shared.serial_numbers import SerialNumberListSerializer, SerialNumberMixin, related_count
+
 from .models import Email, EmailComment
 
 
@@ -18,11 +20,12 @@ class EmailCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'author', 'author_name', 'author_email', 'created_at', 'updated_at']
 
 
-class EmailSerializer(serializers.ModelSerializer):
+class EmailSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Main serializer for Email model with full functionality"""
     
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('-email_date', '-email_time', '-created_at')
     
     # Read-only fields for user information
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
@@ -49,41 +52,20 @@ class EmailSerializer(serializers.ModelSerializer):
     
     # Comments (nested)
     comments = EmailCommentSerializer(many=True, read_only=True)
-    comment_count = serializers.IntegerField(source='comments.count', read_only=True)
+    comment_count = serializers.SerializerMethodField()
     
     # Attachment count
-    attachment_count = serializers.IntegerField(source='attachments.count', read_only=True)
-    
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on email position in ordered list within the same context"""
-        # Filter emails by the same context as the current email
-        queryset_filter = {'is_active': True}
-        
-        # If email is linked to an entity, only count emails for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If email is standalone, only count standalone emails
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-        
-        # Get emails in the same context ordered by email date/time, then creation date
-        active_emails = obj.__class__.objects.filter(**queryset_filter).order_by('-email_date', '-email_time', '-created_at')
-        
-        # Find the position of current email (1-based indexing)
-        for index, email in enumerate(active_emails, 1):
-            if email.id == obj.id:
-                return index
-        
-        # Fallback: return email ID if not found (shouldn't happen)
-        return obj.id
+    attachment_count = serializers.SerializerMethodField()
+
+    def get_comment_count(self, obj):
+        return related_count(obj, 'comment_count', 'comments')
+
+    def get_attachment_count(self, obj):
+        return related_count(obj, 'attachment_count', 'attachments')
     
     class Meta:
         model = Email
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'subject', 'content', 'email_address', 'direction', 'direction_display',
             'status', 'status_display', 'priority', 'priority_display',
@@ -112,11 +94,12 @@ class EmailSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class EmailCreateSerializer(serializers.ModelSerializer):
+class EmailCreateSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Simplified serializer for email creation"""
     
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('-email_date', '-email_time', '-created_at')
     
     # Optional entity linking
     entity_type = serializers.CharField(required=False, allow_blank=True)
@@ -134,36 +117,9 @@ class EmailCreateSerializer(serializers.ModelSerializer):
         """Convert frontend entity type to backend model name"""
         return self.ENTITY_TYPE_MAPPING.get(entity_type.lower(), entity_type.lower())
     
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on email position in ordered list within the same context"""
-        # Filter emails by the same context as the current email
-        queryset_filter = {'is_active': True}
-        
-        # If email is linked to an entity, only count emails for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If email is standalone, only count standalone emails
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-        
-        # Get emails in the same context ordered by email date/time, then creation date
-        active_emails = obj.__class__.objects.filter(**queryset_filter).order_by('-email_date', '-email_time', '-created_at')
-        
-        # Find the position of current email (1-based indexing)
-        for index, email in enumerate(active_emails, 1):
-            if email.id == obj.id:
-                return index
-        
-        # Fallback: return email ID if not found (shouldn't happen)
-        return obj.id
-    
     class Meta:
         model = Email
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'subject', 'content', 'email_address', 'direction', 'status', 'priority',
             'contact', 'contact_name',
@@ -267,11 +223,12 @@ class EmailUpdateSerializer(serializers.ModelSerializer):
         return data
 
 
-class EmailListSerializer(serializers.ModelSerializer):
+class EmailListSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Lightweight serializer for email lists"""
     
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('-email_date', '-email_time', '-created_at')
     
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
     contact_display_name = serializers.CharField(read_only=True)
@@ -282,36 +239,9 @@ class EmailListSerializer(serializers.ModelSerializer):
     entity_type = serializers.CharField(read_only=True)
     entity_id = serializers.IntegerField(source='object_id', read_only=True)
     
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on email position in ordered list within the same context"""
-        # Filter emails by the same context as the current email
-        queryset_filter = {'is_active': True}
-        
-        # If email is linked to an entity, only count emails for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If email is standalone, only count standalone emails
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-        
-        # Get emails in the same context ordered by email date/time, then creation date
-        active_emails = obj.__class__.objects.filter(**queryset_filter).order_by('-email_date', '-email_time', '-created_at')
-        
-        # Find the position of current email (1-based indexing)
-        for index, email in enumerate(active_emails, 1):
-            if email.id == obj.id:
-                return index
-        
-        # Fallback: return email ID if not found (shouldn't happen)
-        return obj.id
-    
     class Meta:
         model = Email
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'subject', 'content', 'email_address', 'direction', 'direction_display',
             'status', 'status_display', 'priority', 'priority_display',
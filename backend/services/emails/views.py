@@ -20,6 +20,7 @@ class EmailListCreateView(generics.ListCreateAPIView):
     """
     permission_classes = [permissions.IsAuthenticated, IsTenantUser, HasTenantPermission]
     required_permissions = ['all', 'view_customers', 'manage_opportunities']
+    keyset_count = 'estimate'
     
     # Entity type mapping for frontend-backend compatibility
     ENTITY_TYPE_MAPPING = {
@@ -136,6 +137,9 @@ class EmailDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Email.objects.filter(is_active=True).select_related(
             'created_by', 'content_type', 'contact'
+        ).annotate(
+            comment_count=Count('comments', distinct=True),
+            attachment_count=Count('attachments', distinct=True)
         ).prefetch_related('comments__author', 'attachments')
     
     def destroy(self, request, *args, **kwargs):
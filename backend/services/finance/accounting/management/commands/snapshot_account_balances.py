@@ -0,0 +1,124 @@
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import get_tenant_model, schema_context
+
+from services.finance.accounting.services import BalanceCalculationService
+
+
+class Command(BaseCommand):
+    help = 'Creates, backfills and verifies per-account balance snapshots'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema',
+            type=str,
+            help='Specific schema to process (optional, defaults to all tenants)',
+        )
+        parser.add_argument(
+            '--frequency',
+            choices=['daily', 'monthly'],
+            default='daily',
+            help='Snapshot frequency (default: daily)',
+        )
+        parser.add_argument(
+            '--date',
+            type=str,
+            help='Snapshot date in YYYY-MM-DD format (default: today)',
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Build snapshots for every past period with posted activity',
+        )
+        parser.add_argument(
+            '--start',
+            type=str,
+            help='Earliest snapshot date to write when backfilling (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Compare stored snapshots against the raw ledger',
+        )
+        parser.add_argument(
+            '--repair',
+            action='store_true',
+            help='With --verify, correct any mismatched snapshots',
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options.get('schema')
+        snapshot_date = self.parse_date(options.get('date')) or date.today()
+        start_date = self.parse_date(options.get('start'))
+
+        TenantModel = get_tenant_model()
+        if schema_name:
+            tenants = TenantModel.objects.filter(schema_name=schema_name)
+            if not tenants.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'Tenant with schema {schema_name} does not exist')
+                )
+                return
+        else:
+            tenants = TenantModel.objects.exclude(schema_name='public')
+
+        for tenant in tenants:
+            try:
+                with schema_context(tenant.schema_name):
+                    self.process_tenant(tenant, options, snapshot_date, start_date)
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Error processing {tenant.schema_name}: {str(e)}')
+                )
+
+    def process_tenant(self, tenant, options, snapshot_date, start_date):
+        """Run the requested snapshot operations for one tenant"""
+        service = BalanceCalculationService()
+
+        if options['backfill']:
+            written = service.backfill(
+                frequency=options['frequency'],
+                start_date=start_date,
+                end_date=snapshot_date
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f'Backfilled {written} snapshots for {tenant.schema_name}')
+            )
+        elif not options['verify']:
+            written = service.create_snapshots(snapshot_date, frequency=options['frequency'])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Wrote {written} snapshots dated {snapshot_date} for {tenant.schema_name}'
+                )
+            )
+
+        if options['verify']:
+            mismatches = service.verify(repair=options['repair'])
+            if not mismatches:
+                self.stdout.write(
+                    self.style.SUCCESS(f'All snapshots match the ledger for {tenant.schema_name}')
+                )
+                return
+
+            for mismatch in mismatches:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"  Account {mismatch['account_id']} @ {mismatch['snapshot_date']}: "
+                        f"stored {mismatch['stored']}, ledger {mismatch['actual']}"
+                    )
+                )
+            action = 'Repaired' if options['repair'] else 'Found'
+            self.stdout.write(
+                self.style.WARNING(
+                    f'{action} {len(mismatches)} mismatched snapshots for {tenant.schema_name}'
+                )
+            )
+
+    def parse_date(self, value):
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'Invalid date "{value}", expected YYYY-MM-DD') from None
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:40
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0006_use_base_currency_default"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AccountBalanceSnapshot",
+            fields=[
+                ("snapshot_id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "snapshot_date",
+                    models.DateField(
+                        help_text="Totals include posted transactions dated on or before this date"
+                    ),
+                ),
+                (
+                    "frequency",
+                    models.CharField(
+                        choices=[("daily", "Daily"), ("monthly", "Monthly")],
+                        default="monthly",
+                        help_text="Schedule that produced this snapshot",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "debit_total",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Cumulative posted debit amount",
+                        max_digits=19,
+                    ),
+                ),
+                (
+                    "credit_total",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Cumulative posted credit amount",
+                        max_digits=19,
+                    ),
+                ),
+                (
+                    "transaction_count",
+                    models.IntegerField(
+                        default=0, help_text="Cumulative number of posted transactions"
+                    ),
+                ),
+                ("created_time", models.DateTimeField(auto_now_add=True)),
+                ("modified_time", models.DateTimeField(auto_now=True)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        help_text="Account this snapshot belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_snapshots",
+                        to="accounting.chartofaccount",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Account Balance Snapshot",
+                "verbose_name_plural": "Account Balance Snapshots",
+                "db_table": "finance_account_balance_snapshots",
+                "ordering": ["account", "-snapshot_date"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("account", "snapshot_date"),
+                        name="unique_account_snapshot_date",
+                    )
+                ],
+            },
+        ),
+    ]
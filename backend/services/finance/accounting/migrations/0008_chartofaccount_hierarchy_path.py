@@ -0,0 +1,57 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:44
+
+from django.db import migrations, models
+
+
+def build_hierarchy_paths(apps, schema_editor):
+    """Populate hierarchy_path and depth for existing accounts"""
+    ChartOfAccount = apps.get_model("accounting", "ChartOfAccount")
+
+    accounts = {account.pk: account for account in ChartOfAccount.objects.all()}
+    paths = {}
+
+    def resolve(account):
+        chain = []
+        current = account
+        while (
+            current is not None and current.pk not in paths and current.pk not in chain
+        ):
+            chain.append(current.pk)
+            current = accounts.get(current.parent_account_id)
+        prefix = (
+            paths[current.pk] if current is not None and current.pk in paths else "/"
+        )
+        for pk in reversed(chain):
+            prefix = f"{prefix}{pk}/"
+            paths[pk] = prefix
+        return paths[account.pk]
+
+    for account in accounts.values():
+        account.hierarchy_path = resolve(account)
+        account.depth = account.hierarchy_path.count("/") - 2
+
+    ChartOfAccount.objects.bulk_update(
+        accounts.values(), ["hierarchy_path", "depth"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0007_accountbalancesnapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chartofaccount",
+            name="hierarchy_path",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Materialized path of ancestor IDs ending with this account, e.g. /1/5/12/",
+                max_length=500,
+            ),
+        ),
+        migrations.RunPython(build_hierarchy_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:58
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0008_chartofaccount_hierarchy_path"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Installed once in the public schema, which every tenant's search_path includes
+        migrations.RunSQL(
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public",
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="accounttransaction",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("description"),
+                    name="gin_trgm_ops",
+                ),
+                name="idx_acctxn_desc_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="accounttransaction",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("reference_number"),
+                    name="gin_trgm_ops",
+                ),
+                name="idx_acctxn_ref_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="accounttransaction",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("entry_number"),
+                    name="gin_trgm_ops",
+                ),
+                name="idx_acctxn_entry_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="accounttransaction",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("payee"), name="gin_trgm_ops"
+                ),
+                name="idx_acctxn_payee_trgm",
+            ),
+        ),
+    ]
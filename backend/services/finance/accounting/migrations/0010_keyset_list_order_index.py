@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0009_search_trigram_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="accounttransaction",
+            index=models.Index(
+                fields=[
+                    "transaction_date",
+                    "created_time",
+                    "categorized_transaction_id",
+                ],
+                name="idx_acctxn_list_order",
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from .accounts import ChartOfAccount, AccountDocument
 from .transactions import AccountTransaction
+from .balances import AccountBalanceSnapshot
 
-__all__ = ['ChartOfAccount', 'AccountDocument', 'AccountTransaction']
\ No newline at end of file
+__all__ = ['ChartOfAccount', 'AccountDocument', 'AccountTransaction', 'AccountBalanceSnapshot']
\ No newline at end of file
@@ -1,4 +1,7 @@
+from collections import defaultdict
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
 from django.conf import settings
@@ -122,6 +125,13 @@ class ChartOfAccount(models.Model):
         editable=False,
         help_text="Depth in account hierarchy (0 for root accounts)"
     )
+    hierarchy_path = models.CharField(
+        max_length=500,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text="Materialized path of ancestor IDs ending with this account, e.g. /1/5/12/"
+    )
     is_child_present = models.BooleanField(
         default=False, 
         editable=False,
@@ -242,6 +252,9 @@ class ChartOfAccount(models.Model):
         # Prevent circular references
         if self.parent_account and self.parent_account.pk == self.pk:
             raise ValidationError("Account cannot be its own parent")
+        if (self.pk and self.parent_account
+                and f'/{self.pk}/' in (self.parent_account.hierarchy_path or '')):
+            raise ValidationError("Account cannot be moved under one of its descendants")
         
         # Update parent account name cache
         if self.parent_account:
@@ -253,9 +266,17 @@ class ChartOfAccount(models.Model):
         
         # Check if this is a new account
         is_new = self.pk is None
+        update_fields = kwargs.get('update_fields')
+        track_path = update_fields is None or 'parent_account' in update_fields
+        previous = None
+        if not is_new and track_path:
+            previous = ChartOfAccount.objects.filter(pk=self.pk).values('hierarchy_path', 'depth').first()
         
         super().save(*args, **kwargs)
         
+        if track_path:
+            self._update_hierarchy_path(previous)
+        
         # Update parent's child metadata after save
         if self.parent_account and is_new:
             parent = self.parent_account
@@ -263,6 +284,36 @@ class ChartOfAccount(models.Model):
             parent.child_count = parent.children.count()
             parent.save(update_fields=['is_child_present', 'child_count'])
     
+    def _update_hierarchy_path(self, previous=None):
+        """
+        Store this account's materialized path and, when the account moved,
+        rewrite the paths and depths of its whole subtree in one UPDATE.
+        """
+        if self.parent_account:
+            parent_path = self.parent_account.hierarchy_path or f'/{self.parent_account.pk}/'
+        else:
+            parent_path = '/'
+        new_path = f'{parent_path}{self.pk}/'
+        
+        old_path = previous['hierarchy_path'] if previous else ''
+        if new_path == old_path:
+            self.hierarchy_path = new_path
+            return
+        
+        ChartOfAccount.objects.filter(pk=self.pk).update(hierarchy_path=new_path)
+        if old_path:
+            ChartOfAccount.objects.filter(
+                hierarchy_path__startswith=old_path
+            ).exclude(pk=self.pk).update(
+                hierarchy_path=Concat(
+                    Value(new_path),
+                    Substr('hierarchy_path', len(old_path) + 1),
+                    output_field=models.CharField()
+                ),
+                depth=F('depth') + (self.depth - previous['depth'])
+            )
+        self.hierarchy_path = new_path
+    
     def delete(self, *args, **kwargs):
         """Override delete to update parent's child metadata"""
         parent = self.parent_account
@@ -303,32 +354,37 @@ class ChartOfAccount(models.Model):
         return 'Other'
     
     def get_descendants(self):
-        """Get all descendant accounts (recursive)"""
-        descendants = []
-        visited = set()
-        
-        def _get_descendants_recursive(account):
-            if account.account_id in visited:
-                # Circular reference detected, skip to prevent infinite recursion
-                return
-            visited.add(account.account_id)
-            
-            children = account.children.all()
-            for child in children:
-                descendants.append(child)
-                _get_descendants_recursive(child)
-        
-        _get_descendants_recursive(self)
-        return descendants
+        """Get all descendant accounts, parents before children"""
+        return list(
+            self.get_subtree().exclude(pk=self.pk).order_by(
+                'depth', 'account_code', 'account_name'
+            )
+        )
     
     def get_ancestors(self):
-        """Get all ancestor accounts up to root"""
-        ancestors = []
-        current = self.parent_account
-        while current:
-            ancestors.append(current)
-            current = current.parent_account
-        return ancestors
+        """Get all ancestor accounts up to root, nearest first"""
+        ancestor_ids = self.get_ancestor_ids()
+        accounts = ChartOfAccount.objects.in_bulk(ancestor_ids)
+        return [accounts[pk] for pk in reversed(ancestor_ids) if pk in accounts]
+    
+    def get_ancestor_ids(self):
+        """Ancestor IDs from the root down, read from the materialized path"""
+        ids = [int(part) for part in (self.hierarchy_path or '').split('/') if part]
+        return [pk for pk in ids if pk != self.pk]
+    
+    def get_subtree(self):
+        """QuerySet of this account and all of its descendants"""
+        return ChartOfAccount.objects.filter(
+            hierarchy_path__startswith=self.hierarchy_path or f'/{self.pk}/'
+        )
+    
+    @staticmethod
+    def group_by_parent(accounts):
+        """Map parent_account_id -> [child accounts] for in-memory tree assembly"""
+        children = defaultdict(list)
+        for account in accounts:
+            children[account.parent_account_id].append(account)
+        return children
 
 
 class AccountDocument(models.Model):
@@ -0,0 +1,148 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import Case, F, Q, Value, When
+
+from .accounts import ChartOfAccount
+
+
+class AccountBalanceSnapshot(models.Model):
+    """
+    Cumulative posted totals for an account up to and including a date.
+    Balance lookups start from the latest snapshot and only aggregate the
+    transactions posted after it.
+    """
+
+    FREQUENCY_CHOICES = [
+        ('daily', 'Daily'),
+        ('monthly', 'Monthly'),
+    ]
+
+    snapshot_id = models.BigAutoField(primary_key=True)
+    account = models.ForeignKey(
+        ChartOfAccount,
+        on_delete=models.CASCADE,
+        related_name='balance_snapshots',
+        help_text="Account this snapshot belongs to"
+    )
+    snapshot_date = models.DateField(
+        help_text="Totals include posted transactions dated on or before this date"
+    )
+    frequency = models.CharField(
+        max_length=10,
+        choices=FREQUENCY_CHOICES,
+        default='monthly',
+        help_text="Schedule that produced this snapshot"
+    )
+    debit_total = models.DecimalField(
+        max_digits=19,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="Cumulative posted debit amount"
+    )
+    credit_total = models.DecimalField(
+        max_digits=19,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="Cumulative posted credit amount"
+    )
+    transaction_count = models.IntegerField(
+        default=0,
+        help_text="Cumulative number of posted transactions"
+    )
+    created_time = models.DateTimeField(auto_now_add=True)
+    modified_time = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'finance_account_balance_snapshots'
+        ordering = ['account', '-snapshot_date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['account', 'snapshot_date'],
+                name='unique_account_snapshot_date'
+            )
+        ]
+        verbose_name = 'Account Balance Snapshot'
+        verbose_name_plural = 'Account Balance Snapshots'
+
+    def __str__(self):
+        return f"{self.account} @ {self.snapshot_date}"
+
+    @classmethod
+    def apply_transaction(cls, transaction, reverse=False):
+        """
+        Keep snapshots on or after the transaction date in step with a
+        posting (or a void, with reverse=True) so back-dated entries never
+        leave stale snapshots behind.
+        """
+        debit = transaction.debit_amount or Decimal('0.00')
+        credit = transaction.credit_amount or Decimal('0.00')
+        count = 1
+        if reverse:
+            debit, credit, count = -debit, -credit, -count
+
+        cls.objects.filter(
+            account_id=transaction.account_id,
+            snapshot_date__gte=transaction.transaction_date
+        ).update(
+            debit_total=F('debit_total') + debit,
+            credit_total=F('credit_total') + credit,
+            transaction_count=F('transaction_count') + count
+        )
+
+    @classmethod
+    def apply_transactions(cls, transactions, reverse=False):
+        """
+        Batch version of apply_transaction: moves every affected snapshot
+        with a single UPDATE of F() expressions, so concurrent batches (and
+        single postings) add to the stored totals instead of overwriting them.
+
+        A snapshot takes the summed deltas of its account's transactions dated
+        on or before it. The When branches for an account run latest date
+        first and carry running totals, because Case stops at the first match.
+        """
+        sign = -1 if reverse else 1
+        deltas = defaultdict(lambda: [Decimal('0.00'), Decimal('0.00'), 0])
+        for transaction in transactions:
+            delta = deltas[(transaction.account_id, transaction.transaction_date)]
+            delta[0] += sign * (transaction.debit_amount or Decimal('0.00'))
+            delta[1] += sign * (transaction.credit_amount or Decimal('0.00'))
+            delta[2] += sign
+        if not deltas:
+            return 0
+
+        dates_by_account = defaultdict(list)
+        for account_id, transaction_date in sorted(deltas):
+            dates_by_account[account_id].append(transaction_date)
+
+        condition = Q()
+        branches = {'debit_total': [], 'credit_total': [], 'transaction_count': []}
+        for account_id, dates in dates_by_account.items():
+            condition |= Q(account_id=account_id, snapshot_date__gte=dates[0])
+            debit, credit, count = Decimal('0.00'), Decimal('0.00'), 0
+            running = []
+            for transaction_date in dates:
+                delta = deltas[(account_id, transaction_date)]
+                debit, credit, count = debit + delta[0], credit + delta[1], count + delta[2]
+                running.append((transaction_date, debit, credit, count))
+            for transaction_date, debit, credit, count in reversed(running):
+                match = Q(account_id=account_id, snapshot_date__gte=transaction_date)
+                branches['debit_total'].append(When(match, then=Value(debit)))
+                branches['credit_total'].append(When(match, then=Value(credit)))
+                branches['transaction_count'].append(When(match, then=Value(count)))
+
+        amount_field = models.DecimalField(max_digits=19, decimal_places=2)
+        count_field = models.IntegerField()
+        zero = Value(Decimal('0.00'), output_field=amount_field)
+        return cls.objects.filter(condition).update(
+            debit_total=F('debit_total') + Case(
+                *branches['debit_total'], default=zero, output_field=amount_field
+            ),
+            credit_total=F('credit_total') + Case(
+                *branches['credit_total'], default=zero, output_field=amount_field
+            ),
+            transaction_count=F('transaction_count') + Case(
+                *branches['transaction_count'], default=Value(0), output_field=count_field
+            )
+        )
@@ -2,6 +2,7 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from django.conf import settings
 from decimal import Decimal
+from core.shared.search import trigram_index
 from .accounts import ChartOfAccount
 
 
@@ -59,6 +60,16 @@ class AccountTransaction(models.Model):
         ('partially_reconciled', 'Partially Reconciled'),
     ]
     
+    # Transaction type groupings used for contact balances
+    RECEIVABLE_TYPES = [
+        'invoice', 'customer_payment', 'credit_notes',
+        'creditnote_refund', 'sales_without_invoices'
+    ]
+    PAYABLE_TYPES = [
+        'bills', 'vendor_payment', 'expense',
+        'card_payment', 'purchase_or_charges'
+    ]
+    
     # Primary Fields
     categorized_transaction_id = models.AutoField(primary_key=True)
     transaction_id = models.CharField(
@@ -283,6 +294,14 @@ class AccountTransaction(models.Model):
             models.Index(fields=['entry_number']),
             models.Index(fields=['reference_number']),
             models.Index(fields=['reconcile_status', 'account']),
+            models.Index(
+                fields=['transaction_date', 'created_time', 'categorized_transaction_id'],
+                name='idx_acctxn_list_order'
+            ),
+            trigram_index('description', name='idx_acctxn_desc_trgm'),
+            trigram_index('reference_number', name='idx_acctxn_ref_trgm'),
+            trigram_index('entry_number', name='idx_acctxn_entry_trgm'),
+            trigram_index('payee', name='idx_acctxn_payee_trgm'),
         ]
         verbose_name = 'Account Transaction'
         verbose_name_plural = 'Account Transactions'
@@ -307,20 +326,12 @@ class AccountTransaction(models.Model):
     @property
     def is_receivable(self):
         """Check if transaction is a receivable"""
-        RECEIVABLE_TYPES = [
-            'invoice', 'customer_payment', 'credit_notes',
-            'creditnote_refund', 'sales_without_invoices'
-        ]
-        return self.transaction_type in RECEIVABLE_TYPES
+        return self.transaction_type in self.RECEIVABLE_TYPES
     
     @property
     def is_payable(self):
         """Check if transaction is a payable"""
-        PAYABLE_TYPES = [
-            'bills', 'vendor_payment', 'expense',
-            'card_payment', 'purchase_or_charges'
-        ]
-        return self.transaction_type in PAYABLE_TYPES
+        return self.transaction_type in self.PAYABLE_TYPES
     
     @property
     def contact(self):
@@ -350,12 +361,18 @@ class AccountTransaction(models.Model):
                 self.base_currency_credit_amount = self.credit_amount * self.exchange_rate
         
         # Update account's transaction flags if this is a new transaction
-        if not self.pk and self.account:
+        is_new = not self.pk
+        if is_new and self.account:
             self.account.has_transaction = True
             self.account.is_involved_in_transaction = True
             self.account.save(update_fields=['has_transaction', 'is_involved_in_transaction'])
         
         super().save(*args, **kwargs)
+        
+        # Entries created directly as posted never go through post_transaction
+        if is_new and self.transaction_status == 'posted':
+            self.update_balance_snapshots()
+            self.update_contact_balance()
     
     def get_amount(self):
         """Get the transaction amount (debit or credit)"""
@@ -368,36 +385,37 @@ class AccountTransaction(models.Model):
     def post_transaction(self, user=None):
         """Post the transaction to the ledger"""
         if self.transaction_status != 'posted':
-            from django.utils import timezone
-            self.transaction_status = 'posted'
-            self.posted_time = timezone.now()
-            self.posted_by = user
-            
-            # Update account balance
-            amount = self.get_amount()
-            if self.debit_or_credit == 'debit':
-                self.account.current_balance += amount
-            else:
-                self.account.current_balance -= amount
-            
-            self.account.save(update_fields=['current_balance'])
-            self.save(update_fields=['transaction_status', 'posted_time', 'posted_by'])
+            from ..services.posting import JournalPostingService
+            result = JournalPostingService(user=user).post([self.pk])
+            if result['errors']:
+                raise ValueError(result['errors'][0]['error'])
+            self._refresh_after_posting(['transaction_status', 'posted_time', 'posted_by'])
     
     def void_transaction(self, user=None):
         """Void the transaction"""
-        if self.transaction_status == 'posted':
-            # Reverse the balance update
-            amount = self.get_amount()
-            if self.debit_or_credit == 'debit':
-                self.account.current_balance -= amount
-            else:
-                self.account.current_balance += amount
-            
-            self.account.save(update_fields=['current_balance'])
-        
-        self.transaction_status = 'void'
-        self.modified_by = user
-        self.save(update_fields=['transaction_status', 'modified_by', 'modified_time'])
+        from ..services.posting import JournalPostingService
+        result = JournalPostingService(user=user).void([self.pk])
+        if result['errors']:
+            raise ValueError(result['errors'][0]['error'])
+        self._refresh_after_posting(['transaction_status', 'modified_by', 'modified_time'])
+    
+    def _refresh_after_posting(self, fields):
+        """Reload fields written by JournalPostingService, including a cached account balance"""
+        self.refresh_from_db(fields=fields)
+        if self._state.fields_cache.get('account') is not None:
+            self.account.refresh_from_db(fields=['current_balance'])
+    
+    def update_balance_snapshots(self, reverse=False):
+        """Apply this transaction to any account snapshots it falls before"""
+        from .balances import AccountBalanceSnapshot
+        AccountBalanceSnapshot.apply_transaction(self, reverse=reverse)
+    
+    def update_contact_balance(self, reverse=False):
+        """Apply this transaction to the contact's materialized balance"""
+        if not self.contact_id:
+            return
+        from services.finance.customers.models import FinanceContactBalance
+        FinanceContactBalance.apply_transaction(self, reverse=reverse)
     
     def create_reversal(self, user=None):
         """Create a reversal transaction"""
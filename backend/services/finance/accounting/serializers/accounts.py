@@ -40,46 +40,13 @@ class ChartOfAccountListSerializer(serializers.ModelSerializer):
             # Return stored balance for performance
             return str(obj.current_balance)
         
-        # Calculate actual balance from transactions
-        from django.db.models import Sum
-        from ..models import AccountTransaction
+        # Balances precomputed for the whole page by the view
+        balances = self.context.get('balances')
+        if balances is not None and obj.account_id in balances:
+            return str(balances[obj.account_id])
         
-        transactions = AccountTransaction.objects.filter(
-            account=obj,
-            transaction_status='posted'
-        )
-        
-        total_debit = transactions.aggregate(total=Sum('debit_amount'))['total'] or Decimal('0.00')
-        total_credit = transactions.aggregate(total=Sum('credit_amount'))['total'] or Decimal('0.00')
-        
-        # Determine balance based on account type
-        asset_types = ['cash', 'bank', 'accounts_receivable', 'other_current_asset', 
-                      'fixed_asset', 'other_asset', 'intangible_asset', 'right_to_use_asset',
-                      'financial_asset', 'contingent_asset', 'contract_asset']
-        
-        expense_types = ['expense', 'cost_of_goods_sold', 'other_expense', 'manufacturing_expense',
-                        'impairment_expense', 'depreciation_expense', 'employee_benefit_expense',
-                        'lease_expense', 'finance_expense', 'tax_expense']
-        
-        if obj.account_type in asset_types or obj.account_type in expense_types:
-            balance = total_debit - total_credit
-        else:
-            balance = total_credit - total_debit
-        
-        # Add opening balance if present
-        if obj.opening_balance:
-            if obj.opening_balance_type == 'debit':
-                if obj.account_type in asset_types or obj.account_type in expense_types:
-                    balance += obj.opening_balance
-                else:
-                    balance -= obj.opening_balance
-            elif obj.opening_balance_type == 'credit':
-                if obj.account_type in asset_types or obj.account_type in expense_types:
-                    balance -= obj.opening_balance
-                else:
-                    balance += obj.opening_balance
-        
-        return str(balance)
+        from ..services import BalanceCalculationService
+        return str(BalanceCalculationService().get_balance(obj))
 
 
 class ChartOfAccountDetailSerializer(serializers.ModelSerializer):
@@ -101,52 +68,15 @@ class ChartOfAccountDetailSerializer(serializers.ModelSerializer):
         ]
     
     def get_closing_balance(self, obj):
-        """Calculate closing balance from all posted transactions"""
-        from django.db.models import Sum
-        from ..models import AccountTransaction
-        
-        # Get all posted transactions for this account
-        transactions = AccountTransaction.objects.filter(
-            account=obj,
-            transaction_status='posted'
-        )
+        """Calculate closing balance from the latest snapshot plus later postings"""
+        from ..services import BalanceCalculationService
         
-        # Sum up debits and credits
-        total_debit = transactions.aggregate(total=Sum('debit_amount'))['total'] or Decimal('0.00')
-        total_credit = transactions.aggregate(total=Sum('credit_amount'))['total'] or Decimal('0.00')
-        
-        # Determine balance based on account type (following accounting principles)
-        # Assets and Expenses have debit normal balances
-        # Liabilities, Equity, and Income have credit normal balances
-        asset_types = ['cash', 'bank', 'accounts_receivable', 'other_current_asset', 
-                      'fixed_asset', 'other_asset', 'intangible_asset', 'right_to_use_asset',
-                      'financial_asset', 'contingent_asset', 'contract_asset']
-        
-        expense_types = ['expense', 'cost_of_goods_sold', 'other_expense', 'manufacturing_expense',
-                        'impairment_expense', 'depreciation_expense', 'employee_benefit_expense',
-                        'lease_expense', 'finance_expense', 'tax_expense']
-        
-        if obj.account_type in asset_types or obj.account_type in expense_types:
-            # Debit normal balance: Balance = Debit - Credit
-            balance = total_debit - total_credit
-        else:
-            # Credit normal balance: Balance = Credit - Debit
-            balance = total_credit - total_debit
-        
-        # Add opening balance if present
-        if obj.opening_balance:
-            if obj.opening_balance_type == 'debit':
-                if obj.account_type in asset_types or obj.account_type in expense_types:
-                    balance += obj.opening_balance
-                else:
-                    balance -= obj.opening_balance
-            elif obj.opening_balance_type == 'credit':
-                if obj.account_type in asset_types or obj.account_type in expense_types:
-                    balance -= obj.opening_balance
-                else:
-                    balance += obj.opening_balance
-        
-        return str(balance)
+        # current_balance reuses the same figure, so compute it once per account
+        cache = self.__dict__.setdefault('_closing_balances', {})
+        if obj.account_id not in cache:
+            service = BalanceCalculationService(as_of_date=self.context.get('as_of_date'))
+            cache[obj.account_id] = str(service.get_balance(obj))
+        return cache[obj.account_id]
     
     def get_current_balance(self, obj):
         """Return the same as closing_balance for consistency"""
@@ -351,9 +281,17 @@ class AccountTreeSerializer(serializers.ModelSerializer):
         ]
     
     def get_children(self, obj):
-        """Recursively serialize child accounts"""
-        children = obj.children.filter(is_active=True).order_by('account_code', 'account_name')
-        return AccountTreeSerializer(children, many=True).data
+        """
+        Recursively serialize child accounts.
+        Uses the prefetched context['children_map'] (built by the tree view
+        from a single query) and only falls back to a query per node without it.
+        """
+        children_map = self.context.get('children_map')
+        if children_map is not None:
+            children = children_map.get(obj.account_id, [])
+        else:
+            children = obj.children.filter(is_active=True).order_by('account_code', 'account_name')
+        return AccountTreeSerializer(children, many=True, context=self.context).data
 
 
 class ChartOfAccountBalanceSerializer(serializers.ModelSerializer):
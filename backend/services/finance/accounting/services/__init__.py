@@ -1,7 +1,8 @@
 # Business logic services for accounting operations
-# from .posting import JournalPostingService
+from .posting import JournalPostingService
 # from .closing import PeriodClosingService
-# from .balance import BalanceCalculationService
+from .balance import BalanceCalculationService
 # from .integration import InvoiceIntegrationService
+from .reports import FinancialReportService
 
-# This file will be updated as services are implemented
\ No newline at end of file
+__all__ = ['JournalPostingService', 'BalanceCalculationService', 'FinancialReportService']
\ No newline at end of file
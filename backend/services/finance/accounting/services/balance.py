@@ -0,0 +1,276 @@
+import calendar
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth
+
+from ..models import AccountBalanceSnapshot, AccountTransaction, ChartOfAccount
+
+ZERO = Decimal('0.00')
+
+
+class BalanceCalculationService:
+    """
+    Account balance lookups backed by AccountBalanceSnapshot.
+
+    A balance as of a date is the latest snapshot on or before that date
+    plus the posted transactions dated after it, so the cost of a lookup
+    depends on recent activity rather than the full account history.
+    """
+
+    def __init__(self, as_of_date=None):
+        self.as_of_date = as_of_date
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get_totals(self, accounts):
+        """
+        Return {account_id: (debit_total, credit_total, transaction_count)}
+        for the given accounts using two queries regardless of how many
+        accounts are requested.
+        """
+        account_ids = [self._account_id(account) for account in accounts]
+        if not account_ids:
+            return {}
+
+        snapshots = AccountBalanceSnapshot.objects.filter(account_id__in=account_ids)
+        if self.as_of_date:
+            snapshots = snapshots.filter(snapshot_date__lte=self.as_of_date)
+        snapshots = snapshots.order_by('account_id', '-snapshot_date').distinct('account_id')
+
+        totals = dict.fromkeys(account_ids, (ZERO, ZERO, 0))
+        accounts_by_date = defaultdict(list)
+        for snapshot in snapshots:
+            totals[snapshot.account_id] = (
+                snapshot.debit_total, snapshot.credit_total, snapshot.transaction_count
+            )
+            accounts_by_date[snapshot.snapshot_date].append(snapshot.account_id)
+
+        # Only transactions after each account's snapshot need aggregating
+        unsnapshotted = set(account_ids).difference(
+            *[set(ids) for ids in accounts_by_date.values()]
+        )
+        condition = Q(account_id__in=unsnapshotted) if unsnapshotted else Q(pk__in=[])
+        for snapshot_date, ids in accounts_by_date.items():
+            condition |= Q(account_id__in=ids, transaction_date__gt=snapshot_date)
+
+        deltas = AccountTransaction.objects.filter(transaction_status='posted').filter(condition)
+        if self.as_of_date:
+            deltas = deltas.filter(transaction_date__lte=self.as_of_date)
+        deltas = deltas.values('account_id').annotate(
+            debit=Sum('debit_amount'),
+            credit=Sum('credit_amount'),
+            count=Count('pk')
+        ).order_by()
+
+        for row in deltas:
+            debit, credit, count = totals[row['account_id']]
+            totals[row['account_id']] = (
+                debit + (row['debit'] or ZERO),
+                credit + (row['credit'] or ZERO),
+                count + row['count']
+            )
+
+        return totals
+
+    def get_balances(self, accounts):
+        """Return {account_id: balance} for a list of ChartOfAccount instances"""
+        accounts = list(accounts)
+        totals = self.get_totals(accounts)
+        return {
+            account.account_id: self.calculate_balance(
+                account, *totals[account.account_id][:2]
+            )
+            for account in accounts
+        }
+
+    def get_balance(self, account):
+        """Return the balance of a single account"""
+        return self.get_balances([account])[account.account_id]
+
+    @staticmethod
+    def calculate_balance(account, total_debit, total_credit):
+        """
+        Convert debit/credit totals into a balance on the account's normal
+        side and apply the opening balance.
+        Assets and Expenses have debit normal balances;
+        Liabilities, Equity and Income have credit normal balances.
+        """
+        debit_normal = account.get_account_type_category() in ('Asset', 'Expense')
+
+        if debit_normal:
+            balance = total_debit - total_credit
+        else:
+            balance = total_credit - total_debit
+
+        if account.opening_balance:
+            if account.opening_balance_type == 'debit':
+                balance += account.opening_balance if debit_normal else -account.opening_balance
+            elif account.opening_balance_type == 'credit':
+                balance += -account.opening_balance if debit_normal else account.opening_balance
+
+        return balance
+
+    # ------------------------------------------------------------------
+    # Snapshot maintenance
+    # ------------------------------------------------------------------
+
+    @transaction.atomic
+    def create_snapshots(self, snapshot_date, frequency='daily', accounts=None):
+        """
+        Write a snapshot dated snapshot_date for every account (or the given
+        accounts), starting from each account's previous snapshot.
+        Returns the number of snapshots written.
+        """
+        if accounts is None:
+            accounts = ChartOfAccount.objects.all()
+        accounts = list(accounts)
+
+        totals = BalanceCalculationService(as_of_date=snapshot_date).get_totals(accounts)
+        rows = [
+            AccountBalanceSnapshot(
+                account_id=account_id,
+                snapshot_date=snapshot_date,
+                frequency=frequency,
+                debit_total=debit,
+                credit_total=credit,
+                transaction_count=count
+            )
+            for account_id, (debit, credit, count) in totals.items()
+        ]
+        return self._upsert(rows)
+
+    @transaction.atomic
+    def backfill(self, frequency='monthly', start_date=None, end_date=None):
+        """
+        Build snapshots for every period with posted activity in one grouped
+        pass over the ledger. Periods without activity are skipped because
+        the previous snapshot already holds the same cumulative totals.
+        Returns the number of snapshots written.
+        """
+        end_date = end_date or date.today()
+        trunc = TruncMonth if frequency == 'monthly' else TruncDay
+
+        periods = AccountTransaction.objects.filter(
+            transaction_status='posted',
+            transaction_date__lte=end_date
+        ).annotate(
+            period=trunc('transaction_date')
+        ).values('account_id', 'period').annotate(
+            debit=Sum('debit_amount'),
+            credit=Sum('credit_amount'),
+            count=Count('pk')
+        ).order_by('account_id', 'period')
+
+        running = {}
+        rows = []
+        for row in periods.iterator():
+            debit, credit, count = running.get(row['account_id'], (ZERO, ZERO, 0))
+            debit += row['debit'] or ZERO
+            credit += row['credit'] or ZERO
+            count += row['count']
+            running[row['account_id']] = (debit, credit, count)
+
+            snapshot_date = min(self._period_end(row['period'], frequency), end_date)
+            if start_date and snapshot_date < start_date:
+                continue
+            rows.append(AccountBalanceSnapshot(
+                account_id=row['account_id'],
+                snapshot_date=snapshot_date,
+                frequency=frequency,
+                debit_total=debit,
+                credit_total=credit,
+                transaction_count=count
+            ))
+
+        return self._upsert(rows)
+
+    def verify(self, accounts=None, repair=False):
+        """
+        Compare stored snapshots with the raw ledger, one grouped query per
+        snapshot date. Returns a list of mismatches; with repair=True the
+        mismatched snapshots are corrected in place.
+        """
+        snapshots = AccountBalanceSnapshot.objects.all()
+        if accounts is not None:
+            snapshots = snapshots.filter(
+                account_id__in=[self._account_id(account) for account in accounts]
+            )
+
+        by_date = defaultdict(list)
+        for snapshot in snapshots.order_by('snapshot_date', 'account_id'):
+            by_date[snapshot.snapshot_date].append(snapshot)
+
+        mismatches = []
+        for snapshot_date, date_snapshots in by_date.items():
+            actual = {
+                row['account_id']: row
+                for row in AccountTransaction.objects.filter(
+                    transaction_status='posted',
+                    transaction_date__lte=snapshot_date,
+                    account_id__in=[s.account_id for s in date_snapshots]
+                ).values('account_id').annotate(
+                    debit=Sum('debit_amount'),
+                    credit=Sum('credit_amount'),
+                    count=Count('pk')
+                ).order_by()
+            }
+
+            for snapshot in date_snapshots:
+                row = actual.get(snapshot.account_id, {})
+                debit = row.get('debit') or ZERO
+                credit = row.get('credit') or ZERO
+                count = row.get('count') or 0
+                if (snapshot.debit_total, snapshot.credit_total, snapshot.transaction_count) == (debit, credit, count):
+                    continue
+
+                mismatches.append({
+                    'account_id': snapshot.account_id,
+                    'snapshot_date': snapshot_date,
+                    'stored': (snapshot.debit_total, snapshot.credit_total, snapshot.transaction_count),
+                    'actual': (debit, credit, count),
+                })
+                if repair:
+                    snapshot.debit_total = debit
+                    snapshot.credit_total = credit
+                    snapshot.transaction_count = count
+                    snapshot.save(update_fields=[
+                        'debit_total', 'credit_total', 'transaction_count', 'modified_time'
+                    ])
+
+        return mismatches
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _account_id(account):
+        return account.account_id if isinstance(account, ChartOfAccount) else account
+
+    @staticmethod
+    def _period_end(period, frequency):
+        period = period.date() if hasattr(period, 'date') else period
+        if frequency == 'monthly':
+            last_day = calendar.monthrange(period.year, period.month)[1]
+            return period.replace(day=last_day)
+        return period
+
+    @staticmethod
+    def _upsert(rows, batch_size=1000):
+        for start in range(0, len(rows), batch_size):
+            AccountBalanceSnapshot.objects.bulk_create(
+                rows[start:start + batch_size],
+                update_conflicts=True,
+                unique_fields=['account', 'snapshot_date'],
+                update_fields=[
+                    'frequency', 'debit_total', 'credit_total',
+                    'transaction_count', 'modified_time'
+                ]
+            )
+        return len(rows)
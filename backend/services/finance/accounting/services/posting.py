@@ -0,0 +1,177 @@
+from decimal import Decimal
+
+from django.db import transaction as db_transaction
+from django.db.models import Case, DecimalField, F, Value, When
+from django.utils import timezone
+
+from ..models import AccountBalanceSnapshot, AccountTransaction, ChartOfAccount
+
+ZERO = Decimal('0.00')
+
+
+class JournalPostingService:
+    """
+    Posts and voids ledger transactions in bulk.
+
+    A batch runs in one database transaction: the transaction rows and
+    their accounts are locked once (in primary key order, so concurrent
+    batches cannot deadlock), each account's balance is moved by a single
+    F() expression carrying the summed delta, and the status change is one
+    UPDATE. Balance snapshots and contact balances are updated in aggregate.
+    Rows that cannot be posted are skipped and reported, not raised.
+    """
+
+    def __init__(self, user=None):
+        self.user = user
+
+    def post(self, transaction_ids):
+        """
+        Post the given transactions.
+        Returns {'posted_count', 'posted_ids', 'errors'} where errors is a
+        list of {'transaction_id', 'error'} for rows that were skipped.
+        """
+        with db_transaction.atomic():
+            transactions, errors = self._lock_transactions(transaction_ids)
+
+            postable = []
+            for txn in transactions:
+                if txn.transaction_status == 'posted':
+                    errors.append(self._error(txn.pk, 'Transaction is already posted.'))
+                elif txn.transaction_status in ['void', 'cancelled']:
+                    errors.append(self._error(
+                        txn.pk,
+                        f'{txn.transaction_status.title()} transactions cannot be posted.'
+                    ))
+                else:
+                    postable.append(txn)
+
+            if postable:
+                now = timezone.now()
+                self._apply_account_deltas(postable)
+                AccountTransaction.objects.filter(
+                    pk__in=[txn.pk for txn in postable]
+                ).update(
+                    transaction_status='posted',
+                    posted_time=now,
+                    posted_by=self.user
+                )
+                for txn in postable:
+                    txn.transaction_status = 'posted'
+                    txn.posted_time = now
+                    txn.posted_by = self.user
+                self._apply_derived_balances(postable)
+
+        return {
+            'posted_count': len(postable),
+            'posted_ids': [txn.pk for txn in postable],
+            'errors': errors,
+        }
+
+    def void(self, transaction_ids):
+        """
+        Void the given transactions, reversing the balance effect of any
+        that were posted.
+        Returns {'voided_count', 'voided_ids', 'errors'}.
+        """
+        with db_transaction.atomic():
+            transactions, errors = self._lock_transactions(transaction_ids)
+
+            voidable = []
+            for txn in transactions:
+                if txn.transaction_status == 'void':
+                    errors.append(self._error(txn.pk, 'Transaction is already void.'))
+                else:
+                    voidable.append(txn)
+
+            posted = [txn for txn in voidable if txn.transaction_status == 'posted']
+            if posted:
+                self._apply_account_deltas(posted, reverse=True)
+
+            if voidable:
+                now = timezone.now()
+                AccountTransaction.objects.filter(
+                    pk__in=[txn.pk for txn in voidable]
+                ).update(
+                    transaction_status='void',
+                    modified_by=self.user,
+                    modified_time=now
+                )
+                for txn in voidable:
+                    txn.transaction_status = 'void'
+                    txn.modified_by = self.user
+                    txn.modified_time = now
+
+            if posted:
+                self._apply_derived_balances(posted, reverse=True)
+
+        return {
+            'voided_count': len(voidable),
+            'voided_ids': [txn.pk for txn in voidable],
+            'errors': errors,
+        }
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _lock_transactions(self, transaction_ids):
+        """Lock the requested transaction rows and report any that are missing"""
+        transaction_ids = list(dict.fromkeys(transaction_ids))
+        transactions = list(
+            AccountTransaction.objects.select_for_update().filter(
+                pk__in=transaction_ids
+            ).order_by('pk')
+        )
+        found = {txn.pk for txn in transactions}
+        errors = [
+            self._error(pk, 'Transaction not found.')
+            for pk in transaction_ids if pk not in found
+        ]
+        return transactions, errors
+
+    @staticmethod
+    def _apply_account_deltas(transactions, reverse=False):
+        """Lock the affected accounts and move each balance with one UPDATE"""
+        deltas = {}
+        for txn in transactions:
+            amount = txn.get_amount() or ZERO
+            if txn.debit_or_credit != 'debit':
+                amount = -amount
+            if reverse:
+                amount = -amount
+            deltas[txn.account_id] = deltas.get(txn.account_id, ZERO) + amount
+
+        deltas = {account_id: delta for account_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        # Lock in a fixed order so concurrent batches queue instead of deadlocking
+        list(
+            ChartOfAccount.objects.select_for_update().filter(
+                pk__in=deltas
+            ).order_by('pk').values_list('pk', flat=True)
+        )
+
+        amount_field = DecimalField(max_digits=19, decimal_places=2)
+        ChartOfAccount.objects.filter(pk__in=deltas).update(
+            current_balance=F('current_balance') + Case(
+                *[When(pk=account_id, then=Value(delta)) for account_id, delta in deltas.items()],
+                default=Value(ZERO),
+                output_field=amount_field
+            )
+        )
+
+    @staticmethod
+    def _apply_derived_balances(transactions, reverse=False):
+        """Keep balance snapshots and contact balances in step with the batch"""
+        from services.finance.customers.models import FinanceContactBalance
+
+        AccountBalanceSnapshot.apply_transactions(transactions, reverse=reverse)
+        FinanceContactBalance.apply_transactions(
+            [txn for txn in transactions if txn.contact_id],
+            reverse=reverse
+        )
+
+    @staticmethod
+    def _error(transaction_id, message):
+        return {'transaction_id': transaction_id, 'error': message}
@@ -0,0 +1,360 @@
+import csv
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Case, DecimalField, Q, Sum, Value, When
+
+from ..models import AccountTransaction, ChartOfAccount
+
+ZERO = Decimal('0.00')
+
+CATEGORY_ORDER = ['Asset', 'Liability', 'Equity', 'Income', 'Expense']
+DEBIT_NORMAL_CATEGORIES = ('Asset', 'Expense')
+
+
+class _EchoBuffer:
+    """File-like object whose write() returns the value, for streaming csv"""
+
+    def write(self, value):
+        return value
+
+
+class FinancialReportService:
+    """
+    Trial balance, balance sheet and profit & loss reports.
+
+    Every report is built from a single grouped query over posted
+    AccountTransaction rows (opening and period movements are split with
+    conditional sums) plus one query for the chart of accounts. Child
+    balances are rolled up the parent_account hierarchy in memory.
+    """
+
+    ROW_COLUMNS = {
+        'trial_balance': [
+            'account_id', 'account_code', 'account_name', 'account_type',
+            'account_category', 'parent_account_id', 'depth',
+            'opening_balance', 'period_debit', 'period_credit',
+            'debit', 'credit', 'total_debit', 'total_credit',
+        ],
+        'balance_sheet': [
+            'section', 'account_id', 'account_code', 'account_name',
+            'account_type', 'parent_account_id', 'depth',
+            'balance', 'total_balance',
+        ],
+        'profit_and_loss': [
+            'section', 'account_id', 'account_code', 'account_name',
+            'account_type', 'parent_account_id', 'depth',
+            'balance', 'total_balance',
+        ],
+    }
+
+    def __init__(self, start_date=None, end_date=None, include_inactive=True):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.include_inactive = include_inactive
+        self._lines = None
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
+
+    def trial_balance(self):
+        """Closing debit/credit per account with opening and period movements"""
+        lines = self._get_lines()
+        rows = []
+        total_debit = total_credit = ZERO
+
+        for line in self._ordered(lines.values()):
+            net = line['closing_debit'] - line['closing_credit']
+            total_net = line['total_closing_debit'] - line['total_closing_credit']
+            debit, credit = (net, ZERO) if net >= 0 else (ZERO, -net)
+            total_debit += debit
+            total_credit += credit
+
+            rows.append({
+                **self._account_fields(line),
+                'opening_balance': line['opening_debit'] - line['opening_credit'],
+                'period_debit': line['period_debit'],
+                'period_credit': line['period_credit'],
+                'debit': debit,
+                'credit': credit,
+                'total_debit': total_net if total_net >= 0 else ZERO,
+                'total_credit': -total_net if total_net < 0 else ZERO,
+            })
+
+        return self._report('trial_balance', rows, {
+            'total_debit': total_debit,
+            'total_credit': total_credit,
+            'difference': total_debit - total_credit,
+            'is_balanced': total_debit == total_credit,
+        })
+
+    def balance_sheet(self):
+        """Asset, liability and equity balances as of the end date"""
+        lines = self._get_lines()
+        rows = []
+        totals = dict.fromkeys(CATEGORY_ORDER, ZERO)
+
+        for line in self._ordered(lines.values()):
+            category = line['account'].get_account_type_category()
+            balance = self._normal_balance(
+                category, line['closing_debit'], line['closing_credit']
+            )
+            totals[category] = totals.get(category, ZERO) + balance
+            if category not in ('Asset', 'Liability', 'Equity'):
+                continue
+
+            rows.append({
+                'section': category,
+                **self._account_fields(line),
+                'balance': balance,
+                'total_balance': self._normal_balance(
+                    category, line['total_closing_debit'], line['total_closing_credit']
+                ),
+            })
+
+        # Income and expense not yet closed to equity
+        net_income = totals['Income'] - totals['Expense']
+        total_equity = totals['Equity'] + net_income
+
+        return self._report('balance_sheet', rows, {
+            'total_assets': totals['Asset'],
+            'total_liabilities': totals['Liability'],
+            'total_equity': total_equity,
+            'net_income': net_income,
+            'total_liabilities_and_equity': totals['Liability'] + total_equity,
+            'is_balanced': totals['Asset'] == totals['Liability'] + total_equity,
+        })
+
+    def profit_and_loss(self):
+        """Income and expense movements between the start and end dates"""
+        lines = self._get_lines()
+        rows = []
+        totals = {'Income': ZERO, 'Expense': ZERO}
+        operating_income = cost_of_goods_sold = ZERO
+
+        for line in self._ordered(lines.values()):
+            category = line['account'].get_account_type_category()
+            if category not in totals:
+                continue
+
+            balance = self._normal_balance(
+                category, line['period_debit'], line['period_credit']
+            )
+            totals[category] += balance
+            if line['account'].account_type == 'income':
+                operating_income += balance
+            elif line['account'].account_type == 'cost_of_goods_sold':
+                cost_of_goods_sold += balance
+
+            rows.append({
+                'section': category,
+                **self._account_fields(line),
+                'balance': balance,
+                'total_balance': self._normal_balance(
+                    category, line['total_period_debit'], line['total_period_credit']
+                ),
+            })
+
+        return self._report('profit_and_loss', rows, {
+            'total_income': totals['Income'],
+            'total_expenses': totals['Expense'],
+            'operating_income': operating_income,
+            'cost_of_goods_sold': cost_of_goods_sold,
+            'gross_profit': operating_income - cost_of_goods_sold,
+            'net_profit': totals['Income'] - totals['Expense'],
+        })
+
+    # ------------------------------------------------------------------
+    # Streaming output
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def stream_json(report):
+        """Yield the report as JSON, one account row per chunk"""
+        encoder = DjangoJSONEncoder()
+        header = {key: value for key, value in report.items() if key not in ('rows', 'totals')}
+
+        yield encoder.encode(header)[:-1] + ', "rows": ['
+        for index, row in enumerate(report['rows']):
+            yield (',' if index else '') + encoder.encode(row)
+        yield '], "totals": ' + encoder.encode(report['totals']) + '}'
+
+    @staticmethod
+    def stream_csv(report):
+        """Yield the report as CSV lines followed by the totals"""
+        writer = csv.writer(_EchoBuffer())
+        columns = report['columns']
+
+        yield writer.writerow(columns)
+        for row in report['rows']:
+            yield writer.writerow([row.get(column, '') for column in columns])
+
+        yield writer.writerow([])
+        for key, value in report['totals'].items():
+            yield writer.writerow([key, value])
+
+    # ------------------------------------------------------------------
+    # Ledger aggregation
+    # ------------------------------------------------------------------
+
+    def _get_lines(self):
+        if self._lines is None:
+            self._lines = self._build_lines()
+        return self._lines
+
+    def _build_lines(self):
+        """
+        Load accounts and ledger totals, then roll totals up the hierarchy.
+        Inactive accounts are always loaded so their postings still count;
+        without include_inactive only those with nothing to show are hidden.
+        """
+        accounts = {account.account_id: account for account in ChartOfAccount.objects.all()}
+
+        lines = {}
+        for account_id, account in accounts.items():
+            opening_debit, opening_credit, period_debit, period_credit = self._account_opening(account)
+            lines[account_id] = {
+                'account': account,
+                'opening_debit': opening_debit,
+                'opening_credit': opening_credit,
+                'period_debit': period_debit,
+                'period_credit': period_credit,
+            }
+
+        for row in self._ledger_totals():
+            line = lines.get(row['account_id'])
+            if line is None:
+                continue
+            line['opening_debit'] += row['opening_debit'] or ZERO
+            line['opening_credit'] += row['opening_credit'] or ZERO
+            line['period_debit'] += row['period_debit'] or ZERO
+            line['period_credit'] += row['period_credit'] or ZERO
+
+        for line in lines.values():
+            line['closing_debit'] = line['opening_debit'] + line['period_debit']
+            line['closing_credit'] = line['opening_credit'] + line['period_credit']
+
+        self._roll_up(lines)
+        if not self.include_inactive:
+            lines = {
+                account_id: line for account_id, line in lines.items()
+                if line['account'].is_active or self._has_balance(line)
+            }
+        return lines
+
+    @staticmethod
+    def _has_balance(line):
+        return any(line[field] for field in (
+            'opening_debit', 'opening_credit', 'period_debit', 'period_credit',
+            'total_period_debit', 'total_period_credit', 'total_closing_debit', 'total_closing_credit',
+        ))
+
+    def _ledger_totals(self):
+        """One grouped pass splitting each account's postings into opening and period"""
+        amount_field = DecimalField(max_digits=19, decimal_places=2)
+        zero = Value(ZERO, output_field=amount_field)
+
+        transactions = AccountTransaction.objects.filter(transaction_status='posted')
+        if self.end_date:
+            transactions = transactions.filter(transaction_date__lte=self.end_date)
+
+        if not self.start_date:
+            # Everything up to the end date falls inside the period
+            return transactions.values('account_id').annotate(
+                opening_debit=zero,
+                opening_credit=zero,
+                period_debit=Sum('debit_amount'),
+                period_credit=Sum('credit_amount'),
+            ).order_by()
+
+        before = Q(transaction_date__lt=self.start_date)
+        during = Q(transaction_date__gte=self.start_date)
+
+        def conditional_sum(condition, field):
+            return Sum(Case(When(condition, then=field), default=zero, output_field=amount_field))
+
+        return transactions.values('account_id').annotate(
+            opening_debit=conditional_sum(before, 'debit_amount'),
+            opening_credit=conditional_sum(before, 'credit_amount'),
+            period_debit=conditional_sum(during, 'debit_amount'),
+            period_credit=conditional_sum(during, 'credit_amount'),
+        ).order_by()
+
+    def _account_opening(self, account):
+        """
+        Split the account's opening balance into (opening_debit,
+        opening_credit, period_debit, period_credit) based on its date.
+        """
+        amounts = [ZERO, ZERO, ZERO, ZERO]
+        if not account.opening_balance or account.opening_balance_type not in ('debit', 'credit'):
+            return amounts
+
+        balance_date = account.opening_balance_date
+        if self.end_date and balance_date and balance_date > self.end_date:
+            return amounts
+
+        in_period = bool(self.start_date and balance_date and balance_date >= self.start_date)
+        index = (2 if in_period else 0) + (0 if account.opening_balance_type == 'debit' else 1)
+        amounts[index] = account.opening_balance
+        return amounts
+
+    @staticmethod
+    def _roll_up(lines):
+        """Add every account's figures to itself and each of its ancestors"""
+        fields = ['period_debit', 'period_credit', 'closing_debit', 'closing_credit']
+        for line in lines.values():
+            for field in fields:
+                line[f'total_{field}'] = ZERO
+
+        for account_id, line in lines.items():
+            visited = set()
+            current_id = account_id
+            while current_id is not None and current_id in lines and current_id not in visited:
+                visited.add(current_id)
+                target = lines[current_id]
+                for field in fields:
+                    target[f'total_{field}'] += line[field]
+                current_id = target['account'].parent_account_id
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _report(self, name, rows, totals):
+        return {
+            'report': name,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'columns': self.ROW_COLUMNS[name],
+            'rows': rows,
+            'totals': totals,
+        }
+
+    @staticmethod
+    def _ordered(lines):
+        def sort_key(line):
+            account = line['account']
+            category = account.get_account_type_category()
+            position = CATEGORY_ORDER.index(category) if category in CATEGORY_ORDER else len(CATEGORY_ORDER)
+            return position, account.account_code or '', account.account_name
+        return sorted(lines, key=sort_key)
+
+    @staticmethod
+    def _account_fields(line):
+        account = line['account']
+        return {
+            'account_id': account.account_id,
+            'account_code': account.account_code,
+            'account_name': account.account_name,
+            'account_type': account.account_type,
+            'account_category': account.get_account_type_category(),
+            'parent_account_id': account.parent_account_id,
+            'depth': account.depth,
+        }
+
+    @staticmethod
+    def _normal_balance(category, debit, credit):
+        if category in DEBIT_NORMAL_CATEGORIES:
+            return debit - credit
+        return credit - debit
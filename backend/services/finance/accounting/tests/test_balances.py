@@ -0,0 +1,73 @@
+from datetime import date
+from decimal import Decimal
+
+from django_tenants.test.cases import TenantTestCase
+
+from services.finance.accounting.models import (
+    AccountBalanceSnapshot,
+    AccountTransaction,
+    ChartOfAccount,
+)
+from services.finance.accounting.services.posting import JournalPostingService
+
+
+class AccountBalanceSnapshotBatchTests(TenantTestCase):
+    def setUp(self):
+        self.account = ChartOfAccount.objects.create(account_name='Operating Bank', account_type='bank')
+        self.january = AccountBalanceSnapshot.objects.create(
+            account=self.account, snapshot_date=date(2024, 1, 31)
+        )
+        self.february = AccountBalanceSnapshot.objects.create(
+            account=self.account, snapshot_date=date(2024, 2, 29)
+        )
+
+    def _transaction(self, number, transaction_date, debit_or_credit, amount):
+        return AccountTransaction.objects.create(
+            transaction_id=f'TXN-{number}',
+            account=self.account,
+            transaction_type='journal',
+            transaction_date=transaction_date,
+            entry_number=f'JE-{number}',
+            debit_or_credit=debit_or_credit,
+            debit_amount=amount if debit_or_credit == 'debit' else Decimal('0.00'),
+            credit_amount=amount if debit_or_credit == 'credit' else Decimal('0.00'),
+        )
+
+    def test_batches_on_the_same_account_both_reach_the_snapshots(self):
+        first = [
+            self._transaction(1, date(2024, 1, 10), 'debit', Decimal('100.00')),
+            self._transaction(2, date(2024, 2, 10), 'credit', Decimal('30.00')),
+        ]
+        second = [
+            self._transaction(3, date(2024, 1, 20), 'debit', Decimal('5.00')),
+            self._transaction(4, date(2024, 2, 20), 'debit', Decimal('7.00')),
+        ]
+
+        service = JournalPostingService()
+        service.post([txn.pk for txn in first])
+        service.post([txn.pk for txn in second])
+
+        self.january.refresh_from_db()
+        self.february.refresh_from_db()
+        self.assertEqual(self.january.debit_total, Decimal('105.00'))
+        self.assertEqual(self.january.credit_total, Decimal('0.00'))
+        self.assertEqual(self.january.transaction_count, 2)
+        self.assertEqual(self.february.debit_total, Decimal('112.00'))
+        self.assertEqual(self.february.credit_total, Decimal('30.00'))
+        self.assertEqual(self.february.transaction_count, 4)
+
+    def test_void_removes_only_its_own_batch(self):
+        first = [self._transaction(1, date(2024, 1, 10), 'debit', Decimal('100.00'))]
+        second = [self._transaction(2, date(2024, 2, 10), 'debit', Decimal('40.00'))]
+
+        service = JournalPostingService()
+        service.post([txn.pk for txn in first])
+        service.post([txn.pk for txn in second])
+        service.void([txn.pk for txn in first])
+
+        self.january.refresh_from_db()
+        self.february.refresh_from_db()
+        self.assertEqual(self.january.debit_total, Decimal('0.00'))
+        self.assertEqual(self.january.transaction_count, 0)
+        self.assertEqual(self.february.debit_total, Decimal('40.00'))
+        self.assertEqual(self.february.transaction_count, 1)
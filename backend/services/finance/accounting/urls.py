@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ChartOfAccountViewSet, AccountTransactionViewSet
+from .views import ChartOfAccountViewSet, AccountTransactionViewSet, FinancialReportViewSet
 
 router = DefaultRouter()
 router.register(r'chartofaccounts', ChartOfAccountViewSet, basename='chartofaccount')
 router.register(r'transactions', AccountTransactionViewSet, basename='accounttransaction')
+router.register(r'reports', FinancialReportViewSet, basename='financialreport')
 
 app_name = 'accounting'
 
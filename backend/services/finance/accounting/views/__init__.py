@@ -1,4 +1,5 @@
 from .accounts import ChartOfAccountViewSet
 from .transactions import AccountTransactionViewSet
+from .reports import FinancialReportViewSet
 
-__all__ = ['ChartOfAccountViewSet', 'AccountTransactionViewSet']
\ No newline at end of file
+__all__ = ['ChartOfAccountViewSet', 'AccountTransactionViewSet', 'FinancialReportViewSet']
\ No newline at end of file
@@ -16,6 +16,7 @@ from ..serializers import (
     AccountTreeSerializer,
     AccountTransactionSerializer
 )
+from ..services import BalanceCalculationService
 
 
 class ChartOfAccountViewSet(viewsets.ModelViewSet):
@@ -149,11 +150,16 @@ class ChartOfAccountViewSet(viewsets.ModelViewSet):
         serializer_context['show_balance'] = show_balance
         
         page = self.paginate_queryset(queryset)
+        accounts = page if page is not None else list(queryset)
+        
+        if show_balance:
+            # Resolve every balance on the page in two queries
+            serializer_context['balances'] = BalanceCalculationService().get_balances(accounts)
+        
+        serializer = self.get_serializer(accounts, many=True, context=serializer_context)
         if page is not None:
-            serializer = self.get_serializer(page, many=True, context=serializer_context)
             return self.get_paginated_response(serializer.data)
         
-        serializer = self.get_serializer(queryset, many=True, context=serializer_context)
         return Response({
             'code': 0,
             'message': 'success',
@@ -177,7 +183,19 @@ class ChartOfAccountViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         """Get account details with balance calculation"""
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
+        
+        serializer_context = self.get_serializer_context()
+        as_of_date = request.query_params.get('as_of_date')
+        if as_of_date:
+            try:
+                serializer_context['as_of_date'] = datetime.strptime(as_of_date, '%Y-%m-%d').date()
+            except ValueError:
+                return Response({
+                    'code': 400,
+                    'message': 'as_of_date must be in YYYY-MM-DD format.'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = self.get_serializer(instance, context=serializer_context)
         
         return Response({
             'code': 0,
@@ -326,13 +344,18 @@ class ChartOfAccountViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def tree(self, request):
         """Return hierarchical tree structure of accounts"""
-        # Get root accounts (no parent)
-        root_accounts = ChartOfAccount.objects.filter(
-            parent_account__isnull=True,
+        # Load the whole active hierarchy once and assemble it in memory
+        accounts = ChartOfAccount.objects.filter(
             is_active=True
         ).order_by('account_code', 'account_name')
+        children_map = ChartOfAccount.group_by_parent(accounts)
+        
+        # Root accounts (no parent)
+        root_accounts = children_map.get(None, [])
         
-        serializer = AccountTreeSerializer(root_accounts, many=True)
+        serializer = AccountTreeSerializer(
+            root_accounts, many=True, context={'children_map': children_map}
+        )
         
         return Response({
             'code': 0,
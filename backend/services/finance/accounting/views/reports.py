@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from django.http import StreamingHttpResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.tenants.permissions import HasTenantPermission, IsTenantUser
+
+from ..services.reports import FinancialReportService
+
+
+class FinancialReportViewSet(viewsets.ViewSet):
+    """
+    ViewSet for accounting reports computed from the posted ledger.
+    Supports ?date.start=YYYY-MM-DD&date.end=YYYY-MM-DD and ?output=json|csv.
+    """
+    permission_classes = [IsAuthenticated, IsTenantUser, HasTenantPermission]
+    required_permissions = ['all', 'manage_accounting', 'view_accounting']
+
+    @action(detail=False, methods=['get'])
+    def trial_balance(self, request):
+        """Trial balance for the requested date range"""
+        return self._render(request, 'trial_balance')
+
+    @action(detail=False, methods=['get'])
+    def balance_sheet(self, request):
+        """Balance sheet as of date.end (defaults to all posted activity)"""
+        return self._render(request, 'balance_sheet')
+
+    @action(detail=False, methods=['get'])
+    def profit_and_loss(self, request):
+        """Profit & loss for the requested date range"""
+        return self._render(request, 'profit_and_loss')
+
+    def _render(self, request, report_name):
+        """Build the report and stream it back as JSON or CSV"""
+        try:
+            start_date = self._parse_date(request.query_params.get('date.start'))
+            end_date = self._parse_date(request.query_params.get('date.end'))
+        except ValueError:
+            return Response({
+                'code': 400,
+                'message': 'Dates must be in YYYY-MM-DD format.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if start_date and end_date and start_date > end_date:
+            return Response({
+                'code': 400,
+                'message': 'date.start must be on or before date.end.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        include_inactive = request.query_params.get('include_inactive', 'true').lower() == 'true'
+        service = FinancialReportService(
+            start_date=None if report_name == 'balance_sheet' else start_date,
+            end_date=end_date,
+            include_inactive=include_inactive
+        )
+        report = getattr(service, report_name)()
+
+        if request.query_params.get('output', 'json').lower() == 'csv':
+            response = StreamingHttpResponse(
+                FinancialReportService.stream_csv(report),
+                content_type='text/csv'
+            )
+            response['Content-Disposition'] = f'attachment; filename="{report_name}.csv"'
+            return response
+
+        return StreamingHttpResponse(
+            FinancialReportService.stream_json(report),
+            content_type='application/json'
+        )
+
+    @staticmethod
+    def _parse_date(value):
+        if not value:
+            return None
+        return datetime.strptime(value, '%Y-%m-%d').date()
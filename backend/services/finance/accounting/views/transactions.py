@@ -4,9 +4,12 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
 from datetime import datetime, date
+from core.shared.exports import ExportMixin
+from core.shared.search import SearchFilter
 from core.tenants.permissions import HasTenantPermission, IsTenantUser
 
 from ..models import AccountTransaction
+from ..services.posting import JournalPostingService
 from ..serializers import (
     AccountTransactionSerializer,
     AccountTransactionCreateSerializer,
@@ -16,7 +19,7 @@ from ..serializers import (
 )
 
 
-class AccountTransactionViewSet(viewsets.ModelViewSet):
+class AccountTransactionViewSet(ExportMixin, viewsets.ModelViewSet):
     """
     ViewSet for Account Transaction management.
     Provides CRUD operations and transaction-specific actions.
@@ -24,10 +27,47 @@ class AccountTransactionViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsTenantUser, HasTenantPermission]
     queryset = AccountTransaction.objects.all()
     required_permissions = ['all', 'manage_accounting', 'view_accounting', 'manage_transactions']
+    # Search in description, reference number, entry number and payee; ledger
+    # listings keep their date/amount sort instead of relevance ordering
+    filter_backends = [SearchFilter]
+    search_fields = ['description', 'reference_number', 'entry_number', 'payee']
+    search_rank = False
+    # Cursor pages over millions of ledger rows report a planner estimate, not COUNT(*)
+    keyset_count = 'estimate'
+    # Ledger export: GET /export/ with the list filters
+    export_filename = 'transactions'
+    export_fields = {
+        'categorized_transaction_id': 'categorized_transaction_id',
+        'transaction_id': 'transaction_id',
+        'entry_number': 'entry_number',
+        'transaction_date': 'transaction_date',
+        'transaction_type': 'transaction_type',
+        'transaction_status': 'transaction_status',
+        'transaction_source': 'transaction_source',
+        'account_id': 'account_id',
+        'account_code': 'account__account_code',
+        'account_name': 'account__account_name',
+        'debit_or_credit': 'debit_or_credit',
+        'debit_amount': 'debit_amount',
+        'credit_amount': 'credit_amount',
+        'currency_code': 'currency_code',
+        'exchange_rate': 'exchange_rate',
+        'base_currency_debit_amount': 'base_currency_debit_amount',
+        'base_currency_credit_amount': 'base_currency_credit_amount',
+        'contact_id': 'contact_id',
+        'payee': 'payee',
+        'description': 'description',
+        'reference_number': 'reference_number',
+        'offset_account_name': 'offset_account_name',
+        'reconcile_status': 'reconcile_status',
+        'invoice_id': 'invoice_id',
+        'payment_id': 'payment_id',
+        'created_time': 'created_time',
+    }
     
     def get_required_permissions(self):
         """Define permissions based on action"""
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'export']:
             # Read operations
             return ['all', 'manage_accounting', 'view_accounting', 'manage_transactions']
         elif self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -134,16 +174,6 @@ class AccountTransactionViewSet(viewsets.ModelViewSet):
         if reconcile_status:
             queryset = queryset.filter(reconcile_status=reconcile_status)
         
-        # Search in description, reference number, entry number
-        search = self.request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(description__icontains=search) |
-                Q(reference_number__icontains=search) |
-                Q(entry_number__icontains=search) |
-                Q(payee__icontains=search)
-            )
-        
         # Sort
         sort_by = self.request.query_params.get('sort_by', '-transaction_date')
         if sort_by in ['transaction_date', '-transaction_date', 'amount', '-amount', 
@@ -245,22 +275,18 @@ class AccountTransactionViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         
         transaction_ids = serializer.validated_data['transaction_ids']
-        transactions = AccountTransaction.objects.filter(
-            categorized_transaction_id__in=transaction_ids
-        )
         
-        posted_count = 0
-        errors = []
-        
-        for transaction in transactions:
-            try:
-                transaction.post_transaction(user=request.user)
-                posted_count += 1
-            except Exception as e:
-                errors.append({
-                    'transaction_id': transaction.categorized_transaction_id,
-                    'error': str(e)
-                })
+        try:
+            result = JournalPostingService(user=request.user).post(transaction_ids)
+            posted_count = result['posted_count']
+            errors = result['errors']
+        except Exception as e:
+            # The batch is atomic, so nothing was posted
+            posted_count = 0
+            errors = [
+                {'transaction_id': transaction_id, 'error': str(e)}
+                for transaction_id in transaction_ids
+            ]
         
         if errors:
             return Response({
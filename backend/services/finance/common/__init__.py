@@ -1,3 +1,3 @@
-from .mixins import DocumentFeesMixin
-
-__all__ = ['DocumentFeesMixin']
+# Shared finance building blocks. This package is an installed app, so
+# import from the submodules (e.g. services.finance.common.mixins) rather
+# than from the package itself.
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class FinanceCommonConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'services.finance.common'
+    label = 'finance_common'
+    verbose_name = 'Finance Common'
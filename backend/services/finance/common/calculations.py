@@ -0,0 +1,140 @@
+"""
+Decimal money maths shared by invoices, estimates and sales orders.
+
+Rounding rules (applied identically everywhere):
+- Every stored amount is rounded to 2 decimal places with ROUND_HALF_UP.
+- line_subtotal = round(quantity x unit_price x (1 - discount_rate / 100))
+- vat_amount = round(line_subtotal x vat_rate / 100), taken from the
+  rounded subtotal so VAT always reconciles with the stored line.
+- line_total = line_subtotal + vat_amount (no further rounding needed).
+- Document totals are sums of the rounded line amounts, so they always
+  equal the sum of what is stored on the lines.
+"""
+from decimal import ROUND_HALF_UP, Decimal, localcontext
+from typing import NamedTuple
+
+MONEY_PLACES = Decimal('0.01')
+HUNDRED = Decimal('100')
+ZERO = Decimal('0.00')
+ROUNDING = ROUND_HALF_UP
+PRECISION = 28
+
+
+def to_decimal(value):
+    """Convert a model or request value to Decimal without float artefacts"""
+    if value is None or value == '':
+        return ZERO
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return Decimal(value)
+
+
+def round_money(value):
+    return value.quantize(MONEY_PLACES, rounding=ROUNDING)
+
+
+class LineAmounts(NamedTuple):
+    """Calculated amounts for one batch of lines, in input order, plus totals"""
+    line_subtotals: list[Decimal]
+    discount_amounts: list[Decimal]
+    vat_amounts: list[Decimal]
+    line_totals: list[Decimal]
+    subtotal: Decimal
+    discount_total: Decimal
+    vat_total: Decimal
+    total: Decimal
+
+
+class FeeAmounts(NamedTuple):
+    shipping_vat_amount: Decimal
+    fees_subtotal: Decimal
+    total_fees: Decimal
+
+
+def calculate_lines(quantities, unit_prices, discount_rates=None, vat_rates=None):
+    """
+    Calculate a whole document's lines in one pass. Arguments are parallel
+    sequences; discount_rates and vat_rates default to 0 for every line.
+    """
+    count = len(quantities)
+    if len(unit_prices) != count:
+        raise ValueError("quantities and unit_prices must be the same length")
+    discount_rates = discount_rates if discount_rates is not None else [ZERO] * count
+    vat_rates = vat_rates if vat_rates is not None else [ZERO] * count
+    if len(discount_rates) != count or len(vat_rates) != count:
+        raise ValueError("discount_rates and vat_rates must match the number of lines")
+
+    line_subtotals, discount_amounts, vat_amounts, line_totals = [], [], [], []
+    subtotal = discount_total = vat_total = ZERO
+
+    with localcontext() as context:
+        context.prec = PRECISION
+        context.rounding = ROUNDING
+
+        for quantity, unit_price, discount_rate, vat_rate in zip(
+                quantities, unit_prices, discount_rates, vat_rates, strict=True):
+            gross = to_decimal(quantity) * to_decimal(unit_price)
+            line_subtotal = round_money(gross * (HUNDRED - to_decimal(discount_rate)) / HUNDRED)
+            discount_amount = round_money(gross) - line_subtotal
+            vat_amount = round_money(line_subtotal * to_decimal(vat_rate) / HUNDRED)
+            line_total = line_subtotal + vat_amount
+
+            line_subtotals.append(line_subtotal)
+            discount_amounts.append(discount_amount)
+            vat_amounts.append(vat_amount)
+            line_totals.append(line_total)
+            subtotal += line_subtotal
+            discount_total += discount_amount
+            vat_total += vat_amount
+
+    return LineAmounts(
+        line_subtotals=line_subtotals,
+        discount_amounts=discount_amounts,
+        vat_amounts=vat_amounts,
+        line_totals=line_totals,
+        subtotal=subtotal,
+        discount_total=discount_total,
+        vat_total=vat_total,
+        total=subtotal + vat_total,
+    )
+
+
+def calculate_line_items(lines):
+    """
+    Calculate and set line_subtotal, vat_amount and line_total on line item
+    instances (any of the three document line models) in one batched pass.
+    Returns the LineAmounts for the batch; callers persist the lines, e.g.
+    with bulk_create or bulk_update for repricing jobs.
+    """
+    lines = list(lines)
+    amounts = calculate_lines(
+        [line.quantity for line in lines],
+        [line.unit_price for line in lines],
+        [line.discount_rate for line in lines],
+        [line.vat_rate for line in lines],
+    )
+    for index, line in enumerate(lines):
+        line.line_subtotal = amounts.line_subtotals[index]
+        line.vat_amount = amounts.vat_amounts[index]
+        line.line_total = amounts.line_totals[index]
+    return amounts
+
+
+def calculate_fees(shipping_fee, shipping_vat_rate, rush_fee):
+    """Shipping VAT and fee totals; rush fees carry no VAT"""
+    with localcontext() as context:
+        context.prec = PRECISION
+        context.rounding = ROUNDING
+
+        shipping_fee = to_decimal(shipping_fee)
+        rush_fee = to_decimal(rush_fee)
+        shipping_vat_amount = round_money(shipping_fee * to_decimal(shipping_vat_rate) / HUNDRED)
+        fees_subtotal = shipping_fee + rush_fee
+
+    return FeeAmounts(
+        shipping_vat_amount=shipping_vat_amount,
+        fees_subtotal=fees_subtotal,
+        total_fees=fees_subtotal + shipping_vat_amount,
+    )
@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.db.models import Sum
+
+from .calculations import ZERO, calculate_line_items
+
+# Line fields copied when a document is duplicated or converted
+LINE_COPY_FIELDS = [
+    'product_id', 'description', 'quantity', 'unit_price',
+    'discount_rate', 'vat_rate', 'sort_order',
+]
+
+
+def recalculate_document_totals(document):
+    """
+    Refresh a document's subtotal and total_amount from its lines with one
+    aggregate query.
+    """
+    totals = document.line_items.aggregate(
+        subtotal=Sum('line_subtotal'),
+        total_amount=Sum('line_total')
+    )
+    document.subtotal = totals['subtotal'] or ZERO
+    document.total_amount = totals['total_amount'] or ZERO
+
+    # Save without triggering additional signals
+    document.save(update_fields=['subtotal', 'total_amount', 'updated_at'])
+
+
+class LineItemWriter:
+    """
+    Collects line items for one document (invoice, estimate or sales order)
+    and writes them with a single bulk_create followed by one totals
+    recalculation. Line maths for the whole batch is done in-process in
+    one Decimal pass (see calculations.calculate_line_items).
+
+        with LineItemWriter(invoice) as writer:
+            writer.copy_from(estimate.line_items.all())
+    """
+
+    def __init__(self, document, batch_size=500):
+        self.document = document
+        self.batch_size = batch_size
+        related = document.line_items
+        self.model = related.model
+        self.fk_name = related.field.name
+        self.lines = []
+
+    def add(self, **fields):
+        """Queue a line item built from model field values"""
+        line = self.model(**fields)
+        setattr(line, self.fk_name, self.document)
+        self.lines.append(line)
+        return line
+
+    def add_many(self, lines_data):
+        """Queue several line items, e.g. validated serializer data"""
+        return [self.add(**dict(line_data)) for line_data in lines_data]
+
+    def copy_from(self, source_lines, fields=None):
+        """Queue copies of existing line items from any finance document"""
+        fields = fields or LINE_COPY_FIELDS
+        return [
+            self.add(**{field: getattr(line, field) for field in fields})
+            for line in source_lines
+        ]
+
+    def save(self):
+        """Write the queued lines and recalculate the document totals once"""
+        calculate_line_items(self.lines)
+        with transaction.atomic():
+            created = self.model.objects.bulk_create(self.lines, batch_size=self.batch_size)
+            recalculate_document_totals(self.document)
+        self.lines = []
+        return created
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.save()
+        return False
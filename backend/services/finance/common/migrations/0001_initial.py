@@ -0,0 +1,81 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="DocumentSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "sequence_key",
+                    models.CharField(
+                        help_text="Document type this sequence numbers, e.g. invoice",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "period",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Year for yearly sequences, 0 for sequences that never reset",
+                    ),
+                ),
+                (
+                    "prefix",
+                    models.CharField(
+                        help_text="Number prefix; {year} is replaced with the sequence year",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "padding",
+                    models.PositiveSmallIntegerField(
+                        default=3,
+                        help_text="Minimum number of digits in the numeric part",
+                    ),
+                ),
+                (
+                    "reset_yearly",
+                    models.BooleanField(
+                        default=True, help_text="Start numbering again at 1 every year"
+                    ),
+                ),
+                (
+                    "last_value",
+                    models.BigIntegerField(
+                        default=0, help_text="Last number handed out"
+                    ),
+                ),
+                ("created_time", models.DateTimeField(auto_now_add=True)),
+                ("modified_time", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Document Sequence",
+                "verbose_name_plural": "Document Sequences",
+                "db_table": "finance_document_sequences",
+                "ordering": ["sequence_key", "-period"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("sequence_key", "period"),
+                        name="unique_document_sequence_period",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from .calculations import calculate_fees
+
 
 class DocumentFeesMixin(models.Model):
     """
@@ -32,17 +34,20 @@ class DocumentFeesMixin(models.Model):
     @property
     def shipping_vat_amount(self):
         """Calculate VAT amount for shipping"""
-        return float(self.shipping_fee) * (float(self.shipping_vat_rate) / 100)
+        return self._fee_amounts().shipping_vat_amount
 
     @property
     def total_fees(self):
         """Calculate total of all fees including VAT"""
-        return float(self.shipping_fee) + self.shipping_vat_amount + float(self.rush_fee)
+        return self._fee_amounts().total_fees
 
     @property
     def fees_subtotal(self):
         """Calculate fees without VAT"""
-        return float(self.shipping_fee) + float(self.rush_fee)
+        return self._fee_amounts().fees_subtotal
+
+    def _fee_amounts(self):
+        return calculate_fees(self.shipping_fee, self.shipping_vat_rate, self.rush_fee)
 
     class Meta:
         abstract = True
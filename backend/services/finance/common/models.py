@@ -0,0 +1,59 @@
+from django.db import models
+
+
+class DocumentSequence(models.Model):
+    """
+    Per-tenant counter for document numbers (invoices, estimates, sales
+    orders, customer and vendor numbers). Rows are locked with
+    SELECT ... FOR UPDATE while numbers are allocated, so concurrent creates
+    never hand out the same number. Yearly sequences keep one row per year.
+    """
+
+    sequence_key = models.CharField(
+        max_length=50,
+        help_text="Document type this sequence numbers, e.g. invoice"
+    )
+    period = models.IntegerField(
+        default=0,
+        help_text="Year for yearly sequences, 0 for sequences that never reset"
+    )
+    prefix = models.CharField(
+        max_length=50,
+        help_text="Number prefix; {year} is replaced with the sequence year"
+    )
+    padding = models.PositiveSmallIntegerField(
+        default=3,
+        help_text="Minimum number of digits in the numeric part"
+    )
+    reset_yearly = models.BooleanField(
+        default=True,
+        help_text="Start numbering again at 1 every year"
+    )
+    last_value = models.BigIntegerField(
+        default=0,
+        help_text="Last number handed out"
+    )
+    created_time = models.DateTimeField(auto_now_add=True)
+    modified_time = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'finance_document_sequences'
+        ordering = ['sequence_key', '-period']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['sequence_key', 'period'],
+                name='unique_document_sequence_period'
+            )
+        ]
+        verbose_name = 'Document Sequence'
+        verbose_name_plural = 'Document Sequences'
+
+    def __str__(self):
+        return f"{self.sequence_key} ({self.period or 'all'}): {self.last_value}"
+
+    def get_prefix(self):
+        """Prefix with the {year} placeholder resolved"""
+        return self.prefix.replace('{year}', str(self.period)) if self.period else self.prefix
+
+    def format_number(self, value):
+        return f"{self.get_prefix()}{value:0{self.padding}d}"
@@ -0,0 +1,209 @@
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BigIntegerField, Max
+from django.db.models.functions import Cast, Substr
+from django.utils import timezone
+
+from .models import DocumentSequence
+
+# Default numbering per document type. Deployments can override entries
+# with settings.FINANCE_DOCUMENT_SEQUENCES and tenants with configure().
+SEQUENCE_DEFAULTS = {
+    'invoice': {
+        'prefix': 'INV-{year}-', 'padding': 3, 'reset_yearly': True,
+        'model': 'invoices.Invoice', 'field': 'invoice_number',
+    },
+    'estimate': {
+        'prefix': 'EST-{year}-', 'padding': 3, 'reset_yearly': True,
+        'model': 'estimates.Estimate', 'field': 'estimate_number',
+    },
+    'sales_order': {
+        'prefix': 'SO-{year}-', 'padding': 3, 'reset_yearly': True,
+        'model': 'sales_orders.SalesOrder', 'field': 'sales_order_number',
+    },
+    'customer': {
+        'prefix': 'CUST-', 'padding': 4, 'reset_yearly': False,
+        'model': 'customers.FinanceContact', 'field': 'customer_number',
+    },
+    'vendor': {
+        'prefix': 'VEND-', 'padding': 4, 'reset_yearly': False,
+        'model': 'customers.FinanceContact', 'field': 'vendor_number',
+    },
+}
+
+
+class DocumentSequenceService:
+    """
+    Allocates document numbers from DocumentSequence counters.
+
+    Allocation locks a single counter row, so it costs one indexed lookup
+    regardless of how many documents exist. A counter is seeded from the
+    highest existing number the first time it is used, and skips ahead if
+    a manually entered number has overtaken it.
+    """
+
+    def __init__(self, sequence_key):
+        if sequence_key not in self.get_defaults():
+            raise ValueError(f"Unknown document sequence '{sequence_key}'")
+        self.sequence_key = sequence_key
+        self.config = self.get_defaults()[sequence_key]
+
+    @staticmethod
+    def get_defaults():
+        defaults = {key: dict(value) for key, value in SEQUENCE_DEFAULTS.items()}
+        for key, value in getattr(settings, 'FINANCE_DOCUMENT_SEQUENCES', {}).items():
+            defaults.setdefault(key, {}).update(value)
+        return defaults
+
+    # ------------------------------------------------------------------
+    # Allocation
+    # ------------------------------------------------------------------
+
+    def next_number(self, on_date=None):
+        """Allocate and return the next document number"""
+        return self.allocate_block(1, on_date=on_date)[0]
+
+    def allocate_block(self, count, on_date=None):
+        """
+        Reserve `count` consecutive numbers in one locked update and return
+        them formatted, e.g. for bulk imports.
+        """
+        if count < 1:
+            return []
+
+        with transaction.atomic():
+            sequence = self._lock_sequence(on_date)
+            start = sequence.last_value + 1
+            numbers = self._format_range(sequence, start, count)
+
+            # A number entered by hand may already occupy part of the block
+            if self._target_queryset().filter(**{f'{self._field}__in': numbers}).exists():
+                start = max(start, self._existing_max(sequence.get_prefix()) + 1)
+                numbers = self._format_range(sequence, start, count)
+
+            sequence.last_value = start + count - 1
+            sequence.save(update_fields=['last_value', 'modified_time'])
+
+        return numbers
+
+    def peek(self, on_date=None):
+        """Return the number the next allocation would produce, without reserving it"""
+        period = self._period(on_date)
+        sequence = self._get_sequence(period) or self._new_sequence(period)
+        return sequence.format_number(sequence.last_value + 1)
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+
+    def configure(self, prefix=None, padding=None, reset_yearly=None, on_date=None):
+        """
+        Change this tenant's numbering. Applies to the current counter and
+        is inherited by every counter created after it.
+        """
+        if reset_yearly is None:
+            reset_yearly = self._reset_yearly()
+
+        with transaction.atomic():
+            sequence = self._lock_sequence(on_date, reset_yearly=reset_yearly)
+            if prefix is not None:
+                sequence.prefix = prefix
+            if padding is not None:
+                sequence.padding = padding
+            sequence.save(update_fields=['prefix', 'padding', 'modified_time'])
+        return sequence
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @property
+    def _field(self):
+        return self.config['field']
+
+    def _target_queryset(self):
+        return apps.get_model(self.config['model']).objects.all()
+
+    def _latest_sequence(self):
+        return DocumentSequence.objects.filter(
+            sequence_key=self.sequence_key
+        ).order_by('-modified_time').first()
+
+    def _reset_yearly(self):
+        """The tenant's most recently used mode, falling back to the default"""
+        latest = self._latest_sequence()
+        return latest.reset_yearly if latest else self.config['reset_yearly']
+
+    def _period(self, on_date=None, reset_yearly=None):
+        if reset_yearly is None:
+            reset_yearly = self._reset_yearly()
+        if not reset_yearly:
+            return 0
+        return (on_date or timezone.localdate()).year
+
+    def _get_sequence(self, period, lock=False):
+        queryset = DocumentSequence.objects.filter(sequence_key=self.sequence_key, period=period)
+        if lock:
+            queryset = queryset.select_for_update()
+        return queryset.first()
+
+    def _new_sequence(self, period):
+        """Unsaved counter for a period, inheriting the tenant's latest settings"""
+        latest = self._latest_sequence()
+        prefix = latest.prefix if latest else self.config['prefix']
+        padding = latest.padding if latest else self.config['padding']
+        sequence = DocumentSequence(
+            sequence_key=self.sequence_key,
+            period=period,
+            prefix=prefix,
+            padding=padding,
+            reset_yearly=bool(period),
+        )
+        sequence.last_value = self._existing_max(sequence.get_prefix())
+        return sequence
+
+    def _lock_sequence(self, on_date=None, reset_yearly=None):
+        period = self._period(on_date, reset_yearly)
+        sequence = self._get_sequence(period, lock=True)
+        if sequence is None:
+            new_sequence = self._new_sequence(period)
+            DocumentSequence.objects.get_or_create(
+                sequence_key=self.sequence_key,
+                period=period,
+                defaults={
+                    'prefix': new_sequence.prefix,
+                    'padding': new_sequence.padding,
+                    'reset_yearly': new_sequence.reset_yearly,
+                    'last_value': new_sequence.last_value,
+                }
+            )
+            sequence = self._get_sequence(period, lock=True)
+        return sequence
+
+    def _existing_max(self, prefix):
+        """Highest numeric suffix among existing numbers with this prefix"""
+        field = self._field
+        result = self._target_queryset().filter(**{
+            f'{field}__startswith': prefix,
+            f'{field}__regex': rf'^{re.escape(prefix)}\d+$',
+        }).aggregate(
+            max_value=Max(Cast(Substr(field, len(prefix) + 1), BigIntegerField()))
+        )
+        return result['max_value'] or 0
+
+    @staticmethod
+    def _format_range(sequence, start, count):
+        return [sequence.format_number(value) for value in range(start, start + count)]
+
+
+def next_document_number(sequence_key, on_date=None):
+    """Allocate the next number for a document type, e.g. 'invoice'"""
+    return DocumentSequenceService(sequence_key).next_number(on_date=on_date)
+
+
+def allocate_document_numbers(sequence_key, count, on_date=None):
+    """Reserve a block of consecutive numbers for a document type"""
+    return DocumentSequenceService(sequence_key).allocate_block(count, on_date=on_date)
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+
+# Seconds a dashboard summary may be served from cache; 0 disables caching
+SUMMARY_CACHE_TIMEOUT = getattr(settings, 'FINANCE_SUMMARY_CACHE_TIMEOUT', 30)
+
+
+def status_count_aggregates(status_choices, field='status'):
+    """Conditional Count() per status, for use in a single aggregate() call"""
+    return {
+        f'status_{value}': Count('pk', filter=Q(**{field: value}))
+        for value, _label in status_choices
+    }
+
+
+def status_breakdown(totals, status_choices):
+    """Shape the status_* aggregates into the {status: {label, count}} response format"""
+    return {
+        value: {
+            'label': label,
+            'count': totals[f'status_{value}'],
+        }
+        for value, label in status_choices
+    }
+
+
+def summary_cache_key(name, schema_name=None):
+    """Cache key scoped to the tenant schema (the current one by default)"""
+    return f'finance_summary:{schema_name or connection.schema_name}:{name}'
+
+
+def get_cached_summary(name, builder, refresh=False, timeout=None):
+    """
+    Return builder() through a short-lived per-tenant cache so dashboards
+    polling the summary endpoints do not re-aggregate on every request.
+    """
+    timeout = SUMMARY_CACHE_TIMEOUT if timeout is None else timeout
+    if not timeout:
+        return builder()
+
+    key = summary_cache_key(name)
+    if not refresh:
+        summary = cache.get(key)
+        if summary is not None:
+            return summary
+
+    summary = builder()
+    cache.set(key, summary, timeout)
+    return summary
+
+
+def invalidate_summary(name, schema_name=None):
+    """
+    Drop a tenant's cached summary (the current tenant by default). With a
+    per-process cache only this process's copy goes; others catch up within
+    SUMMARY_CACHE_TIMEOUT.
+    """
+    cache.delete(summary_cache_key(name, schema_name))
+
+
+def invalidate_summary_on_change(model, name):
+    """Invalidate summary name once any save or delete of model commits"""
+    def on_change(sender, **kwargs):
+        # The schema is read now: it may have changed by commit time
+        schema_name = connection.schema_name
+        transaction.on_commit(lambda: invalidate_summary(name, schema_name))
+
+    post_save.connect(on_change, sender=model, weak=False, dispatch_uid=f'finance_summary_{name}_save')
+    post_delete.connect(on_change, sender=model, weak=False, dispatch_uid=f'finance_summary_{name}_delete')
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django_tenants.utils import get_tenant_model, schema_context
+
+from services.finance.customers.models import FinanceContactBalance
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds materialized receivable/payable balances from the posted ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema',
+            type=str,
+            help='Specific schema to rebuild (optional, defaults to all tenants)',
+        )
+        parser.add_argument(
+            '--contact',
+            type=int,
+            action='append',
+            dest='contact_ids',
+            help='Only rebuild the given contact ID (can be repeated)',
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options.get('schema')
+        contact_ids = options.get('contact_ids')
+
+        TenantModel = get_tenant_model()
+        if schema_name:
+            tenants = TenantModel.objects.filter(schema_name=schema_name)
+            if not tenants.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'Tenant with schema {schema_name} does not exist')
+                )
+                return
+        else:
+            tenants = TenantModel.objects.exclude(schema_name='public')
+
+        for tenant in tenants:
+            try:
+                with schema_context(tenant.schema_name):
+                    written = FinanceContactBalance.rebuild(contact_ids=contact_ids)
+                self.stdout.write(
+                    self.style.SUCCESS(f'Rebuilt {written} contact balances for {tenant.schema_name}')
+                )
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Error rebuilding {tenant.schema_name}: {str(e)}')
+                )
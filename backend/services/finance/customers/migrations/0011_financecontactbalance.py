@@ -0,0 +1,133 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:38
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+RECEIVABLE_TYPES = [
+    "invoice",
+    "customer_payment",
+    "credit_notes",
+    "creditnote_refund",
+    "sales_without_invoices",
+]
+PAYABLE_TYPES = [
+    "bills",
+    "vendor_payment",
+    "expense",
+    "card_payment",
+    "purchase_or_charges",
+]
+
+
+def backfill_contact_balances(apps, schema_editor):
+    """Populate balances from the posted ledger for existing contacts"""
+    FinanceContact = apps.get_model("customers", "FinanceContact")
+    FinanceContactBalance = apps.get_model("customers", "FinanceContactBalance")
+    AccountTransaction = apps.get_model("accounting", "AccountTransaction")
+
+    amount_field = models.DecimalField(max_digits=19, decimal_places=2)
+    zero = models.Value(Decimal("0.00"), output_field=amount_field)
+
+    totals = (
+        AccountTransaction.objects.filter(
+            transaction_status="posted", contact_id__isnull=False
+        )
+        .values("contact_id")
+        .annotate(
+            receivables=models.Sum(
+                models.Case(
+                    models.When(
+                        transaction_type__in=RECEIVABLE_TYPES,
+                        then=models.F("debit_amount") - models.F("credit_amount"),
+                    ),
+                    default=zero,
+                    output_field=amount_field,
+                )
+            ),
+            payables=models.Sum(
+                models.Case(
+                    models.When(
+                        transaction_type__in=PAYABLE_TYPES,
+                        then=models.F("credit_amount") - models.F("debit_amount"),
+                    ),
+                    default=zero,
+                    output_field=amount_field,
+                )
+            ),
+        )
+        .order_by()
+    )
+
+    balances = {}
+    for row in totals:
+        try:
+            balances[int(row["contact_id"])] = (row["receivables"], row["payables"])
+        except (TypeError, ValueError):
+            continue
+
+    rows = []
+    for contact_id in FinanceContact.objects.values_list("contact_id", flat=True):
+        receivables, payables = balances.get(contact_id, (None, None))
+        rows.append(
+            FinanceContactBalance(
+                contact_id=contact_id,
+                receivables_balance=receivables or Decimal("0.00"),
+                payables_balance=payables or Decimal("0.00"),
+            )
+        )
+    FinanceContactBalance.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customers", "0010_remove_financecontact_contact_persons_contactperson"),
+        ("accounting", "0006_use_base_currency_default"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FinanceContactBalance",
+            fields=[
+                (
+                    "contact",
+                    models.OneToOneField(
+                        db_column="contact_id",
+                        help_text="Finance contact this balance belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="balance",
+                        serialize=False,
+                        to="customers.financecontact",
+                    ),
+                ),
+                (
+                    "receivables_balance",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Posted receivable debits less credits",
+                        max_digits=19,
+                    ),
+                ),
+                (
+                    "payables_balance",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Posted payable credits less debits",
+                        max_digits=19,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Finance Contact Balance",
+                "verbose_name_plural": "Finance Contact Balances",
+                "db_table": "finance_contact_balance",
+            },
+        ),
+        migrations.RunPython(backfill_contact_balances, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,13 @@
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Case, DecimalField, F, Sum, Value, When
+from django.utils import timezone
 from decimal import Decimal
 import uuid
 
+from core.shared.search import trigram_index
+
 
 class FinanceContact(models.Model):
     contact_id = models.AutoField(primary_key=True)
@@ -342,6 +346,8 @@ class FinanceContact(models.Model):
             models.Index(fields=['contact_type'], name='idx_fincontact_contact_type'),
             models.Index(fields=['customer_number'], name='idx_customer_number'),
             models.Index(fields=['vendor_number'], name='idx_vendor_number'),
+            trigram_index('display_name', name='idx_fincontact_name_trgm'),
+            trigram_index('vat_registration_number', name='idx_fincontact_vat_trgm'),
         ]
         constraints = []
 
@@ -536,6 +542,235 @@ class FinanceContact(models.Model):
             payables += self.linked_entity.get_payables_balance()
         
         return receivables - payables
+    
+    def get_ledger_balance(self):
+        """Return the materialized balance row, or None if none exists yet"""
+        try:
+            return self.balance
+        except FinanceContactBalance.DoesNotExist:
+            return None
+    
+    def get_ledger_balances(self):
+        """
+        Return (receivables, payables) from the materialized balance ledger.
+        Reads the select_related row when available, so list views do not
+        aggregate AccountTransaction per contact.
+        """
+        balance = self.get_ledger_balance()
+        if balance is None:
+            return Decimal('0.00'), Decimal('0.00')
+        return balance.receivables_balance, balance.payables_balance
+    
+    def get_ledger_net_balance(self):
+        """Net ledger balance including the linked entity if exists"""
+        receivables, payables = self.get_ledger_balances()
+        
+        if self.linked_entity:
+            linked_receivables, linked_payables = self.linked_entity.get_ledger_balances()
+            receivables += linked_receivables
+            payables += linked_payables
+        
+        return receivables - payables
+
+
+class FinanceContactBalance(models.Model):
+    """
+    Materialized receivable/payable balance per finance contact.
+    Maintained from posted AccountTransaction rows when they are posted or
+    voided; rebuild with the rebuild_contact_balances management command.
+    """
+    contact = models.OneToOneField(
+        FinanceContact,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='balance',
+        db_column='contact_id',
+        help_text="Finance contact this balance belongs to"
+    )
+    receivables_balance = models.DecimalField(
+        max_digits=19,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="Posted receivable debits less credits"
+    )
+    payables_balance = models.DecimalField(
+        max_digits=19,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="Posted payable credits less debits"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        app_label = 'customers'
+        db_table = 'finance_contact_balance'
+        verbose_name = 'Finance Contact Balance'
+        verbose_name_plural = 'Finance Contact Balances'
+    
+    def __str__(self):
+        return f"Balance for contact #{self.contact_id}"
+    
+    @staticmethod
+    def get_transaction_deltas(transaction):
+        """Return (receivable_delta, payable_delta) contributed by a transaction"""
+        debit = transaction.debit_amount or Decimal('0.00')
+        credit = transaction.credit_amount or Decimal('0.00')
+        
+        if transaction.is_receivable:
+            return debit - credit, Decimal('0.00')
+        if transaction.is_payable:
+            return Decimal('0.00'), credit - debit
+        return Decimal('0.00'), Decimal('0.00')
+    
+    @classmethod
+    def apply_transaction(cls, transaction, reverse=False):
+        """Add (or with reverse=True, remove) a transaction's effect on the balance"""
+        try:
+            contact_pk = int(transaction.contact_id)
+        except (TypeError, ValueError):
+            return
+        
+        receivable, payable = cls.get_transaction_deltas(transaction)
+        if reverse:
+            receivable, payable = -receivable, -payable
+        if not receivable and not payable:
+            return
+        
+        updated = cls.objects.filter(contact_id=contact_pk).update(
+            receivables_balance=F('receivables_balance') + receivable,
+            payables_balance=F('payables_balance') + payable,
+            updated_at=timezone.now()
+        )
+        
+        if not updated:
+            # No row yet - the transaction status is already saved, so the
+            # ledger itself holds the correct figure for this contact
+            cls.rebuild(contact_ids=[contact_pk])
+    
+    @classmethod
+    def apply_transactions(cls, transactions, reverse=False):
+        """
+        Batch version of apply_transaction: one UPDATE for all affected
+        contacts, falling back to a ledger rebuild for contacts without a row.
+        """
+        deltas = {}
+        for transaction in transactions:
+            try:
+                contact_pk = int(transaction.contact_id)
+            except (TypeError, ValueError):
+                continue
+            receivable, payable = cls.get_transaction_deltas(transaction)
+            if reverse:
+                receivable, payable = -receivable, -payable
+            current = deltas.get(contact_pk, (Decimal('0.00'), Decimal('0.00')))
+            deltas[contact_pk] = (current[0] + receivable, current[1] + payable)
+        
+        deltas = {pk: delta for pk, delta in deltas.items() if delta[0] or delta[1]}
+        if not deltas:
+            return
+        
+        amount_field = DecimalField(max_digits=19, decimal_places=2)
+        zero = Value(Decimal('0.00'), output_field=amount_field)
+        
+        existing = set(cls.objects.filter(contact_id__in=deltas).values_list('contact_id', flat=True))
+        if existing:
+            cls.objects.filter(contact_id__in=existing).update(
+                receivables_balance=F('receivables_balance') + Case(
+                    *[When(contact_id=pk, then=Value(deltas[pk][0])) for pk in existing],
+                    default=zero,
+                    output_field=amount_field
+                ),
+                payables_balance=F('payables_balance') + Case(
+                    *[When(contact_id=pk, then=Value(deltas[pk][1])) for pk in existing],
+                    default=zero,
+                    output_field=amount_field
+                ),
+                updated_at=timezone.now()
+            )
+        
+        missing = set(deltas) - existing
+        if missing:
+            cls.rebuild(contact_ids=list(missing))
+    
+    @classmethod
+    def rebuild(cls, contact_ids=None, batch_size=1000):
+        """
+        Recompute balances from posted ledger rows in one grouped query.
+        Rebuilds every contact unless contact_ids is given. Returns the
+        number of balance rows written.
+        """
+        from services.finance.accounting.models import AccountTransaction
+        
+        amount_field = DecimalField(max_digits=19, decimal_places=2)
+        zero = Value(Decimal('0.00'), output_field=amount_field)
+        
+        transactions = AccountTransaction.objects.filter(
+            transaction_status='posted',
+            contact_id__isnull=False
+        )
+        contacts = FinanceContact.objects.all()
+        if contact_ids is not None:
+            transactions = transactions.filter(
+                contact_id__in=[str(contact_id) for contact_id in contact_ids]
+            )
+            contacts = contacts.filter(contact_id__in=contact_ids)
+        
+        totals = transactions.values('contact_id').annotate(
+            receivables=Sum(Case(
+                When(
+                    transaction_type__in=AccountTransaction.RECEIVABLE_TYPES,
+                    then=F('debit_amount') - F('credit_amount')
+                ),
+                default=zero,
+                output_field=amount_field
+            )),
+            payables=Sum(Case(
+                When(
+                    transaction_type__in=AccountTransaction.PAYABLE_TYPES,
+                    then=F('credit_amount') - F('debit_amount')
+                ),
+                default=zero,
+                output_field=amount_field
+            )),
+        ).order_by()
+        
+        balances = {}
+        for row in totals:
+            try:
+                balances[int(row['contact_id'])] = (
+                    row['receivables'] or Decimal('0.00'),
+                    row['payables'] or Decimal('0.00'),
+                )
+            except (TypeError, ValueError):
+                continue
+        
+        rows = []
+        written = 0
+        for contact_pk in contacts.order_by().values_list('contact_id', flat=True).iterator():
+            receivables, payables = balances.get(contact_pk, (Decimal('0.00'), Decimal('0.00')))
+            rows.append(cls(
+                contact_id=contact_pk,
+                receivables_balance=receivables,
+                payables_balance=payables,
+                updated_at=timezone.now()
+            ))
+            if len(rows) >= batch_size:
+                written += cls._upsert(rows)
+                rows = []
+        if rows:
+            written += cls._upsert(rows)
+        
+        return written
+    
+    @classmethod
+    def _upsert(cls, rows):
+        cls.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['contact'],
+            update_fields=['receivables_balance', 'payables_balance', 'updated_at']
+        )
+        return len(rows)
 
 
 class ContactPerson(models.Model):
@@ -669,6 +904,9 @@ class ContactPerson(models.Model):
             models.Index(fields=['email'], name='idx_cp_email'),
             models.Index(fields=['first_name', 'last_name'], name='idx_cp_name'),
             models.Index(fields=['created_at'], name='idx_cp_created'),
+            trigram_index('first_name', name='idx_cp_fname_trgm'),
+            trigram_index('last_name', name='idx_cp_lname_trgm'),
+            trigram_index('email', name='idx_cp_email_trgm'),
         ]
         
         # Constraints
@@ -262,16 +262,18 @@ class CustomerListSerializer(serializers.ModelSerializer):
             return obj.linked_entity.customer_number
     
     def get_receivables_balance(self, obj):
-        """Get receivables balance for this contact"""
-        return str(obj.get_receivables_balance())
+        """Get receivables balance from the materialized balance ledger"""
+        receivables, _ = obj.get_ledger_balances()
+        return str(receivables)
     
     def get_payables_balance(self, obj):
-        """Get payables balance for this contact"""
-        return str(obj.get_payables_balance())
+        """Get payables balance from the materialized balance ledger"""
+        _, payables = obj.get_ledger_balances()
+        return str(payables)
     
     def get_net_balance(self, obj):
         """Get net balance including linked entity"""
-        return str(obj.get_net_balance())
+        return str(obj.get_ledger_net_balance())
 
 
 class CustomerDetailSerializer(serializers.ModelSerializer):
@@ -289,6 +291,10 @@ class CustomerDetailSerializer(serializers.ModelSerializer):
     billing_address = serializers.SerializerMethodField()
     shipping_address = serializers.SerializerMethodField()
     
+    # Balance fields
+    receivables_balance = serializers.SerializerMethodField()
+    payables_balance = serializers.SerializerMethodField()
+    
     # Linking fields
     is_linked = serializers.BooleanField(read_only=True)
     linked_entity = serializers.SerializerMethodField()
@@ -354,6 +360,9 @@ class CustomerDetailSerializer(serializers.ModelSerializer):
             'updated_by',
             'updated_by_name',
             'account',
+            # Balance fields
+            'receivables_balance',
+            'payables_balance',
             # Linking fields
             'is_linked',
             'linked_entity',
@@ -383,6 +392,16 @@ class CustomerDetailSerializer(serializers.ModelSerializer):
     def get_shipping_address(self, obj):
         return obj.get_shipping_address_dict()
     
+    def get_receivables_balance(self, obj):
+        """Get receivables balance from the materialized balance ledger"""
+        receivables, _ = obj.get_ledger_balances()
+        return str(receivables)
+    
+    def get_payables_balance(self, obj):
+        """Get payables balance from the materialized balance ledger"""
+        _, payables = obj.get_ledger_balances()
+        return str(payables)
+    
     def get_linked_entity(self, obj):
         """Get detailed information about linked entity"""
         if not obj.linked_entity:
@@ -5,9 +5,12 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.shared.exports import ExportMixin
+from core.shared.search import SearchFilter
 from core.tenants.permissions import HasTenantPermission, IsTenantUser
 from services.crm.accounts.models import Account
 from services.crm.contacts.models import Contact
+from services.finance.common.sequences import next_document_number
 
 from .models import FinanceContact, ContactPerson
 from .serializers import (
@@ -40,51 +43,55 @@ class BaseContactViewSet(viewsets.ModelViewSet):
             'created_by',
             'updated_by',
             'receivable_account',
-            'payable_account'
+            'payable_account',
+            'balance',
+            'linked_entity',
+            'linked_entity__balance'
         ).all()
     
     def generate_customer_number(self):
         """Generate next customer number in format CUST-XXXX"""
-        # Get all customer numbers and extract the numeric part
-        existing_numbers = FinanceContact.objects.filter(
-            customer_number__startswith='CUST-'
-        ).values_list('customer_number', flat=True)
-        
-        max_num = 0
-        for num_str in existing_numbers:
-            try:
-                # Extract number from CUST-XXXX format
-                num = int(num_str.split('-')[1])
-                max_num = max(max_num, num)
-            except (IndexError, ValueError):
-                continue
-        
-        return f'CUST-{max_num + 1:04d}'
+        return next_document_number('customer')
     
     def generate_vendor_number(self):
         """Generate next vendor number in format VEND-XXXX"""
-        # Get all vendor numbers and extract the numeric part
-        existing_numbers = FinanceContact.objects.filter(
-            vendor_number__startswith='VEND-'
-        ).values_list('vendor_number', flat=True)
-        
-        max_num = 0
-        for num_str in existing_numbers:
-            try:
-                # Extract number from VEND-XXXX format
-                num = int(num_str.split('-')[1])
-                max_num = max(max_num, num)
-            except (IndexError, ValueError):
-                continue
-        
-        return f'VEND-{max_num + 1:04d}'
+        return next_document_number('vendor')
 
-
-class CustomerViewSet(BaseContactViewSet):
+class CustomerViewSet(ExportMixin, BaseContactViewSet):
     """
     ViewSet for managing customers with tenant isolation and RBAC
     Includes auto-create functionality for Accounts and Contacts
     """
+    filter_backends = [SearchFilter]
+    search_fields = [
+        'display_name', 'vat_registration_number', 'account__account_name',
+        'contact_persons_rel__first_name', 'contact_persons_rel__last_name',
+        'contact_persons_rel__email',
+    ]
+    export_filename = 'customers'
+    export_fields = {
+        'contact_id': 'contact_id',
+        'customer_number': 'customer_number',
+        'display_name': 'display_name',
+        'company_name': 'company_name',
+        'customer_type': 'customer_type',
+        'customer_status': 'customer_status',
+        'account_id': 'account_id',
+        'account_name': 'account__account_name',
+        'currency': 'currency',
+        'payment_terms': 'payment_terms',
+        'credit_limit': 'credit_limit',
+        'vat_treatment': 'vat_treatment',
+        'vat_registration_number': 'vat_registration_number',
+        'billing_street': 'billing_street',
+        'billing_city': 'billing_city',
+        'billing_country': 'billing_country',
+        'billing_phone': 'billing_phone',
+        'outstanding_receivable_amount': 'outstanding_receivable_amount',
+        'owner_email': 'owner__email',
+        'customer_since': 'customer_since',
+        'created_at': 'created_at',
+    }
 
     def get_queryset(self):
         """
@@ -122,19 +129,27 @@ class CustomerViewSet(BaseContactViewSet):
         """
         List customers with optional filtering and search
         """
-        queryset = self.get_queryset()
+        # Search across names, account, contact persons and VAT number
+        queryset = self.apply_list_filters(self.filter_queryset(self.get_queryset()))
 
-        # Search functionality
-        search_query = request.query_params.get('search', '')
-        if search_query:
-            queryset = queryset.filter(
-                Q(display_name__icontains=search_query) |
-                Q(account__account_name__icontains=search_query) |
-                Q(contact_persons_rel__first_name__icontains=search_query) |
-                Q(contact_persons_rel__last_name__icontains=search_query) |
-                Q(contact_persons_rel__email__icontains=search_query) |
-                Q(vat_registration_number__icontains=search_query)
-            )
+        # Pagination
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def get_export_queryset(self):
+        return self.apply_list_filters(self.filter_queryset(self.get_queryset()))
+
+    def apply_list_filters(self, queryset):
+        """
+        Apply the list query parameters (type, status, currency, payment terms,
+        owner and ordering); shared by list and export
+        """
+        request = self.request
 
         # Filter by customer type
         customer_type = request.query_params.get('customer_type', '')
@@ -161,19 +176,13 @@ class CustomerViewSet(BaseContactViewSet):
         if owner_id:
             queryset = queryset.filter(owner_id=owner_id)
 
-        # Ordering
-        ordering = request.query_params.get('ordering', 'display_name')
+        # Ordering (search results stay in relevance order unless one is given)
+        ordering = request.query_params.get('ordering')
+        if not ordering and not request.query_params.get('search'):
+            ordering = 'display_name'
         if ordering:
             queryset = queryset.order_by(ordering)
-
-        # Pagination
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return queryset
 
     @action(detail=False, methods=['get'])
     def autocomplete_companies(self, request):
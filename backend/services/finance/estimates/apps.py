@@ -5,3 +5,7 @@ class EstimatesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'services.finance.estimates'
     verbose_name = 'Estimates'
+
+    def ready(self):
+        from services.finance.common.summaries import invalidate_summary_on_change
+        invalidate_summary_on_change(self.get_model('Estimate'), 'estimates')
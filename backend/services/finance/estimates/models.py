@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.db import models
 
+from services.finance.common.calculations import calculate_line_items
+from services.finance.common.line_items import recalculate_document_totals
 from services.finance.common.mixins import DocumentFeesMixin
 
 
@@ -186,41 +188,14 @@ class Estimate(DocumentFeesMixin, models.Model):
 
     @staticmethod
     def generate_next_estimate_number():
-        """Generate the next sequential estimate number in format EST-YYYY-NNN"""
-        import re
+        """
+        Allocate the next sequential estimate number in format EST-YYYY-NNN.
+        Numbers come from the tenant's locked DocumentSequence counter, so
+        concurrent creates never receive the same number.
+        """
+        from services.finance.common.sequences import next_document_number
 
-        from django.db.models import Max
-        from django.utils import timezone
-
-        current_year = timezone.now().year
-        year_prefix = f"EST-{current_year}-"
-
-        # Find the highest estimate number for current year that follows our format
-        estimates = Estimate.objects.filter(
-            estimate_number__regex=r'^EST-\d{4}-\d+$'
-        ).filter(
-            estimate_number__startswith=year_prefix
-        ).aggregate(
-            max_number=Max('estimate_number')
-        )
-
-        max_estimate_number = estimates['max_number']
-
-        if not max_estimate_number:
-            # First estimate of the year
-            return f"EST-{current_year}-001"
-
-        # Extract numeric suffix using regex (match any number of digits)
-        match = re.search(r'EST-\d{4}-(\d+)$', max_estimate_number)
-        if match:
-            current_number = int(match.group(1))
-            next_number = current_number + 1
-        else:
-            # Fallback if existing number doesn't follow pattern
-            next_number = 1
-
-        # Format with zero-padding (minimum 3 digits, more if needed)
-        return f"EST-{current_year}-{next_number:03d}"
+        return next_document_number('estimate')
 
 
 class EstimateLineItem(models.Model):
@@ -326,22 +301,17 @@ class EstimateLineItem(models.Model):
 
     def save(self, *args, **kwargs):
         """Override save to calculate line totals automatically."""
-        # Calculate line_subtotal: (quantity × unit_price) - discount
-        subtotal_before_discount = float(self.quantity) * float(self.unit_price)
-        discount_amount = subtotal_before_discount * (float(self.discount_rate) / 100)
-        self.line_subtotal = subtotal_before_discount - discount_amount
-
-        # Calculate VAT amount: line_subtotal × vat_rate
-        self.vat_amount = float(self.line_subtotal) * (float(self.vat_rate) / 100)
-
-        # Calculate line_total: line_subtotal + vat_amount
-        self.line_total = float(self.line_subtotal) + float(self.vat_amount)
+        self.calculate_totals()
 
         super().save(*args, **kwargs)
 
         # Update parent estimate totals
         self._update_estimate_totals()
 
+    def calculate_totals(self):
+        """Calculate line_subtotal, vat_amount and line_total in place."""
+        calculate_line_items([self])
+
     def delete(self, *args, **kwargs):
         """Override delete to update parent estimate totals."""
         estimate = self.estimate
@@ -354,19 +324,4 @@ class EstimateLineItem(models.Model):
 
     def _update_estimate_totals_for_estimate(self, estimate):
         """Update totals for a specific estimate."""
-        from django.db.models import Sum
-
-        # Calculate subtotal (sum of all line_subtotal)
-        subtotal_result = estimate.line_items.aggregate(
-            total_subtotal=Sum('line_subtotal')
-        )
-        estimate.subtotal = subtotal_result['total_subtotal'] or 0.00
-
-        # Calculate total_amount (sum of all line_total)
-        total_result = estimate.line_items.aggregate(
-            total_amount=Sum('line_total')
-        )
-        estimate.total_amount = total_result['total_amount'] or 0.00
-
-        # Save without triggering additional signals
-        estimate.save(update_fields=['subtotal', 'total_amount', 'updated_at'])
+        recalculate_document_totals(estimate)
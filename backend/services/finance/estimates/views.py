@@ -10,6 +10,12 @@ from rest_framework.response import Response
 
 from core.auth.utils import rate_limit
 from core.tenants.permissions import HasTenantPermission, IsTenantUser
+from services.finance.common.line_items import LineItemWriter
+from services.finance.common.summaries import (
+    get_cached_summary,
+    status_breakdown,
+    status_count_aggregates,
+)
 
 from .models import Estimate, EstimateLineItem
 from .serializers import (
@@ -69,47 +75,45 @@ class EstimateViewSet(viewsets.ModelViewSet):
     def summary(self, request):
         """
         Get estimate summary statistics for the current tenant
+        Computed with a single grouped aggregate and cached briefly per tenant;
+        pass ?refresh=true to bypass the cache.
         """
-        queryset = self.get_queryset()
+        refresh = request.query_params.get('refresh', '').lower() == 'true'
+        summary_data = get_cached_summary('estimates', self._build_summary, refresh=refresh)
 
-        total_estimates = queryset.count()
-        total_value = sum(float(e.total_amount) for e in queryset)
-        avg_estimate_value = total_value / total_estimates if total_estimates > 0 else 0
-
-        # Status breakdown
-        status_breakdown = {}
-        for choice_value, choice_label in Estimate.STATUS_CHOICES:
-            count = queryset.filter(status=choice_value).count()
-            status_breakdown[choice_value] = {
-                'label': choice_label,
-                'count': count
-            }
+        serializer = EstimateSummarySerializer(summary_data)
+        return Response(serializer.data)
 
-        # Estimates expiring soon (next 30 days)
+    def _build_summary(self):
         today = timezone.now().date()
         thirty_days_from_now = today + timedelta(days=30)
-        estimates_expiring_soon = queryset.filter(
-            valid_until__lte=thirty_days_from_now,
-            valid_until__gte=today,
-            status__in=['draft', 'sent']
-        ).count()
-
-        # Recent estimates (last 30 days)
         thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_estimates = queryset.filter(created_at__gte=thirty_days_ago).count()
 
-        summary_data = {
+        totals = Estimate.objects.aggregate(
+            total_estimates=models.Count('pk'),
+            total_value=models.Sum('total_amount'),
+            # Estimates expiring soon (next 30 days)
+            estimates_expiring_soon=models.Count('pk', filter=models.Q(
+                valid_until__lte=thirty_days_from_now,
+                valid_until__gte=today,
+                status__in=['draft', 'sent']
+            )),
+            recent_estimates=models.Count('pk', filter=models.Q(created_at__gte=thirty_days_ago)),
+            **status_count_aggregates(Estimate.STATUS_CHOICES)
+        )
+
+        total_estimates = totals['total_estimates']
+        total_value = totals['total_value'] or 0
+
+        return {
             'total_estimates': total_estimates,
             'total_value': total_value,
-            'avg_estimate_value': avg_estimate_value,
-            'estimates_by_status': status_breakdown,
-            'estimates_expiring_soon': estimates_expiring_soon,
-            'recent_estimates': recent_estimates,
+            'avg_estimate_value': total_value / total_estimates if total_estimates > 0 else 0,
+            'estimates_by_status': status_breakdown(totals, Estimate.STATUS_CHOICES),
+            'estimates_expiring_soon': totals['estimates_expiring_soon'],
+            'recent_estimates': totals['recent_estimates'],
         }
 
-        serializer = EstimateSummarySerializer(summary_data)
-        return Response(serializer.data)
-
     @action(detail=False, methods=['get'])
     def search(self, request):
         """
@@ -164,17 +168,8 @@ class EstimateViewSet(viewsets.ModelViewSet):
             )
 
             # Duplicate line items
-            for line_item in original_estimate.line_items.all():
-                EstimateLineItem.objects.create(
-                    estimate=new_estimate,
-                    product=line_item.product,
-                    description=line_item.description,
-                    quantity=line_item.quantity,
-                    unit_price=line_item.unit_price,
-                    discount_rate=line_item.discount_rate,
-                    vat_rate=line_item.vat_rate,
-                    sort_order=line_item.sort_order,
-                )
+            with LineItemWriter(new_estimate) as writer:
+                writer.copy_from(original_estimate.line_items.all())
 
             # Return the new estimate with full details
             response_serializer = EstimateSerializer(new_estimate)
@@ -305,18 +300,8 @@ class EstimateViewSet(viewsets.ModelViewSet):
             )
 
             # Now create line items for the sales order
-            from services.finance.sales_orders.models import SalesOrderLineItem
-            for line_item in estimate.line_items.all():
-                SalesOrderLineItem.objects.create(
-                    sales_order=sales_order,
-                    product=line_item.product,
-                    description=line_item.description,
-                    quantity=line_item.quantity,
-                    unit_price=line_item.unit_price,
-                    discount_rate=line_item.discount_rate,
-                    vat_rate=line_item.vat_rate,
-                    sort_order=line_item.sort_order,
-                )
+            with LineItemWriter(sales_order) as writer:
+                writer.copy_from(estimate.line_items.all())
 
             return Response({
                 'message': 'Estimate successfully converted to sales order',
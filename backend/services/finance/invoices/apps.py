@@ -6,3 +6,7 @@ class InvoicesConfig(AppConfig):
     name = 'services.finance.invoices'
     label = 'invoices'
     verbose_name = 'Invoices'
+
+    def ready(self):
+        from services.finance.common.summaries import invalidate_summary_on_change
+        invalidate_summary_on_change(self.get_model('Invoice'), 'invoices')
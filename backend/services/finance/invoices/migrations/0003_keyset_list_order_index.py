@@ -0,0 +1,27 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_search_trigram_indexes"),
+        ("contacts", "0002_search_trigram_indexes"),
+        ("customers", "0012_search_trigram_indexes"),
+        ("deals", "0003_deal_pipeline_snapshot"),
+        ("estimates", "0001_initial"),
+        ("invoices", "0002_search_trigram_indexes"),
+        ("sales_orders", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(
+                fields=["invoice_date", "invoice_id"], name="idx_invoice_list_order"
+            ),
+        ),
+    ]
@@ -1,5 +1,9 @@
 from django.conf import settings
 from django.db import models
+
+from core.shared.search import trigram_index
+from services.finance.common.calculations import calculate_line_items, to_decimal
+from services.finance.common.line_items import LineItemWriter, recalculate_document_totals
 from services.finance.common.mixins import DocumentFeesMixin
 
 
@@ -300,8 +304,12 @@ class Invoice(DocumentFeesMixin, models.Model):
             models.Index(fields=['created_at'], name='idx_invoice_created'),
             models.Index(fields=['status'], name='idx_invoice_status'),
             models.Index(fields=['invoice_date'], name='idx_invoice_date'),
+            models.Index(fields=['invoice_date', 'invoice_id'], name='idx_invoice_list_order'),
             models.Index(fields=['due_date'], name='idx_invoice_due_date'),
             models.Index(fields=['paid_date'], name='idx_invoice_paid_date'),
+            trigram_index('invoice_number', name='idx_invoice_number_trgm'),
+            trigram_index('po_number', name='idx_invoice_po_trgm'),
+            trigram_index('reference_number', name='idx_invoice_ref_trgm'),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -315,46 +323,19 @@ class Invoice(DocumentFeesMixin, models.Model):
 
     @staticmethod
     def generate_next_invoice_number():
-        """Generate the next sequential invoice number in format INV-YYYY-NNN"""
-        import re
-
-        from django.db.models import Max
-        from django.utils import timezone
-
-        current_year = timezone.now().year
-        year_prefix = f"INV-{current_year}-"
-
-        # Find the highest invoice number for current year that follows our format
-        invoices = Invoice.objects.filter(
-            invoice_number__regex=r'^INV-\d{4}-\d+$'
-        ).filter(
-            invoice_number__startswith=year_prefix
-        ).aggregate(
-            max_number=Max('invoice_number')
-        )
-
-        max_invoice_number = invoices['max_number']
-
-        if not max_invoice_number:
-            # First invoice of the year
-            return f"INV-{current_year}-001"
-
-        # Extract numeric suffix using regex (match any number of digits)
-        match = re.search(r'INV-\d{4}-(\d+)$', max_invoice_number)
-        if match:
-            current_number = int(match.group(1))
-            next_number = current_number + 1
-        else:
-            # Fallback if existing number doesn't follow pattern
-            next_number = 1
+        """
+        Allocate the next sequential invoice number in format INV-YYYY-NNN.
+        Numbers come from the tenant's locked DocumentSequence counter, so
+        concurrent creates never receive the same number.
+        """
+        from services.finance.common.sequences import next_document_number
 
-        # Format with zero-padding (minimum 3 digits, more if needed)
-        return f"INV-{current_year}-{next_number:03d}"
+        return next_document_number('invoice')
 
     def save(self, *args, **kwargs):
         """Override save to calculate amount_due and update status."""
         # Calculate amount_due
-        self.amount_due = float(self.total_amount) - float(self.amount_paid)
+        self.amount_due = to_decimal(self.total_amount) - to_decimal(self.amount_paid)
 
         # Auto-update status based on payment
         if self.amount_paid == 0:
@@ -448,17 +429,8 @@ class Invoice(DocumentFeesMixin, models.Model):
         )
 
         # Copy line items from estimate
-        for estimate_line in estimate.line_items.all():
-            InvoiceLineItem.objects.create(
-                invoice=invoice,
-                product=estimate_line.product,
-                description=estimate_line.description,
-                quantity=estimate_line.quantity,
-                unit_price=estimate_line.unit_price,
-                discount_rate=estimate_line.discount_rate,
-                vat_rate=estimate_line.vat_rate,
-                sort_order=estimate_line.sort_order,
-            )
+        with LineItemWriter(invoice) as writer:
+            writer.copy_from(estimate.line_items.all())
 
         return invoice
 
@@ -534,17 +506,8 @@ class Invoice(DocumentFeesMixin, models.Model):
         )
 
         # Copy line items from sales order
-        for order_line in sales_order.line_items.all():
-            InvoiceLineItem.objects.create(
-                invoice=invoice,
-                product=order_line.product,
-                description=order_line.description,
-                quantity=order_line.quantity,
-                unit_price=order_line.unit_price,
-                discount_rate=order_line.discount_rate,
-                vat_rate=order_line.vat_rate,
-                sort_order=order_line.sort_order,
-            )
+        with LineItemWriter(invoice) as writer:
+            writer.copy_from(sales_order.line_items.all())
 
         return invoice
 
@@ -652,22 +615,17 @@ class InvoiceLineItem(models.Model):
 
     def save(self, *args, **kwargs):
         """Override save to calculate line totals automatically."""
-        # Calculate line_subtotal: (quantity × unit_price) - discount
-        subtotal_before_discount = float(self.quantity) * float(self.unit_price)
-        discount_amount = subtotal_before_discount * (float(self.discount_rate) / 100)
-        self.line_subtotal = subtotal_before_discount - discount_amount
-
-        # Calculate VAT amount: line_subtotal × vat_rate
-        self.vat_amount = float(self.line_subtotal) * (float(self.vat_rate) / 100)
-
-        # Calculate line_total: line_subtotal + vat_amount
-        self.line_total = float(self.line_subtotal) + float(self.vat_amount)
+        self.calculate_totals()
 
         super().save(*args, **kwargs)
 
         # Update parent invoice totals
         self._update_invoice_totals()
 
+    def calculate_totals(self):
+        """Calculate line_subtotal, vat_amount and line_total in place."""
+        calculate_line_items([self])
+
     def delete(self, *args, **kwargs):
         """Override delete to update parent invoice totals."""
         invoice = self.invoice
@@ -680,22 +638,7 @@ class InvoiceLineItem(models.Model):
 
     def _update_invoice_totals_for_invoice(self, invoice):
         """Update totals for a specific invoice."""
-        from django.db.models import Sum
-
-        # Calculate subtotal (sum of all line_subtotal)
-        subtotal_result = invoice.line_items.aggregate(
-            total_subtotal=Sum('line_subtotal')
-        )
-        invoice.subtotal = subtotal_result['total_subtotal'] or 0.00
-
-        # Calculate total_amount (sum of all line_total)
-        total_result = invoice.line_items.aggregate(
-            total_amount=Sum('line_total')
-        )
-        invoice.total_amount = total_result['total_amount'] or 0.00
-
-        # Save without triggering additional signals
-        invoice.save(update_fields=['subtotal', 'total_amount', 'updated_at'])
+        recalculate_document_totals(invoice)
 
 
 class InvoicePayment(models.Model):
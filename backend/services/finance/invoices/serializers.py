@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from services.finance.common.line_items import LineItemWriter
+
 from .models import Invoice, InvoiceLineItem, InvoicePayment
 
 User = get_user_model()
@@ -679,9 +681,8 @@ class InvoiceCreateSerializer(serializers.ModelSerializer):
         invoice = super().create(validated_data)
         
         # Create line items
-        for line_item_data in line_items_data:
-            line_item_data['invoice'] = invoice
-            InvoiceLineItem.objects.create(**line_item_data)
+        with LineItemWriter(invoice) as writer:
+            writer.add_many(line_items_data)
         
         return invoice
 
@@ -9,7 +9,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from core.auth.utils import rate_limit
+from core.shared.exports import ExportMixin
+from core.shared.search import SearchFilter, search_queryset
 from core.tenants.permissions import HasTenantPermission, IsTenantUser
+from services.finance.common.line_items import LineItemWriter
+from services.finance.common.summaries import (
+    get_cached_summary,
+    status_breakdown,
+    status_count_aggregates,
+)
 
 from .models import Invoice, InvoiceLineItem, InvoicePayment
 from .serializers import (
@@ -25,12 +33,50 @@ from .serializers import (
 )
 
 
-class InvoiceViewSet(viewsets.ModelViewSet):
+class InvoiceViewSet(ExportMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing invoices with tenant isolation and RBAC
     """
     permission_classes = [IsAuthenticated, IsTenantUser, HasTenantPermission]
     required_permissions = ['all', 'manage_opportunities', 'manage_accounts']
+    filter_backends = [SearchFilter]
+    search_fields = ['invoice_number', 'po_number', 'reference_number', 'account__account_name']
+    keyset_count = 'estimate'
+    export_filename = 'invoices'
+    export_fields = {
+        'invoice_id': 'invoice_id',
+        'invoice_number': 'invoice_number',
+        'po_number': 'po_number',
+        'reference_number': 'reference_number',
+        'status': 'status',
+        'invoice_date': 'invoice_date',
+        'due_date': 'due_date',
+        'paid_date': 'paid_date',
+        'payment_terms': 'payment_terms',
+        'customer_id': 'customer_id',
+        'customer_name': 'customer__display_name',
+        'account_id': 'account_id',
+        'account_name': 'account__account_name',
+        'owner_email': 'owner__email',
+        'subtotal': 'subtotal',
+        'total_amount': 'total_amount',
+        'amount_paid': 'amount_paid',
+        'amount_due': 'amount_due',
+        'created_at': 'created_at',
+    }
+    # Added with ?include=lines: one row per line item (invoices without lines keep one empty row)
+    export_line_fields = {
+        'line_item_id': 'line_items__line_item_id',
+        'line_product_id': 'line_items__product_id',
+        'line_description': 'line_items__description',
+        'line_quantity': 'line_items__quantity',
+        'line_unit_price': 'line_items__unit_price',
+        'line_discount_rate': 'line_items__discount_rate',
+        'line_vat_rate': 'line_items__vat_rate',
+        'line_vat_amount': 'line_items__vat_amount',
+        'line_subtotal': 'line_items__line_subtotal',
+        'line_total': 'line_items__line_total',
+    }
 
     def get_queryset(self):
         """
@@ -41,6 +87,24 @@ class InvoiceViewSet(viewsets.ModelViewSet):
             'account', 'contact', 'deal', 'owner', 'estimate', 'created_by', 'updated_by'
         ).prefetch_related('line_items__product', 'payments').all()
 
+    def _export_lines(self):
+        return self.request.query_params.get('include') == 'lines'
+
+    def get_export_fields(self):
+        fields = super().get_export_fields()
+        if self._export_lines():
+            fields.update(self.export_line_fields)
+        return fields
+
+    def get_export_queryset(self):
+        queryset = super().get_export_queryset()
+        if self._export_lines():
+            # Keep each invoice's lines together and in document order
+            queryset = queryset.order_by(
+                '-invoice_date', '-invoice_id', 'line_items__sort_order', 'line_items__line_item_id'
+            )
+        return queryset
+
     def get_serializer_class(self):
         """
         Return appropriate serializer based on action
@@ -72,52 +136,46 @@ class InvoiceViewSet(viewsets.ModelViewSet):
     def summary(self, request):
         """
         Get invoice summary statistics for the current tenant
+        Computed with a single grouped aggregate and cached briefly per tenant;
+        pass ?refresh=true to bypass the cache.
         """
-        queryset = self.get_queryset()
+        refresh = request.query_params.get('refresh', '').lower() == 'true'
+        summary_data = get_cached_summary('invoices', self._build_summary, refresh=refresh)
 
-        total_invoices = queryset.count()
-        total_value = sum(float(i.total_amount) for i in queryset)
-        total_paid = sum(float(i.amount_paid) for i in queryset)
-        total_outstanding = total_value - total_paid
-        avg_invoice_value = total_value / total_invoices if total_invoices > 0 else 0
-
-        # Status breakdown
-        status_breakdown = {}
-        for choice_value, choice_label in Invoice.STATUS_CHOICES:
-            count = queryset.filter(status=choice_value).count()
-            status_breakdown[choice_value] = {
-                'label': choice_label,
-                'count': count
-            }
+        serializer = InvoiceSummarySerializer(summary_data)
+        return Response(serializer.data)
 
-        # Overdue invoices
+    def _build_summary(self):
         today = timezone.now().date()
-        overdue_queryset = queryset.filter(
-            due_date__lt=today,
-            status__in=['sent', 'partial']
+        thirty_days_ago = timezone.now() - timedelta(days=30)
+        overdue = models.Q(due_date__lt=today, status__in=['sent', 'partial'])
+
+        totals = Invoice.objects.aggregate(
+            total_invoices=models.Count('pk'),
+            total_value=models.Sum('total_amount'),
+            total_paid=models.Sum('amount_paid'),
+            overdue_invoices=models.Count('pk', filter=overdue),
+            overdue_amount=models.Sum('amount_due', filter=overdue),
+            recent_invoices=models.Count('pk', filter=models.Q(created_at__gte=thirty_days_ago)),
+            **status_count_aggregates(Invoice.STATUS_CHOICES)
         )
-        overdue_invoices = overdue_queryset.count()
-        overdue_amount = sum(float(i.amount_due) for i in overdue_queryset)
 
-        # Recent invoices (last 30 days)
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_invoices = queryset.filter(created_at__gte=thirty_days_ago).count()
+        total_invoices = totals['total_invoices']
+        total_value = totals['total_value'] or 0
+        total_paid = totals['total_paid'] or 0
 
-        summary_data = {
+        return {
             'total_invoices': total_invoices,
             'total_value': total_value,
             'total_paid': total_paid,
-            'total_outstanding': total_outstanding,
-            'avg_invoice_value': avg_invoice_value,
-            'invoices_by_status': status_breakdown,
-            'overdue_invoices': overdue_invoices,
-            'overdue_amount': overdue_amount,
-            'recent_invoices': recent_invoices,
+            'total_outstanding': total_value - total_paid,
+            'avg_invoice_value': total_value / total_invoices if total_invoices > 0 else 0,
+            'invoices_by_status': status_breakdown(totals, Invoice.STATUS_CHOICES),
+            'overdue_invoices': totals['overdue_invoices'],
+            'overdue_amount': totals['overdue_amount'] or 0,
+            'recent_invoices': totals['recent_invoices'],
         }
 
-        serializer = InvoiceSummarySerializer(summary_data)
-        return Response(serializer.data)
-
     @action(detail=False, methods=['get'])
     def search(self, request):
         """
@@ -128,15 +186,8 @@ class InvoiceViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Query parameter "q" is required'},
                           status=status.HTTP_400_BAD_REQUEST)
 
-        queryset = self.get_queryset()
-
-        # Search in invoice number, account name, and PO number
-        filtered_queryset = queryset.filter(
-            models.Q(invoice_number__icontains=query) |
-            models.Q(account__account_name__icontains=query) |
-            models.Q(po_number__icontains=query) |
-            models.Q(reference_number__icontains=query)
-        )
+        # Search in invoice number, account name, PO and reference number
+        filtered_queryset = search_queryset(self.get_queryset(), query, self.search_fields)
 
         serializer = InvoiceListSerializer(filtered_queryset, many=True)
         return Response(serializer.data)
@@ -188,17 +239,8 @@ class InvoiceViewSet(viewsets.ModelViewSet):
             )
 
             # Duplicate line items
-            for line_item in original_invoice.line_items.all():
-                InvoiceLineItem.objects.create(
-                    invoice=new_invoice,
-                    product=line_item.product,
-                    description=line_item.description,
-                    quantity=line_item.quantity,
-                    unit_price=line_item.unit_price,
-                    discount_rate=line_item.discount_rate,
-                    vat_rate=line_item.vat_rate,
-                    sort_order=line_item.sort_order,
-                )
+            with LineItemWriter(new_invoice) as writer:
+                writer.copy_from(original_invoice.line_items.all())
 
             # Return the new invoice with full details
             response_serializer = InvoiceSerializer(new_invoice)
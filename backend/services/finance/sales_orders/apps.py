@@ -5,4 +5,8 @@ class SalesOrdersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'services.finance.sales_orders'
     label = 'sales_orders'
-    verbose_name = 'Sales Orders'
\ No newline at end of file
+    verbose_name = 'Sales Orders'
+
+    def ready(self):
+        from services.finance.common.summaries import invalidate_summary_on_change
+        invalidate_summary_on_change(self.get_model('SalesOrder'), 'sales_orders')
@@ -1,5 +1,7 @@
 from django.conf import settings
 from django.db import models
+from services.finance.common.calculations import calculate_line_items
+from services.finance.common.line_items import recalculate_document_totals
 from services.finance.common.mixins import DocumentFeesMixin
 
 
@@ -266,40 +268,14 @@ class SalesOrder(DocumentFeesMixin, models.Model):
 
     @staticmethod
     def generate_next_sales_order_number():
-        """Generate the next sequential sales order number in format SO-YYYY-NNN"""
-        from django.utils import timezone
-        from django.db.models import Max
-        import re
-        
-        current_year = timezone.now().year
-        year_prefix = f"SO-{current_year}-"
-        
-        # Find the highest sales order number for current year that follows our format
-        sales_orders = SalesOrder.objects.filter(
-            sales_order_number__regex=r'^SO-\d{4}-\d+$'
-        ).filter(
-            sales_order_number__startswith=year_prefix
-        ).aggregate(
-            max_number=Max('sales_order_number')
-        )
-        
-        max_sales_order_number = sales_orders['max_number']
-        
-        if not max_sales_order_number:
-            # First sales order of the year
-            return f"SO-{current_year}-001"
-        
-        # Extract numeric suffix using regex (match any number of digits)
-        match = re.search(r'SO-\d{4}-(\d+)$', max_sales_order_number)
-        if match:
-            current_number = int(match.group(1))
-            next_number = current_number + 1
-        else:
-            # Fallback if existing number doesn't follow pattern
-            next_number = 1
-        
-        # Format with zero-padding (minimum 3 digits, more if needed)
-        return f"SO-{current_year}-{next_number:03d}"
+        """
+        Allocate the next sequential sales order number in format SO-YYYY-NNN.
+        Numbers come from the tenant's locked DocumentSequence counter, so
+        concurrent creates never receive the same number.
+        """
+        from services.finance.common.sequences import next_document_number
+
+        return next_document_number('sales_order')
 
 
 class SalesOrderLineItem(models.Model):
@@ -405,22 +381,17 @@ class SalesOrderLineItem(models.Model):
 
     def save(self, *args, **kwargs):
         """Override save to calculate line totals automatically."""
-        # Calculate line_subtotal: (quantity × unit_price) - discount
-        subtotal_before_discount = float(self.quantity) * float(self.unit_price)
-        discount_amount = subtotal_before_discount * (float(self.discount_rate) / 100)
-        self.line_subtotal = subtotal_before_discount - discount_amount
-
-        # Calculate VAT amount: line_subtotal × vat_rate
-        self.vat_amount = float(self.line_subtotal) * (float(self.vat_rate) / 100)
-
-        # Calculate line_total: line_subtotal + vat_amount
-        self.line_total = float(self.line_subtotal) + float(self.vat_amount)
+        self.calculate_totals()
 
         super().save(*args, **kwargs)
 
         # Update parent sales order totals
         self._update_sales_order_totals()
 
+    def calculate_totals(self):
+        """Calculate line_subtotal, vat_amount and line_total in place."""
+        calculate_line_items([self])
+
     def delete(self, *args, **kwargs):
         """Override delete to update parent sales order totals."""
         sales_order = self.sales_order
@@ -433,19 +404,4 @@ class SalesOrderLineItem(models.Model):
 
     def _update_sales_order_totals_for_sales_order(self, sales_order):
         """Update totals for a specific sales order."""
-        from django.db.models import Sum
-
-        # Calculate subtotal (sum of all line_subtotal)
-        subtotal_result = sales_order.line_items.aggregate(
-            total_subtotal=Sum('line_subtotal')
-        )
-        sales_order.subtotal = subtotal_result['total_subtotal'] or 0.00
-
-        # Calculate total_amount (sum of all line_total)
-        total_result = sales_order.line_items.aggregate(
-            total_amount=Sum('line_total')
-        )
-        sales_order.total_amount = total_result['total_amount'] or 0.00
-
-        # Save without triggering additional signals
-        sales_order.save(update_fields=['subtotal', 'total_amount', 'updated_at'])
\ No newline at end of file
+        recalculate_document_totals(sales_order)
\ No newline at end of file
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.db import transaction
 
+from services.finance.common.line_items import LineItemWriter
+
 from .models import SalesOrder, SalesOrderLineItem
 
 
@@ -188,9 +190,8 @@ class SalesOrderCreateSerializer(serializers.ModelSerializer):
             sales_order = SalesOrder.objects.create(**validated_data)
             
             # Create line items
-            for line_item_data in line_items_data:
-                line_item_data['sales_order'] = sales_order
-                SalesOrderLineItem.objects.create(**line_item_data)
+            with LineItemWriter(sales_order) as writer:
+                writer.add_many(line_items_data)
             
             return sales_order
 
@@ -209,9 +210,8 @@ class SalesOrderCreateSerializer(serializers.ModelSerializer):
                 instance.line_items.all().delete()
                 
                 # Create new line items
-                for line_item_data in line_items_data:
-                    line_item_data['sales_order'] = instance
-                    SalesOrderLineItem.objects.create(**line_item_data)
+                with LineItemWriter(instance) as writer:
+                    writer.add_many(line_items_data)
             
             return instance
 
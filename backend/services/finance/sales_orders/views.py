@@ -10,6 +10,12 @@ from rest_framework.response import Response
 
 from core.auth.utils import rate_limit
 from core.tenants.permissions import HasTenantPermission, IsTenantUser
+from services.finance.common.line_items import LineItemWriter
+from services.finance.common.summaries import (
+    get_cached_summary,
+    status_breakdown,
+    status_count_aggregates,
+)
 
 from .models import SalesOrder, SalesOrderLineItem
 from .serializers import (
@@ -70,60 +76,54 @@ class SalesOrderViewSet(viewsets.ModelViewSet):
     def summary(self, request):
         """
         Get sales order summary statistics for the current tenant
+        Computed with a single grouped aggregate and cached briefly per tenant;
+        pass ?refresh=true to bypass the cache.
         """
-        queryset = self.get_queryset()
-
-        total_sales_orders = queryset.count()
-        total_value = sum(float(so.total_amount) for so in queryset)
-        avg_order_value = total_value / total_sales_orders if total_sales_orders > 0 else 0
-
-        # Status breakdown
-        status_breakdown = {}
-        for choice_value, choice_label in SalesOrder.STATUS_CHOICES:
-            count = queryset.filter(status=choice_value).count()
-            status_breakdown[choice_value] = {
-                'label': choice_label,
-                'count': count
-            }
-
-        # Orders pending shipment (confirmed but not shipped)
-        orders_pending_shipment = queryset.filter(
-            status__in=['confirmed', 'in_progress']
-        ).count()
-
-        # Recent orders (last 30 days)
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_orders = queryset.filter(created_at__gte=thirty_days_ago).count()
+        refresh = request.query_params.get('refresh', '').lower() == 'true'
+        summary_data = get_cached_summary('sales_orders', self._build_summary, refresh=refresh)
 
-        # Orders this month
+        serializer = SalesOrderSummarySerializer(summary_data)
+        return Response(serializer.data)
+
+    def _build_summary(self):
+        thirty_days_ago = timezone.now() - timedelta(days=30)
         today = timezone.now()
         start_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        orders_this_month = queryset.filter(
-            sales_order_date__gte=start_of_month.date()
-        ).count()
-
-        # Orders last month
         last_month_end = start_of_month - timedelta(days=1)
         last_month_start = last_month_end.replace(day=1)
-        orders_last_month = queryset.filter(
-            sales_order_date__gte=last_month_start.date(),
-            sales_order_date__lt=start_of_month.date()
-        ).count()
 
-        summary_data = {
+        totals = SalesOrder.objects.aggregate(
+            total_sales_orders=models.Count('pk'),
+            total_value=models.Sum('total_amount'),
+            # Orders pending shipment (confirmed but not shipped)
+            orders_pending_shipment=models.Count('pk', filter=models.Q(
+                status__in=['confirmed', 'in_progress']
+            )),
+            recent_orders=models.Count('pk', filter=models.Q(created_at__gte=thirty_days_ago)),
+            orders_this_month=models.Count('pk', filter=models.Q(
+                sales_order_date__gte=start_of_month.date()
+            )),
+            orders_last_month=models.Count('pk', filter=models.Q(
+                sales_order_date__gte=last_month_start.date(),
+                sales_order_date__lt=start_of_month.date()
+            )),
+            **status_count_aggregates(SalesOrder.STATUS_CHOICES)
+        )
+
+        total_sales_orders = totals['total_sales_orders']
+        total_value = totals['total_value'] or 0
+
+        return {
             'total_sales_orders': total_sales_orders,
-            'total_value': str(total_value),
-            'avg_order_value': str(avg_order_value),
-            'orders_by_status': status_breakdown,
-            'orders_pending_shipment': orders_pending_shipment,
-            'recent_orders': recent_orders,
-            'orders_this_month': orders_this_month,
-            'orders_last_month': orders_last_month,
+            'total_value': total_value,
+            'avg_order_value': total_value / total_sales_orders if total_sales_orders > 0 else 0,
+            'orders_by_status': status_breakdown(totals, SalesOrder.STATUS_CHOICES),
+            'orders_pending_shipment': totals['orders_pending_shipment'],
+            'recent_orders': totals['recent_orders'],
+            'orders_this_month': totals['orders_this_month'],
+            'orders_last_month': totals['orders_last_month'],
         }
 
-        serializer = SalesOrderSummarySerializer(summary_data)
-        return Response(serializer.data)
-
     @action(detail=True, methods=['get'])
     def line_items(self, request, pk=None):
         """
@@ -143,10 +143,8 @@ class SalesOrderViewSet(viewsets.ModelViewSet):
         serializer = SalesOrderLineItemCreateSerializer(data=request.data, many=True)
         
         if serializer.is_valid():
-            line_items = []
-            for item_data in serializer.validated_data:
-                item_data['sales_order'] = sales_order
-                line_items.append(SalesOrderLineItem.objects.create(**item_data))
+            with LineItemWriter(sales_order) as writer:
+                line_items = writer.add_many(serializer.validated_data)
             
             response_serializer = SalesOrderLineItemSerializer(line_items, many=True)
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
@@ -201,7 +199,7 @@ class SalesOrderViewSet(viewsets.ModelViewSet):
         line_items_data = []
         for line_item in original_order.line_items.all():
             line_items_data.append({
-                'product': line_item.product.pk,
+                'product': line_item.product_id,
                 'description': line_item.description,
                 'quantity': line_item.quantity,
                 'unit_price': line_item.unit_price,
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ImportsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'services.imports'
+    label = 'imports'
+    verbose_name = 'Bulk Imports'
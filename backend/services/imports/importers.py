@@ -0,0 +1,509 @@
+"""
+Batch validation and loading for each importable entity.
+
+A batch of parsed rows is validated column by column with the model field's
+own clean() (type conversion, choices, max length, validators), then checked
+for duplicates against the file so far and against the table with one IN
+query per unique column. Accounts, CRM contacts and owners are resolved from
+in-memory indexes built once per job, and valid rows are written with
+bulk_create. Errors are collected per row instead of aborting the batch.
+"""
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db.models.functions import Lower
+
+from services.crm.accounts.models import Account
+from services.crm.contacts.models import Contact
+from services.crm.leads.analytics import record_leads_created
+from services.crm.leads.models import Lead
+from services.finance.common.sequences import allocate_document_numbers
+from services.finance.customers.models import ContactPerson, FinanceContact
+from services.inventory.items.models import Item
+from services.search.indexing import index_objects
+from services.search.registry import get_search_entity
+
+INSERT_BATCH_SIZE = 500
+
+BOOLEAN_VALUES = {
+    'true': True, 'yes': True, 'y': True, '1': True,
+    'false': False, 'no': False, 'n': False, '0': False,
+}
+
+ADDRESS_FIELDS = [
+    'billing_street', 'billing_city', 'billing_state_province', 'billing_zip_postal_code', 'billing_country',
+    'shipping_street', 'shipping_city', 'shipping_state_province', 'shipping_zip_postal_code', 'shipping_country',
+]
+
+
+class ImportRow:
+    """One data row: raw column values, cleaned model values and any errors"""
+
+    __slots__ = ('row_number', 'raw', 'data', 'errors')
+
+    def __init__(self, row_number, raw):
+        self.row_number = row_number
+        self.raw = raw
+        self.data = {}
+        self.errors = []
+
+    def add_error(self, field, message):
+        self.errors.append((field, message))
+
+    @property
+    def is_valid(self):
+        return not self.errors
+
+
+def split_name(name):
+    parts = name.split()
+    return parts[0], ' '.join(parts[1:])
+
+
+def _reindex(entity_type, pks):
+    """Index freshly created rows, read back with the entity's select_related"""
+    if pks:
+        index_objects(entity_type, get_search_entity(entity_type).get_queryset().filter(pk__in=pks))
+
+
+class UserIndex:
+    """User ids by email for owner columns, looked up once per distinct email"""
+
+    def __init__(self):
+        self.ids = {}
+
+    def load(self, emails):
+        missing = {email.lower() for email in emails} - set(self.ids)
+        if missing:
+            found = dict(
+                get_user_model().objects.annotate(key=Lower('email')).filter(
+                    key__in=missing
+                ).values_list('key', 'pk')
+            )
+            for email in missing:
+                self.ids[email] = found.get(email)
+
+    def get(self, email):
+        return self.ids.get(email.lower())
+
+
+class AccountIndex:
+    """
+    Account ids by lower-cased name, read once per job. Missing names are
+    bulk created (skipping names that appeared concurrently, which the
+    case-insensitive unique constraint catches) and read back in one query.
+    """
+
+    def __init__(self):
+        self.ids = dict(
+            Account.objects.annotate(key=Lower('account_name')).values_list(
+                'key', 'account_id'
+            ).iterator(chunk_size=5000)
+        )
+
+    def get(self, name):
+        return self.ids.get(name.lower())
+
+    def create_missing(self, accounts):
+        """accounts maps lower-cased names to unsaved Accounts; returns the new ids"""
+        missing = {key: account for key, account in accounts.items() if key not in self.ids}
+        if not missing:
+            return []
+        Account.objects.bulk_create(missing.values(), batch_size=INSERT_BATCH_SIZE, ignore_conflicts=True)
+        created = dict(
+            Account.objects.annotate(key=Lower('account_name')).filter(
+                key__in=list(missing)
+            ).values_list('key', 'account_id')
+        )
+        self.ids.update(created)
+        return list(created.values())
+
+
+class ContactIndex:
+    """
+    CRM contact ids by email (unique per tenant) and, for rows without an
+    email, by (first name, last name, account), read once per job.
+    """
+
+    def __init__(self):
+        self.by_email = {}
+        self.by_name = {}
+        contacts = Contact.objects.values_list(
+            'contact_id', 'email', 'first_name', 'last_name', 'account_id'
+        ).iterator(chunk_size=5000)
+        for contact_id, email, first_name, last_name, account_id in contacts:
+            self.add(contact_id, email, first_name, last_name, account_id)
+
+    @staticmethod
+    def name_key(first_name, last_name, account_id):
+        return (first_name or '').lower(), (last_name or '').lower(), account_id
+
+    def add(self, contact_id, email, first_name, last_name, account_id):
+        if email:
+            self.by_email[email.lower()] = contact_id
+        self.by_name.setdefault(self.name_key(first_name, last_name, account_id), contact_id)
+
+    def get(self, email, first_name, last_name, account_id):
+        if email:
+            return self.by_email.get(email.lower())
+        return self.by_name.get(self.name_key(first_name, last_name, account_id))
+
+
+class BaseImporter(ABC):
+    """
+    Validates and loads batches of rows for one model.
+
+    fields are model fields read from columns of the same name; required
+    columns must be present; unique_fields may not repeat within the file or
+    match an existing row. permissions are the tenant permissions needed to
+    start the import (None: any tenant member).
+    """
+    entity_type = None
+    model = None
+    fields = []
+    required = []
+    unique_fields = []
+    permissions = None
+    extra_columns = []
+
+    def __init__(self, job):
+        self.job = job
+        self.user_id = job.created_by_id
+        self.users = UserIndex()
+        self.seen = {field: set() for field in self.unique_fields}
+        self.model_fields = {name: self.model._meta.get_field(name) for name in self.fields}
+
+    @classmethod
+    def columns(cls):
+        return list(cls.fields) + [column for column in cls.extra_columns if column not in cls.fields]
+
+    # ------------------------------------------------------------------
+    # Validation
+    # ------------------------------------------------------------------
+
+    def validate(self, rows):
+        """Clean every row in the batch, collecting errors on the rows"""
+        for name in self.required:
+            for row in rows:
+                if not row.raw.get(name):
+                    row.add_error(name, 'This field is required.')
+
+        for name, field in self.model_fields.items():
+            for row in rows:
+                value = row.raw.get(name, '')
+                if value == '':
+                    # Empty cells keep the model default
+                    if not field.has_default():
+                        row.data[name] = None if field.null else ''
+                    continue
+                if field.get_internal_type() == 'BooleanField':
+                    value = BOOLEAN_VALUES.get(value.lower(), value)
+                try:
+                    row.data[name] = field.clean(value, None)
+                except ValidationError as exc:
+                    row.add_error(name, ' '.join(exc.messages))
+
+        self.check_unique(rows)
+        self.resolve_owners(rows)
+        self.validate_rows([row for row in rows if row.is_valid])
+
+    def check_unique(self, rows):
+        for name in self.unique_fields:
+            candidates = defaultdict(list)
+            for row in rows:
+                value = row.data.get(name)
+                if not row.is_valid or value in (None, ''):
+                    continue
+                if value in self.seen[name]:
+                    row.add_error(name, f'Duplicate {name} "{value}" earlier in the file.')
+                    continue
+                self.seen[name].add(value)
+                candidates[value].append(row)
+
+            if candidates:
+                existing = set(
+                    self.model._default_manager.filter(**{f'{name}__in': list(candidates)}).values_list(name, flat=True)
+                )
+                for value in existing:
+                    for row in candidates[value]:
+                        row.add_error(name, f'A record with {name} "{value}" already exists.')
+
+    def resolve_owners(self, rows):
+        """owner_email column -> owner id; defaults to the user who started the import"""
+        self.users.load({row.raw['owner_email'] for row in rows if row.raw.get('owner_email')})
+        for row in rows:
+            email = row.raw.get('owner_email')
+            if not email:
+                row.data['owner_id'] = self.user_id
+                continue
+            owner_id = self.users.get(email)
+            if owner_id is None:
+                row.add_error('owner_email', f'No user with email "{email}".')
+            row.data['owner_id'] = owner_id
+
+    def validate_rows(self, rows):  # noqa: B027
+        """Hook for cross-field rules on rows that passed field validation"""
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @abstractmethod
+    def load(self, rows):
+        """Create records for valid rows; returns the number created"""
+
+    def audit(self):
+        return {'created_by_id': self.user_id, 'updated_by_id': self.user_id}
+
+    def field_values(self, row):
+        return {name: row.data[name] for name in self.fields if name in row.data}
+
+
+class CustomerImporter(BaseImporter):
+    """
+    Customers (finance contacts) with their CRM account, CRM contact and
+    primary contact person, as CustomerCreateUpdateSerializer creates them.
+    company_name finds or creates the account; contact_name/contact_email/
+    contact_phone find or create the CRM contact and the contact person.
+    """
+    entity_type = 'customer'
+    model = FinanceContact
+    permissions = ['all', 'manage_customers']
+    fields = [
+        'customer_number', 'display_name', 'company_name', 'website',
+        'customer_type', 'customer_status', 'currency', 'payment_terms', 'credit_limit',
+        'vat_treatment', 'vat_registration_number',
+        'billing_attention', 'billing_street', 'billing_city', 'billing_state_province',
+        'billing_zip_postal_code', 'billing_country', 'billing_phone',
+        'shipping_attention', 'shipping_street', 'shipping_city', 'shipping_state_province',
+        'shipping_zip_postal_code', 'shipping_country', 'shipping_phone',
+        'notes',
+    ]
+    unique_fields = ['customer_number']
+    extra_columns = ['contact_name', 'contact_email', 'contact_phone', 'owner_email']
+
+    def __init__(self, job):
+        super().__init__(job)
+        self.accounts = AccountIndex()
+        self.contacts = ContactIndex()
+        self.email_field = ContactPerson._meta.get_field('email')
+
+    def validate_rows(self, rows):
+        for row in rows:
+            if not (row.data.get('display_name') or row.data.get('company_name') or row.raw.get('contact_name')):
+                row.add_error('display_name', 'display_name, company_name or contact_name is required.')
+            email = row.raw.get('contact_email')
+            if email:
+                try:
+                    self.email_field.clean(email, None)
+                except ValidationError as exc:
+                    row.add_error('contact_email', ' '.join(exc.messages))
+
+    def load(self, rows):
+        audit = self.audit()
+
+        # Accounts by company name
+        new_accounts = {}
+        for row in rows:
+            company = row.data.get('company_name')
+            if company and self.accounts.get(company) is None:
+                new_accounts.setdefault(company.lower(), Account(
+                    account_name=company,
+                    owner_id=row.data['owner_id'],
+                    **{field: row.data.get(field) or '' for field in ADDRESS_FIELDS},
+                    **audit
+                ))
+        _reindex('account', self.accounts.create_missing(new_accounts))
+
+        # CRM contacts by email, or by name within the account
+        new_contacts = {}
+        for row in rows:
+            name = row.raw.get('contact_name')
+            if not name:
+                continue
+            first_name, last_name = split_name(name)
+            email = row.raw.get('contact_email') or None
+            account_id = self.accounts.get(row.data['company_name']) if row.data.get('company_name') else None
+            if self.contacts.get(email, first_name, last_name, account_id) is None:
+                key = email.lower() if email else ContactIndex.name_key(first_name, last_name, account_id)
+                new_contacts.setdefault(key, Contact(
+                    first_name=first_name,
+                    last_name=last_name,
+                    email=email,
+                    phone=row.raw.get('contact_phone') or None,
+                    account_id=account_id,
+                    owner_id=row.data['owner_id'],
+                    **audit
+                ))
+        created_contacts = Contact.objects.bulk_create(new_contacts.values(), batch_size=INSERT_BATCH_SIZE)
+        for contact in created_contacts:
+            self.contacts.add(contact.pk, contact.email, contact.first_name, contact.last_name, contact.account_id)
+        _reindex('contact', [contact.pk for contact in created_contacts])
+
+        # Customers, numbered from one allocated block
+        numbers = iter(allocate_document_numbers(
+            'customer', sum(1 for row in rows if not row.data.get('customer_number'))
+        ))
+        customers = []
+        for row in rows:
+            values = self.field_values(row)
+            company = values.get('company_name')
+            values['customer_number'] = values.get('customer_number') or next(numbers)
+            values['display_name'] = values.get('display_name') or company or row.raw.get('contact_name')
+            customers.append(FinanceContact(
+                contact_type='customer',
+                source='finance',
+                account_id=self.accounts.get(company) if company else None,
+                owner_id=row.data['owner_id'],
+                **values,
+                **audit
+            ))
+        FinanceContact.objects.bulk_create(customers, batch_size=INSERT_BATCH_SIZE)
+
+        persons = []
+        for row, customer in zip(rows, customers, strict=True):
+            name = row.raw.get('contact_name')
+            if name:
+                first_name, last_name = split_name(name)
+                persons.append(ContactPerson(
+                    contact=customer,
+                    first_name=first_name,
+                    last_name=last_name,
+                    email=row.raw.get('contact_email') or None,
+                    phone=row.raw.get('contact_phone') or None,
+                    is_primary_contact=True,
+                    **audit
+                ))
+        ContactPerson.objects.bulk_create(persons, batch_size=INSERT_BATCH_SIZE)
+
+        _reindex('customer', [customer.pk for customer in customers])
+        return len(customers)
+
+
+class LeadImporter(BaseImporter):
+    """Leads, linked to an existing account when company_name matches one"""
+    entity_type = 'lead'
+    model = Lead
+    permissions = ['all', 'manage_leads']
+    fields = [
+        'first_name', 'last_name', 'title', 'company_name', 'email', 'phone', 'website',
+        'description', 'lead_status', 'lead_source', 'industry', 'score',
+        'street', 'city', 'state', 'country', 'postal_code',
+        'number_of_employees', 'average_revenue',
+    ]
+    required = ['first_name', 'last_name']
+    unique_fields = ['email']
+    extra_columns = ['owner_email']
+
+    def __init__(self, job):
+        super().__init__(job)
+        self.accounts = AccountIndex()
+
+    def load(self, rows):
+        audit = self.audit()
+        leads = []
+        for row in rows:
+            values = self.field_values(row)
+            company = values.get('company_name')
+            leads.append(Lead(
+                account_id=self.accounts.get(company) if company else None,
+                lead_owner_id=row.data['owner_id'],
+                **values,
+                **audit
+            ))
+        Lead.objects.bulk_create(leads, batch_size=INSERT_BATCH_SIZE)
+        record_leads_created(leads)
+        _reindex('lead', [lead.pk for lead in leads])
+        return len(leads)
+
+
+class ContactImporter(BaseImporter):
+    """CRM contacts; account_name finds or creates the account"""
+    entity_type = 'contact'
+    model = Contact
+    permissions = ['all', 'manage_contacts']
+    fields = [
+        'first_name', 'last_name', 'title', 'description', 'email', 'phone',
+        'mailing_street', 'mailing_city', 'mailing_state_province', 'mailing_country', 'postal_code',
+    ]
+    required = ['first_name', 'last_name']
+    unique_fields = ['email']
+    extra_columns = ['account_name', 'owner_email']
+
+    def __init__(self, job):
+        super().__init__(job)
+        self.accounts = AccountIndex()
+
+    def load(self, rows):
+        audit = self.audit()
+        new_accounts = {}
+        for row in rows:
+            name = row.raw.get('account_name')
+            if name and self.accounts.get(name) is None:
+                new_accounts.setdefault(name.lower(), Account(
+                    account_name=name, owner_id=row.data['owner_id'], **audit
+                ))
+        _reindex('account', self.accounts.create_missing(new_accounts))
+
+        contacts = [
+            Contact(
+                account_id=self.accounts.get(row.raw['account_name']) if row.raw.get('account_name') else None,
+                owner_id=row.data['owner_id'],
+                **self.field_values(row),
+                **audit
+            )
+            for row in rows
+        ]
+        Contact.objects.bulk_create(contacts, batch_size=INSERT_BATCH_SIZE)
+        _reindex('contact', [contact.pk for contact in contacts])
+        return len(contacts)
+
+
+class ItemImporter(BaseImporter):
+    """Inventory items, checked with Item.clean() since bulk_create skips save()"""
+    entity_type = 'item'
+    model = Item
+    fields = [
+        'name', 'sku', 'description', 'status', 'item_type', 'product_type',
+        'rate', 'purchase_rate', 'unit', 'reorder_level', 'initial_stock', 'initial_stock_rate',
+        'upc', 'ean', 'isbn', 'mpn', 'sales_description', 'purchase_description', 'is_returnable',
+        'weight', 'weight_unit', 'length', 'width', 'height', 'dimension_unit',
+    ]
+    required = ['name']
+    unique_fields = ['sku']
+
+    def resolve_owners(self, rows):
+        """Items have no owner"""
+
+    def build(self, row):
+        item = Item(**self.field_values(row), **self.audit())
+        if item.initial_stock:
+            # Opening stock, as the item serializer sets it
+            item.stock_on_hand = item.available_stock = item.actual_available_stock = item.initial_stock
+        return item
+
+    def validate_rows(self, rows):
+        for row in rows:
+            try:
+                self.build(row).clean()
+            except ValidationError as exc:
+                for field, messages in exc.message_dict.items():
+                    row.add_error(field, ' '.join(messages))
+
+    def load(self, rows):
+        items = [self.build(row) for row in rows]
+        Item.objects.bulk_create(items, batch_size=INSERT_BATCH_SIZE)
+        _reindex('item', [item.pk for item in items])
+        return len(items)
+
+
+IMPORTERS = {
+    importer.entity_type: importer
+    for importer in (CustomerImporter, LeadImporter, ContactImporter, ItemImporter)
+}
+
+
+def get_importer(job):
+    return IMPORTERS[job.entity_type](job)
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django_tenants.utils import get_tenant_model, schema_context
+
+from services.imports.models import ImportJob
+from services.imports.services import process_pending_jobs, requeue_stalled_jobs
+
+
+class Command(BaseCommand):
+    help = 'Runs queued bulk import jobs for each tenant'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema',
+            type=str,
+            help='Specific schema to process (optional, defaults to all tenants)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Maximum number of jobs to run per tenant',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Rows validated and loaded per transaction (default: 1000)',
+        )
+        parser.add_argument(
+            '--requeue-running',
+            action='store_true',
+            help='Queue running jobs with no progress for IMPORT_JOB_STALLED_AFTER_MINUTES (default: 30) '
+                 'so they resume after their last committed row',
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options.get('schema')
+
+        TenantModel = get_tenant_model()
+        if schema_name:
+            tenants = TenantModel.objects.filter(schema_name=schema_name)
+            if not tenants.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'Tenant with schema {schema_name} does not exist')
+                )
+                return
+        else:
+            tenants = TenantModel.objects.exclude(schema_name='public')
+
+        for tenant in tenants:
+            try:
+                with schema_context(tenant.schema_name):
+                    if options['requeue_running']:
+                        requeue_stalled_jobs()
+                    jobs = process_pending_jobs(limit=options.get('limit'), batch_size=options.get('batch_size'))
+                for job in jobs:
+                    message = (
+                        f'{tenant.schema_name}: {job.entity_type} import #{job.pk} {job.status} '
+                        f'({job.processed_rows} rows, {job.created_count} created, {job.error_count} rejected)'
+                    )
+                    if job.status == ImportJob.STATUS_FAILED:
+                        self.stdout.write(self.style.ERROR(f'{message}: {job.last_error}'))
+                    else:
+                        self.stdout.write(self.style.SUCCESS(message))
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Error processing {tenant.schema_name}: {str(e)}')
+                )
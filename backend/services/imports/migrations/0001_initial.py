@@ -0,0 +1,148 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import services.imports.models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportJob",
+            fields=[
+                ("job_id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "entity_type",
+                    models.CharField(
+                        choices=[
+                            ("customer", "Customers"),
+                            ("lead", "Leads"),
+                            ("contact", "Contacts"),
+                            ("item", "Items"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        upload_to=services.imports.models.import_upload_path
+                    ),
+                ),
+                ("original_filename", models.CharField(max_length=255)),
+                (
+                    "file_format",
+                    models.CharField(
+                        choices=[("csv", "CSV"), ("xlsx", "Excel (XLSX)")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "dry_run",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Validate every row and report errors without creating records",
+                    ),
+                ),
+                ("options", models.JSONField(blank=True, default=dict)),
+                ("last_row_number", models.PositiveIntegerField(default=0)),
+                ("processed_rows", models.PositiveIntegerField(default=0)),
+                ("created_count", models.PositiveIntegerField(default=0)),
+                ("error_count", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="import_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Import Job",
+                "verbose_name_plural": "Import Jobs",
+                "db_table": "import_job",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ImportRowError",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("row_number", models.PositiveIntegerField()),
+                ("field", models.CharField(blank=True, default="", max_length=100)),
+                ("message", models.TextField()),
+                ("data", models.JSONField(blank=True, default=dict)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="row_errors",
+                        to="imports.importjob",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Import Row Error",
+                "verbose_name_plural": "Import Row Errors",
+                "db_table": "import_row_error",
+                "ordering": ["row_number", "id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="importjob",
+            index=models.Index(
+                fields=["status", "created_at"], name="idx_import_job_status"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="importjob",
+            index=models.Index(
+                fields=["created_by", "created_at"], name="idx_import_job_creator"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="importrowerror",
+            index=models.Index(
+                fields=["job", "row_number"], name="idx_import_error_job_row"
+            ),
+        ),
+    ]
@@ -0,0 +1,115 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.db import connection, models
+
+
+def import_upload_path(instance, filename):
+    """imports/{tenant_schema}/{uuid}{ext}"""
+    tenant_schema = connection.schema_name if hasattr(connection, 'schema_name') else 'public'
+    _name, ext = os.path.splitext(filename)
+    return f"imports/{tenant_schema}/{uuid.uuid4().hex}{ext.lower()}"
+
+
+class ImportJob(models.Model):
+    """
+    One bulk import of a CSV/XLSX file into customers, leads, contacts or items.
+
+    last_row_number is the last file row whose chunk has been committed. It is
+    advanced in the same transaction as the chunk's records and row errors,
+    so a failed or interrupted job resumes after it without duplicating rows.
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_CANCELLED, 'Cancelled'),
+    ]
+
+    ENTITY_CHOICES = [
+        ('customer', 'Customers'),
+        ('lead', 'Leads'),
+        ('contact', 'Contacts'),
+        ('item', 'Items'),
+    ]
+
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('xlsx', 'Excel (XLSX)'),
+    ]
+
+    job_id = models.BigAutoField(primary_key=True)
+    entity_type = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+
+    file = models.FileField(upload_to=import_upload_path)
+    original_filename = models.CharField(max_length=255)
+    file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    dry_run = models.BooleanField(
+        default=False,
+        help_text="Validate every row and report errors without creating records"
+    )
+    options = models.JSONField(default=dict, blank=True)
+
+    # Progress
+    last_row_number = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='import_jobs',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'import_job'
+        verbose_name = 'Import Job'
+        verbose_name_plural = 'Import Jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='idx_import_job_status'),
+            models.Index(fields=['created_by', 'created_at'], name='idx_import_job_creator'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type} import #{self.pk} ({self.status})"
+
+
+class ImportRowError(models.Model):
+    """A rejected row of an import job, with the raw values for the error report"""
+
+    job = models.ForeignKey(ImportJob, on_delete=models.CASCADE, related_name='row_errors')
+    # Spreadsheet row number: the header is row 1, the first data row is row 2
+    row_number = models.PositiveIntegerField()
+    field = models.CharField(max_length=100, blank=True, default='')
+    message = models.TextField()
+    data = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        db_table = 'import_row_error'
+        verbose_name = 'Import Row Error'
+        verbose_name_plural = 'Import Row Errors'
+        ordering = ['row_number', 'id']
+        indexes = [
+            models.Index(fields=['job', 'row_number'], name='idx_import_error_job_row'),
+        ]
+
+    def __str__(self):
+        return f"Row {self.row_number}: {self.message}"
@@ -0,0 +1,86 @@
+"""
+Streaming readers for import files.
+
+Both readers yield (row_number, {column: value}) one row at a time, with
+column names normalised (``Display Name`` -> ``display_name``) and values as
+stripped strings, so memory does not grow with the size of the file.
+"""
+import csv
+import io
+import re
+
+FIRST_DATA_ROW = 2
+
+
+class ImportFileError(Exception):
+    """The file cannot be read as an import (bad format, missing header)"""
+
+
+def normalize_header(name):
+    return re.sub(r'[\s\-]+', '_', str(name or '').strip().lower())
+
+
+def _clean(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets store whole numbers (phones, zip codes) as floats
+        value = int(value)
+    return str(value).strip()
+
+
+def _read_header(row):
+    header = [normalize_header(name) for name in row]
+    if not any(header):
+        raise ImportFileError('The first row must contain column names')
+    return header
+
+
+def iter_csv_rows(file, delimiter=','):
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.reader(text, delimiter=delimiter)
+        try:
+            header = _read_header(next(reader))
+        except StopIteration:
+            raise ImportFileError('The file is empty') from None
+
+        for row_number, row in enumerate(reader, start=FIRST_DATA_ROW):
+            if not any(value.strip() for value in row):
+                continue
+            yield row_number, {
+                name: _clean(value) for name, value in zip(header, row, strict=False) if name
+            }
+    except UnicodeDecodeError as exc:
+        raise ImportFileError('CSV files must be UTF-8 encoded') from exc
+    finally:
+        text.detach()
+
+
+def iter_xlsx_rows(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise ImportFileError('XLSX imports require openpyxl; upload a CSV file instead') from exc
+
+    # read_only streams rows from the sheet XML instead of loading the workbook
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        try:
+            header = _read_header(next(rows))
+        except StopIteration:
+            raise ImportFileError('The file is empty') from None
+
+        for row_number, row in enumerate(rows, start=FIRST_DATA_ROW):
+            values = {name: _clean(value) for name, value in zip(header, row, strict=False) if name}
+            if any(values.values()):
+                yield row_number, values
+    finally:
+        workbook.close()
+
+
+def iter_rows(file, file_format, delimiter=','):
+    if file_format == 'xlsx':
+        return iter_xlsx_rows(file)
+    return iter_csv_rows(file, delimiter=delimiter)
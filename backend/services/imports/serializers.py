@@ -0,0 +1,73 @@
+import os
+
+from rest_framework import serializers
+
+from .importers import IMPORTERS
+from .models import ImportJob, ImportRowError
+
+FILE_FORMATS = {'.csv': 'csv', '.txt': 'csv', '.xlsx': 'xlsx'}
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Import job with its progress counters"""
+    created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            'job_id',
+            'entity_type',
+            'status',
+            'original_filename',
+            'file_format',
+            'dry_run',
+            'options',
+            'last_row_number',
+            'processed_rows',
+            'created_count',
+            'error_count',
+            'last_error',
+            'created_by',
+            'created_by_name',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
+
+
+class ImportJobCreateSerializer(serializers.ModelSerializer):
+    """Upload a CSV/XLSX file and queue it for import"""
+    delimiter = serializers.CharField(required=False, max_length=1, write_only=True)
+
+    class Meta:
+        model = ImportJob
+        fields = ['job_id', 'entity_type', 'file', 'dry_run', 'delimiter']
+        read_only_fields = ['job_id']
+
+    def validate_file(self, value):
+        _name, ext = os.path.splitext(value.name)
+        if ext.lower() not in FILE_FORMATS:
+            raise serializers.ValidationError(
+                f"Unsupported file type. Allowed: {', '.join(FILE_FORMATS)}"
+            )
+        return value
+
+    def validate_entity_type(self, value):
+        if value not in IMPORTERS:
+            raise serializers.ValidationError(f"Unknown entity type '{value}'")
+        return value
+
+    def create(self, validated_data):
+        upload = validated_data['file']
+        delimiter = validated_data.pop('delimiter', None)
+        validated_data['original_filename'] = upload.name[:255]
+        validated_data['file_format'] = FILE_FORMATS[os.path.splitext(upload.name)[1].lower()]
+        validated_data['options'] = {'delimiter': delimiter} if delimiter else {}
+        return super().create(validated_data)
+
+
+class ImportRowErrorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportRowError
+        fields = ['row_number', 'field', 'message', 'data']
@@ -0,0 +1,160 @@
+import logging
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .importers import ImportRow, get_importer
+from .models import ImportJob, ImportRowError
+from .readers import iter_rows
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+# A running job whose progress has not moved for this long is taken to have
+# lost its worker and may be requeued
+STALLED_AFTER_MINUTES = getattr(settings, 'IMPORT_JOB_STALLED_AFTER_MINUTES', 30)
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _still_claimed(job):
+    # started_at tells this run apart from a later claim of a requeued job
+    return ImportJob.objects.filter(
+        pk=job.pk, status=ImportJob.STATUS_RUNNING, started_at=job.started_at
+    )
+
+
+def _stalled_before():
+    return timezone.now() - timedelta(minutes=STALLED_AFTER_MINUTES)
+
+
+def _process_batch(job, importer, batch):
+    """
+    Validate, load and record one chunk of rows in a single transaction.
+    Returns False, with the chunk rolled back, if the job stopped running
+    (cancelled, or requeued as stalled) while the chunk was being loaded.
+    """
+    rows = [ImportRow(row_number, raw) for row_number, raw in batch]
+    with transaction.atomic():
+        importer.validate(rows)
+        valid = [row for row in rows if row.is_valid]
+        created = importer.load(valid) if valid and not job.dry_run else 0
+
+        # Locked only now so cancelling never waits for a whole chunk to load
+        if not _still_claimed(job).select_for_update().exists():
+            transaction.set_rollback(True)
+            return False
+
+        failed = [row for row in rows if not row.is_valid]
+        ImportRowError.objects.bulk_create([
+            ImportRowError(
+                job_id=job.pk,
+                row_number=row.row_number,
+                field=field,
+                message=message,
+                data=row.raw,
+            )
+            for row in failed
+            for field, message in row.errors
+        ], batch_size=BATCH_SIZE)
+
+        ImportJob.objects.filter(pk=job.pk).update(
+            last_row_number=rows[-1].row_number,
+            processed_rows=F('processed_rows') + len(rows),
+            created_count=F('created_count') + created,
+            error_count=F('error_count') + len(failed),
+            updated_at=timezone.now(),
+        )
+    return True
+
+
+def run_import_job(job, batch_size=None):
+    """
+    Run a pending job from the row after last_row_number to the end of the
+    file. The file is streamed and handled in chunks of batch_size rows; if a
+    chunk hits a database error only that chunk is rolled back, the job is
+    marked failed and can be resumed. The job stops before its next chunk
+    once its status is no longer running. Returns the refreshed job.
+    """
+    claimed = ImportJob.objects.filter(pk=job.pk, status=ImportJob.STATUS_PENDING).update(
+        status=ImportJob.STATUS_RUNNING,
+        started_at=timezone.now(),
+        updated_at=timezone.now(),
+        finished_at=None,
+        last_error='',
+    )
+    if not claimed:
+        # Already picked up by another worker, finished or cancelled
+        job.refresh_from_db()
+        return job
+
+    job.refresh_from_db()
+    batch_size = batch_size or job.options.get('batch_size') or BATCH_SIZE
+    status = ImportJob.STATUS_COMPLETED
+    error = ''
+    stopped = False
+    try:
+        importer = get_importer(job)
+        with job.file.open('rb') as file:
+            rows = iter_rows(file, job.file_format, delimiter=job.options.get('delimiter', ','))
+            pending = (row for row in rows if row[0] > job.last_row_number)
+            for batch in _batches(pending, batch_size):
+                if not _still_claimed(job).exists() or not _process_batch(job, importer, batch):
+                    stopped = True
+                    break
+    except Exception as exc:
+        logger.exception('Import job %s failed', job.pk)
+        status = ImportJob.STATUS_FAILED
+        error = str(exc)
+
+    if stopped:
+        # A requeued job is left pending for the worker that picks it up
+        ImportJob.objects.filter(pk=job.pk, status=ImportJob.STATUS_CANCELLED).update(
+            finished_at=timezone.now()
+        )
+    else:
+        _still_claimed(job).update(
+            status=status,
+            last_error=error,
+            finished_at=timezone.now(),
+        )
+    job.refresh_from_db()
+    return job
+
+
+def process_pending_jobs(limit=None, batch_size=None):
+    """Run the current tenant's pending jobs, oldest first. Returns the jobs run."""
+    jobs = ImportJob.objects.filter(status=ImportJob.STATUS_PENDING).order_by('created_at')
+    if limit:
+        jobs = jobs[:limit]
+    return [run_import_job(job, batch_size=batch_size) for job in jobs]
+
+
+def requeue_job(job):
+    """
+    Put a failed, cancelled or stalled job back in the queue to resume where
+    it stopped. A running job counts as stalled once it has made no progress
+    for IMPORT_JOB_STALLED_AFTER_MINUTES.
+    """
+    requeueable = (
+        Q(status__in=[ImportJob.STATUS_FAILED, ImportJob.STATUS_CANCELLED])
+        | Q(status=ImportJob.STATUS_RUNNING, updated_at__lt=_stalled_before())
+    )
+    return ImportJob.objects.filter(requeueable, pk=job.pk).update(
+        status=ImportJob.STATUS_PENDING, finished_at=None, updated_at=timezone.now()
+    ) > 0
+
+
+def requeue_stalled_jobs():
+    """Requeue the current tenant's stalled running jobs. Returns how many were queued."""
+    return ImportJob.objects.filter(
+        status=ImportJob.STATUS_RUNNING, updated_at__lt=_stalled_before()
+    ).update(status=ImportJob.STATUS_PENDING, updated_at=timezone.now())
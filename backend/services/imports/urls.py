@@ -0,0 +1,11 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from .views import ImportJobViewSet
+
+router = DefaultRouter()
+router.register(r'', ImportJobViewSet, basename='import-job')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
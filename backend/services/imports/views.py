@@ -0,0 +1,135 @@
+from django.http import StreamingHttpResponse
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.shared.exports import stream_csv
+from core.tenant_core.principals import BASIC_PERMISSIONS, get_tenant_principal
+from core.tenants.permissions import IsTenantUser
+
+from .importers import IMPORTERS
+from .models import ImportJob
+from .serializers import (
+    ImportJobCreateSerializer,
+    ImportJobSerializer,
+    ImportRowErrorSerializer,
+)
+from .services import requeue_job
+
+
+class ImportJobViewSet(mixins.CreateModelMixin,
+                       mixins.ListModelMixin,
+                       mixins.RetrieveModelMixin,
+                       viewsets.GenericViewSet):
+    """
+    Bulk imports of customers, leads, contacts and items from CSV/XLSX.
+
+    POST /api/imports/ (multipart: entity_type, file, dry_run) queues a job;
+    the process_import_jobs command runs queued jobs. Rejected rows are
+    listed at /api/imports/{id}/errors/ (?output=csv for a fix-up file).
+    """
+    permission_classes = [IsAuthenticated, IsTenantUser]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
+
+    def get_queryset(self):
+        queryset = ImportJob.objects.select_related('created_by')
+        if self.request.user.is_superadmin:
+            return queryset
+        return queryset.filter(created_by=self.request.user)
+
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return ImportJobCreateSerializer
+        return ImportJobSerializer
+
+    def check_import_permission(self, entity_type):
+        permissions = IMPORTERS[entity_type].permissions
+        user = self.request.user
+        if permissions is None or user.is_superadmin:
+            return
+        principal = get_tenant_principal(user, getattr(self.request, 'tenant', None), self.request)
+        if not principal.has_roles and any(p in BASIC_PERMISSIONS for p in permissions):
+            return
+        if not principal.has_any_permission(permissions):
+            raise PermissionDenied(f'You do not have permission to import {entity_type} records.')
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.check_import_permission(serializer.validated_data['entity_type'])
+        job = serializer.save(created_by=request.user)
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def columns(self, request):
+        """Columns accepted for each entity type"""
+        return Response({
+            entity_type: {
+                'columns': importer.columns(),
+                'required': importer.required,
+            }
+            for entity_type, importer in IMPORTERS.items()
+        })
+
+    @action(detail=True, methods=['get'])
+    def errors(self, request, pk=None):
+        """
+        Rejected rows of the job
+        GET /api/imports/{id}/errors/?output=csv streams them with the original
+        columns, ready to be corrected and imported again
+        """
+        job = self.get_object()
+        errors = job.row_errors.order_by('row_number', 'id')
+
+        if request.query_params.get('output') == 'csv':
+            columns = IMPORTERS[job.entity_type].columns()
+            rows = (
+                [error.row_number, error.field, error.message] + [error.data.get(column, '') for column in columns]
+                for error in errors.iterator(chunk_size=2000)
+            )
+            response = StreamingHttpResponse(
+                stream_csv(['row_number', 'error_field', 'error'] + columns, rows),
+                content_type='text/csv; charset=utf-8'
+            )
+            response['Content-Disposition'] = f'attachment; filename="import-{job.pk}-errors.csv"'
+            return response
+
+        page = self.paginate_queryset(errors)
+        if page is not None:
+            return self.get_paginated_response(ImportRowErrorSerializer(page, many=True).data)
+        return Response(ImportRowErrorSerializer(errors, many=True).data)
+
+    @action(detail=True, methods=['post'])
+    def resume(self, request, pk=None):
+        """Queue a failed, cancelled or stalled job to continue after its last committed row"""
+        job = self.get_object()
+        if not requeue_job(job):
+            if job.status == ImportJob.STATUS_RUNNING:
+                return Response(
+                    {'error': 'The job is still running; it can be resumed once it has stalled'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            return Response(
+                {'error': f'A {job.status} job cannot be resumed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        job.refresh_from_db()
+        return Response(ImportJobSerializer(job).data)
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        """Stop a queued or running job; chunks already committed are kept"""
+        job = self.get_object()
+        updated = ImportJob.objects.filter(
+            pk=job.pk, status__in=[ImportJob.STATUS_PENDING, ImportJob.STATUS_RUNNING]
+        ).update(status=ImportJob.STATUS_CANCELLED)
+        if not updated:
+            return Response(
+                {'error': f'A {job.status} job cannot be cancelled'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        job.refresh_from_db()
+        return Response(ImportJobSerializer(job).data)
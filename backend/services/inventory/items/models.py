@@ -4,6 +4,7 @@ from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator, RegexValidator
 from django.core.exceptions import ValidationError
+from core.shared.search import trigram_index
 from services.finance.accounting.models import ChartOfAccount
 from services.finance.customers.models import FinanceContact
 
@@ -415,6 +416,9 @@ class Item(models.Model):
             models.Index(fields=['name']),
             models.Index(fields=['status']),
             models.Index(fields=['item_type']),
+            trigram_index('name', name='idx_item_name_trgm'),
+            trigram_index('sku', name='idx_item_sku_trgm'),
+            trigram_index('description', name='idx_item_desc_trgm'),
         ]
         constraints = [
             models.UniqueConstraint(
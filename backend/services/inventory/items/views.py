@@ -2,11 +2,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q, F
+from django.db.models import F
 from django.shortcuts import get_object_or_404
 from decimal import Decimal
 import logging
 
+from core.shared.search import SearchFilter
+
 from .models import (
     Item, ItemGroup, Location, ItemLocation,
     CustomField, ItemCustomFieldValue
@@ -125,6 +127,8 @@ class ItemViewSet(viewsets.ModelViewSet):
     queryset = Item.objects.all()
     permission_classes = [IsAuthenticated]
     lookup_field = 'item_id'
+    filter_backends = [SearchFilter]
+    search_fields = ['name', 'sku', 'description']
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -138,18 +142,9 @@ class ItemViewSet(viewsets.ModelViewSet):
             return ItemDetailSerializer
     
     def get_queryset(self):
-        """Apply filters and search"""
+        """Apply filters (search is applied by SearchFilter)"""
         queryset = super().get_queryset()
         
-        # Search functionality
-        search = self.request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) |
-                Q(sku__icontains=search) |
-                Q(description__icontains=search)
-            )
-        
         # Status filter
         status_param = self.request.query_params.get('status')
         if status_param:
@@ -1,6 +1,8 @@
 from django.contrib.contenttypes.models import ContentType
 from rest_framework import serializers
 
+from core.shared.serial_numbers import SerialNumberListSerializer, SerialNumberMixin, related_count
+
 from .models import Meeting, MeetingComment
 
 
@@ -18,11 +20,12 @@ class MeetingCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'author', 'author_name', 'author_email', 'created_at', 'updated_at']
 
 
-class MeetingSerializer(serializers.ModelSerializer):
+class MeetingSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Main serializer for Meeting model with full functionality"""
     
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('-meeting_date', '-meeting_time', '-created_at')
     
     # Read-only fields for user information
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
@@ -48,41 +51,20 @@ class MeetingSerializer(serializers.ModelSerializer):
     
     # Comments (nested)
     comments = MeetingCommentSerializer(many=True, read_only=True)
-    comment_count = serializers.IntegerField(source='comments.count', read_only=True)
+    comment_count = serializers.SerializerMethodField()
     
     # Attachment count
-    attachment_count = serializers.IntegerField(source='attachments.count', read_only=True)
-    
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on meeting position in ordered list within the same context"""
-        # Filter meetings by the same context as the current meeting
-        queryset_filter = {'is_active': True}
-        
-        # If meeting is linked to an entity, only count meetings for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If meeting is standalone, only count standalone meetings
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-        
-        # Get meetings in the same context ordered by meeting date/time, then creation date
-        active_meetings = obj.__class__.objects.filter(**queryset_filter).order_by('-meeting_date', '-meeting_time', '-created_at')
-        
-        # Find the position of current meeting (1-based indexing)
-        for index, meeting in enumerate(active_meetings, 1):
-            if meeting.id == obj.id:
-                return index
-        
-        # Fallback: return meeting ID if not found (shouldn't happen)
-        return obj.id
+    attachment_count = serializers.SerializerMethodField()
+
+    def get_comment_count(self, obj):
+        return related_count(obj, 'comment_count', 'comments')
+
+    def get_attachment_count(self, obj):
+        return related_count(obj, 'attachment_count', 'attachments')
     
     class Meta:
         model = Meeting
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'title', 'description', 'status', 'status_display',
             'priority', 'priority_display',
@@ -110,11 +92,12 @@ class MeetingSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class MeetingCreateSerializer(serializers.ModelSerializer):
+class MeetingCreateSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Simplified serializer for meeting creation"""
     
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('-meeting_date', '-meeting_time', '-created_at')
     
     # Optional entity linking
     entity_type = serializers.CharField(required=False, allow_blank=True)
@@ -129,36 +112,9 @@ class MeetingCreateSerializer(serializers.ModelSerializer):
         """Convert frontend entity type to backend model name"""
         return self.ENTITY_TYPE_MAPPING.get(entity_type.lower(), entity_type.lower())
     
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on meeting position in ordered list within the same context"""
-        # Filter meetings by the same context as the current meeting
-        queryset_filter = {'is_active': True}
-        
-        # If meeting is linked to an entity, only count meetings for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If meeting is standalone, only count standalone meetings
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-        
-        # Get meetings in the same context ordered by meeting date/time, then creation date
-        active_meetings = obj.__class__.objects.filter(**queryset_filter).order_by('-meeting_date', '-meeting_time', '-created_at')
-        
-        # Find the position of current meeting (1-based indexing)
-        for index, meeting in enumerate(active_meetings, 1):
-            if meeting.id == obj.id:
-                return index
-        
-        # Fallback: return meeting ID if not found (shouldn't happen)
-        return obj.id
-    
     class Meta:
         model = Meeting
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'title', 'description', 'status', 'priority',
             'contact', 'contact_name', 'contact_phone', 'contact_email',
@@ -260,11 +216,12 @@ class MeetingUpdateSerializer(serializers.ModelSerializer):
         return data
 
 
-class MeetingListSerializer(serializers.ModelSerializer):
+class MeetingListSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Lightweight serializer for meeting lists"""
     
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('-meeting_date', '-meeting_time', '-created_at')
     
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
     contact_display_name = serializers.CharField(read_only=True)
@@ -275,36 +232,9 @@ class MeetingListSerializer(serializers.ModelSerializer):
     entity_type = serializers.CharField(read_only=True)
     entity_id = serializers.IntegerField(source='object_id', read_only=True)
     
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on meeting position in ordered list within the same context"""
-        # Filter meetings by the same context as the current meeting
-        queryset_filter = {'is_active': True}
-        
-        # If meeting is linked to an entity, only count meetings for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If meeting is standalone, only count standalone meetings
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-        
-        # Get meetings in the same context ordered by meeting date/time, then creation date
-        active_meetings = obj.__class__.objects.filter(**queryset_filter).order_by('-meeting_date', '-meeting_time', '-created_at')
-        
-        # Find the position of current meeting (1-based indexing)
-        for index, meeting in enumerate(active_meetings, 1):
-            if meeting.id == obj.id:
-                return index
-        
-        # Fallback: return meeting ID if not found (shouldn't happen)
-        return obj.id
-    
     class Meta:
         model = Meeting
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'title', 'description', 'status', 'status_display',
             'priority', 'priority_display',
@@ -130,6 +130,9 @@ class MeetingDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Meeting.objects.filter(is_active=True).select_related(
             'created_by', 'content_type', 'contact'
+        ).annotate(
+            comment_count=Count('comments', distinct=True),
+            attachment_count=Count('attachments', distinct=True)
         ).prefetch_related('comments__author', 'attachments')
     
     def destroy(self, request, *args, **kwargs):
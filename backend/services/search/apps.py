@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'services.search'
+    label = 'search'
+    verbose_name = 'Global Search'
+
+    def ready(self):
+        from .signals import connect_search_signals
+        connect_search_signals()
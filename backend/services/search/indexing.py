@@ -0,0 +1,130 @@
+import logging
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import SearchDocument
+from .registry import SEARCH_ENTITIES, get_search_entity
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_SCHEMA_NAME = 'public'
+DOCUMENT_UPDATE_FIELDS = ['title', 'subtitle', 'content', 'owner_id', 'created_by_id', 'updated_at']
+
+
+def _truncate(value, length=255):
+    value = '' if value is None else str(value)
+    return value[:length]
+
+
+def build_document(entity, instance):
+    """Unsaved SearchDocument for instance, or None when it is not indexed"""
+    if not entity.should_index(instance):
+        return None
+
+    return SearchDocument(
+        entity_type=entity.entity_type,
+        object_id=str(instance.pk),
+        title=_truncate(entity.title(instance)) or str(instance.pk),
+        subtitle=_truncate(entity.subtitle(instance) if entity.subtitle else ''),
+        content='\n'.join(entity.get_values(instance)),
+        owner_id=getattr(instance, entity.owner_field) if entity.owner_field else None,
+        created_by_id=getattr(instance, entity.created_by_field) if entity.created_by_field else None,
+        updated_at=timezone.now(),
+    )
+
+
+def index_objects(entity_type, instances, batch_size=500):
+    """
+    Upsert the documents for instances of one entity type with
+    INSERT ... ON CONFLICT, removing documents for instances that are no
+    longer indexed. Bulk writers call this for rows saved without signals.
+    """
+    entity = get_search_entity(entity_type)
+    documents = []
+    excluded = []
+    for instance in instances:
+        document = build_document(entity, instance)
+        if document is None:
+            excluded.append(str(instance.pk))
+        else:
+            documents.append(document)
+
+    if documents:
+        SearchDocument.objects.bulk_create(
+            documents,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['entity_type', 'object_id'],
+            update_fields=DOCUMENT_UPDATE_FIELDS,
+        )
+    if excluded:
+        SearchDocument.objects.filter(entity_type=entity_type, object_id__in=excluded).delete()
+    return len(documents)
+
+
+def remove_objects(entity_type, object_ids):
+    return SearchDocument.objects.filter(
+        entity_type=entity_type,
+        object_id__in=[str(object_id) for object_id in object_ids]
+    ).delete()[0]
+
+
+def _update_index(entity, instance, action):
+    """Apply action under a savepoint so a failed index write never rolls back the record's own save"""
+    if connection.schema_name == PUBLIC_SCHEMA_NAME:
+        return
+    try:
+        with transaction.atomic():
+            action()
+    except Exception as e:
+        logger.warning(f"Failed to update search index for {entity.entity_type} {instance.pk}: {e}")
+
+
+def index_instance(entity, instance):
+    _update_index(entity, instance, lambda: index_objects(entity.entity_type, [instance]))
+
+
+def remove_instance(entity, instance):
+    _update_index(entity, instance, lambda: remove_objects(entity.entity_type, [instance.pk]))
+
+
+def reindex_related(entity, relation, instance, batch_size=500):
+    """Re-index the documents of entity that copy fields from instance through relation"""
+    def action():
+        queryset = entity.get_queryset().filter(**{relation: instance})
+        batch = []
+        for related in queryset.iterator(chunk_size=batch_size):
+            batch.append(related)
+            if len(batch) >= batch_size:
+                index_objects(entity.entity_type, batch)
+                batch = []
+        if batch:
+            index_objects(entity.entity_type, batch)
+
+    _update_index(entity, instance, action)
+
+
+def rebuild_index(entity_types=None, batch_size=1000):
+    """
+    Rebuild the documents of the current schema from the source tables.
+    Returns {entity_type: documents_written}.
+    """
+    written = {}
+    for entity in SEARCH_ENTITIES:
+        if entity_types and entity.entity_type not in entity_types:
+            continue
+
+        with transaction.atomic():
+            SearchDocument.objects.filter(entity_type=entity.entity_type).delete()
+            count = 0
+            batch = []
+            for instance in entity.get_queryset().iterator(chunk_size=batch_size):
+                batch.append(instance)
+                if len(batch) >= batch_size:
+                    count += index_objects(entity.entity_type, batch)
+                    batch = []
+            if batch:
+                count += index_objects(entity.entity_type, batch)
+        written[entity.entity_type] = count
+    return written
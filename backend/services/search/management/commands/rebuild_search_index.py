@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import get_tenant_model, schema_context
+
+from services.search.indexing import rebuild_index
+from services.search.registry import SEARCH_ENTITY_MAP
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the global search documents from the CRM, finance and inventory tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--schema',
+            type=str,
+            help='Specific schema to process (optional, defaults to all tenants)',
+        )
+        parser.add_argument(
+            '--types',
+            type=str,
+            help=f"Comma-separated entity types to rebuild (default: all of {', '.join(SEARCH_ENTITY_MAP)})",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows read and upserted per batch (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        schema_name = options.get('schema')
+        entity_types = self.parse_types(options.get('types'))
+
+        TenantModel = get_tenant_model()
+        if schema_name:
+            tenants = TenantModel.objects.filter(schema_name=schema_name)
+            if not tenants.exists():
+                self.stdout.write(
+                    self.style.ERROR(f'Tenant with schema {schema_name} does not exist')
+                )
+                return
+        else:
+            tenants = TenantModel.objects.exclude(schema_name='public')
+
+        for tenant in tenants:
+            try:
+                with schema_context(tenant.schema_name):
+                    written = rebuild_index(entity_types, batch_size=options['batch_size'])
+                summary = ', '.join(f'{entity_type}: {count}' for entity_type, count in written.items())
+                self.stdout.write(
+                    self.style.SUCCESS(f'Rebuilt search index for {tenant.schema_name} ({summary})')
+                )
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Error processing {tenant.schema_name}: {str(e)}')
+                )
+
+    def parse_types(self, value):
+        if not value:
+            return None
+        entity_types = [entity_type.strip() for entity_type in value.split(',') if entity_type.strip()]
+        unknown = [entity_type for entity_type in entity_types if entity_type not in SEARCH_ENTITY_MAP]
+        if unknown:
+            raise CommandError(f"Unknown entity types: {', '.join(unknown)}")
+        return entity_types
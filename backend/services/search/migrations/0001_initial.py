@@ -0,0 +1,66 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:01
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        # Installed once in the public schema, which every tenant's search_path includes
+        migrations.RunSQL(
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public",
+            migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("entity_type", models.CharField(max_length=32)),
+                ("object_id", models.CharField(max_length=64)),
+                ("title", models.CharField(max_length=255)),
+                ("subtitle", models.CharField(blank=True, default="", max_length=255)),
+                ("content", models.TextField()),
+                ("owner_id", models.BigIntegerField(blank=True, null=True)),
+                ("created_by_id", models.BigIntegerField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Search Document",
+                "verbose_name_plural": "Search Documents",
+                "db_table": "search_document",
+                "indexes": [
+                    models.Index(
+                        fields=["entity_type"], name="idx_searchdoc_entity_type"
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("content"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="idx_searchdoc_content_trgm",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("entity_type", "object_id"),
+                        name="unique_search_document_per_object",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.15 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+# User primary keys are UUIDs. The integer columns could never hold them, so
+# they are recreated rather than cast; run rebuild_search_index to fill them
+# for existing documents.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveField(model_name="searchdocument", name="owner_id"),
+        migrations.RemoveField(model_name="searchdocument", name="created_by_id"),
+        migrations.AddField(
+            model_name="searchdocument",
+            name="owner_id",
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="searchdocument",
+            name="created_by_id",
+            field=models.UUIDField(blank=True, null=True),
+        ),
+    ]
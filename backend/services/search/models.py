@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+
+from core.shared.search import trigram_index
+
+
+class SearchDocument(models.Model):
+    """
+    One searchable row per CRM, finance or inventory record in the tenant,
+    kept in sync by the post_save/post_delete handlers in signals.py.
+    content holds every searchable field of the record, one per line.
+    """
+    entity_type = models.CharField(max_length=32)
+    # Primary keys are integers for most entities and UUIDs for items
+    object_id = models.CharField(max_length=64)
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True, default='')
+    content = models.TextField()
+
+    # Visibility for entities that restricted users only see when they own them (user UUIDs)
+    owner_id = models.UUIDField(null=True, blank=True)
+    created_by_id = models.UUIDField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'search_document'
+        verbose_name = 'Search Document'
+        verbose_name_plural = 'Search Documents'
+        indexes = [
+            models.Index(fields=['entity_type'], name='idx_searchdoc_entity_type'),
+            trigram_index('content', name='idx_searchdoc_content_trgm'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['entity_type', 'object_id'],
+                name='unique_search_document_per_object'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}:{self.object_id} {self.title}"
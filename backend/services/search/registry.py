@@ -0,0 +1,137 @@
+from django.apps import apps
+from django.db.models.constants import LOOKUP_SEP
+
+
+class SearchEntity:
+    """
+    How one model is indexed for global search.
+
+    fields are the attributes (optionally following foreign keys with __)
+    copied into the document content; permissions are the tenant permissions
+    that unlock the entity in results (None: any tenant member). Entities with
+    owner_field/created_by_field are also shown to members holding one of
+    list_permissions, but only for records they own or created.
+    """
+
+    def __init__(self, entity_type, model, fields, title, subtitle=None, permissions=None,
+                 select_related=(), include=None, owner_field=None, created_by_field=None,
+                 list_permissions=None):
+        self.entity_type = entity_type
+        self.model_label = model
+        self.fields = fields
+        self.title = title
+        self.subtitle = subtitle
+        self.permissions = permissions
+        self.select_related = select_related
+        self.include = include
+        self.owner_field = owner_field
+        self.created_by_field = created_by_field
+        self.list_permissions = list_permissions
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def get_queryset(self):
+        queryset = self.model._default_manager.all()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        return queryset
+
+    def should_index(self, instance):
+        return self.include is None or self.include(instance)
+
+    def get_values(self, instance):
+        values = []
+        for path in self.fields:
+            value = instance
+            for attr in path.split(LOOKUP_SEP):
+                value = getattr(value, attr, None)
+                if value is None:
+                    break
+            if value not in (None, ''):
+                values.append(str(value))
+        return values
+
+    @property
+    def restricted_to_owner(self):
+        return bool(self.owner_field or self.created_by_field)
+
+
+def _full_name(instance):
+    return f"{instance.first_name or ''} {instance.last_name or ''}".strip()
+
+
+SEARCH_ENTITIES = [
+    SearchEntity(
+        'lead', 'leads.Lead',
+        fields=['first_name', 'last_name', 'company_name', 'email', 'phone'],
+        title=_full_name,
+        subtitle=lambda lead: lead.company_name or lead.email,
+        permissions=['all', 'manage_leads', 'view_customers'],
+        owner_field='lead_owner_id',
+        created_by_field='created_by_id',
+        # Same permissions the leads list requires
+        list_permissions=['all', 'manage_leads', 'view_customers', 'view_only', 'manage_contacts', 'manage_accounts'],
+    ),
+    SearchEntity(
+        'contact', 'contacts.Contact',
+        fields=['first_name', 'last_name', 'email', 'phone', 'account__account_name'],
+        title=_full_name,
+        subtitle=lambda contact: contact.email,
+        permissions=['all', 'manage_contacts'],
+        select_related=['account'],
+    ),
+    SearchEntity(
+        'account', 'accounts.Account',
+        fields=['account_name', 'industry', 'phone'],
+        title=lambda account: account.account_name,
+        subtitle=lambda account: account.industry,
+        permissions=['all', 'manage_accounts'],
+    ),
+    SearchEntity(
+        'deal', 'deals.Deal',
+        fields=['deal_name', 'stage', 'account__account_name'],
+        title=lambda deal: deal.deal_name,
+        subtitle=lambda deal: deal.stage,
+        permissions=['all', 'manage_opportunities'],
+        select_related=['account'],
+    ),
+    SearchEntity(
+        'customer', 'customers.FinanceContact',
+        fields=['display_name', 'company_name', 'customer_number', 'vat_registration_number'],
+        title=lambda customer: customer.display_name,
+        subtitle=lambda customer: customer.customer_number,
+        permissions=['all', 'manage_customers'],
+        include=lambda customer: customer.contact_type == 'customer',
+    ),
+    SearchEntity(
+        'invoice', 'invoices.Invoice',
+        fields=['invoice_number', 'po_number', 'reference_number', 'account__account_name'],
+        title=lambda invoice: invoice.invoice_number,
+        subtitle=lambda invoice: invoice.account.account_name if invoice.account_id else '',
+        permissions=['all', 'manage_opportunities', 'manage_accounts'],
+        select_related=['account'],
+    ),
+    SearchEntity(
+        'estimate', 'estimates.Estimate',
+        fields=['estimate_number', 'po_number', 'account__account_name'],
+        title=lambda estimate: estimate.estimate_number,
+        subtitle=lambda estimate: estimate.account.account_name if estimate.account_id else '',
+        permissions=['all', 'manage_opportunities', 'manage_accounts'],
+        select_related=['account'],
+    ),
+    SearchEntity(
+        'item', 'inventory_items.Item',
+        fields=['name', 'sku', 'description'],
+        title=lambda item: item.name,
+        subtitle=lambda item: item.sku,
+    ),
+]
+
+SEARCH_ENTITY_MAP = {entity.entity_type: entity for entity in SEARCH_ENTITIES}
+
+
+def get_search_entity(entity_type):
+    return SEARCH_ENTITY_MAP.get(entity_type)
+
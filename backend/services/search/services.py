@@ -0,0 +1,96 @@
+import re
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Count, F, FloatField, Q, Value, Window
+from django.db.models.functions import Coalesce, RowNumber
+from django.utils.html import escape
+
+from .models import SearchDocument
+from .registry import SEARCH_ENTITIES
+
+SNIPPET_RADIUS = 60
+
+
+def search_documents(query, entity_types, limit=5, owner_filters=None):
+    """
+    Top limit matching documents per entity type, in one statement.
+
+    Rows match on the trigram-indexed content, are ranked per type with
+    ROW_NUMBER() OVER (PARTITION BY entity_type ORDER BY similarity DESC)
+    and cut at limit; a COUNT(*) window over the same partition carries each
+    type's total match count. owner_filters maps entity types to an extra Q
+    restricting which of their documents the caller may see.
+
+    Returns {entity_type: (total, [SearchDocument, ...])}.
+    """
+    condition = Q()
+    for entity_type in entity_types:
+        restriction = (owner_filters or {}).get(entity_type)
+        type_condition = Q(entity_type=entity_type)
+        if restriction is not None:
+            type_condition &= restriction
+        condition |= type_condition
+
+    def rank():
+        return Coalesce(TrigramWordSimilarity(query, 'content'), Value(0.0), output_field=FloatField())
+
+    documents = SearchDocument.objects.filter(condition, content__icontains=query).annotate(
+        rank=rank(),
+        position=Window(
+            expression=RowNumber(),
+            partition_by=[F('entity_type')],
+            order_by=[rank().desc(), F('updated_at').desc(), F('pk').desc()],
+        ),
+        total=Window(expression=Count('pk'), partition_by=[F('entity_type')]),
+    ).filter(position__lte=limit).order_by('entity_type', 'position')
+
+    results = {entity_type: (0, []) for entity_type in entity_types}
+    for document in documents:
+        total, hits = results[document.entity_type]
+        hits.append(document)
+        results[document.entity_type] = (document.total, hits)
+    return results
+
+
+def highlight(text, query, radius=SNIPPET_RADIUS):
+    """
+    HTML-safe snippet of text around the first match of query, with every
+    match inside the snippet wrapped in <mark>.
+    """
+    text = text or ''
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    first = pattern.search(text)
+    if first is None:
+        return escape(text[:radius * 2])
+
+    start = max(0, first.start() - radius)
+    end = min(len(text), first.end() + radius)
+    snippet = text[start:end]
+
+    parts = []
+    position = 0
+    for match in pattern.finditer(snippet):
+        parts.append(escape(snippet[position:match.start()]))
+        parts.append(f'<mark>{escape(match.group())}</mark>')
+        position = match.end()
+    parts.append(escape(snippet[position:]))
+
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if end < len(text) else ''
+    return prefix + ''.join(parts) + suffix
+
+
+def serialize_hit(document, query):
+    return {
+        'id': document.object_id,
+        'type': document.entity_type,
+        'title': document.title,
+        'subtitle': document.subtitle,
+        'title_highlight': highlight(document.title, query),
+        'highlight': highlight(document.content.replace('\n', ' · '), query),
+        'rank': round(document.rank, 4),
+    }
+
+
+def searchable_types():
+    return [entity.entity_type for entity in SEARCH_ENTITIES]
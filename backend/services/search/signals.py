@@ -0,0 +1,73 @@
+from collections import defaultdict
+
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import post_delete, post_save
+
+from .indexing import index_instance, reindex_related, remove_instance
+from .registry import SEARCH_ENTITIES
+
+
+def _make_handlers(entity):
+    def on_save(sender, instance, raw=False, **kwargs):
+        # Fixture loading writes raw rows; rebuild_search_index covers those
+        if raw:
+            return
+        index_instance(entity, instance)
+
+    def on_delete(sender, instance, **kwargs):
+        remove_instance(entity, instance)
+
+    return on_save, on_delete
+
+
+def _related_dependencies():
+    """
+    Map each related model to the (entity, relation, copied fields) whose
+    documents copy its fields, e.g. accounts.Account to the contact, deal,
+    invoice and estimate documents that include account__account_name.
+    """
+    copied = defaultdict(set)
+    for entity in SEARCH_ENTITIES:
+        for path in entity.fields:
+            if LOOKUP_SEP in path:
+                relation, field = path.split(LOOKUP_SEP, 1)
+                copied[(entity, relation)].add(field.split(LOOKUP_SEP, 1)[0])
+
+    dependencies = defaultdict(list)
+    for (entity, relation), fields in copied.items():
+        related_model = entity.model._meta.get_field(relation).related_model
+        dependencies[related_model].append((entity, relation, fields))
+    return dependencies
+
+
+def _make_related_handler(dependents):
+    def on_related_save(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+        # A new row has nothing pointing at it yet
+        if raw or created:
+            return
+        for entity, relation, fields in dependents:
+            if update_fields is not None and not fields & set(update_fields):
+                continue
+            reindex_related(entity, relation, instance)
+
+    return on_related_save
+
+
+def connect_search_signals():
+    """Keep search documents in step with every registered model and the models they copy fields from"""
+    for entity in SEARCH_ENTITIES:
+        on_save, on_delete = _make_handlers(entity)
+        post_save.connect(
+            on_save, sender=entity.model, weak=False,
+            dispatch_uid=f'search_index_{entity.entity_type}'
+        )
+        post_delete.connect(
+            on_delete, sender=entity.model, weak=False,
+            dispatch_uid=f'search_remove_{entity.entity_type}'
+        )
+
+    for related_model, dependents in _related_dependencies().items():
+        post_save.connect(
+            _make_related_handler(dependents), sender=related_model, weak=False,
+            dispatch_uid=f'search_reindex_related_{related_model._meta.label_lower}'
+        )
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from services.crm.leads.models import Lead
+from services.search.views import GlobalSearchView
+
+User = get_user_model()
+
+
+class GlobalSearchLeadVisibilityTests(TenantTestCase):
+    def setUp(self):
+        self.member = self._user('member')
+        self.colleague = self._user('colleague')
+        Lead.objects.create(first_name='Acme', last_name='Owned', lead_owner=self.member)
+        Lead.objects.create(first_name='Acme', last_name='Created', created_by=self.member)
+        Lead.objects.create(first_name='Acme', last_name='Other', lead_owner=self.colleague)
+
+    def _user(self, name):
+        user = User.objects.create_user(
+            username=name, email=f'{name}@example.com', password='secret',
+            first_name=name.title(), last_name='User'
+        )
+        user.tenants.add(self.tenant)
+        return user
+
+    def _search(self, user, query):
+        request = APIRequestFactory().get('/api/search/', {'q': query, 'types': 'lead', 'limit': 20})
+        request.tenant = self.tenant
+        force_authenticate(request, user=user)
+        return GlobalSearchView.as_view()(request)
+
+    def test_member_without_roles_only_finds_own_leads(self):
+        response = self._search(self.member, 'acme')
+
+        self.assertEqual(response.status_code, 200)
+        titles = {hit['title'] for hit in response.data['results']['lead']}
+        self.assertEqual(titles, {'Acme Owned', 'Acme Created'})
+        self.assertEqual(response.data['counts']['lead'], 2)
@@ -0,0 +1,85 @@
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.tenant_core.principals import BASIC_PERMISSIONS, get_tenant_principal
+from core.tenants.permissions import IsTenantUser
+
+from .registry import SEARCH_ENTITIES
+from .services import search_documents, serialize_hit
+
+MIN_QUERY_LENGTH = 2
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 20
+
+
+class GlobalSearchView(APIView):
+    """
+    Search leads, contacts, accounts, deals, customers, invoices, estimates
+    and items in one request.
+
+    GET /api/search/?q=acme&types=lead,invoice&limit=5
+    """
+    permission_classes = [IsAuthenticated, IsTenantUser]
+
+    def get_visible_types(self, request):
+        """
+        Map each entity type the user may search to the Q limiting which of its
+        documents they see (None: all of them), mirroring the list endpoints.
+        """
+        user = request.user
+        if user.is_superadmin:
+            return {entity.entity_type: None for entity in SEARCH_ENTITIES}
+
+        principal = get_tenant_principal(user, getattr(request, 'tenant', None), request)
+
+        def allowed(permissions):
+            # Members without roles get the basic viewing permissions
+            if not principal.has_roles and any(p in BASIC_PERMISSIONS for p in permissions):
+                return True
+            return principal.has_any_permission(permissions)
+
+        visible = {}
+        for entity in SEARCH_ENTITIES:
+            if entity.restricted_to_owner:
+                # Same rule as the leads list: seeing every record takes a real
+                # role permission, otherwise users see records they own or created
+                if principal.has_any_permission(entity.permissions or []):
+                    visible[entity.entity_type] = None
+                elif entity.list_permissions and allowed(entity.list_permissions):
+                    visible[entity.entity_type] = Q(owner_id=user.pk) | Q(created_by_id=user.pk)
+            elif entity.permissions is None or allowed(entity.permissions):
+                visible[entity.entity_type] = None
+        return visible
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if len(query) < MIN_QUERY_LENGTH:
+            return Response(
+                {'error': f'Search query must be at least {MIN_QUERY_LENGTH} characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        visible = self.get_visible_types(request)
+        requested = request.query_params.get('types')
+        if requested:
+            requested = {entity_type.strip() for entity_type in requested.split(',') if entity_type.strip()}
+            visible = {key: value for key, value in visible.items() if key in requested}
+
+        results = search_documents(query, list(visible), limit=limit, owner_filters=visible) if visible else {}
+
+        return Response({
+            'query': query,
+            'results': {
+                entity_type: [serialize_hit(document, query) for document in hits]
+                for entity_type, (_total, hits) in results.items()
+            },
+            'counts': {entity_type: total for entity_type, (total, _hits) in results.items()},
+        })
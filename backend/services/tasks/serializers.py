@@ -1,6 +1,8 @@
 from django.contrib.contenttypes.models import ContentType
 from rest_framework import serializers
 
+from core.shared.serial_numbers import SerialNumberListSerializer, SerialNumberMixin, related_count
+
 from .models import Task, TaskComment
 
 
@@ -18,11 +20,12 @@ class TaskCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'author', 'author_name', 'author_email', 'created_at', 'updated_at']
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Main serializer for Task model with full functionality"""
 
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('created_at',)
 
     # Read-only fields for user information
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
@@ -42,38 +45,14 @@ class TaskSerializer(serializers.ModelSerializer):
 
     # Comments (nested)
     comments = TaskCommentSerializer(many=True, read_only=True)
-    comment_count = serializers.IntegerField(source='comments.count', read_only=True)
-
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on task position in ordered list within the same context"""
-        # Filter tasks by the same context as the current task
-        queryset_filter = {'is_active': True}
-
-        # If task is linked to an entity, only count tasks for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If task is standalone, only count standalone tasks
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-
-        # Get tasks in the same context ordered by creation date
-        active_tasks = obj.__class__.objects.filter(**queryset_filter).order_by('created_at')
-
-        # Find the position of current task (1-based indexing)
-        for index, task in enumerate(active_tasks, 1):
-            if task.id == obj.id:
-                return index
-
-        # Fallback: return task ID if not found (shouldn't happen)
-        return obj.id
+    comment_count = serializers.SerializerMethodField()
+
+    def get_comment_count(self, obj):
+        return related_count(obj, 'comment_count', 'comments')
 
     class Meta:
         model = Task
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'title', 'description', 'priority', 'priority_display',
             'status', 'status_display', 'deadline', 'completed_at',
@@ -98,46 +77,20 @@ class TaskSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class TaskCreateSerializer(serializers.ModelSerializer):
+class TaskCreateSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Simplified serializer for task creation"""
 
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('created_at',)
 
     # Optional entity linking
     entity_type = serializers.CharField(required=False, allow_blank=True)
     entity_id = serializers.IntegerField(required=False, allow_null=True)
 
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on task position in ordered list within the same context"""
-        # Filter tasks by the same context as the current task
-        queryset_filter = {'is_active': True}
-
-        # If task is linked to an entity, only count tasks for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If task is standalone, only count standalone tasks
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-
-        # Get tasks in the same context ordered by creation date
-        active_tasks = obj.__class__.objects.filter(**queryset_filter).order_by('created_at')
-
-        # Find the position of current task (1-based indexing)
-        for index, task in enumerate(active_tasks, 1):
-            if task.id == obj.id:
-                return index
-
-        # Fallback: return task ID if not found (shouldn't happen)
-        return obj.id
-
     class Meta:
         model = Task
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'title', 'description', 'priority', 'status', 'deadline',
             'estimated_hours', 'tags',
@@ -199,11 +152,12 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
-class TaskListSerializer(serializers.ModelSerializer):
+class TaskListSerializer(SerialNumberMixin, serializers.ModelSerializer):
     """Lightweight serializer for task lists"""
 
     # Dynamic serial number field
     serial_number = serializers.SerializerMethodField()
+    serial_number_ordering = ('created_at',)
 
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
     priority_display = serializers.CharField(source='get_priority_display', read_only=True)
@@ -213,36 +167,9 @@ class TaskListSerializer(serializers.ModelSerializer):
     entity_type = serializers.CharField(read_only=True)
     entity_id = serializers.IntegerField(source='object_id', read_only=True)
 
-    def get_serial_number(self, obj):
-        """Calculate dynamic serial number based on task position in ordered list within the same context"""
-        # Filter tasks by the same context as the current task
-        queryset_filter = {'is_active': True}
-
-        # If task is linked to an entity, only count tasks for the same entity
-        if obj.content_type and obj.object_id:
-            queryset_filter.update({
-                'content_type': obj.content_type,
-                'object_id': obj.object_id
-            })
-        else:
-            # If task is standalone, only count standalone tasks
-            queryset_filter.update({
-                'content_type__isnull': True
-            })
-
-        # Get tasks in the same context ordered by creation date
-        active_tasks = obj.__class__.objects.filter(**queryset_filter).order_by('created_at')
-
-        # Find the position of current task (1-based indexing)
-        for index, task in enumerate(active_tasks, 1):
-            if task.id == obj.id:
-                return index
-
-        # Fallback: return task ID if not found (shouldn't happen)
-        return obj.id
-
     class Meta:
         model = Task
+        list_serializer_class = SerialNumberListSerializer
         fields = [
             'id', 'serial_number', 'title', 'description', 'priority', 'priority_display', 'status', 'status_display',
             'deadline', 'created_by_name',
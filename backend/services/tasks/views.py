@@ -1,5 +1,5 @@
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils import timezone
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
@@ -104,6 +104,8 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Task.objects.filter(is_active=True).select_related(
             'created_by', 'content_type'
+        ).annotate(
+            comment_count=Count('comments', distinct=True)
         ).prefetch_related('comments__author')
 
     def destroy(self, request, *args, **kwargs):